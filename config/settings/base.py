@@ -151,6 +151,69 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'mediafiles')
 # since the default permissions set for large files deny it access.
 FILE_UPLOAD_PERMISSIONS = 0o644
 
+# Disk space management for job files saved in mediafiles/jobs. All sizes are in bytes.
+# Free space that jobs must always leave on the mediafiles volume.
+PRESQT_DISK_RESERVE = int(os.environ.get('PRESQT_DISK_RESERVE', 1024 ** 3))
+# Maximum space all of a single user's jobs can take up. 0 means there is no quota.
+PRESQT_USER_DISK_QUOTA = int(os.environ.get('PRESQT_USER_DISK_QUOTA', 0))
+# Maximum number of download, upload and transfer jobs a single user can have running at once.
+# Jobs over the limit wait until one of the user's other jobs finishes. 0 means there is no limit.
+PRESQT_USER_JOB_LIMIT = int(os.environ.get('PRESQT_USER_JOB_LIMIT', 3))
+# Default for the 'presqt-delete-after-deliver' header. When on, a job's files are deleted as soon
+# as its zip file is fetched or its resources are uploaded to the destination target.
+PRESQT_DELETE_AFTER_DELIVER = os.environ.get('PRESQT_DELETE_AFTER_DELIVER', 'no') == 'yes'
+# Opt-in content addressed store in mediafiles/cas. Downloaded files are kept by their hashes and
+# copied into later jobs that download the same files instead of fetching them again.
+PRESQT_CONTENT_STORE = os.environ.get('PRESQT_CONTENT_STORE', 'no') == 'yes'
+# Size cap of the content store. The least recently used files are removed past it.
+PRESQT_CONTENT_STORE_MAX_SIZE = int(os.environ.get('PRESQT_CONTENT_STORE_MAX_SIZE', 10 * 1024 ** 3))
+# Transfers to infinite depth targets upload each file as soon as it's downloaded and checked
+# instead of waiting for the whole download to be bagged first.
+PRESQT_PIPELINED_TRANSFER = os.environ.get('PRESQT_PIPELINED_TRANSFER', 'no') == 'yes'
+# Number of files a pipelined transfer holds between its download, fixity and upload stages.
+PRESQT_TRANSFER_QUEUE_SIZE = int(os.environ.get('PRESQT_TRANSFER_QUEUE_SIZE', 16))
+# Number of seconds SciGraph terms are cached for. Keywords SciGraph doesn't know are cached
+# for a shorter time so new vocabulary is picked up sooner.
+PRESQT_SCIGRAPH_CACHE_TTL = int(os.environ.get('PRESQT_SCIGRAPH_CACHE_TTL', 7 * 24 * 60 * 60))
+PRESQT_SCIGRAPH_NEGATIVE_CACHE_TTL = int(os.environ.get('PRESQT_SCIGRAPH_NEGATIVE_CACHE_TTL',
+                                                        60 * 60))
+# Backend used to enhance keywords. 'scigraph' asks the remote SciGraph host and 'local' looks
+# terms up in a vocabulary index built with the build_keyword_vocabulary command.
+PRESQT_KEYWORD_ENHANCER = os.environ.get('PRESQT_KEYWORD_ENHANCER', 'scigraph')
+PRESQT_KEYWORD_VOCABULARY = os.environ.get('PRESQT_KEYWORD_VOCABULARY',
+                                           os.path.join(BASE_DIR, 'keyword_vocabulary.sqlite3'))
+# Number of seconds target statuses are cached for before they're probed again in the background.
+PRESQT_STATUS_CACHE_TTL = int(os.environ.get('PRESQT_STATUS_CACHE_TTL', 60))
+# Number of probes per target kept for its latency percentiles and availability.
+PRESQT_STATUS_WINDOW = int(os.environ.get('PRESQT_STATUS_WINDOW', 60))
+# Number of seconds FAIRshare evaluations are cached for by resource url and test collection.
+PRESQT_FAIRSHARE_CACHE_TTL = int(os.environ.get('PRESQT_FAIRSHARE_CACHE_TTL', 24 * 60 * 60))
+# Number of seconds the cached FAIRshake API schema is used before checking it's still current.
+PRESQT_FAIRSHAKE_SCHEMA_TTL = int(os.environ.get('PRESQT_FAIRSHAKE_SCHEMA_TTL', 24 * 60 * 60))
+# Number of delta files a project's FTS metadata can have before uploads compact them into
+# PRESQT_FTS_METADATA.json. 0 rewrites PRESQT_FTS_METADATA.json on every upload.
+PRESQT_FTS_METADATA_MAX_DELTAS = int(os.environ.get('PRESQT_FTS_METADATA_MAX_DELTAS', 20))
+# Base URL of a mock target server (python manage.py run_mock_targets) that target API requests
+# are sent to instead of the live targets. Only for offline tests and benchmarks.
+PRESQT_TARGET_BASE_URL = os.environ.get('PRESQT_TARGET_BASE_URL')
+# Default for the 'presqt-profile' header. When on, the stacks of each job's process are sampled
+# into a collapsed stack file in the job's directory.
+PRESQT_PROFILE_JOBS = os.environ.get('PRESQT_PROFILE_JOBS', 'no') == 'yes'
+# Number of seconds between the stack samples of profiled jobs.
+PRESQT_PROFILE_INTERVAL = float(os.environ.get('PRESQT_PROFILE_INTERVAL', 0.01))
+# Token admin endpoints expect in the 'presqt-admin-token' header. Admin endpoints are off
+# when it's not set.
+PRESQT_ADMIN_TOKEN = os.environ.get('PRESQT_ADMIN_TOKEN')
+# How job processes are started. 'fork' forks them from the request server. 'forkserver' sends a
+# small job spec to a job worker forked from a lean server that has the job code preloaded.
+PRESQT_JOB_START_METHOD = os.environ.get('PRESQT_JOB_START_METHOD', 'fork')
+# Number of seconds a job can run for. Jobs stop themselves at their deadline and the watchdog
+# kills them if they haven't stopped PRESQT_JOB_CANCEL_GRACE seconds later.
+PRESQT_JOB_TIMEOUT = int(os.environ.get('PRESQT_JOB_TIMEOUT', 3600))
+# Number of seconds a cancelled or timed out job has to stop and save its progress before its
+# process is killed.
+PRESQT_JOB_CANCEL_GRACE = int(os.environ.get('PRESQT_JOB_CANCEL_GRACE', 10))
+
 # Test user tokens. Used for unit tests.
 # DON'T EVER USE THESE TOKENS TO STORE NON-PUBLIC DATA AS THEY ARE NOT SECURE
 OSF_TEST_USER_TOKEN = os.environ['OSF_TEST_USER_TOKEN']
@@ -18,9 +18,12 @@ from django.urls import path, include
 from django.views.generic import RedirectView
 
 from presqt.api_v1.urls import api_v1_endpoints
+from presqt.api_v1.views.metrics.metrics import Metrics
 
 urlpatterns = [
     path('', RedirectView.as_view(pattern_name='api_root')),
     path('admin/', admin.site.urls),
-    path('api_v1/', include(api_v1_endpoints))
+    path('api_v1/', include(api_v1_endpoints)),
+    # Prometheus scrapes /metrics without a trailing slash
+    path('metrics', Metrics.as_view(), name='metrics')
 ]
@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'presqt.settings')
 
 application = get_wsgi_application()
+
+from config.settings.base import PRESQT_JOB_START_METHOD  # noqa: E402
+
+if PRESQT_JOB_START_METHOD == 'forkserver':
+    from presqt.api_v1.utilities.multiprocess.spawn_action_process import \
+        start_job_worker_server
+    start_job_worker_server()
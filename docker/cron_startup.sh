@@ -1,4 +1,7 @@
 #!/bin/sh
 
+# start the expired mediafiles sweeper
+python /usr/src/app/manage.py delete_outdated_mediafiles --continuous &
+
 # start cron
 /usr/sbin/crond -f -l 8
\ No newline at end of file
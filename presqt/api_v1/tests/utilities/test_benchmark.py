@@ -0,0 +1,78 @@
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities.benchmark.baseline import compare_to_baseline
+from presqt.api_v1.utilities.benchmark.run_scenario import run_scenario
+from presqt.api_v1.utilities.benchmark.scenarios import validate_scenarios
+from presqt.utilities import PresQTValidationError
+
+SHAPE = {'depth': 1, 'folders': 1, 'files': 2, 'file_size': [64, 128]}
+
+
+class TestBenchmark(SimpleTestCase):
+    def setUp(self):
+        self.baseline = [{'name': 'download', 'status': 'finished', 'wall_time': 1.0,
+                          'peak_rss': 100 * 1024 ** 2, 'bytes_written': 1024,
+                          'http_requests': {'osf': 10}, 'phases': {'fetch': 0.5, 'zip': 0.01}}]
+
+    def test_run_scenarios(self):
+        """
+        Each action should run through the API against the mock targets and be measured.
+        """
+        for scenario in [
+                {'name': 'download', 'action': 'download', 'target': 'github', 'shape': SHAPE},
+                {'name': 'upload', 'action': 'upload', 'target': 'osf', 'shape': SHAPE},
+                {'name': 'transfer', 'action': 'transfer', 'target': 'gitlab',
+                 'destination': 'zenodo', 'shape': SHAPE}]:
+            with self.subTest(action=scenario['action']):
+                result = run_scenario(scenario, timeout=60)
+                self.assertEqual(result['status'], 'finished', result.get('message'))
+                self.assertGreater(result['wall_time'], 0)
+                self.assertGreater(result['peak_rss'], 0)
+                self.assertGreater(sum(result['http_requests'].values()), 0)
+
+        # The last result was the transfer
+        self.assertEqual(set(result['http_requests']), {'gitlab', 'zenodo'})
+        self.assertLessEqual({'fetch', 'file_download', 'fixity', 'bag', 'zip', 'upload',
+                              'metadata'}, set(result['phases']))
+
+    def test_validate_scenarios(self):
+        """
+        Scenarios with bad names, actions or targets should be rejected.
+        """
+        validate_scenarios([{'name': 'a', 'action': 'download', 'target': 'osf'}])
+        for scenarios in [
+                [{'action': 'download', 'target': 'osf'}],
+                [{'name': 'a', 'action': 'download', 'target': 'osf'},
+                 {'name': 'a', 'action': 'upload', 'target': 'osf'}],
+                [{'name': 'a', 'action': 'delete', 'target': 'osf'}],
+                [{'name': 'a', 'action': 'download', 'target': 'bad_target'}],
+                [{'name': 'a', 'action': 'transfer', 'target': 'osf'}]]:
+            with self.subTest(scenarios=scenarios):
+                with self.assertRaises(PresQTValidationError):
+                    validate_scenarios(scenarios)
+
+    def test_no_regressions(self):
+        """
+        Changes within the tolerance or below the minimums should not be regressions.
+        """
+        result = dict(self.baseline[0], wall_time=1.1, bytes_written=4096,
+                      phases={'fetch': 0.55, 'zip': 0.05})
+        self.assertEqual(compare_to_baseline([result], self.baseline), [])
+        # Scenarios that aren't in the baseline are skipped
+        self.assertEqual(compare_to_baseline([dict(result, name='new')], self.baseline), [])
+
+    def test_regressions(self):
+        """
+        Slower runs, more memory, extra requests and failed jobs should be regressions.
+        """
+        result = dict(self.baseline[0], wall_time=1.5, peak_rss=200 * 1024 ** 2,
+                      http_requests={'osf': 11}, phases={'fetch': 0.5, 'zip': 0.5})
+        self.assertEqual(compare_to_baseline([result], self.baseline), [
+            'download: wall_time went from 1.0 to 1.5',
+            'download: zip phase went from 0.01 to 0.5',
+            'download: peak_rss went from 104857600 to 209715200',
+            'download: osf requests went from 10 to 11'])
+
+        self.assertEqual(
+            compare_to_baseline([dict(result, status='failed')], self.baseline),
+            ['download: the job failed instead of finishing'])
@@ -0,0 +1,137 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+from rest_framework.reverse import reverse
+
+from presqt.api_v1.utilities import get_user_jobs, hash_tokens
+from presqt.api_v1.utilities.keyword_enhancement import bulk_keywords
+from presqt.api_v1.utilities.utils import job_index
+from presqt.utilities import PresQTResponseException
+
+TERM = {'labels': ['eggs'], 'uri': 'http://purl.obolibrary.org/obo/EGG_1',
+        'fragment': 'EGG_1', 'categories': ['food']}
+
+
+def run_in_process(self, method_to_call, action):
+    """
+    Stand in for spawn_action_process that runs the job in the test's process.
+    """
+    self.function_process = MagicMock(pid=1)
+    method_to_call()
+
+
+def keywords(token, resource_id):
+    if resource_id == 'missing':
+        raise PresQTResponseException("PresQT Error: The resource could not be found.", 404)
+    return {'keywords': ['spam'], 'enhanced_keywords': []}
+
+
+def keywords_upload(token, resource_id, keywords):
+    return {'updated_keywords': keywords, 'project_id': resource_id.split('/')[0]}
+
+
+class TestBulkKeywords(SimpleTestCase):
+    def setUp(self):
+        self.header = {'HTTP_PRESQT_SOURCE_TOKEN': 'bulk_keywords_test_token'}
+        self.url = reverse('bulk_keywords', kwargs={'target_name': 'osf'})
+        self.metadata_upload = MagicMock()
+        self.functions = {'keywords': keywords, 'keywords_upload': keywords_upload,
+                          'metadata_upload': self.metadata_upload}
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        patcher = patch.object(job_index, 'JOB_INDEX_PATH',
+                               os.path.join(directory, 'job_index.sqlite3'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post_job(self, body):
+        """
+        Start a bulk keywords job and run it in the test's process.
+        """
+        with patch.object(bulk_keywords, 'spawn_action_process', run_in_process), \
+                patch.object(bulk_keywords.FunctionRouter, 'get_function',
+                             side_effect=lambda target, action: self.functions[action]), \
+                patch.object(bulk_keywords, 'get_enhancer_terms',
+                             return_value={'eggs': TERM, 'ham': None}) as mock_terms:
+            response = self.client.post(self.url, json.dumps(body),
+                                        content_type='application/json', **self.header)
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data['job_id']
+        self.addCleanup(shutil.rmtree, os.path.join('mediafiles', 'jobs', job_id))
+        self.assertTrue(response.data['bulk_keywords_job'].endswith('?job_id={}'.format(job_id)))
+        return job_id, mock_terms
+
+    def test_bulk_keywords_job(self):
+        """
+        Keywords should be added to every resource and the ontologies looked up once. Each
+        project should get one metadata action.
+        """
+        body = {'resources': [
+            {'resource_id': 'proj1/file1', 'keywords': ['eggs']},
+            {'resource_id': 'proj1/file2', 'keywords': ['ham']},
+            {'resource_id': 'proj2/file1', 'keywords': ['eggs']},
+            {'resource_id': 'missing', 'keywords': ['eggs']}]}
+
+        job_id, mock_terms = self.post_job(body)
+        self.assertEqual([job[:2] for job in get_user_jobs(
+            [hash_tokens('bulk_keywords_test_token')])], [(job_id, 'bulk_keywords')])
+
+        mock_terms.assert_called_once()
+        self.assertEqual(sorted(mock_terms.call_args[0][0]), ['eggs', 'ham'])
+        self.assertEqual(self.metadata_upload.call_count, 2)
+        project_metadata = {call[0][1]: call[0][2]
+                            for call in self.metadata_upload.call_args_list}
+        proj1_keywords = project_metadata['proj1']['actions'][0]['keywords']
+        self.assertEqual(proj1_keywords['sourceKeywordsEnhanced'], ['eggs', 'ham'])
+        self.assertEqual(proj1_keywords['ontologies'][0]['keywords'], ['eggs'])
+
+        job_response = self.client.get(
+            reverse('job_status', kwargs={'action': 'bulk_keywords'}), {'job_id': job_id},
+            **self.header)
+        self.assertEqual(job_response.status_code, 200)
+        self.assertEqual(job_response.data['job_percentage'], 99)
+        self.assertEqual(job_response.data['message'],
+                         'Keywords have been added to 3 of 4 resources.')
+        results = {result['resource_id']: result for result in job_response.data['results']}
+        self.assertEqual(results['proj1/file1']['final_keywords'], ['spam', 'eggs'])
+        self.assertEqual(results['missing']['status_code'], 404)
+
+    def test_bulk_keywords_job_error(self):
+        """
+        Errors the job doesn't handle should fail it rather than leave it in progress.
+        """
+        self.functions['keywords'] = MagicMock(side_effect=KeyError('keywords'))
+        first_job, mock_terms = self.post_job(
+            {'resources': [{'resource_id': 'proj1/file1', 'keywords': ['eggs']}]})
+        second_job, mock_terms = self.post_job(
+            {'resources': [{'resource_id': 'proj1/file1', 'keywords': ['eggs']}]})
+        self.assertNotEqual(first_job, second_job)
+
+        # Without a job id the latest job is returned
+        job_response = self.client.get(
+            reverse('job_status', kwargs={'action': 'bulk_keywords'}), **self.header)
+        self.assertEqual(job_response.status_code, 500)
+        self.assertEqual(job_response.data['status'], 'failed')
+        self.assertEqual(job_response.data['status_code'], 500)
+        self.assertEqual(job_response.data['message'],
+                         "PresQT Error: The bulk keywords job failed unexpectedly: "
+                         "KeyError('keywords')")
+
+    def test_bulk_keywords_validation(self):
+        """
+        Invalid resources should be rejected before a job is started.
+        """
+        body = {'resources': [{'resource_id': 'proj1', 'keywords': 'eggs'}]}
+        response = self.client.post(self.url, json.dumps(body),
+                                    content_type='application/json', **self.header)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'],
+                         "Resource 0: PresQT Error: 'keywords' must be in list format.")
+
+        response = self.client.post(self.url, json.dumps({}),
+                                    content_type='application/json', **self.header)
+        self.assertEqual(response.status_code, 400)
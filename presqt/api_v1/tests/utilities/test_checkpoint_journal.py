@@ -0,0 +1,171 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import requests
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities import FunctionRouter
+from presqt.targets.utilities import install_target_url_override
+from presqt.targets.utilities.mock_targets import MockTargetsServer
+from presqt.targets.utilities.utils import target_urls
+from presqt.utilities import (CheckpointJournal, JobControl, open_checkpoint_journal,
+                              close_checkpoint_journal, get_checkpointed_file,
+                              get_checkpointed_upload, checkpoint_uploaded_file,
+                              checkpointed_destination, get_uncached_resources, read_file,
+                              PresQTJobStopped)
+
+ACTION = 'resource_upload'
+
+
+class TestCheckpointJournal(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(close_checkpoint_journal)
+        self.resource_main_dir = os.path.join(self.directory, 'resources')
+        self.journal = self.new_journal()
+        self.journal.start(b'job spec')
+
+        self.process_info_path = os.path.join(self.directory, 'process_info.json')
+        with open(self.process_info_path, 'w') as process_info_file:
+            json.dump({ACTION: {'upload_total_files': 0, 'upload_files_finished': 0,
+                                'message': ''}}, process_info_file)
+
+    def new_journal(self):
+        return CheckpointJournal(
+            os.path.join(self.directory, CheckpointJournal.DIRECTORY_NAME),
+            self.resource_main_dir)
+
+    def write_resource(self, path, contents):
+        file_path = '{}{}'.format(self.resource_main_dir, path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as resource_file:
+            resource_file.write(contents)
+        return file_path
+
+    def test_record_and_load(self):
+        """
+        Recorded work should be read back by the next attempt, skipping a torn last entry.
+        """
+        self.assertEqual(CheckpointJournal.read_job_spec(self.directory), b'job spec')
+        self.journal.record({'stage': 'destination', 'name': 'create_project', 'result': 1})
+        with open(self.journal.journal_path, 'a') as journal_file:
+            journal_file.write('{"stage": "upl')
+
+        journal = self.new_journal()
+        journal.load()
+        self.assertEqual(journal.destinations, {'create_project': 1})
+        self.assertEqual(journal.uploads, {})
+
+        # A new job starts with an empty journal
+        journal.start(None)
+        journal.load()
+        self.assertEqual(journal.destinations, {})
+        self.assertIsNone(CheckpointJournal.read_job_spec(self.directory))
+
+    def test_checkpointed_file(self):
+        """
+        Downloads should only be reused when the source still has the same contents.
+        """
+        resource = {'path': '/project/spam.txt', 'title': 'spam.txt', 'file': b'spam',
+                    'hashes': {'md5': 'spam_md5', 'sha256': None}}
+        file_path = self.write_resource(resource['path'], b'spam')
+        self.journal.record_download(resource, file_path)
+
+        # Making the bag moved the file into the data directory
+        os.makedirs(os.path.join(self.resource_main_dir, 'data'))
+        os.replace(os.path.join(self.resource_main_dir, 'project'),
+                   os.path.join(self.resource_main_dir, 'data', 'project'))
+        self.journal.keep_previous_files()
+        self.assertFalse(os.path.exists(self.resource_main_dir))
+
+        open_checkpoint_journal(self.new_journal())
+        changed_resource = dict(resource, file=None, hashes={'md5': 'eggs_md5', 'sha256': None})
+        self.assertIsNone(get_checkpointed_file(changed_resource))
+
+        resources = [dict(resource, file=None), changed_resource]
+        self.assertEqual(get_uncached_resources(resources), [changed_resource])
+        self.assertEqual(read_file(resources[0]['blob_path']), b'spam')
+
+    def test_checkpointed_upload(self):
+        """
+        Uploaded files should be skipped by the next attempt unless their contents changed.
+        """
+        journal = self.new_journal()
+        journal.file_hashes = {'/spam.txt': 'spam_md5', '/eggs.txt': 'eggs_md5'}
+        open_checkpoint_journal(journal)
+        for path in ['/spam.txt', '/eggs.txt']:
+            self.assertIsNone(get_checkpointed_upload(path, self.process_info_path, ACTION))
+            checkpoint_uploaded_file({'actionRootPath': path, 'destinationPath': path,
+                                      'title': path[1:], 'destinationHash': None}, 'updated')
+
+        journal = self.new_journal()
+        journal.file_hashes = {'/spam.txt': 'spam_md5', '/eggs.txt': 'new_eggs_md5'}
+        open_checkpoint_journal(journal)
+        file_metadata, file_action = get_checkpointed_upload(
+            '/spam.txt', self.process_info_path, ACTION)
+        self.assertEqual(file_metadata['destinationPath'], '/spam.txt')
+        self.assertEqual(file_action, 'updated')
+        self.assertIsNone(get_checkpointed_upload('/eggs.txt', self.process_info_path, ACTION))
+        self.assertEqual(
+            read_file(self.process_info_path, True)[ACTION]['upload_files_finished'], 1)
+
+    def test_checkpointed_destination(self):
+        """
+        Destinations should only be created by the first attempt of a job.
+        """
+        created = []
+
+        def create_project(title):
+            created.append(title)
+            return len(created), title
+
+        self.assertEqual(checkpointed_destination(create_project, 'Spam'), (1, 'Spam'))
+        open_checkpoint_journal(self.new_journal())
+        self.assertEqual(checkpointed_destination(create_project, 'Spam'), [2, 'Spam'])
+        open_checkpoint_journal(self.new_journal())
+        self.assertEqual(checkpointed_destination(create_project, 'Spam (PresQT1)'), [2, 'Spam'])
+        self.assertEqual(created, ['Spam', 'Spam'])
+
+    def test_resumed_upload(self):
+        """
+        A resumed upload should keep uploading to the repository its first attempt created.
+        """
+        server = MockTargetsServer({'projects': 1, 'depth': 1, 'folders': 1, 'files': 1,
+                                    'file_size': 64}).start()
+        self.addCleanup(server.stop)
+        patcher = patch.object(target_urls, '_target_base_url', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        install_target_url_override(server.url)
+
+        data_directory = os.path.join(self.resource_main_dir, 'data')
+        file_paths = [self.write_resource('/data/New Project/{}'.format(name), name.encode())
+                      for name in ['eggs.txt', 'spam.txt']]
+        upload = FunctionRouter.get_function('github', ACTION)
+
+        # The first attempt is stopped after uploading one file
+        open_checkpoint_journal(self.journal)
+        job_control = JobControl(ACTION)
+        with patch.object(job_control, 'check',
+                          side_effect=[None, PresQTJobStopped('Stopped', '499')]):
+            with self.assertRaises(PresQTJobStopped):
+                upload('token', None, data_directory, 'md5', 'ignore', self.process_info_path,
+                       ACTION, job_control)
+
+        open_checkpoint_journal(self.new_journal())
+        with patch('presqt.targets.github.functions.upload.requests.put',
+                   wraps=requests.put) as put:
+            upload_dict = upload('token', None, data_directory, 'md5', 'ignore',
+                                 self.process_info_path, ACTION, JobControl(ACTION))
+        self.assertEqual(put.call_count, 1)
+        self.assertEqual(str(upload_dict['project_id']), '100002')
+        self.assertEqual(
+            sorted(file['actionRootPath'] for file in upload_dict['file_metadata_list']),
+            file_paths)
+        self.assertEqual(sorted(server.dataset.get_project('github', '100002').files),
+                         ['eggs.txt', 'spam.txt'])
+        self.assertIsNone(server.dataset.get_project('github', '100003'))
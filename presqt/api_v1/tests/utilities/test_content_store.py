@@ -0,0 +1,144 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from contextlib import closing
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from presqt.utilities import get_uncached_resources, write_resource_file
+from presqt.utilities.io import content_store
+
+
+class TestContentStore(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        for name, value in [('CONTENT_STORE_DIRECTORY', os.path.join(self.directory, 'cas')),
+                            ('PRESQT_CONTENT_STORE', True),
+                            ('PRESQT_CONTENT_STORE_MAX_SIZE', 10)]:
+            patcher = patch.object(content_store, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def download(self, path, contents):
+        """
+        Save a resource like a target's download function would after its fixity check passed.
+        """
+        md5 = hashlib.md5(contents).hexdigest()
+        file_path = os.path.join(self.directory, 'job', path)
+        write_resource_file(file_path, {'file': contents},
+                            {'fixity': True, 'hash_algorithm': 'md5', 'source_hash': md5})
+        return file_path, md5
+
+    def get_blobs(self):
+        with closing(content_store.connect_content_store()) as connection:
+            return connection.execute('SELECT sha256, size FROM blobs').fetchall()
+
+    def get_hashes(self):
+        with closing(content_store.connect_content_store()) as connection:
+            return connection.execute('SELECT algorithm, sha256 FROM hashes').fetchall()
+
+    def test_dedupe(self):
+        """
+        Files with the same contents should be stored once under every hash they were
+        downloaded with, and later downloads should be served from the store.
+        """
+        sha256 = hashlib.sha256(b'spam').hexdigest()
+        self.download('spam.txt', b'spam')
+        content_store.store_blob(b'spam', {'sha1': hashlib.sha1(b'spam').hexdigest()})
+
+        self.assertEqual(self.get_blobs(), [(sha256, 4)])
+        self.assertEqual(sorted(self.get_hashes()),
+                         [('md5', sha256), ('sha1', sha256), ('sha256', sha256)])
+
+        resource = {'title': 'spam.txt', 'path': '/spam.txt', 'file': None,
+                    'hashes': {'md5': hashlib.md5(b'spam').hexdigest()}}
+        self.assertEqual(get_uncached_resources([resource]), [])
+        self.assertEqual(resource['blob_path'],
+                         os.path.join(content_store.CONTENT_STORE_DIRECTORY, sha256))
+
+        # PresQT metadata files are always downloaded
+        metadata = dict(resource, title='PRESQT_FTS_METADATA.json')
+        self.assertEqual(get_uncached_resources([metadata]), [metadata])
+
+    def test_job_copies(self):
+        """
+        Jobs should get their own copy of a blob so writing to it doesn't change the blob.
+        """
+        blob_path = content_store.store_blob(b'spam', {})
+        file_path = os.path.join(self.directory, 'job', 'spam.txt')
+        write_resource_file(file_path, {'file': None, 'blob_path': blob_path}, None)
+        self.assertEqual(os.stat(file_path).st_nlink, 1)
+
+        with open(file_path, 'wb') as job_file:
+            job_file.write(b'eggs')
+        with open(blob_path, 'rb') as blob:
+            self.assertEqual(blob.read(), b'spam')
+
+        # Copying the blob again replaces the job's file
+        write_resource_file(file_path, {'file': None, 'blob_path': blob_path}, None)
+        with open(file_path, 'rb') as job_file:
+            self.assertEqual(job_file.read(), b'spam')
+        self.assertEqual(os.listdir(os.path.dirname(file_path)), ['spam.txt'])
+
+    def test_eviction(self):
+        """
+        The least recently used blobs and every hash mapped to them should be evicted once the
+        store grows past its size cap. Jobs keep their copies of evicted blobs.
+        """
+        spam_path, spam_md5 = self.download('spam.txt', b'spam')
+        eggs_path, eggs_md5 = self.download('eggs.txt', b'eggs')
+        # Using spam makes eggs the least recently used blob
+        self.assertIsNotNone(content_store.get_blob_path({'md5': spam_md5}))
+
+        self.download('ham.txt', b'ham')
+        self.assertEqual(sorted(self.get_blobs()),
+                         sorted([(hashlib.sha256(b'spam').hexdigest(), 4),
+                                 (hashlib.sha256(b'ham').hexdigest(), 3)]))
+        self.assertNotIn(hashlib.sha256(b'eggs').hexdigest(),
+                         [sha256 for algorithm, sha256 in self.get_hashes()])
+        self.assertIsNone(content_store.get_blob_path({'md5': eggs_md5}))
+        self.assertFalse(os.path.exists(os.path.join(
+            content_store.CONTENT_STORE_DIRECTORY, hashlib.sha256(b'eggs').hexdigest())))
+        with open(eggs_path, 'rb') as job_file:
+            self.assertEqual(job_file.read(), b'eggs')
+
+        # The blob being stored is never evicted, even past the size cap. Blobs that are about
+        # to be copied into a job are kept until they have been copied.
+        spam_blob = content_store.get_blob_path({'md5': spam_md5})
+        content_store.store_blob(b'spam and eggs', {})
+        self.assertEqual(sorted(self.get_blobs()),
+                         sorted([(hashlib.sha256(b'spam').hexdigest(), 4),
+                                 (hashlib.sha256(b'spam and eggs').hexdigest(), 13)]))
+        self.assertTrue(os.path.isfile(spam_blob))
+
+        # The first lookup of spam above was never released
+        content_store.release_blob(spam_blob)
+        write_resource_file(spam_path, {'file': None, 'blob_path': spam_blob}, None)
+        content_store.store_blob(b'spam and eggs', {})
+        self.assertEqual(self.get_blobs(), [(hashlib.sha256(b'spam and eggs').hexdigest(), 13)])
+
+    def test_pins_of_ended_processes(self):
+        """
+        Blobs pinned by processes that have ended should be evicted like any other blob.
+        """
+        spam_path, spam_md5 = self.download('spam.txt', b'spam')
+        self.assertIsNotNone(content_store.get_blob_path({'md5': spam_md5}))
+        with patch.object(content_store, 'is_process_running', return_value=False):
+            content_store.store_blob(b'spam and eggs', {})
+        self.assertEqual(self.get_blobs(), [(hashlib.sha256(b'spam and eggs').hexdigest(), 13)])
+        with closing(content_store.connect_content_store()) as connection:
+            self.assertEqual(connection.execute('SELECT * FROM pins').fetchall(), [])
+
+    def test_content_store_off(self):
+        """
+        Nothing should be stored or served while the content store is off.
+        """
+        with patch.object(content_store, 'PRESQT_CONTENT_STORE', False):
+            file_path, md5 = self.download('spam.txt', b'spam')
+            self.assertIsNone(content_store.get_blob_path({'md5': md5}))
+        self.assertFalse(os.path.exists(content_store.CONTENT_STORE_DIRECTORY))
+        with open(file_path, 'rb') as job_file:
+            self.assertEqual(job_file.read(), b'spam')
@@ -0,0 +1,139 @@
+import os
+import shutil
+import tempfile
+from contextlib import closing
+from unittest.mock import patch, MagicMock
+
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities import (new_job_id, index_job, remove_indexed_job,
+                                     disk_space_admission, wait_for_disk_space,
+                                     update_disk_reservation)
+from presqt.api_v1.utilities.utils import disk_usage, job_index
+from presqt.utilities import (JobControl, PresQTJobStopped, PresQTValidationError, read_file,
+                              write_file, open_download_admission, close_download_admission,
+                              admit_download)
+
+
+class TestDiskUsage(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        for module, name, value in [
+                (job_index, 'JOB_INDEX_PATH', os.path.join(self.directory, 'job_index.sqlite3')),
+                (job_index, 'MEDIA_ROOT', self.directory),
+                (disk_usage, 'JOBS_DIRECTORY', os.path.join(self.directory, 'jobs')),
+                (disk_usage, 'PRESQT_DISK_RESERVE', 0),
+                (disk_usage, 'PRESQT_USER_DISK_QUOTA', None),
+                (disk_usage.shutil, 'disk_usage', MagicMock(return_value=MagicMock(free=1000)))]:
+            patcher = patch.object(module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def start_job(self, job_status='in_progress'):
+        job_id = new_job_id()
+        self.set_status(job_id, job_status)
+        index_job(job_id, 'spam', 'resource_download')
+        return job_id
+
+    def set_status(self, job_id, job_status):
+        write_file(self.get_process_info_path(job_id),
+                   {'resource_download': {'status': job_status, 'message': 'Spam'}}, True)
+
+    def get_process_info_path(self, job_id):
+        return os.path.join(self.directory, 'jobs', job_id, 'process_info.json')
+
+    def get_reservations(self):
+        with closing(job_index.connect_job_index()) as connection:
+            return dict(connection.execute(
+                'SELECT job_id, projected_size FROM disk_reservations').fetchall())
+
+    def test_reserve_disk_space(self):
+        """
+        Jobs should only be admitted while the space promised to other in progress jobs leaves
+        room for them. Space a job has already written no longer counts as reserved.
+        """
+        first_job, second_job = self.start_job(), self.start_job()
+        disk_space_admission(first_job, 'resource_download', 600)
+        with self.assertRaises(PresQTValidationError) as e:
+            disk_space_admission(second_job, 'resource_download', 600)
+        self.assertEqual(e.exception.status_code, 507)
+        self.assertEqual(self.get_reservations(), {first_job: 600})
+
+        # Written files take up free space instead of reservations
+        with open(os.path.join(self.directory, 'jobs', first_job, 'spam.txt'), 'wb') as spam:
+            spam.write(b'spam' * 50)
+        written = disk_usage.get_directory_size(os.path.join(self.directory, 'jobs', first_job))
+        self.assertTrue(disk_usage.reserve_disk_space(
+            second_job, 'resource_download', 400 + written))
+
+        # Reservations are released once their jobs end or are removed
+        self.set_status(first_job, 'finished')
+        remove_indexed_job(second_job)
+        self.assertTrue(disk_usage.reserve_disk_space(self.start_job(), 'resource_download', 1000))
+        self.assertEqual(len(self.get_reservations()), 1)
+
+    def test_wait_for_disk_space(self):
+        """
+        Spawned jobs should wait until there is room for them, then reserve it.
+        """
+        first_job, second_job = self.start_job(), self.start_job()
+        self.assertTrue(disk_usage.reserve_disk_space(first_job, 'resource_download', 1000))
+
+        def finish_first_job(interval):
+            self.assertEqual(read_file(self.get_process_info_path(second_job), True)[
+                'resource_download']['message'], disk_usage.DISK_SPACE_MESSAGE)
+            self.set_status(first_job, 'finished')
+
+        with patch.object(disk_usage, 'sleep', side_effect=finish_first_job) as sleep:
+            wait_for_disk_space(second_job, 1000, self.get_process_info_path(second_job),
+                                'resource_download', JobControl('resource_download'))
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(self.get_reservations(), {second_job: 1000})
+
+    def test_wait_for_disk_space_stopped(self):
+        """
+        Jobs stopped while they wait for disk space should stop waiting without reserving any.
+        """
+        first_job, second_job = self.start_job(), self.start_job()
+        self.assertTrue(disk_usage.reserve_disk_space(first_job, 'resource_download', 1000))
+
+        job_control = JobControl('resource_download')
+        job_control.cancel()
+        with self.assertRaises(PresQTJobStopped) as e:
+            wait_for_disk_space(second_job, 1000, self.get_process_info_path(second_job),
+                                'resource_download', job_control, interval=0)
+        self.assertEqual(e.exception.status_code, '499')
+        self.assertEqual(self.get_reservations(), {first_job: 1000})
+
+    def test_admit_download(self):
+        """
+        Download functions should be admitted with the sizes their targets listed before
+        fetching. Files served from the content store count the size of their blob unless it has
+        been evicted since.
+        """
+        blob_path = os.path.join(self.directory, 'blob')
+        with open(blob_path, 'wb') as blob:
+            blob.write(b'spam' * 10)
+        resources = [{'size': 100},
+                     {'size': 200, 'blob_path': blob_path},
+                     {'size': 300, 'blob_path': os.path.join(self.directory, 'evicted')}]
+
+        # Nothing is admitted unless admission is open
+        admit_download(resources, lambda resource: resource['size'])
+
+        admitted = []
+        open_download_admission(admitted.append)
+        self.addCleanup(close_download_admission)
+        admit_download(resources, lambda resource: resource['size'])
+        self.assertEqual(admitted, [440])
+
+    def test_update_disk_reservation(self):
+        """
+        Jobs should be able to shrink their reservation to what they fetched without waiting.
+        """
+        job_id = self.start_job()
+        self.assertTrue(disk_usage.reserve_disk_space(job_id, 'resource_download', 1000))
+        update_disk_reservation(job_id, 'resource_download', 400)
+        self.assertEqual(self.get_reservations(), {job_id: 400})
+        self.assertTrue(disk_usage.reserve_disk_space(self.start_job(), 'resource_download', 600))
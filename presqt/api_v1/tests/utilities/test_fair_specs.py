@@ -0,0 +1,43 @@
+import json
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from rest_framework.reverse import reverse
+
+from presqt.api_v1.utilities import fairshare_results
+from presqt.api_v1.utilities.service_helpers import fair_specs
+
+
+class TestFairSpecs(SimpleTestCase):
+    def test_specs_indexed(self):
+        """
+        The spec tables should be indexed by metric link and test id.
+        """
+        metric_link = 'https://w3id.org/FAIR_Evaluator/metrics/1'
+        self.assertEqual(fair_specs.FAIRSHARE_TESTS[metric_link]['test_id'], 1)
+        self.assertEqual(fair_specs.FAIRSHARE_TEST_LINKS[1], metric_link)
+        self.assertEqual(fair_specs.FAIRSHAKE_METRICS[metric_link], '90')
+        self.assertEqual(set(fair_specs.FAIRSHAKE_RUBRIC_PAYLOADS.keys()),
+                         {'93', '94', '95', '96'})
+
+    def test_endpoints_read_no_files(self):
+        """
+        The FAIR endpoints and results should be served without reading the spec files again.
+        """
+        with patch('presqt.utilities.io.read_file.open', side_effect=AssertionError):
+            response = self.client.get(reverse('fairshare'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, fair_specs.FAIRSHARE_TEST_LIST)
+
+            response = self.client.get(reverse('fairshake', kwargs={'rubric_id': '93'}))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['metrics'][0]['id'], '30')
+            self.assertEqual(response.data['answer_options'][0],
+                             {'value': '0.0', 'value_text': 'no'})
+
+            response_json = {'evaluationResult': json.dumps({
+                'https://w3id.org/FAIR_Evaluator/metrics/2': [{'http://schema.org/comment': [
+                    {'@value': 'FAILURE: Not persistent\n'}]}]})}
+            results = fairshare_results(response_json, [1, 2])
+            self.assertEqual(results[0]['failures'], ['Not persistent'])
+            self.assertEqual(fairshare_results(response_json, [1]), [])
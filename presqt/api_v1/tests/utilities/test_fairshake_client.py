@@ -0,0 +1,110 @@
+import json
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import coreapi
+from coreapi.codecs import CoreJSONCodec
+from django.test import SimpleTestCase
+from rest_framework.reverse import reverse
+
+from presqt.api_v1.utilities.service_helpers import fairshake_client
+from presqt.api_v1.utilities.service_helpers.fair_specs import FAIRSHAKE_RUBRICS
+
+SCHEMA = coreapi.Document(url=fairshake_client.FAIRSHAKE_SCHEMA_URL, title='FAIRshake', content={
+    'assessment': {'create': coreapi.Link(
+        url='https://fairshake.cloud/assessment/', action='post')}})
+
+
+class TestFairshakeClient(SimpleTestCase):
+    def setUp(self):
+        self.cache_path = 'mediafiles/test_fairshake_schema.json'
+        cache_path = patch.object(fairshake_client, 'FAIRSHAKE_SCHEMA_CACHE_PATH', self.cache_path)
+        cache_path.start()
+        self.addCleanup(cache_path.stop)
+        self.decoders = coreapi.Client().decoders
+
+    def tearDown(self):
+        if os.path.exists(self.cache_path):
+            os.remove(self.cache_path)
+
+    def test_schema_cached(self):
+        """
+        The schema should be read from disk and only downloaded again once FAIRshake says it
+        has changed.
+        """
+        session = MagicMock()
+        session.get.return_value = MagicMock(
+            status_code=200, ok=True, content=CoreJSONCodec().encode(SCHEMA),
+            headers={'content-type': 'application/coreapi+json', 'ETag': '"v1"'})
+        self.assertEqual(fairshake_client.get_fairshake_schema(session, self.decoders), SCHEMA)
+        self.assertEqual(fairshake_client.get_fairshake_schema(session, self.decoders), SCHEMA)
+        self.assertEqual(session.get.call_count, 1)
+
+        session.get.return_value = MagicMock(status_code=304, ok=False, headers={})
+        later = time.time() + fairshake_client.PRESQT_FAIRSHAKE_SCHEMA_TTL + 1
+        with patch.object(fairshake_client.time, 'time', return_value=later):
+            self.assertEqual(fairshake_client.get_fairshake_schema(session, self.decoders),
+                             SCHEMA)
+        self.assertEqual(session.get.call_args[1]['headers']['If-None-Match'], '"v1"')
+
+        # A cache written by another version of coreapi isn't used
+        with open(self.cache_path) as cache_file:
+            cache = json.load(cache_file)
+        cache['coreapi_version'] = '0.0.0'
+        with open(self.cache_path, 'w') as cache_file:
+            json.dump(cache, cache_file)
+        with self.assertRaises(fairshake_client.PresQTResponseException):
+            fairshake_client.get_fairshake_schema(session, self.decoders)
+
+    def test_bulk_assessment(self):
+        """
+        Each assessment in a bulk request should get its own result in the order given.
+        """
+        answers = {metric_id: '1.0' for metric_id in FAIRSHAKE_RUBRICS['93']}
+        body = {'assessments': [
+            {'rubric_id': '93', 'project_url': 'https://osf.io/egg/', 'project_title': 'Egg',
+             'rubric_answers': answers},
+            {'rubric_id': '96', 'project_url': 'https://osf.io/ham/', 'project_title': 'Ham'},
+            {'rubric_id': '93', 'project_url': 'https://osf.io/spam/', 'project_title': 'Spam',
+             'rubric_answers': answers}]}
+
+        def action(schema, keys, params):
+            if keys == ['digital_object', 'create']:
+                if params['url'] == 'https://osf.io/spam/':
+                    raise coreapi.exceptions.ErrorMessage('error')
+                return {'id': 7}
+            return {'answers': [{'metric': 30, 'answer': 1.0}]}
+
+        client = MagicMock()
+        client.action.side_effect = action
+        job = MagicMock()
+        job.return_value.start.return_value = 'job_id'
+        view_module = 'presqt.api_v1.views.service.fairshake.bulk_assessment'
+        with patch.object(fairshake_client, 'get_fairshake_client',
+                          return_value=(client, SCHEMA)), \
+                patch('{}.get_cached_fairshare_evaluation'.format(view_module),
+                      return_value=None), \
+                patch('{}.FairshareEvaluationJob'.format(view_module), job):
+            response = self.client.post(reverse('fairshake_bulk'), json.dumps(body),
+                                        content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        egg, ham, spam = response.data['assessments']
+        self.assertEqual(egg['digital_object_id'], 7)
+        self.assertEqual(egg['rubric_responses'][0]['score_explanation'], 'yes')
+        self.assertEqual(ham['job_id'], 'job_id')
+        self.assertTrue(ham['fairshare_evaluation_job'].endswith('?job_id=job_id'))
+        self.assertEqual(spam['status_code'], 400)
+        self.assertEqual(spam['project_url'], 'https://osf.io/spam/')
+
+    def test_bulk_validation(self):
+        """
+        Return a 400 naming the assessment that failed validation.
+        """
+        body = {'assessments': [{'rubric_id': '93', 'project_title': 'Egg'}]}
+        response = self.client.post(reverse('fairshake_bulk'), json.dumps(body),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'],
+                         "Assessment 0: PresQT Error: 'project_url' missing in POST body.")
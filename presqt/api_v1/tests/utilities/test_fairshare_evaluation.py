@@ -0,0 +1,153 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+from rest_framework.reverse import reverse
+
+from presqt.api_v1.utilities.service_helpers import fairshare_evaluation
+from presqt.api_v1.utilities.utils import job_index
+from presqt.utilities import PresQTResponseException
+
+METRIC = 'https://w3id.org/FAIR_Evaluator/metrics/1'
+RESPONSE_JSON = {'evaluationResult': json.dumps({METRIC: [{'http://schema.org/comment': [
+    {'@value': "SUCCESS: Found an identifier of type 'doi'\n"}]}]})}
+
+
+def run_in_process(self, method_to_call, action):
+    """
+    Stand in for spawn_action_process that runs the job in the test's process.
+    """
+    self.function_process = MagicMock(pid=1)
+    method_to_call()
+
+
+class TestFairshareEvaluation(SimpleTestCase):
+    def setUp(self):
+        self.cache_path = 'mediafiles/test_fairshare_cache.sqlite3'
+        cache_path = patch.object(fairshare_evaluation, 'FAIRSHARE_CACHE_PATH', self.cache_path)
+        cache_path.start()
+        self.addCleanup(cache_path.stop)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        patcher = patch.object(job_index, 'JOB_INDEX_PATH',
+                               os.path.join(directory, 'job_index.sqlite3'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.resource_id = 'https://doi.org/10.17605/OSF.IO/EGG'
+
+    def tearDown(self):
+        for suffix in ['', '-wal', '-shm']:
+            if os.path.exists(self.cache_path + suffix):
+                os.remove(self.cache_path + suffix)
+
+    def test_evaluation_cached(self):
+        """
+        A repeat evaluation of the same resource should come from the cache until it expires.
+        Failed evaluations aren't cached.
+        """
+        with patch.object(fairshare_evaluation.requests, 'post',
+                          return_value=MagicMock(status_code=500)):
+            with self.assertRaises(PresQTResponseException) as e:
+                fairshare_evaluation.fairshare_evaluation(self.resource_id)
+        self.assertEqual(e.exception.status_code, 503)
+
+        with patch.object(fairshare_evaluation.requests, 'post',
+                          return_value=MagicMock(status_code=200,
+                                                 json=lambda: RESPONSE_JSON)) as mock_post:
+            self.assertEqual(fairshare_evaluation.fairshare_evaluation(self.resource_id),
+                             RESPONSE_JSON)
+            self.assertEqual(fairshare_evaluation.fairshare_evaluation(self.resource_id),
+                             RESPONSE_JSON)
+            self.assertEqual(mock_post.call_count, 1)
+
+            later = time.time() + fairshare_evaluation.PRESQT_FAIRSHARE_CACHE_TTL + 1
+            with patch.object(fairshare_evaluation.time, 'time', return_value=later):
+                self.assertIsNone(
+                    fairshare_evaluation.get_cached_fairshare_evaluation(self.resource_id))
+
+    def test_evaluation_job(self):
+        """
+        An evaluation that isn't cached should run as a job with its results under job_status.
+        Once cached the evaluator should return the results straight away.
+        """
+        url = reverse('fairshare')
+        body = {'resource_id': self.resource_id, 'tests': [1]}
+        with patch.object(fairshare_evaluation, 'spawn_action_process', run_in_process), \
+                patch.object(fairshare_evaluation.requests, 'post',
+                             return_value=MagicMock(status_code=200,
+                                                    json=lambda: RESPONSE_JSON)) as mock_post:
+            response = self.client.post(url, json.dumps(body), content_type='application/json',
+                                        HTTP_PRESQT_SOURCE_TOKEN='spam')
+            self.assertEqual(response.status_code, 202)
+            ticket_number = response.data['job_id']
+            self.addCleanup(shutil.rmtree, os.path.join('mediafiles', 'jobs', ticket_number))
+
+            job_response = self.client.get(
+                reverse('job_status', kwargs={'action': 'fairshare_evaluation'}),
+                {'job_id': ticket_number})
+            self.assertEqual(job_response.status_code, 200)
+            self.assertEqual(self.client.get(
+                reverse('job_status', kwargs={'action': 'fairshare_evaluation'}),
+                HTTP_PRESQT_SOURCE_TOKEN='spam').data, job_response.data)
+            self.assertEqual(self.client.get(
+                reverse('job_status', kwargs={'action': 'fairshare_evaluation'}),
+                {'job_id': 'eggs'}).status_code, 404)
+            self.assertEqual(job_response.data['status'], 'finished')
+            results = job_response.data['fairshare_evaluation_results']
+            self.assertEqual(results[0]['metric_link'], METRIC)
+            self.assertEqual(results[0]['successes'], ["Found an identifier of type 'doi'"])
+
+            response = self.client.post(url, json.dumps(body), content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, results)
+            self.assertEqual(mock_post.call_count, 1)
+
+    def test_running_job_shared(self):
+        """
+        Requests for a resource and tests that are already being evaluated should get the
+        running job, and everyone who asked for an email should get one when it finishes.
+        Rubric 96 assessments should wait on an evaluation job too.
+        """
+        url = reverse('fairshare')
+        body = {'resource_id': self.resource_id, 'tests': [1]}
+        started_jobs = []
+        with patch.object(fairshare_evaluation, 'spawn_action_process',
+                          lambda job, method_to_call, action: started_jobs.append(job)):
+            response = self.client.post(url, json.dumps(body), content_type='application/json',
+                                        HTTP_PRESQT_EMAIL_OPT_IN='spam@example.com')
+            self.assertEqual(response.status_code, 202)
+            ticket_number = response.data['job_id']
+            self.addCleanup(shutil.rmtree, os.path.join('mediafiles', 'jobs', ticket_number))
+
+            response = self.client.post(url, json.dumps(body), content_type='application/json',
+                                        HTTP_PRESQT_EMAIL_OPT_IN='eggs@example.com')
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(response.data['job_id'], ticket_number)
+            self.assertEqual(len(started_jobs), 1)
+
+            # Other tests of the same resource are evaluated by their own job
+            assessment_url = reverse('fairshake', kwargs={'rubric_id': '96'})
+            assessment_body = {'project_url': self.resource_id, 'project_title': 'Eggs'}
+            responses = [self.client.post(assessment_url, json.dumps(assessment_body),
+                                          content_type='application/json') for _ in range(2)]
+            for response in responses:
+                self.assertEqual(response.status_code, 202)
+                self.assertTrue(response.data['fairshare_evaluation_job'].endswith(
+                    '?job_id={}'.format(responses[0].data['job_id'])))
+            self.addCleanup(shutil.rmtree, os.path.join(
+                'mediafiles', 'jobs', responses[0].data['job_id']))
+            self.assertNotEqual(responses[0].data['job_id'], ticket_number)
+            self.assertEqual(len(started_jobs), 2)
+
+        job = started_jobs[0]
+        job.function_process = MagicMock(pid=1)
+        with patch.object(fairshare_evaluation.requests, 'post',
+                          return_value=MagicMock(status_code=200, json=lambda: RESPONSE_JSON)), \
+                patch.object(fairshare_evaluation, 'email_blaster') as email_blaster:
+            job._evaluate()
+        self.assertEqual(sorted(call[0][0] for call in email_blaster.call_args_list),
+                         ['eggs@example.com', 'spam@example.com'])
@@ -0,0 +1,72 @@
+import json
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from presqt.utilities import (encode_fts_metadata, fts_metadata_needs_compaction,
+                              get_fts_metadata_delta_name, is_fts_metadata_file,
+                              load_valid_fts_metadata, merge_fts_metadata)
+
+
+def action(action_id, action_date_time):
+    return {
+        'id': action_id,
+        'details': 'PresQT Upload to OSF',
+        'actionDateTime': action_date_time,
+        'actionType': 'resource_upload',
+        'sourceTargetName': 'Local Machine',
+        'sourceUsername': None,
+        'destinationTargetName': 'osf',
+        'destinationUsername': None,
+        'keywords': {},
+        'files': {'created': [], 'updated': [], 'ignored': []}
+    }
+
+
+class TestFTSMetadata(SimpleTestCase):
+    def test_fts_metadata_files(self):
+        """
+        The base metadata file and its delta files should be recognized as FTS metadata.
+        """
+        metadata = {'allKeywords': [], 'actions': [action('1234', '2020-01-01')]}
+        delta_name = get_fts_metadata_delta_name(metadata)
+        self.assertEqual(delta_name, 'PRESQT_FTS_METADATA_DELTA_1234.json')
+        self.assertTrue(is_fts_metadata_file(delta_name))
+        self.assertTrue(is_fts_metadata_file('PRESQT_FTS_METADATA.json'))
+        self.assertFalse(is_fts_metadata_file('INVALID_PRESQT_FTS_METADATA.json'))
+        self.assertFalse(is_fts_metadata_file('PRESQT_FTS_METADATA_DELTA_1234.txt'))
+
+    def test_needs_compaction(self):
+        """
+        Deltas should be compacted once there are PRESQT_FTS_METADATA_MAX_DELTAS of them.
+        """
+        with patch('presqt.utilities.utils.fts_metadata.PRESQT_FTS_METADATA_MAX_DELTAS', 3):
+            self.assertFalse(fts_metadata_needs_compaction(2))
+            self.assertTrue(fts_metadata_needs_compaction(3))
+
+    def test_merge_fts_metadata(self):
+        """
+        Merged metadata should hold every action once, newest first, and every keyword.
+        """
+        base = {'allKeywords': ['eggs'], 'actions': [action('b', '2020-02-01'),
+                                                     action('a', '2020-01-01')],
+                'extra_metadata': {'title': 'Project'}}
+        delta = {'allKeywords': ['ham', 'eggs'], 'actions': [action('c', '2020-03-01')],
+                 'extra_metadata': {'title': 'Other'}}
+        new = {'allKeywords': ['spam'], 'actions': [action('d', '2020-04-01'),
+                                                    action('b', '2020-02-01')]}
+
+        merged = merge_fts_metadata([base, delta, new])
+        self.assertEqual([entry['id'] for entry in merged['actions']], ['d', 'c', 'b', 'a'])
+        self.assertEqual(merged['allKeywords'], ['eggs', 'ham', 'spam'])
+        self.assertEqual(merged['extra_metadata'], {'title': 'Project'})
+        self.assertEqual(load_valid_fts_metadata(encode_fts_metadata(merged)), merged)
+
+    def test_load_valid_fts_metadata(self):
+        """
+        Invalid JSON and documents that don't match the schema shouldn't be loaded.
+        """
+        self.assertIsNone(load_valid_fts_metadata(b'{"allKeywords": '))
+        self.assertIsNone(load_valid_fts_metadata(json.dumps({'actions': []})))
+        self.assertEqual(load_valid_fts_metadata(b'{"allKeywords": [], "actions": []}'),
+                         {'allKeywords': [], 'actions': []})
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities import FTSMetadataBuilder, create_upload_metadata
+from presqt.api_v1.utilities.metadata.fts_metadata_builder import build_file_dict
+from presqt.utilities import get_dictionary_index
+
+
+def file_metadata(path):
+    return {'destinationPath': path, 'destinationHashes': {}, 'failedFixityInfo': [],
+            'title': path.rpartition('/')[2], 'sourceHashes': {}, 'sourcePath': path,
+            'extra': {}}
+
+
+class TestFTSMetadataBuilder(SimpleTestCase):
+    def test_get_and_move_files(self):
+        """
+        Files should be found by their destination path, including after they've been moved.
+        """
+        builder = FTSMetadataBuilder()
+        for path in ['/project/a.txt', '/project/b.txt']:
+            builder.add_file(file_metadata(path))
+        self.assertEqual(len(builder), 2)
+        self.assertEqual(builder.get_file('/project/b.txt')['title'], 'b.txt')
+        self.assertIsNone(builder.get_file('/project/c.txt'))
+
+        # a.txt moves to where b.txt was at the same time as b.txt moves away
+        moved = builder.move_files([('/project/a.txt', '/project/b.txt'),
+                                    ('/project/b.txt', '/other/b.txt')])
+        self.assertEqual([entry['title'] for entry in moved], ['a.txt', 'b.txt'])
+        self.assertEqual(builder.get_file('/project/b.txt')['title'], 'a.txt')
+        self.assertEqual(builder.get_file('/other/b.txt')['title'], 'b.txt')
+        self.assertIsNone(builder.get_file('/project/a.txt'))
+        self.assertEqual([entry['destinationPath'] for entry in builder],
+                         ['/project/b.txt', '/other/b.txt'])
+
+    def test_build_file_dict(self):
+        """
+        Files should be sorted into the created, updated and ignored lists.
+        """
+        files = [file_metadata(path) for path in ['/a', '/b', '/c']]
+        file_dict = build_file_dict(files, ['/b'], ['/c'], 'destinationPath')
+        self.assertEqual(file_dict, {'created': [files[0]], 'updated': [files[2]],
+                                     'ignored': [files[1]]})
+
+    def test_create_upload_metadata(self):
+        """
+        Uploaded files should have their destination details added to their metadata.
+        """
+        builder = FTSMetadataBuilder()
+        for path in ['/project/a.txt', '/project/b.txt']:
+            builder.add_file(file_metadata(path))
+        instance = SimpleNamespace(
+            fts_metadata_builder=builder, data_directory='/ticket/data', hash_algorithm='md5',
+            all_keywords=[], source_fts_metadata_actions=[], extra_metadata={},
+            action_metadata={'files': {'created': builder.files, 'updated': [], 'ignored': []}})
+        file_metadata_list = [
+            {'actionRootPath': '/ticket/data/project/a.txt', 'destinationPath': '/dest/a.txt',
+             'destinationHash': 'abc', 'failed_fixity_info': []},
+            {'actionRootPath': '/ticket/data/project/b.txt', 'destinationPath': '/dest/b.txt',
+             'destinationHash': None, 'failed_fixity_info': []}]
+
+        with patch('presqt.api_v1.utilities.metadata.upload_metadata.write_and_validate_metadata',
+                   return_value=True):
+            validation = create_upload_metadata(instance, file_metadata_list,
+                                                {'destinationUsername': 'user'}, 'project',
+                                                ['/project/b.txt'], [])
+
+        self.assertEqual(validation, True)
+        files = instance.fts_metadata_data['actions'][0]['files']
+        self.assertEqual(files['created'][0]['destinationPath'], '/dest/a.txt')
+        self.assertEqual(files['created'][0]['destinationHashes'], {'md5': 'abc'})
+        self.assertEqual(files['ignored'][0]['destinationPath'], '/dest/b.txt')
+        self.assertEqual(files['ignored'][0]['destinationHashes'], {})
+
+    def test_get_dictionary_index(self):
+        """
+        The first dictionary with each value should be indexed.
+        """
+        dicts = [{'url': 'a', 'n': 1}, {'url': 'b', 'n': 2}, {'url': 'a', 'n': 3}]
+        index = get_dictionary_index(dicts, 'url')
+        self.assertEqual(index['a']['n'], 1)
+        self.assertEqual(index['b']['n'], 2)
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities import FunctionRouter
+from presqt.targets.github.functions.fetch import github_fetch_resources
+from presqt.utilities import read_file
+
+# Imports the API the way a worker does, then lists the target modules that were imported
+IMPORT_SCRIPT = """
+import os, sys
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
+import django
+django.setup()
+import config.urls
+print(sorted(module for module in sys.modules if module.startswith('presqt.targets.osf')))
+from presqt.api_v1.utilities import FunctionRouter
+FunctionRouter.get_function('osf', 'resource_detail')
+print('presqt.targets.osf.functions.fetch' in sys.modules)
+"""
+
+
+class TestFunctionRouter(SimpleTestCase):
+    def test_get_function(self):
+        """
+        Functions should be resolved from the functions of each target in targets.json.
+        """
+        self.assertIs(FunctionRouter.get_function('github', 'resource_collection'),
+                      github_fetch_resources)
+        self.assertIs(FunctionRouter.github_resource_collection, github_fetch_resources)
+        with self.assertRaises(AttributeError):
+            FunctionRouter.get_function('github', 'bad_action')
+        with self.assertRaises(AttributeError):
+            FunctionRouter.get_function('bad_target', 'resource_collection')
+
+        # Every supported action has a function
+        for target in read_file('presqt/specs/targets.json', True):
+            for action in ['resource_collection', 'resource_detail', 'resource_download',
+                           'resource_upload', 'keywords', 'keywords_upload']:
+                if target['supported_actions'][action]:
+                    with self.subTest(target=target['name'], action=action):
+                        self.assertTrue(callable(
+                            FunctionRouter.get_function(target['name'], action)))
+
+    def test_lazy_imports(self):
+        """
+        Target modules should only be imported when one of their functions is first used.
+        """
+        output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT], check=True,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout
+        self.assertEqual(output.splitlines(), ['[]', 'True'])
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import aiohttp
+import requests
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities.utils import job_metrics
+from presqt.api_v1.utilities.utils.job_metrics import get_prometheus_metrics, record_job_metrics
+from presqt.targets.utilities import (HttpAccounting, close_http_accounting,
+                                      get_endpoint_template, open_http_accounting)
+from presqt.targets.utilities.mock_targets import MockTargetsServer
+from presqt.targets.utilities.utils import target_urls
+
+
+class TestEndpointTemplates(SimpleTestCase):
+    def test_get_endpoint_template(self):
+        """
+        Target urls should be matched to their endpoint templates, including urls sent to a
+        mock target server.
+        """
+        for url, expected in [
+                ('https://api.github.com/repos/presqt/repo/contents/a/b.txt?ref=master',
+                 ('github', '/repos/{owner}/{repo}/contents/{path:.*}')),
+                ('https://raw.githubusercontent.com/presqt/repo/master/a/b.txt',
+                 ('github', '/{owner}/{repo}/{branch}/{path:.*}')),
+                ('https://api.osf.io/v2/nodes/cmn5z/files/osfstorage/',
+                 ('osf', '/v2/nodes/{node_id}/files/{provider}')),
+                ('https://files.osf.io/v1/resources/cmn5z/providers/osfstorage/5cd98',
+                 ('osf', '/v1/resources/{node_id}/providers/{provider}/{resource_id}')),
+                ('https://ndownloader.figshare.com/files/123', ('figshare', '/files/{file_id}')),
+                ('https://zenodo.org/api/unknown/1', ('zenodo', '{other}')),
+                ('https://fairshake.cloud/evaluation', ('other', 'fairshake.cloud'))]:
+            with self.subTest(url=url):
+                self.assertEqual(get_endpoint_template(url), expected)
+
+        with patch.object(target_urls, '_target_base_url', 'http://127.0.0.1:8080'):
+            self.assertEqual(get_endpoint_template('http://127.0.0.1:8080/curate_nd/api/items/1'),
+                             ('curate_nd', '/api/items/{item_id}'))
+            self.assertEqual(get_endpoint_template('http://127.0.0.1:8080/bad/api/items/1'),
+                             ('other', '127.0.0.1:8080'))
+
+
+class TestHttpAccounting(SimpleTestCase):
+    def setUp(self):
+        self.accounting = HttpAccounting()
+        open_http_accounting(self.accounting)
+        self.addCleanup(close_http_accounting)
+
+    def test_requests(self):
+        """
+        Requests made with requests and aiohttp should be counted by target, endpoint and
+        status code.
+        """
+        async def get(url):
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url) as response:
+                    await response.read()
+
+        with MockTargetsServer({'projects': 1, 'depth': 0, 'files': 1}) as server, \
+                patch.object(target_urls, '_target_base_url', server.url):
+            url = '{}/zenodo/api/records/'.format(server.url)
+            requests.get(url + '1?access_token=token')
+            asyncio.new_event_loop().run_until_complete(get(url + '2?access_token=token'))
+            requests.get('{}/zenodo/api/licenses?access_token=token'.format(server.url))
+
+        summary = self.accounting.to_dict()
+        self.assertEqual(summary['requests'], 3)
+        zenodo = summary['targets']['zenodo']
+        self.assertEqual(zenodo['requests'], 3)
+        self.assertEqual(zenodo['errors'], 2)
+        self.assertEqual([(endpoint['endpoint'], endpoint['statuses'])
+                          for endpoint in zenodo['endpoints']],
+                         [('/api/licenses', {'200': 1}), ('/api/records/{record_id}', {'404': 2})])
+        self.assertEqual(zenodo['endpoints'][1]['latency']['+Inf'], 2)
+
+    def test_latency_histogram(self):
+        """
+        Each bucket should count the requests that took at most its seconds.
+        """
+        url = 'https://api.github.com/user'
+        for seconds in [0.01, 0.3, 0.3, 60]:
+            self.accounting.request_made('get', url, 200, seconds)
+        self.accounting.request_made('GET', url, None, 1)
+
+        endpoint = self.accounting.to_dict()['targets']['github']['endpoints'][0]
+        self.assertEqual(endpoint['method'], 'GET')
+        self.assertEqual(endpoint['statuses'], {'200': 4, 'error': 1})
+        self.assertEqual(endpoint['latency'], {'0.05': 1, '0.1': 1, '0.25': 1, '0.5': 3, '1': 4,
+                                               '2.5': 4, '5': 4, '10': 4, '30': 4, '+Inf': 5})
+
+    def test_metrics(self):
+        """
+        The requests of ended jobs should be exported as Prometheus counters and histograms.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with patch.object(job_metrics, 'JOB_METRICS_PATH',
+                          os.path.join(directory, 'job_metrics.sqlite3')):
+            self.accounting.request_made('GET', 'https://gitlab.com/api/v4/projects/1', 200, 0.2)
+            self.accounting.request_made('GET', 'https://gitlab.com/api/v4/projects/2', 404, 2)
+            record_job_metrics('resource_download', 'finished', {}, self.accounting.to_dict())
+            record_job_metrics('resource_download', 'finished', {}, self.accounting.to_dict())
+            metrics = get_prometheus_metrics().splitlines()
+
+        labels = 'target="gitlab",method="GET",endpoint="/api/v4/projects/{project_id}"'
+        for line in ['# TYPE presqt_target_http_requests_total counter',
+                     'presqt_target_http_requests_total{{{},status="200"}} 2'.format(labels),
+                     'presqt_target_http_requests_total{{{},status="404"}} 2'.format(labels),
+                     '# TYPE presqt_target_http_request_duration_seconds histogram',
+                     'presqt_target_http_request_duration_seconds_bucket'
+                     '{{{},le="0.1"}} 0'.format(labels),
+                     'presqt_target_http_request_duration_seconds_bucket'
+                     '{{{},le="0.25"}} 2'.format(labels),
+                     'presqt_target_http_request_duration_seconds_bucket'
+                     '{{{},le="+Inf"}} 4'.format(labels),
+                     'presqt_target_http_request_duration_seconds_sum{{{}}} 4.4'.format(labels),
+                     'presqt_target_http_request_duration_seconds_count{{{}}} 4'.format(labels)]:
+            self.assertIn(line, metrics)
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import signal
+import time
+
+from django.test import SimpleTestCase
+
+from presqt.utilities import CANCEL_SIGNAL, JobControl, PresQTJobStopped
+from presqt.utilities.utils.job_control import TIMEOUT_MESSAGE
+
+
+class TestJobControl(SimpleTestCase):
+    def test_check(self):
+        """
+        Jobs should only be stopped once they're cancelled or past their deadline.
+        """
+        job_control = JobControl('resource_download', time.time() + 60)
+        job_control.check()
+        self.assertFalse(job_control.stopping())
+
+        job_control.cancel()
+        with self.assertRaises(PresQTJobStopped) as e:
+            job_control.check()
+        self.assertEqual(e.exception.data, 'Download was cancelled by the user')
+        self.assertEqual(e.exception.status_code, '499')
+
+        job_control = JobControl('resource_upload', time.time() - 1)
+        with self.assertRaises(PresQTJobStopped) as e:
+            job_control.check()
+        self.assertEqual(e.exception.data, TIMEOUT_MESSAGE)
+        self.assertEqual(e.exception.status_code, 504)
+
+    def test_run_until_complete(self):
+        """
+        Async requests should run to completion unless the job is stopped while they're running.
+        """
+        async def requests(cancelled):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        job_control = JobControl('resource_transfer_in')
+        self.assertEqual(job_control.run_until_complete(loop, asyncio.sleep(0, 'done')), 'done')
+
+        cancelled = []
+        loop.call_later(0.2, job_control.cancel)
+        start = time.time()
+        with self.assertRaises(PresQTJobStopped) as e:
+            job_control.run_until_complete(loop, requests(cancelled))
+        self.assertEqual(e.exception.data, 'Transfer was cancelled by the user')
+        self.assertEqual(cancelled, [True])
+        self.assertLess(time.time() - start, 5)
+
+    def test_listen_for_cancel(self):
+        """
+        Jobs should be cancelled when their process gets the cancel signal.
+        """
+        self.addCleanup(signal.signal, CANCEL_SIGNAL, signal.getsignal(CANCEL_SIGNAL))
+        job_control = JobControl('resource_download')
+        job_control.listen_for_cancel()
+
+        os.kill(os.getpid(), CANCEL_SIGNAL)
+        self.assertTrue(job_control.cancelled)
@@ -0,0 +1,146 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from presqt.api_v1.utilities import (new_job_id, index_job, find_job, get_job_users,
+                                     claim_job_slot, remove_indexed_job, hash_tokens,
+                                     update_or_create_process_info, add_job_user,
+                                     ANONYMOUS_OWNER)
+from presqt.api_v1.utilities.utils import job_index
+from presqt.api_v1.views.resource.base_resource import BaseResource
+from presqt.utilities import JobControl, PresQTValidationError, read_file
+
+
+class TestJobIndex(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = patch.object(job_index, 'JOB_INDEX_PATH',
+                               os.path.join(self.directory, 'job_index.sqlite3'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(job_index, 'MEDIA_ROOT', 'mediafiles')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def start_job(self, owner, action, job_status='in_progress'):
+        job_id = new_job_id()
+        self.addCleanup(shutil.rmtree, os.path.join('mediafiles', 'jobs', job_id), True)
+        update_or_create_process_info({'status': job_status, 'message': 'Spam',
+                                       'download_total_files': 4, 'download_files_finished': 2},
+                                      action, job_id)
+        index_job(job_id, owner, action)
+        return job_id
+
+    def test_find_job(self):
+        """
+        Status requests should find the job they name, or the owner's latest job.
+        """
+        first_job = self.start_job('spam', 'resource_download')
+        second_job = self.start_job('spam', 'resource_download')
+        self.start_job('spam', 'resource_upload')
+
+        self.assertEqual(find_job('spam', 'resource_download'), second_job)
+        self.assertEqual(find_job('spam', 'resource_download', first_job), first_job)
+        with self.assertRaises(PresQTValidationError) as e:
+            find_job('eggs', 'resource_download', first_job)
+        self.assertEqual(e.exception.status_code, 404)
+
+        # Jobs that can be started without a token are found by their id alone
+        anonymous_job = self.start_job(ANONYMOUS_OWNER, 'fairshare_evaluation')
+        self.assertEqual(find_job(None, 'fairshare_evaluation', anonymous_job), anonymous_job)
+        with self.assertRaises(PresQTValidationError) as e:
+            find_job(None, 'fairshare_evaluation', first_job)
+        self.assertEqual(e.exception.status_code, 404)
+
+        # Owners without indexed jobs have a single job named after them
+        self.assertEqual(find_job('eggs', 'resource_download'), 'eggs')
+        self.assertEqual(get_job_users('spam_eggs'), ['spam', 'eggs'])
+
+        remove_indexed_job(second_job)
+        self.assertEqual(find_job('spam', 'resource_download'), first_job)
+
+    def test_claim_job_slot(self):
+        """
+        Jobs should only start while each of their users has fewer running jobs than the limit.
+        """
+        with patch.object(job_index, 'PRESQT_USER_JOB_LIMIT', 1):
+            spam_job = self.start_job('spam', 'resource_download')
+            self.assertTrue(claim_job_slot(spam_job))
+
+            # Transfers count towards both users
+            transfer_job = self.start_job('spam_eggs', 'resource_transfer_in')
+            eggs_job = self.start_job('eggs', 'resource_upload')
+            self.assertFalse(claim_job_slot(transfer_job))
+            self.assertTrue(claim_job_slot(eggs_job))
+
+            update_or_create_process_info({'status': 'finished'}, 'resource_download', spam_job)
+            update_or_create_process_info({'status': 'failed'}, 'resource_upload', eggs_job)
+            self.assertTrue(claim_job_slot(transfer_job))
+
+        with patch.object(job_index, 'PRESQT_USER_JOB_LIMIT', 0):
+            self.assertTrue(claim_job_slot(self.start_job('spam', 'resource_download')))
+
+    def test_wait_for_job_slot(self):
+        """
+        Jobs stopped while they wait for a slot should fail without ever taking one.
+        """
+        with patch.object(job_index, 'PRESQT_USER_JOB_LIMIT', 1):
+            self.assertTrue(claim_job_slot(self.start_job('spam', 'resource_download')))
+
+            job = BaseResource()
+            job.action = 'resource_download'
+            job.ticket_number = self.start_job('spam', 'resource_download')
+            job.process_info_obj = read_file(os.path.join(
+                'mediafiles', 'jobs', job.ticket_number, 'process_info.json'), True)[job.action]
+            job.job_control = JobControl(job.action)
+            job.job_control.cancel()
+            self.assertFalse(job._wait_for_job_slot(interval=0))
+
+        process_info = read_file(os.path.join(
+            'mediafiles', 'jobs', job.ticket_number, 'process_info.json'), True)[job.action]
+        self.assertEqual(process_info['status'], 'failed')
+        self.assertEqual(process_info['status_code'], '499')
+        self.assertFalse(job.job_slot_claimed)
+
+    def test_job_collection(self):
+        """
+        Each user should see their own jobs, newest first.
+        """
+        spam_hash, eggs_hash = hash_tokens('spam'), hash_tokens('eggs')
+        download_job = self.start_job(spam_hash, 'resource_download')
+        transfer_job = self.start_job('{}_{}'.format(eggs_hash, spam_hash), 'resource_transfer_in')
+        self.start_job(eggs_hash, 'resource_download')
+        keywords_job = new_job_id()
+        self.addCleanup(shutil.rmtree, os.path.join('mediafiles', 'jobs', keywords_job), True)
+        update_or_create_process_info({'status': 'in_progress', 'message': 'Spam',
+                                       'total_resources': 4, 'resources_finished': 1},
+                                      'bulk_keywords', keywords_job)
+        index_job(keywords_job, spam_hash, 'bulk_keywords')
+        evaluation_job = new_job_id()
+        self.addCleanup(shutil.rmtree, os.path.join('mediafiles', 'jobs', evaluation_job), True)
+        update_or_create_process_info({'status': 'in_progress', 'message': 'Spam',
+                                       'fairshare_evaluation_results': []},
+                                      'fairshare_evaluation', evaluation_job)
+        index_job(evaluation_job, ANONYMOUS_OWNER, 'fairshare_evaluation')
+        add_job_user(evaluation_job, spam_hash)
+
+        response = APIClient().get(reverse('job_collection'), HTTP_PRESQT_SOURCE_TOKEN='spam')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job['job_id'] for job in response.data],
+                         [evaluation_job, keywords_job, transfer_job, download_job])
+        self.assertEqual(response.data[0]['action'], 'fairshare_evaluation')
+        self.assertEqual(response.data[0]['job_percentage'], 0)
+        self.assertEqual(response.data[1]['job_percentage'], 25)
+        self.assertEqual(response.data[3]['action'], 'download')
+        self.assertEqual(response.data[3]['job_percentage'], 50)
+        self.assertTrue(response.data[3]['job_status'].endswith(
+            '/api_v1/job_status/download/?job_id={}'.format(download_job)))
+
+        response = APIClient().get(reverse('job_collection'))
+        self.assertEqual(response.status_code, 400)
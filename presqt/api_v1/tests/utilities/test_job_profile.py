@@ -0,0 +1,95 @@
+import os
+import shutil
+import time
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from presqt.api_v1.utilities import get_profile_opt
+from presqt.api_v1.utilities.utils.job_profile import get_job_profile_path, run_profiled
+from presqt.api_v1.utilities.validation import admin_token_validation
+from presqt.utilities import PresQTValidationError
+
+TICKET_NUMBER = 'test_job_profile'
+
+
+def busy_job():
+    deadline = time.monotonic() + 0.2
+    while time.monotonic() < deadline:
+        pass
+
+
+class TestJobProfile(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(shutil.rmtree, os.path.join('mediafiles', 'jobs', TICKET_NUMBER),
+                        ignore_errors=True)
+        patcher = patch.object(admin_token_validation, 'PRESQT_ADMIN_TOKEN', 'admin-token')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.url = reverse('job_profile', kwargs={'ticket_number': TICKET_NUMBER,
+                                                  'action': 'resource_download'})
+
+    def test_run_profiled(self):
+        """
+        Profiled jobs should write the stacks they were sampled in to a collapsed stack file.
+        """
+        profile_path = get_job_profile_path(TICKET_NUMBER, 'resource_download')
+        run_profiled(busy_job, profile_path)
+
+        with open(profile_path) as profile_file:
+            lines = profile_file.read().splitlines()
+        stacks = [line.rsplit(' ', 1) for line in lines]
+        job_stacks = [stack.split(';') for stack, count in stacks
+                      if stack.startswith('MainThread;')]
+        # Frames go from the thread down to the running function
+        self.assertTrue(any(frames[-1].startswith('busy_job (') for frames in job_stacks))
+        self.assertTrue(all(int(count) > 0 for stack, count in stacks))
+
+    def test_profile_endpoints(self):
+        """
+        Admins should be able to list and retrieve job profiles.
+        """
+        run_profiled(busy_job, get_job_profile_path(TICKET_NUMBER, 'resource_download'))
+
+        response = self.client.get(reverse('job_profile_collection'),
+                                   HTTP_PRESQT_ADMIN_TOKEN='admin-token')
+        self.assertEqual(response.status_code, 200)
+        profile = next(profile for profile in response.data
+                       if profile['ticket_number'] == TICKET_NUMBER)
+        self.assertEqual(profile['action'], 'resource_download')
+        self.assertTrue(profile['link'].endswith(self.url))
+
+        response = self.client.get(self.url, HTTP_PRESQT_ADMIN_TOKEN='admin-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'busy_job', b''.join(response.streaming_content))
+
+        response = self.client.get(
+            reverse('job_profile', kwargs={'ticket_number': TICKET_NUMBER,
+                                           'action': 'resource_upload'}),
+            HTTP_PRESQT_ADMIN_TOKEN='admin-token')
+        self.assertEqual(response.status_code, 404)
+
+    def test_admin_token(self):
+        """
+        Admin endpoints should need the admin token, and be off when there isn't one.
+        """
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.assertEqual(self.client.get(self.url, HTTP_PRESQT_ADMIN_TOKEN='bad').status_code,
+                         401)
+        with patch.object(admin_token_validation, 'PRESQT_ADMIN_TOKEN', None):
+            self.assertEqual(
+                self.client.get(self.url, HTTP_PRESQT_ADMIN_TOKEN='admin-token').status_code, 403)
+
+    def test_get_profile_opt(self):
+        """
+        The presqt-profile header should be 'yes' or 'no'.
+        """
+        factory = APIRequestFactory()
+        self.assertTrue(get_profile_opt(factory.get('/', HTTP_PRESQT_PROFILE='yes')))
+        self.assertFalse(get_profile_opt(factory.get('/', HTTP_PRESQT_PROFILE='no')))
+        self.assertFalse(get_profile_opt(factory.get('/')))
+        with self.assertRaises(PresQTValidationError):
+            get_profile_opt(factory.get('/', HTTP_PRESQT_PROFILE='maybe'))
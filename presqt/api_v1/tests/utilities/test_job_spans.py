@@ -0,0 +1,131 @@
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+import aiohttp
+import requests
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from presqt.api_v1.utilities.utils import job_metrics
+from presqt.api_v1.utilities.utils.job_metrics import get_prometheus_metrics, record_job_metrics
+from presqt.targets.utilities.mock_targets import MockTargetsServer
+from presqt.utilities import JobSpans, close_job_spans, open_job_spans, record_span
+
+
+class TestJobSpans(SimpleTestCase):
+    def setUp(self):
+        self.spans = JobSpans()
+        open_job_spans(self.spans)
+        self.addCleanup(close_job_spans)
+
+    def test_span_totals(self):
+        """
+        Each span should add up its runs, time and bytes, even when the span raises.
+        """
+        with self.spans.span('fixity') as span:
+            span.add_bytes(10)
+        with self.assertRaises(ValueError):
+            with self.spans.span('fixity') as span:
+                span.add_bytes(5)
+                raise ValueError
+        record_span('file_download', 0.5, 100)
+        record_span('file_download', 0.25, 50)
+
+        spans = self.spans.to_dict()
+        self.assertEqual(spans['fixity']['count'], 2)
+        self.assertEqual(spans['fixity']['bytes'], 15)
+        self.assertEqual(spans['file_download'], {'count': 2, 'seconds': 0.75, 'bytes': 150,
+                                                  'http_requests': 0, 'http_retries': 0})
+
+        # Nothing is recorded without an open job
+        close_job_spans()
+        record_span('file_download', 1, 1)
+        self.assertEqual(self.spans.to_dict()['file_download']['count'], 2)
+
+    def test_http_hooks_imported_lazily(self):
+        """
+        Importing the utilities shouldn't import aiohttp, only opening a job's spans should.
+        """
+        script = ("import sys; import presqt.utilities; print('aiohttp' in sys.modules); "
+                  "presqt.utilities.open_job_spans(presqt.utilities.JobSpans()); "
+                  "print('aiohttp' in sys.modules)")
+        output = subprocess.run([sys.executable, '-c', script], check=True,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout
+        self.assertEqual(output.splitlines(), ['False', 'True'])
+
+    def test_http_requests(self):
+        """
+        Requests made with requests and aiohttp should be counted in every open span. Only
+        requests repeated after a failure are counted as retries.
+        """
+        async def get(url):
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url) as response:
+                    await response.read()
+
+        with MockTargetsServer({'projects': 1, 'depth': 0, 'files': 1}) as server:
+            url = '{}/zenodo/api/licenses'.format(server.url)
+            requests.get(url)
+            with self.spans.span('fetch'):
+                requests.get(url)
+                with self.spans.span('file_download'):
+                    asyncio.new_event_loop().run_until_complete(get(url + '?page=2'))
+                requests.get(url + '?page=3')
+
+            with self.spans.span('upload'):
+                self.spans.request_made('PUT', url, None)
+                self.spans.request_made('PUT', url, 503)
+                self.spans.request_made('PUT', url, 201)
+                self.spans.request_made('PUT', url, 201)
+
+        spans = self.spans.to_dict()
+        self.assertEqual(spans['fetch']['http_requests'], 3)
+        self.assertEqual(spans['fetch']['http_retries'], 0)
+        self.assertEqual(spans['file_download']['http_requests'], 1)
+        self.assertEqual(spans['file_download']['http_retries'], 0)
+        self.assertEqual(spans['upload']['http_requests'], 4)
+        self.assertEqual(spans['upload']['http_retries'], 2)
+
+
+class TestJobMetrics(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        patcher = patch.object(job_metrics, 'JOB_METRICS_PATH',
+                               os.path.join(directory, 'job_metrics.sqlite3'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_metrics(self):
+        """
+        Ended jobs should be added up by action and exported in the Prometheus format.
+        """
+        spans = {'fetch': {'count': 1, 'seconds': 1.5, 'bytes': 100, 'http_requests': 4,
+                           'http_retries': 1}}
+        record_job_metrics('resource_download', 'finished', spans)
+        record_job_metrics('resource_download', 'finished', spans)
+        record_job_metrics('resource_download', 'failed', {})
+
+        metrics = get_prometheus_metrics()
+        for line in ['# TYPE presqt_jobs_total counter',
+                     'presqt_jobs_total{action="resource_download",status="failed"} 1',
+                     'presqt_jobs_total{action="resource_download",status="finished"} 2',
+                     'presqt_job_span_count_total{action="resource_download",span="fetch"} 2',
+                     'presqt_job_span_seconds_total{action="resource_download",span="fetch"} 3.0',
+                     'presqt_job_span_bytes_total{action="resource_download",span="fetch"} 200',
+                     'presqt_job_span_http_requests_total'
+                     '{action="resource_download",span="fetch"} 8',
+                     'presqt_job_span_http_retries_total'
+                     '{action="resource_download",span="fetch"} 2']:
+            self.assertIn(line, metrics.splitlines())
+
+        response = APIClient().get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertEqual(response.content.decode(), metrics)
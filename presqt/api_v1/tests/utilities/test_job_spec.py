@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import shutil
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+
+from presqt.api_v1.utilities import kill_job_process, update_or_create_process_info
+from presqt.api_v1.utilities.multiprocess import kill_job_process as kill_job_process_module
+from presqt.api_v1.utilities.multiprocess.job_spec import (build_job_spec, load_job_spec,
+                                                           run_job_spec)
+from presqt.utilities import JobControl, read_file
+
+TICKET_NUMBER = 'test_job_spec'
+ACTION = 'resource_download'
+
+
+class SpecJob(object):
+    """
+    A job that writes the link from its email and the process it ran in to process_info.
+    """
+    def __init__(self, request):
+        self.request = request
+        self.ticket_number = TICKET_NUMBER
+        self.job_control = JobControl(ACTION)
+        self.process_info_obj = {'status': 'in_progress', 'function_process_id': None}
+        self.process_info_path = update_or_create_process_info(
+            self.process_info_obj, ACTION, TICKET_NUMBER)
+
+    def _run(self):
+        self.process_info_obj['function_process_id'] = self.function_process.pid
+        self.process_info_obj['link'] = self.request.build_absolute_uri('/api_v1/')
+        self.process_info_obj['status'] = 'finished'
+        update_or_create_process_info(self.process_info_obj, ACTION, self.ticket_number)
+
+
+class TestJobSpec(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(shutil.rmtree, os.path.join('mediafiles', 'jobs', TICKET_NUMBER),
+                        ignore_errors=True)
+        self.request = APIRequestFactory().get('/api_v1/targets/github/resources/1.zip')
+
+    def test_job_spec(self):
+        """
+        Job specs should rebuild the job's state without the request that started it.
+        """
+        job = SpecJob(self.request)
+        job.function_process = multiprocessing.Process()
+
+        spec, loaded_job = load_job_spec(build_job_spec(job, job._run, ACTION))
+        self.assertIsInstance(loaded_job, SpecJob)
+        self.assertEqual(spec['method'], '_run')
+        self.assertEqual(spec['process_info_path'], job.process_info_path)
+        self.assertEqual(loaded_job.process_info_obj, job.process_info_obj)
+        self.assertNotIn('function_process', vars(loaded_job))
+        self.assertEqual(loaded_job.request.build_absolute_uri('/api_v1/'),
+                         'http://testserver/api_v1/')
+
+        # Jobs holding state that can't be pickled aren't sent to job workers
+        job.lock = threading.Lock()
+        self.assertIsNone(build_job_spec(job, job._run, ACTION))
+
+    def test_run_job_spec(self):
+        """
+        Job workers should fork the job's process and watch it until it finishes.
+        """
+        job = SpecJob(self.request)
+        run_job_spec(build_job_spec(job, job._run, ACTION), 60)
+
+        process_info = read_file(job.process_info_path, True)[ACTION]
+        self.assertEqual(process_info['status'], 'finished')
+        self.assertEqual(process_info['link'], 'http://testserver/api_v1/')
+        self.assertNotEqual(process_info['function_process_id'], os.getpid())
+
+    def test_kill_job_process(self):
+        """
+        Job processes should be killed whether they're children of the server or not.
+        """
+        process = multiprocessing.Process(target=threading.Event().wait)
+        process.start()
+        self.assertTrue(kill_job_process(process.pid))
+        self.assertFalse(process.is_alive())
+        self.assertFalse(kill_job_process(process.pid))
+
+        with patch.object(kill_job_process_module, 'PRESQT_JOB_START_METHOD', 'forkserver'):
+            process = multiprocessing.Process(target=threading.Event().wait)
+            process.start()
+            with patch.object(kill_job_process_module.multiprocessing, 'active_children',
+                              return_value=[]):
+                self.assertTrue(kill_job_process(process.pid))
+            process.join()
+            self.assertEqual(process.exitcode, -9)
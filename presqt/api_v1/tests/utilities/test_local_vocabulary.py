@@ -0,0 +1,105 @@
+import json
+import os
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities import fetch_ontologies, keyword_enhancer
+from presqt.api_v1.utilities.keyword_enhancement import enhancer_backend, local_vocabulary
+from presqt.api_v1.utilities.keyword_enhancement.automatic_keywords import automatic_keywords
+from presqt.utilities import PresQTResponseException
+
+OBO_DUMP = """format-version: 1.2
+
+[Term]
+id: CL:0000025
+name: egg cell
+namespace: cell
+synonym: "ovum" EXACT []
+synonym: "egg" RELATED []
+
+[Term]
+id: CL:0000000
+name: old egg
+is_obsolete: true
+
+[Typedef]
+id: part_of
+name: part of
+"""
+
+JSON_DUMP = [{'labels': ['Egg'], 'synonyms': [], 'uri': 'http://example.org/egg',
+              'fragment': 'egg', 'categories': ['food']}]
+
+
+class TestLocalVocabulary(SimpleTestCase):
+    def setUp(self):
+        self.directory = 'mediafiles/test_local_vocabulary'
+        os.makedirs(self.directory, exist_ok=True)
+        self.obo_path = os.path.join(self.directory, 'cl.obo')
+        self.json_path = os.path.join(self.directory, 'food.json')
+        self.index_path = os.path.join(self.directory, 'vocabulary.sqlite3')
+        with open(self.obo_path, 'w') as obo_file:
+            obo_file.write(OBO_DUMP)
+        with open(self.json_path, 'w') as json_file:
+            json.dump(JSON_DUMP, json_file)
+
+        for setting_patch in [
+                patch.object(local_vocabulary, 'PRESQT_KEYWORD_VOCABULARY', self.index_path),
+                patch.object(enhancer_backend, 'PRESQT_KEYWORD_ENHANCER', 'local')]:
+            setting_patch.start()
+            self.addCleanup(setting_patch.stop)
+
+    def tearDown(self):
+        for file_name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, file_name))
+        os.rmdir(self.directory)
+
+    def test_local_enhancement(self):
+        """
+        Keywords should be enhanced from the local index, matching labels before synonyms.
+        """
+        call_command('build_keyword_vocabulary', self.obo_path, self.json_path,
+                     '--output', self.index_path, stdout=open(os.devnull, 'w'))
+
+        new_keywords, final_keywords = keyword_enhancer(['Ovum', 'old egg', 'unknown'])
+        self.assertEqual(new_keywords, ['egg cell'])
+        self.assertEqual(sorted(final_keywords), ['egg cell', 'old egg', 'ovum', 'unknown'])
+
+        ontologies = fetch_ontologies(['egg', 'ovum', 'egg cell'])
+        self.assertEqual(ontologies, [
+            {'keywords': ['egg'], 'ontology': 'http://example.org/egg', 'ontology_id': 'egg',
+             'categories': ['food']},
+            {'keywords': ['ovum', 'egg cell'],
+             'ontology': 'http://purl.obolibrary.org/obo/CL_0000025',
+             'ontology_id': 'CL_0000025', 'categories': ['cell']}])
+
+    def test_enhancer_recorded_in_metadata(self):
+        """
+        The backend used should be recorded as the enhancer in the keyword metadata.
+        """
+        local_vocabulary.build_vocabulary_index([self.obo_path], self.index_path)
+
+        class Transfer(object):
+            source_target_name = 'osf'
+            source_token = 'token'
+            source_resource_id = 'id'
+            all_keywords = []
+            keywords = []
+
+        with patch('presqt.api_v1.utilities.keyword_enhancement.automatic_keywords.'
+                   'FunctionRouter.get_function',
+                   return_value=lambda token, resource_id: {'keywords': ['Ovum']}):
+            keyword_dict = automatic_keywords(Transfer())
+
+        self.assertEqual(keyword_dict['enhancer'], 'local')
+        self.assertEqual(keyword_dict['sourceKeywordsEnhanced'], ['egg cell'])
+
+    def test_missing_index(self):
+        """
+        A 500 error should be raised if the local index hasn't been built.
+        """
+        with self.assertRaises(PresQTResponseException) as e:
+            keyword_enhancer(['egg'])
+        self.assertEqual(e.exception.status_code, 500)
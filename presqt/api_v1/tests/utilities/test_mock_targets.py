@@ -0,0 +1,128 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+import requests
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities import FunctionRouter
+from presqt.targets.utilities import install_target_url_override, override_target_url
+from presqt.targets.utilities.mock_targets import MOCK_INVALID_TOKEN, MockTargetsServer
+from presqt.targets.utilities.utils import target_urls
+from presqt.utilities import JobControl, PresQTResponseException, PresQTValidationError
+
+SHAPE = {'projects': 2, 'depth': 1, 'folders': 1, 'files': 2, 'file_size': 64}
+PROJECT_IDS = {'osf': 'm0001', 'github': '100001', 'gitlab': '200001', 'zenodo': '300001',
+               'figshare': '400001', 'curate_nd': 'mk000000001'}
+
+
+class TestMockTargets(SimpleTestCase):
+    def setUp(self):
+        self.server = MockTargetsServer(SHAPE).start()
+        self.addCleanup(self.server.stop)
+        # Requests only go to the mock while the test runs
+        patcher = patch.object(target_urls, '_target_base_url', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        install_target_url_override(self.server.url)
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def process_info(self, action):
+        process_info_path = os.path.join(self.directory, 'process_info.json')
+        with open(process_info_path, 'w') as process_info_file:
+            json.dump({action: {'download_total_files': 0, 'download_files_finished': 0,
+                                'upload_total_files': 0, 'upload_files_finished': 0,
+                                'message': ''}}, process_info_file)
+        return process_info_path
+
+    def test_override_target_url(self):
+        """
+        Target urls should be pointed at the mock server and other urls left alone.
+        """
+        self.assertEqual(override_target_url('https://api.osf.io/v2/nodes/?page=2'),
+                         '{}/osf/v2/nodes/?page=2'.format(self.server.url))
+        self.assertEqual(override_target_url('http://api.figshare.com/v2/account'),
+                         '{}/figshare/v2/account'.format(self.server.url))
+        self.assertEqual(override_target_url('https://example.com/v2/nodes/'),
+                         'https://example.com/v2/nodes/')
+
+        with patch.object(target_urls, '_target_base_url', None):
+            self.assertEqual(override_target_url('https://api.osf.io/v2/nodes/'),
+                             'https://api.osf.io/v2/nodes/')
+
+    def test_fetch_and_download(self):
+        """
+        Every target's fetch and download functions should work against the mock server.
+        """
+        for target_name, project_id in PROJECT_IDS.items():
+            with self.subTest(target=target_name):
+                resources, pages = FunctionRouter.get_function(
+                    target_name, 'resource_collection')('token', {})
+                self.assertEqual(
+                    [resource['title'].replace('-', ' ') for resource in resources],
+                    ['Mock Project 1', 'Mock Project 2'])
+
+                resource = FunctionRouter.get_function(
+                    target_name, 'resource_detail')('token', project_id)
+                self.assertEqual(str(resource['id']), project_id)
+
+                download = FunctionRouter.get_function(target_name, 'resource_download')(
+                    'token', project_id, self.process_info('resource_download'),
+                    'resource_download', JobControl('resource_download'))
+                # FigShare projects only have the files that are in articles
+                self.assertEqual(len(download['resources']), 2 if target_name == 'figshare' else 4)
+                contents = [file.contents for file in
+                            self.server.dataset.get_project(target_name, project_id).walk()]
+                for downloaded in download['resources']:
+                    self.assertIn(downloaded['file'], contents)
+
+    def test_invalid_token(self):
+        """
+        The mock targets should reject the invalid token like the live targets do.
+        """
+        for target_name in PROJECT_IDS:
+            with self.subTest(target=target_name):
+                with self.assertRaises((PresQTResponseException, PresQTValidationError)):
+                    FunctionRouter.get_function(target_name, 'resource_collection')(
+                        MOCK_INVALID_TOKEN, {})
+
+    def test_upload(self):
+        """
+        Uploaded files should be added to the mock dataset.
+        """
+        resource_main_dir = os.path.join(self.directory, 'data')
+        os.makedirs(os.path.join(resource_main_dir, 'New Project', 'folder'))
+        with open(os.path.join(resource_main_dir, 'New Project', 'folder', 'eggs.txt'),
+                  'w') as upload_file:
+            upload_file.write('eggs')
+
+        FunctionRouter.get_function('github', 'resource_upload')(
+            'token', None, resource_main_dir, 'md5', 'ignore',
+            self.process_info('resource_upload'), 'resource_upload',
+            JobControl('resource_upload'))
+
+        project = self.server.dataset.get_project('github', '100003')
+        self.assertEqual(project.title, 'New_Project')
+        self.assertEqual(project.files['folder/eggs.txt'].contents, b'eggs')
+
+    def test_latency_and_rate_limit(self):
+        """
+        Responses should be delayed by the latency and a 429 returned over the rate limit.
+        """
+        with MockTargetsServer(SHAPE, latency=0.2, rate_limit=2) as server:
+            headers = {'Authorization': 'token token'}
+            start = time.monotonic()
+            responses = [requests.get('{}/github/user'.format(server.url), headers=headers)
+                         for _ in range(3)]
+            self.assertGreaterEqual(time.monotonic() - start, 0.4)
+
+            self.assertEqual([response.status_code for response in responses], [200, 200, 429])
+            self.assertEqual(responses[2].headers['Retry-After'], '1')
+            # Each target has its own limit
+            self.assertEqual(requests.get('{}/gitlab/api/v4/user'.format(server.url),
+                                          headers={'Private-Token': 'token'}).status_code, 200)
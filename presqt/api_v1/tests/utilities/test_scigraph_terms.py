@@ -0,0 +1,60 @@
+import os
+import time
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities import fetch_ontologies, keyword_enhancer
+from presqt.api_v1.utilities.keyword_enhancement import scigraph_terms
+
+TERM = {'labels': ['Egg', 'Ovum'], 'uri': 'http://purl.obolibrary.org/obo/CL_0000025',
+        'fragment': 'CL_0000025', 'categories': ['cell']}
+
+
+class TestSciGraphTerms(SimpleTestCase):
+    def setUp(self):
+        self.cache_path = os.path.join('mediafiles', 'test_scigraph_cache.sqlite3')
+        cache_path = patch.object(scigraph_terms, 'SCIGRAPH_CACHE_PATH', self.cache_path)
+        cache_path.start()
+        self.addCleanup(cache_path.stop)
+        self.fetched = []
+
+    def tearDown(self):
+        for suffix in ['', '-wal', '-shm']:
+            if os.path.exists(self.cache_path + suffix):
+                os.remove(self.cache_path + suffix)
+
+    async def fake_get(self, keyword, session):
+        self.fetched.append(keyword)
+        return {'egg': (keyword, TERM), 'zzz': (keyword, None)}.get(keyword, (keyword, False))
+
+    def test_lookups_shared_and_cached(self):
+        """
+        Keyword enhancement and ontology lookups should share the cached SciGraph terms.
+        Unknown keywords are cached but failed lookups are tried again.
+        """
+        with patch.object(scigraph_terms, 'async_get', self.fake_get):
+            new_keywords, final_keywords = keyword_enhancer(['Egg', 'zzz', 'down'])
+            self.assertEqual(sorted(self.fetched), ['down', 'egg', 'zzz'])
+            self.assertEqual(sorted(new_keywords), ['ovum'])
+            self.assertEqual(sorted(final_keywords), ['down', 'egg', 'ovum', 'zzz'])
+
+            self.fetched = []
+            ontologies = fetch_ontologies(['egg', 'zzz', 'down'])
+            self.assertEqual(self.fetched, ['down'])
+            self.assertEqual(ontologies, [{'keywords': ['egg'], 'ontology': TERM['uri'],
+                                           'ontology_id': 'CL_0000025',
+                                           'categories': ['cell']}])
+
+    def test_negative_entries_expire_sooner(self):
+        """
+        Unknown keywords should be looked up again once the negative TTL has passed.
+        """
+        with patch.object(scigraph_terms, 'async_get', self.fake_get):
+            scigraph_terms.get_scigraph_terms(['egg', 'zzz'])
+            self.fetched = []
+            later = time.time() + scigraph_terms.PRESQT_SCIGRAPH_NEGATIVE_CACHE_TTL + 1
+            with patch.object(scigraph_terms.time, 'time', return_value=later):
+                terms = scigraph_terms.get_scigraph_terms(['egg', 'zzz'])
+        self.assertEqual(self.fetched, ['zzz'])
+        self.assertEqual(terms, {'egg': TERM, 'zzz': None})
@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from rest_framework import status
+
+from presqt.api_v1.utilities import update_or_create_process_info
+from presqt.api_v1.utilities.utils.transfer_pipeline import TransferPipeline
+from presqt.utilities import (JobControl, PresQTResponseException, stream_downloaded_contents,
+                              stream_resources, walk_upload_directory, list_upload_directory,
+                              write_file, ResourceStream)
+
+
+class PipelinedTransfer(object):
+    """
+    Stand in for the BaseResource attributes a pipelined transfer uses.
+    """
+    def __init__(self, ticket_number):
+        self.ticket_number = ticket_number
+        self.action = 'resource_transfer_in'
+        self.process_info_path = update_or_create_process_info(
+            {'download_total_files': 0, 'upload_total_files': 0}, self.action, ticket_number)
+        self.data_directory = os.path.join('mediafiles', 'jobs', ticket_number, 'transfer', 'data')
+        self.source_token = 'source_token'
+        self.source_resource_id = 'source_id'
+        self.destination_token = 'destination_token'
+        self.destination_resource_id = None
+        self.destination_target_name = 'osf'
+        self.file_duplicate_action = 'ignore'
+        self.zipped_bag = None
+        self.job_control = JobControl(self.action)
+
+    def _save_downloaded_resource(self, resource):
+        file_path = '{}{}'.format(self.data_directory, resource['path'])
+        write_file(file_path, resource['file'])
+        fixity_obj = {'hash_algorithm': 'md5',
+                      'presqt_hash': hashlib.md5(resource['file']).hexdigest()}
+        return file_path, fixity_obj
+
+
+class TestTransferPipeline(SimpleTestCase):
+    def setUp(self):
+        self.ticket_number = 'test_transfer_pipeline'
+        self.instance = PipelinedTransfer(self.ticket_number)
+        self.urls = ['https://source/1', 'https://source/2', 'https://source/3']
+        self.resources = [{'file': url, 'hashes': {}, 'title': url[-1],
+                           'path': '/project/{}'.format(url[-1]), 'source_path': '',
+                           'extra_metadata': {}} for url in self.urls]
+        self.uploaded = []
+        self.top_level = None
+        self.first_upload = threading.Event()
+        target_data = patch('presqt.api_v1.utilities.utils.transfer_pipeline.get_target_data',
+                            return_value={'supported_hash_algorithms': ['md5']})
+        target_data.start()
+        self.addCleanup(target_data.stop)
+
+    def tearDown(self):
+        shutil.rmtree(os.path.join('mediafiles', 'jobs', self.ticket_number), ignore_errors=True)
+
+    def download(self, token, resource_id, process_info_path, action, job_control):
+        stream_resources(self.resources, self.urls)
+        for url in self.urls:
+            asyncio.new_event_loop().run_until_complete(
+                stream_downloaded_contents(url, url.encode()))
+            # Nothing more is downloaded until the first file has been uploaded
+            self.assertTrue(self.first_upload.wait(10))
+        return {'resources': [dict(resource, file=resource['file'].encode())
+                              for resource in self.resources],
+                'empty_containers': [], 'action_metadata': {}, 'extra_metadata': {}}
+
+    def upload(self, token, resource_id, resource_main_dir, hash_algorithm,
+               file_duplicate_action, process_info_path, action, job_control):
+        self.top_level = list_upload_directory(resource_main_dir)
+        for path, subdirs, files in walk_upload_directory(resource_main_dir):
+            for name in files:
+                self.uploaded.append(os.path.join(path, name))
+                self.first_upload.set()
+        return {'file_metadata_list': self.uploaded}
+
+    def test_files_uploaded_while_downloading(self):
+        """
+        Files should be uploaded as soon as they're downloaded and the upload should only
+        finish once the download does.
+        """
+        pipeline = TransferPipeline(self.instance)
+        with patch('presqt.api_v1.utilities.utils.transfer_pipeline.FunctionRouter.get_function',
+                   return_value=self.upload):
+            func_dict = pipeline.run_download(self.download)
+            pipeline.finish_download([])
+            upload_dict = pipeline.wait_for_upload()
+
+        self.assertEqual(len(func_dict['resources']), 3)
+        expected_paths = ['{}/project/{}'.format(self.instance.data_directory, url[-1])
+                          for url in self.urls]
+        self.assertEqual(upload_dict['file_metadata_list'], expected_paths)
+        self.assertEqual(pipeline.file_hashes[expected_paths[0]],
+                         hashlib.md5(self.urls[0].encode()).hexdigest())
+        self.assertEqual(pipeline.hash_algorithm, 'md5')
+        self.assertEqual(self.top_level, (self.instance.data_directory, ['project'], []))
+
+    def test_download_error_stops_upload(self):
+        """
+        If the download fails the upload should be stopped and the download's error raised.
+        """
+        def failing_download(token, resource_id, process_info_path, action, job_control):
+            stream_resources(self.resources, self.urls)
+            asyncio.new_event_loop().run_until_complete(
+                stream_downloaded_contents(self.urls[0], b'contents'))
+            self.assertTrue(self.first_upload.wait(10))
+            raise PresQTResponseException('Source error', status.HTTP_400_BAD_REQUEST)
+
+        pipeline = TransferPipeline(self.instance)
+        with patch('presqt.api_v1.utilities.utils.transfer_pipeline.FunctionRouter.get_function',
+                   return_value=self.upload):
+            with self.assertRaises(PresQTResponseException) as e:
+                pipeline.run_download(failing_download)
+
+        self.assertEqual(e.exception.data, 'Source error')
+        self.assertFalse(pipeline.upload_thread.is_alive())
+        self.assertIsInstance(pipeline.upload_error, PresQTResponseException)
+
+    def test_invalid_structure_not_uploaded(self):
+        """
+        A file that makes the structure invalid should fail the transfer before it's uploaded.
+        """
+        self.resources[1]['path'] = '/other_project/2'
+        pipeline = TransferPipeline(self.instance)
+        with patch('presqt.api_v1.utilities.utils.transfer_pipeline.FunctionRouter.get_function',
+                   return_value=self.upload):
+            with self.assertRaises(PresQTResponseException) as e:
+                pipeline.run_download(self.download)
+
+        self.assertEqual(e.exception.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Multiple directories exist at the top level', e.exception.data)
+        self.assertEqual(self.uploaded,
+                         ['{}/project/1'.format(self.instance.data_directory)])
+
+    def test_complete_tree_validated(self):
+        """
+        The structure should be validated again once the download is done and the upload
+        should fail if it's invalid.
+        """
+        pipeline = TransferPipeline(self.instance)
+        with patch('presqt.api_v1.utilities.utils.transfer_pipeline.FunctionRouter.get_function',
+                   return_value=self.upload):
+            pipeline.run_download(self.download)
+            # A file written to the top level without being streamed
+            write_file(os.path.join(self.instance.data_directory, 'spam.txt'), b'spam')
+            pipeline.finish_download([])
+            with self.assertRaises(PresQTResponseException) as e:
+                pipeline.wait_for_upload()
+
+        self.assertEqual(e.exception.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(pipeline.upload_thread.is_alive())
+
+    def test_upload_exception_fails_job(self):
+        """
+        Any exception raised by the upload function should be raised as a PresQT error.
+        """
+        def failing_upload(*args):
+            self.first_upload.set()
+            raise KeyError('eggs')
+
+        pipeline = TransferPipeline(self.instance)
+        with patch('presqt.api_v1.utilities.utils.transfer_pipeline.FunctionRouter.get_function',
+                   return_value=failing_upload):
+            pipeline.run_download(self.download)
+            pipeline.finish_download([])
+            with self.assertRaises(PresQTResponseException) as e:
+                pipeline.wait_for_upload()
+
+        self.assertEqual(e.exception.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertIn("KeyError('eggs')", e.exception.data)
+
+
+class TestResourceStream(SimpleTestCase):
+    def test_put_async(self):
+        """
+        Coroutines adding to a full stream should wait without holding up the event loop.
+        """
+        stream = ResourceStream(1)
+        stream.put('spam')
+        finished = []
+
+        async def other_download():
+            await asyncio.sleep(0)
+            finished.append('other_download')
+            # Make room once the other coroutine has run
+            self.assertEqual(stream.queue.get_nowait(), 'spam')
+
+        async def put():
+            await stream.put_async('eggs')
+            finished.append('put')
+
+        async def download():
+            await asyncio.wait_for(asyncio.gather(put(), other_download()), 10)
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        loop.run_until_complete(download())
+        self.assertEqual(finished, ['other_download', 'put'])
+        self.assertEqual(stream.drain(), ['eggs'])
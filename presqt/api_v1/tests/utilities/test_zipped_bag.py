@@ -0,0 +1,194 @@
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import bagit
+from django.test import SimpleTestCase
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from presqt.api_v1.utilities import find_job, hash_tokens
+from presqt.api_v1.utilities.depth_helpers.zipped_bag import rewrite_zipped_bag
+from presqt.api_v1.utilities.metadata.upload_metadata import get_zipped_upload_source_metadata
+from presqt.api_v1.utilities.utils import job_index
+from presqt.api_v1.utilities.validation.bagit_validation import (validate_zipped_bag,
+                                                                 encode_manifest_path,
+                                                                 decode_manifest_path)
+from presqt.utilities import PresQTValidationError
+
+UPLOAD_RESOURCES = 'presqt/api_v1/tests/resources/upload'
+
+
+class TestZippedBag(SimpleTestCase):
+    """
+    Test validating and rewriting bags without extracting them.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def make_zipped_bag(self, files):
+        """
+        Bag a set of files and zip the bag. Returns the path to the zip file.
+        """
+        bag_path = os.path.join(self.directory, 'SpamBag')
+        for path, contents in files.items():
+            os.makedirs(os.path.join(bag_path, os.path.dirname(path)), exist_ok=True)
+            with open(os.path.join(bag_path, path), 'w') as bag_file:
+                bag_file.write(contents)
+        bagit.make_bag(bag_path, checksums=['sha256'])
+
+        zip_path = os.path.join(self.directory, 'SpamBag.zip')
+        with zipfile.ZipFile(zip_path, 'w') as bag_zip:
+            for root, dirs, files in os.walk(bag_path):
+                for name in files:
+                    file_path = os.path.join(root, name)
+                    bag_zip.write(file_path, os.path.relpath(file_path, self.directory))
+        return zip_path
+
+    def rewrite_bag(self, zip_path):
+        """
+        Validate a zipped bag, collect its source metadata and rewrite it, like a finite depth
+        upload does. Returns the source metadata instance and the rewritten bag extracted to disk.
+        """
+        zipped_bag = validate_zipped_bag(zip_path, ['md5'])
+        instance = SimpleNamespace()
+        get_zipped_upload_source_metadata(instance, zipped_bag)
+
+        rewritten_path = os.path.join(self.directory, 'rewritten.zip')
+        rewrite_zipped_bag(zipped_bag, rewritten_path, {'context': {}, 'actions': []})
+        bag_path = os.path.join(self.directory, 'rewritten')
+        with zipfile.ZipFile(rewritten_path) as rewritten_zip:
+            rewritten_zip.extractall(bag_path)
+        return instance, bag_path
+
+    def test_validate_valid_bag(self):
+        """
+        A valid bag should have each payload file hashed with its manifests' algorithms and any
+        extra algorithms asked for.
+        """
+        zipped_bag = validate_zipped_bag(
+            os.path.join(UPLOAD_RESOURCES, 'ProjectSingleFileToUpload.zip'), ['md5'])
+
+        self.assertEqual(zipped_bag['bag_prefix'], 'ProjectSingleFileToUploadBag/')
+        self.assertEqual(zipped_bag['base_directory_name'], 'ProjectSingleFileToUploadBag')
+        self.assertEqual(sorted(zipped_bag['algorithms']), ['sha256', 'sha512'])
+        self.assertEqual(len(zipped_bag['payload']), 1)
+        for path, hashes in zipped_bag['payload'].items():
+            self.assertTrue(path.startswith('data/NewProject/'))
+            self.assertEqual(sorted(hashes), ['md5', 'sha256', 'sha512'])
+        self.assertEqual(zipped_bag['payload_directories'], ['data/', 'data/NewProject/'])
+
+    def test_validate_invalid_bags(self):
+        """
+        Invalid bags should raise a 400.
+        """
+        for zip_name in ['BadBagItManifest.zip', 'BadBagItMissingFile.zip', 'not_a_bag.zip']:
+            with self.assertRaises(PresQTValidationError) as e:
+                validate_zipped_bag(os.path.join(UPLOAD_RESOURCES, zip_name))
+            self.assertEqual(e.exception.status_code, 400)
+
+        # A payload file was added without updating the bag
+        zip_path = os.path.join(self.directory, 'extra_file.zip')
+        shutil.copy(os.path.join(UPLOAD_RESOURCES, 'ProjectSingleFileToUpload.zip'), zip_path)
+        with zipfile.ZipFile(zip_path, 'a') as bag_zip:
+            bag_zip.writestr('ProjectSingleFileToUploadBag/data/NewProject/eggs.txt', 'eggs')
+        with self.assertRaises(PresQTValidationError) as e:
+            validate_zipped_bag(zip_path)
+        self.assertEqual(e.exception.status_code, 400)
+        self.assertTrue(e.exception.data.startswith('Payload-Oxum validation failed.'))
+
+        # A manifest named after a hash algorithm that doesn't exist
+        zip_path = os.path.join(self.directory, 'unknown_algorithm.zip')
+        shutil.copy(os.path.join(UPLOAD_RESOURCES, 'ProjectSingleFileToUpload.zip'), zip_path)
+        with zipfile.ZipFile(zip_path, 'a') as bag_zip:
+            bag_zip.writestr('ProjectSingleFileToUploadBag/manifest-spam.txt', '')
+        with self.assertRaises(PresQTValidationError) as e:
+            validate_zipped_bag(zip_path)
+        self.assertEqual(e.exception.status_code, 400)
+        self.assertEqual(e.exception.data, 'Unsupported manifest hash algorithm: spam')
+
+    def test_rewrite_bag(self):
+        """
+        A rewritten bag should be a valid bag holding the FTS metadata file without the bag's own
+        valid FTS metadata file.
+        """
+        instance, bag_path = self.rewrite_bag(self.make_zipped_bag({
+            'Spam/eggs.txt': 'eggs',
+            'Spam/PRESQT_FTS_METADATA.json': json.dumps(
+                {'allKeywords': ['spam'], 'actions': []})}))
+        bagit.Bag(bag_path).validate()
+
+        self.assertEqual(instance.all_keywords, ['spam'])
+        self.assertTrue(os.path.isfile(os.path.join(bag_path, 'data', 'Spam', 'eggs.txt')))
+        self.assertTrue(os.path.isfile(os.path.join(bag_path, 'data', 'PRESQT_FTS_METADATA.json')))
+        self.assertFalse(os.path.exists(
+            os.path.join(bag_path, 'data', 'Spam', 'PRESQT_FTS_METADATA.json')))
+
+        # Payload and tag manifests separate hashes from paths the same way
+        for manifest_name in ['manifest-sha256.txt', 'tagmanifest-sha256.txt']:
+            with open(os.path.join(bag_path, manifest_name)) as manifest:
+                for line in manifest:
+                    self.assertRegex(line, r'^[0-9a-f]+  \S')
+
+    def test_rewrite_bag_invalid_metadata(self):
+        """
+        A rewritten bag should keep an invalid FTS metadata file under a new name.
+        """
+        instance, bag_path = self.rewrite_bag(
+            os.path.join(UPLOAD_RESOURCES, 'Invalid_Metadata_Upload.zip'))
+        bagit.Bag(bag_path).validate()
+
+        self.assertEqual(instance.source_fts_metadata_actions, [])
+        self.assertTrue(os.path.isfile(
+            os.path.join(bag_path, 'data', 'Bad_Egg', 'INVALID_PRESQT_FTS_METADATA.json')))
+        self.assertFalse(os.path.exists(
+            os.path.join(bag_path, 'data', 'Bad_Egg', 'PRESQT_FTS_METADATA.json')))
+
+    def test_manifest_paths(self):
+        """
+        Line breaks in paths should be percent encoded in manifests.
+        """
+        self.assertEqual(encode_manifest_path('data/spam\r\neggs.txt'), 'data/spam%0D%0Aeggs.txt')
+        self.assertEqual(decode_manifest_path('data/spam%0d%0Aeggs.txt'), 'data/spam\r\neggs.txt')
+
+
+class TestZippedBagUpload(SimpleTestCase):
+    """
+    Test uploads to finite depth targets, which validate the bag inside the uploaded zip.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.headers = {'HTTP_PRESQT_DESTINATION_TOKEN': 'spam',
+                        'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
+                        'HTTP_PRESQT_EMAIL_OPT_IN': ''}
+        self.url = reverse('resource_collection', kwargs={'target_name': 'zenodo'})
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = patch.object(job_index, 'JOB_INDEX_PATH',
+                               os.path.join(self.directory, 'job_index.sqlite3'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_invalid_bag_removes_job(self):
+        """
+        An upload whose bag fails validation shouldn't leave its job behind.
+        """
+        job_id = 'test_zipped_bag_upload'
+        self.addCleanup(shutil.rmtree, os.path.join('mediafiles', 'jobs', job_id), True)
+        with patch('presqt.api_v1.views.resource.base_resource.new_job_id',
+                   return_value=job_id):
+            response = self.client.post(self.url, {'presqt-file': open(
+                'presqt/api_v1/tests/resources/upload/BadBagItManifest.zip', 'rb')},
+                **self.headers)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data['error'].startswith('PresQT Error: '))
+        self.assertFalse(os.path.exists(os.path.join('mediafiles', 'jobs', job_id)))
+        self.assertEqual(find_job(hash_tokens('spam'), 'resource_upload'), hash_tokens('spam'))
@@ -31,7 +31,6 @@ class TestDownloadJobGET(SimpleTestCase):
         self.hashes = {
             "sha256": "3e517cda95ddbfcb270ab273201517f5ae0ee1190a9c5f6f7e6662f97868366f",
             "md5": "9e79fdd9032629743fca52634ecdfd86"}
-        self.ticket_number = hash_tokens(OSF_TEST_USER_TOKEN)
         self.token = OSF_TEST_USER_TOKEN
 
     def test_success_200_zip(self):
@@ -103,6 +102,55 @@ class TestDownloadJobGET(SimpleTestCase):
         # Delete corresponding folder
         shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
 
+    def test_success_200_concurrent_jobs(self):
+        """
+        A user's downloads should run side by side, each with its own job id.
+        """
+        resource_ids = [self.resource_id, '5cd98b0af244ec0021e5f8dd']
+        job_ids = []
+        for resource_id in resource_ids:
+            url = reverse('resource', kwargs={'target_name': self.target_name,
+                                              'resource_id': resource_id,
+                                              'resource_format': 'zip'})
+            response = self.client.get(url, **self.header)
+            self.assertEqual(response.status_code, 202)
+            self.assertTrue(response.data['download_job_zip'].endswith(
+                '?job_id={}'.format(response.data['job_id'])))
+            job_ids.append(response.data['job_id'])
+        self.assertNotEqual(job_ids[0], job_ids[1])
+
+        for job_id in job_ids:
+            process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(job_id)
+            process_info = read_file(process_info_path, True)
+            while process_info['resource_download']['status'] == 'in_progress':
+                try:
+                    process_info = read_file(process_info_path, True)
+                except json.decoder.JSONDecodeError:
+                    # Pass while the process_info file is being written to
+                    pass
+
+        # Each job is found by its job id
+        url = reverse('job_status', kwargs={'action': 'download', 'response_format': 'zip'})
+        for resource_id, job_id in zip(resource_ids, job_ids):
+            response = self.client.get('{}?job_id={}'.format(url, job_id), **self.header)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response._headers['content-disposition'][1],
+                             'attachment; filename=osf_download_{}.zip'.format(resource_id))
+
+        # Requests without a job id get the user's latest job
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response._headers['content-disposition'][1],
+                         'attachment; filename=osf_download_{}.zip'.format(resource_ids[1]))
+
+        # Another user's job can't be found by its id
+        response = self.client.get('{}?job_id={}'.format(url, job_ids[0]),
+                                   **{'HTTP_PRESQT_SOURCE_TOKEN': 'bad_token'})
+        self.assertEqual(response.status_code, 404)
+
+        # Delete corresponding folders
+        for job_id in job_ids:
+            shutil.rmtree('mediafiles/jobs/{}'.format(job_id))
+
     def test_success_202(self):
         """
         Return a 202 if the resource has not finished being prepared on the server.
@@ -291,7 +339,6 @@ class TestDownloadJobPATCH(SimpleTestCase):
                        'HTTP_PRESQT_EMAIL_OPT_IN': ''}
         self.resource_id = 'cmn5z'
         self.target_name = 'osf'
-        self.ticket_number = hash_tokens(OSF_TEST_USER_TOKEN)
         self.token = OSF_TEST_USER_TOKEN
 
     def test_success_200(self):
@@ -301,8 +348,9 @@ class TestDownloadJobPATCH(SimpleTestCase):
         download_url = reverse('resource', kwargs={'target_name': self.target_name,
                                                    'resource_id': self.resource_id,
                                                    'resource_format': 'zip'})
-        self.client.get(download_url, **self.header)
+        response = self.client.get(download_url, **self.header)
 
+        self.ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
         # Verify process_info file status is 'in_progress' initially
         process_info = read_file('{}/process_info.json'.format(ticket_path), True)
@@ -338,8 +386,9 @@ class TestDownloadJobPATCH(SimpleTestCase):
         download_url = reverse('resource', kwargs={'target_name': self.target_name,
                                                    'resource_id': '5cd98510f244ec001fe5632f',
                                                    'resource_format': 'zip'})
-        self.client.get(download_url, **self.header)
+        response = self.client.get(download_url, **self.header)
 
+        self.ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
         # Verify process_info file status is 'in_progress' initially
         process_info = read_file('{}/process_info.json'.format(ticket_path), True)
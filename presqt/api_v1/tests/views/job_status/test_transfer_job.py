@@ -15,7 +15,7 @@ from rest_framework.test import APIClient
 from config.settings.base import (OSF_UPLOAD_TEST_USER_TOKEN, GITHUB_TEST_USER_TOKEN,
                                   ZENODO_TEST_USER_TOKEN, OSF_TEST_USER_TOKEN)
 
-from presqt.api_v1.utilities import transfer_target_validation, hash_tokens
+from presqt.api_v1.utilities import transfer_target_validation
 from presqt.utilities import read_file, PresQTValidationError
 from presqt.targets.osf.utilities import delete_users_projects
 
@@ -37,8 +37,6 @@ class TestTransferJobGET(SimpleTestCase):
                         'HTTP_PRESQT_KEYWORD_ACTION': 'manual',
                         'HTTP_PRESQT_EMAIL_OPT_IN': '',
                         'HTTP_PRESQT_FAIRSHARE_EVALUATOR_OPT_IN': 'no'}
-        self.ticket_number = "{}_{}".format(hash_tokens(
-            self.source_token), hash_tokens(self.destination_token))
         self.resource_id = '209373660'
         self.url = reverse('resource_collection', kwargs={'target_name': 'osf'})
 
@@ -61,6 +59,7 @@ class TestTransferJobGET(SimpleTestCase):
             **self.headers,
             format='json')
 
+        self.ticket_number = response.data['job_id']
         self.process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(self.ticket_number)
         self.transfer_job = response.data['transfer_job']
         process_info = read_file(self.process_info_path, True)
@@ -112,12 +111,11 @@ class TestTransferJobGET(SimpleTestCase):
                         'HTTP_PRESQT_KEYWORD_ACTION': 'automatic',
                         'HTTP_PRESQT_EMAIL_OPT_IN': 'eggs@test.com',
                         'HTTP_PRESQT_FAIRSHARE_EVALUATOR_OPT_IN': 'no'}
-        self.ticket_number = "{}_{}".format(hash_tokens(
-            self.source_token), hash_tokens(ZENODO_TEST_USER_TOKEN))
         response = self.client.post(self.url, {"source_target_name": "github",
                                                "source_resource_id": self.resource_id,
                                                "keywords": []},
                                     **self.headers, format='json')
+        self.ticket_number = response.data['job_id']
         self.process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(self.ticket_number)
         self.transfer_job = response.data['transfer_job']
         process_info = read_file(self.process_info_path, True)
@@ -166,6 +164,7 @@ class TestTransferJobGET(SimpleTestCase):
             "source_resource_id": github_project_id,
             "keywords": []}, **self.headers, format='json')
 
+        self.ticket_number = response.data['job_id']
         self.process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(self.ticket_number)
         self.transfer_job = response.data['transfer_job']
         process_info = read_file(self.process_info_path, True)
@@ -266,6 +265,7 @@ class TestTransferJobGET(SimpleTestCase):
             "source_resource_id": github_project_id,
             "keywords": []}, **self.headers, format='json')
 
+        self.ticket_number = response.data['job_id']
         self.process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(self.ticket_number)
         self.transfer_job = response.data['transfer_job']
         process_info = read_file(self.process_info_path, True)
@@ -333,6 +333,7 @@ class TestTransferJobGET(SimpleTestCase):
             "source_resource_id": github_project_id,
             "keywords": []}, **self.headers, format='json')
 
+        self.ticket_number = response.data['job_id']
         self.process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(
             self.ticket_number)
         self.transfer_job = response.data['transfer_job']
@@ -441,6 +442,7 @@ class TestTransferJobGET(SimpleTestCase):
             "source_resource_id": github_project_id,
             "keywords": ["test", "words"]}, **self.headers, format='json')
 
+        self.ticket_number = response.data['job_id']
         self.process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(
             self.ticket_number)
         self.transfer_job = response.data['transfer_job']
@@ -523,10 +525,11 @@ class TestTransferJobGET(SimpleTestCase):
         """
         Return a 400 if the `presqt-destination-token` is missing in the headers.
         """
-        self.client.post(self.url, {
+        response = self.client.post(self.url, {
             "source_target_name": "github",
             "source_resource_id": self.resource_id,
             "keywords": []}, **self.headers, format='json')
+        self.ticket_number = response.data['job_id']
         process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(self.ticket_number)
         process_info = read_file(process_info_path, True)
 
@@ -554,12 +557,11 @@ class TestTransferJobGET(SimpleTestCase):
         Return a 500 if the BaseResource._transfer_resource method running on the server gets a 401 error because the token is invalid.
         """
         self.headers['HTTP_PRESQT_DESTINATION_TOKEN'] = 'bad_token'
-        self.client.post(self.url, {
+        response = self.client.post(self.url, {
             "source_target_name": "github",
             "source_resource_id": self.resource_id, "keywords": []},
             **self.headers, format='json')
-        self.ticket_number = '{}_{}'.format(hash_tokens(
-            self.source_token), hash_tokens('bad_token'))
+        self.ticket_number = response.data['job_id']
         process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(self.ticket_number)
         process_info = read_file(process_info_path, True)
         url = reverse('job_status', kwargs={'action': 'transfer'})
@@ -600,6 +602,7 @@ class TestTransferJobGET(SimpleTestCase):
                 "source_target_name": "github",
                 "source_resource_id": self.resource_id, "keywords": []},
                 **self.headers, format='json')
+            self.ticket_number = response.data['job_id']
             process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(self.ticket_number)
             process_info = read_file(process_info_path, True)
 
@@ -638,6 +641,7 @@ class TestTransferJobGET(SimpleTestCase):
                 "source_target_name": "github",
                 "source_resource_id": "garbage_id", "keywords": []},
                 **self.headers, format='json')
+            self.ticket_number = response.data['job_id']
             process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(self.ticket_number)
             process_info = read_file(process_info_path, True)
 
@@ -698,15 +702,14 @@ class TestTransferJobGET(SimpleTestCase):
                    'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
                    'HTTP_PRESQT_KEYWORD_ACTION': 'automatic',
                    'HTTP_PRESQT_EMAIL_OPT_IN': ''}
-        self.ticket_number = '{}_{}'.format(hash_tokens(
-            OSF_TEST_USER_TOKEN), hash_tokens(GITHUB_TEST_USER_TOKEN))
         url = reverse('resource_collection', kwargs={'target_name': 'github'})
 
-        self.client.post(url, {
+        response = self.client.post(url, {
             "source_target_name": "osf",
             "source_resource_id": '5db70f51f3bb87000c853575', "keywords": []},
             **headers, format='json')
 
+        self.ticket_number = response.data['job_id']
         process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(self.ticket_number)
         process_info = read_file(process_info_path, True)
 
@@ -742,6 +745,7 @@ class TestTransferJobGET(SimpleTestCase):
             "keywords": []},
             **self.headers, format='json')
 
+        self.ticket_number = response.data['job_id']
         self.process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(self.ticket_number)
         self.transfer_job = response.data['transfer_job']
         process_info = read_file(self.process_info_path, True)
@@ -785,6 +789,7 @@ class TestTransferJobGET(SimpleTestCase):
                 "source_resource_id": github_id,
                 "keywords": []}, **self.headers, format='json')
 
+            self.ticket_number = response.data['job_id']
             self.process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(
                 self.ticket_number)
             self.transfer_job = response.data['transfer_job']
@@ -815,6 +820,7 @@ class TestTransferJobGET(SimpleTestCase):
                 "source_resource_id": github_id,
                 "keywords": []}, **self.headers, format='json')
 
+            self.ticket_number = response.data['job_id']
             self.process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(
                 self.ticket_number)
             self.transfer_job = response.data['transfer_job']
@@ -846,8 +852,6 @@ class TestTransferJobPATCH(SimpleTestCase):
         self.client = APIClient()
         self.destination_token = OSF_UPLOAD_TEST_USER_TOKEN
         self.source_token = GITHUB_TEST_USER_TOKEN
-        self.ticket_number = '{}_{}'.format(hash_tokens(
-            self.source_token), hash_tokens(self.destination_token))
         self.headers = {'HTTP_PRESQT_DESTINATION_TOKEN': self.destination_token,
                         'HTTP_PRESQT_SOURCE_TOKEN': self.source_token,
                         'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
@@ -860,11 +864,12 @@ class TestTransferJobPATCH(SimpleTestCase):
         """
         Return a 200 for successful cancelled transfer process.
         """
-        self.client.post(self.url, {
+        response = self.client.post(self.url, {
             "source_target_name": "github",
             "source_resource_id": self.resource_id,
             "keywords": []}, **self.headers, format='json')
 
+        self.ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
 
         # Verify process_info file status is 'in_progress' initially
@@ -901,11 +906,12 @@ class TestTransferJobPATCH(SimpleTestCase):
         """
         Return a 406 for unsuccessful cancel because the transfer finished already.
         """
-        self.client.post(self.url, {
+        response = self.client.post(self.url, {
             "source_target_name": "github",
             "source_resource_id": self.resource_id,
             "keywords": []}, **self.headers, format='json')
 
+        self.ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
 
         # Verify process_info file status is 'in_progress' initially
@@ -941,11 +947,12 @@ class TestTransferJobPATCH(SimpleTestCase):
         """
         Return a 400 if the `presqt-destination-token` is missing in the headers.
         """
-        self.client.post(self.url, {
+        response = self.client.post(self.url, {
             "source_target_name": "github",
             "source_resource_id": self.resource_id,
             "keywords": []},
             **self.headers, format='json')
+        self.ticket_number = response.data['job_id']
 
         url = reverse('job_status', kwargs={'action': 'transfer'})
         headers = {'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore'}
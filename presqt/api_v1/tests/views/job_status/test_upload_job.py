@@ -25,7 +25,6 @@ class TestUploadJobGET(SimpleTestCase):
         self.headers = {'HTTP_PRESQT_DESTINATION_TOKEN': self.token,
                         'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
                         'HTTP_PRESQT_EMAIL_OPT_IN': ''}
-        self.ticket_number = hash_tokens(OSF_UPLOAD_TEST_USER_TOKEN)
 
     def tearDown(self):
         """
@@ -43,13 +42,14 @@ class TestUploadJobGET(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 202)
         self.upload_job = response.data['upload_job']
+        self.ticket_number = response.data['job_id']
         self.process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(
             self.ticket_number)
         process_info = read_file(self.process_info_path, True)
 
         # Verify the upload_job link is what we expect
-        self.assertEqual(self.upload_job, ('http://testserver{}'.format(reverse(
-            'job_status', kwargs={'action': 'upload'}))))
+        self.assertEqual(self.upload_job, ('http://testserver{}?job_id={}'.format(reverse(
+            'job_status', kwargs={'action': 'upload'}), self.ticket_number)))
 
         # Save initial process data that we can use to rewrite to the process_info file for testing
         self.initial_process_info = process_info
@@ -86,7 +86,7 @@ class TestUploadJobGET(SimpleTestCase):
 
         url = reverse('job_status', kwargs={'action': 'upload'})
         response = self.client.get(url, **self.headers)
-        ticket_one = self.ticket_number
+        ticket_numbers = [self.ticket_number]
         # Verify the status code and data
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['message'], 'Upload successful.')
@@ -98,6 +98,7 @@ class TestUploadJobGET(SimpleTestCase):
         self.url = reverse('resource_collection', kwargs={'target_name': 'osf'})
         self.file = 'presqt/api_v1/tests/resources/upload/ProjectBagItToUpload.zip'
         self.call_upload_resources()
+        ticket_numbers.append(self.ticket_number)
 
         url = reverse('job_status', kwargs={'action': 'upload'})
         response = self.client.get(url, **self.headers)
@@ -109,6 +110,7 @@ class TestUploadJobGET(SimpleTestCase):
         self.url = reverse('resource_collection', kwargs={'target_name': 'osf'})
         self.file = 'presqt/api_v1/tests/resources/upload/ProjectBagItToUpload.zip'
         self.call_upload_resources()
+        ticket_numbers.append(self.ticket_number)
 
         url = reverse('job_status', kwargs={'action': 'upload'})
         response = self.client.get(url, **self.headers)
@@ -123,8 +125,9 @@ class TestUploadJobGET(SimpleTestCase):
 
         self.assertEqual(sorted(expected_titles), sorted(titles))
 
-        # Delete corresponding folder
-        shutil.rmtree('mediafiles/jobs/{}'.format(ticket_one))
+        # Delete corresponding folders
+        for ticket_number in ticket_numbers:
+            shutil.rmtree('mediafiles/jobs/{}'.format(ticket_number))
 
         # Ensure no email was sent for this request as no email was provided.
         self.assertEqual(len(mail.outbox), 0)
@@ -219,7 +222,6 @@ class TestUploadJobGET(SimpleTestCase):
         """
         self.url = reverse('resource_collection', kwargs={'target_name': 'osf'})
         self.headers['HTTP_PRESQT_DESTINATION_TOKEN'] = 'bad_token'
-        self.ticket_number = hash_tokens('bad_token')
         self.file = 'presqt/api_v1/tests/resources/upload/ProjectBagItToUpload.zip'
         self.call_upload_resources()
 
@@ -269,6 +271,7 @@ class TestUploadJobGET(SimpleTestCase):
                          "The Resource provided, {}, is not a container".format(file_id))
 
         # Delete corresponding folders
+        shutil.rmtree('mediafiles/jobs/{}'.format(ticket_number))
         shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
 
     def test_get_error_500_403_unauthorized_resource_osf(self):
@@ -532,14 +535,15 @@ class TestUploadJobPATCH(SimpleTestCase):
                         'HTTP_PRESQT_EMAIL_OPT_IN': ''}
         self.upload_url = reverse('resource_collection', kwargs={'target_name': 'osf'})
         self.file = 'presqt/api_v1/tests/resources/upload/ProjectBagItToUpload.zip'
-        self.ticket_number = hash_tokens(self.token)
 
     def test_success_200(self):
         """
         Return a 200 for successful cancelled upload process.
         """
-        self.client.post(self.upload_url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
+        response = self.client.post(self.upload_url, {'presqt-file': open(self.file, 'rb')},
+                                    **self.headers)
 
+        self.ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
         # Verify process_info file status is 'in_progress' initially
         process_info = read_file('{}/process_info.json'.format(ticket_path), True)
@@ -575,8 +579,10 @@ class TestUploadJobPATCH(SimpleTestCase):
         """
         Return a 406 for unsuccessful cancel because the upload finished already.
         """
-        self.client.post(self.upload_url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
+        response = self.client.post(self.upload_url, {'presqt-file': open(self.file, 'rb')},
+                                    **self.headers)
 
+        self.ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
         # Verify process_info file status is 'in_progress' initially
         process_info = read_file('{}/process_info.json'.format(ticket_path), True)
@@ -611,8 +617,10 @@ class TestUploadJobPATCH(SimpleTestCase):
         """
         self.url = reverse('resource_collection', kwargs={'target_name': 'osf'})
         self.file = 'presqt/api_v1/tests/resources/upload/ProjectBagItToUpload.zip'
-        self.client.post(self.upload_url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
+        response = self.client.post(self.upload_url, {'presqt-file': open(self.file, 'rb')},
+                                    **self.headers)
 
+        self.ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
         # Verify process_info file status is 'in_progress' initially
         process_info = read_file('{}/process_info.json'.format(ticket_path), True)
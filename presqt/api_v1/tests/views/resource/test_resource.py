@@ -184,8 +184,9 @@ class TestResourcePOSTWithFile(SimpleTestCase):
         response = self.client.post(url, {'presqt-file': open(good_file, 'rb')}, **self.headers)
         self.assertEqual(response.status_code, 202)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(hash_tokens(self.token))
-        process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(hash_tokens(self.token))
+        ticket_number = response.data['job_id']
+        ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
+        process_info_path = '{}/process_info.json'.format(ticket_path)
         process_info = read_file(process_info_path, True)
         resource_main_dir = '{}/{}'.format(ticket_path, next(os.walk(ticket_path))[1][0])
 
@@ -194,13 +195,13 @@ class TestResourcePOSTWithFile(SimpleTestCase):
 
         # Create bad hashes with the ticket number and run the upload function manually
         file_hashes = {'mediafiles/jobs/{}/BagItToUpload/data/NewProject/funnyfunnyimages/Screen Shot 2019-07-15 at 3.26.49 PM.png'.format(
-            hash_tokens(self.token)): '6d33275234b28d77348e4e1049f58b95a485a7a441684a9eb9175d01c7f141e'}
+            ticket_number): '6d33275234b28d77348e4e1049f58b95a485a7a441684a9eb9175d01c7f141e'}
 
         # Create an instance of the BaseResource and add all of the appropriate class attributes
         # needed for _upload_resource()
         resource_instance = BaseResource()
         resource_instance.resource_main_dir = resource_main_dir
-        resource_instance.ticket_number = hash_tokens(self.token)
+        resource_instance.ticket_number = ticket_number
         resource_instance.process_info_path = process_info_path
         resource_instance.destination_target_name = 'osf'
         resource_instance.action = 'resource_upload'
@@ -231,7 +232,7 @@ class TestResourcePOSTWithFile(SimpleTestCase):
                          '/NewProject/funnyfunnyimages/Screen Shot 2019-07-15 at 3.26.49 PM.png'])
 
         # Delete corresponding folder
-        shutil.rmtree('mediafiles/jobs/{}'.format(hash_tokens(self.token)))
+        shutil.rmtree(ticket_path)
 
     def test_error_400_target_not_supported_test_target(self):
         """
@@ -352,6 +353,46 @@ class TestResourcePOSTWithFile(SimpleTestCase):
         self.assertEqual(response.data, {
                          'error': "PresQT Error: data/fixity_info.json exists in manifest but was not found on filesystem"})
 
+    def test_error_400_bad_delete_after_deliver(self):
+        """
+        Return a 400 if the POST fails because an invalid 'presqt-delete-after-deliver' header
+        was given.
+        """
+        self.headers['HTTP_PRESQT_DELETE_AFTER_DELIVER'] = 'maybe'
+        url = reverse('resource', kwargs={'target_name': 'osf', 'resource_id': 'resource_id'})
+        response = self.client.post(url, {
+            'presqt-file': open('presqt/api_v1/tests/resources/upload/ProjectBagItToUpload.zip', 'rb')}, **self.headers)
+        # Verify the error status code and message
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {
+                         'error': "PresQT Error: 'presqt-delete-after-deliver' must be 'yes' or 'no'."})
+
+    @patch('presqt.api_v1.utilities.utils.disk_usage.PRESQT_USER_DISK_QUOTA', 1)
+    def test_error_507_user_disk_quota(self):
+        """
+        Return a 507 if the POST fails because the upload would put the user over their disk quota.
+        """
+        url = reverse('resource', kwargs={'target_name': 'osf', 'resource_id': 'resource_id'})
+        response = self.client.post(url, {
+            'presqt-file': open('presqt/api_v1/tests/resources/upload/ProjectBagItToUpload.zip', 'rb')}, **self.headers)
+        # Verify the error status code and message
+        self.assertEqual(response.status_code, 507)
+        self.assertEqual(response.data, {
+                         'error': "PresQT Error: This request would exceed the user's disk quota of 1 bytes on the server."})
+
+    @patch('presqt.api_v1.utilities.utils.disk_usage.PRESQT_DISK_RESERVE', 1024 ** 6)
+    def test_error_507_not_enough_disk_space(self):
+        """
+        Return a 507 if the POST fails because the server doesn't have enough free disk space.
+        """
+        url = reverse('resource', kwargs={'target_name': 'osf', 'resource_id': 'resource_id'})
+        response = self.client.post(url, {
+            'presqt-file': open('presqt/api_v1/tests/resources/upload/ProjectBagItToUpload.zip', 'rb')}, **self.headers)
+        # Verify the error status code and message
+        self.assertEqual(response.status_code, 507)
+        self.assertEqual(response.data, {
+                         'error': "PresQT Error: The server does not have enough disk space for this request right now. Please try again later."})
+
 
 class TestResourcePOSTWithBody(SimpleTestCase):
     """
@@ -1,9 +1,12 @@
-from unittest.mock import patch
+import glob
+import os
+from unittest.mock import MagicMock, patch
 
 import requests
 from django.test import SimpleTestCase
 from rest_framework.reverse import reverse
 
+from presqt.api_v1.utilities.utils import target_status
 from presqt.utilities import read_file
 
 
@@ -14,6 +17,16 @@ class TestTargetCollection(SimpleTestCase):
 
     targets = read_file("presqt/specs/targets.json", True)
 
+    def setUp(self):
+        self.cache_path = 'mediafiles/test_target_statuses.json'
+        cache_path = patch.object(target_status, 'STATUS_CACHE_PATH', self.cache_path)
+        cache_path.start()
+        self.addCleanup(cache_path.stop)
+
+    def tearDown(self):
+        for path in glob.glob('{}*'.format(self.cache_path)):
+            os.remove(path)
+
     def test_get_success(self):
         """
         Return a 200 if the GET method is successful
@@ -50,3 +63,41 @@ class TestTargetCollection(SimpleTestCase):
                 self.assertIn("status", item.keys())
                 self.assertIn("detail", item.keys())
                 self.assertEqual(item["status"], "timeout")
+
+    def test_get_cached(self):
+        """
+        Statuses should be served from the cache and only probed again once it's stale.
+        """
+        with patch.object(target_status.requests, 'get',
+                          return_value=MagicMock(status_code=200)) as mock_get:
+            self.client.get(reverse("status_collection"))
+            self.assertEqual(mock_get.call_count, len(self.targets))
+
+            response = self.client.get(reverse("status_collection"))
+            self.assertEqual(mock_get.call_count, len(self.targets))
+
+        item = response.data[0]
+        self.assertEqual(item["status"], "ok")
+        self.assertIn("checked_at", item.keys())
+        self.assertIn("latency_ms", item.keys())
+        self.assertEqual(set(item["latency_percentiles_ms"].keys()), {"p50", "p95", "p99"})
+        self.assertEqual(item["availability"]["probes"], 1)
+        self.assertEqual(item["availability"]["ratio"], 1)
+
+    def test_get_rolling_availability(self):
+        """
+        Availability should cover each target's recent probes.
+        """
+        with patch.object(target_status.requests, 'get',
+                          return_value=MagicMock(status_code=200)):
+            target_status.refresh_target_statuses()
+        with patch.object(target_status.requests, 'get', side_effect=requests.ReadTimeout()):
+            target_status.refresh_target_statuses()
+
+        with patch.object(target_status, 'PRESQT_STATUS_CACHE_TTL', 3600):
+            response = self.client.get(reverse("status_collection"))
+
+        for item in response.data:
+            self.assertEqual(item["status"], "timeout")
+            self.assertEqual(item["availability"]["probes"], 2)
+            self.assertEqual(item["availability"]["ratio"], 0.5)
@@ -1,14 +1,18 @@
 from django.urls import path
 
+from presqt.api_v1.views.admin.job_profile import JobProfileCollection, JobProfile
+from presqt.api_v1.views.job_status.job_collection import JobCollection
 from presqt.api_v1.views.job_status.job_status import JobStatus
 from presqt.api_v1.views.bag_and_zip.bag_and_zip import BagAndZip
 from presqt.api_v1.views.service.fairshare.evaluator import FairshareEvaluator
 from presqt.api_v1.views.service.fairshake.assessment import FairshakeAssessment
+from presqt.api_v1.views.service.fairshake.bulk_assessment import FairshakeBulkAssessment
 from presqt.api_v1.views.service.keywords.keyword_enhancement import KeywordEnhancement
 from presqt.api_v1.views.status.status import StatusCollection
 from presqt.api_v1 import api_root
 from presqt.api_v1.views.resource.resource import Resource
 from presqt.api_v1.views.resource.resource_keywords import ResourceKeywords
+from presqt.api_v1.views.resource.bulk_keywords import BulkResourceKeywords
 from presqt.api_v1.views.resource.resource_collection import ResourceCollection
 from presqt.api_v1.views.service.eaasi.proposal import Proposals, Proposal
 from presqt.api_v1.views.target.target import TargetCollection, Target
@@ -34,6 +38,8 @@ api_v1_endpoints = [
          Resource.as_view(), name="resource"),
     path('targets/<str:target_name>/resources/<str:resource_id>/keywords/',
          ResourceKeywords.as_view(), name="keywords"),
+    path('targets/<str:target_name>/keywords/',
+         BulkResourceKeywords.as_view(), name="bulk_keywords"),
 
     # Services
     path('services/', ServiceCollection.as_view(), name='service_collection'),
@@ -51,6 +57,12 @@ api_v1_endpoints = [
     # Job Status
     path('job_status/<str:action>.<str:response_format>/', JobStatus.as_view(), name='job_status'),
     path('job_status/<str:action>/', JobStatus.as_view(), name='job_status'),
+    path('jobs/', JobCollection.as_view(), name='job_collection'),
+
+    # Admin
+    path('admin/profiles/', JobProfileCollection.as_view(), name='job_profile_collection'),
+    path('admin/jobs/<str:ticket_number>/profiles/<str:action>/', JobProfile.as_view(),
+         name='job_profile'),
 
     # FAIRshare Evaluator
     path('services/fairshare/evaluator/', FairshareEvaluator.as_view(), name='fairshare'),
@@ -58,6 +70,8 @@ api_v1_endpoints = [
     # FAIRshake Assessment
     path('services/fairshake/rubric/<str:rubric_id>/', FairshakeAssessment.as_view(),
          name="fairshake"),
+    path('services/fairshake/assessments/', FairshakeBulkAssessment.as_view(),
+         name="fairshake_bulk"),
 
     # Keyword Enhancement
     path('services/presqt/keyword_enhancement/', KeywordEnhancement.as_view(), name="keyword_enhancement"),
@@ -5,12 +5,16 @@ from presqt.api_v1.utilities.metadata.download_metadata import create_download_m
 from presqt.api_v1.utilities.metadata.upload_metadata import create_upload_metadata, \
     get_upload_source_metadata
 from presqt.api_v1.utilities.multiprocess.spawn_action_process import spawn_action_process
+from presqt.api_v1.utilities.multiprocess.kill_job_process import (kill_job_process,
+                                                                 stop_job_process)
+from presqt.api_v1.utilities.multiprocess.resume_job import resume_job
 from presqt.api_v1.utilities.utils.get_action_message import get_action_message
 from presqt.api_v1.utilities.utils.get_target_data import get_target_data
 from presqt.api_v1.utilities.utils.function_router import FunctionRouter
 from presqt.api_v1.utilities.utils.target_actions import (
     action_checker, link_builder)
 from presqt.api_v1.utilities.metadata.create_fts_metadata import create_fts_metadata
+from presqt.api_v1.utilities.metadata.fts_metadata_builder import FTSMetadataBuilder
 from presqt.api_v1.utilities.validation.file_duplicate_action_validation import \
     file_duplicate_action_validation
 from presqt.api_v1.utilities.validation.process_token_validation import process_token_validation
@@ -20,12 +24,20 @@ from presqt.api_v1.utilities.validation.get_process_info_data import get_process
 from presqt.api_v1.utilities.validation.token_validation import (get_source_token,
                                                                  get_destination_token)
 from presqt.api_v1.utilities.validation.email_validation import get_user_email_opt
+from presqt.api_v1.utilities.validation.delete_after_deliver_validation import \
+    get_delete_after_deliver_opt
+from presqt.api_v1.utilities.validation.profile_validation import get_profile_opt
+from presqt.api_v1.utilities.validation.admin_token_validation import admin_token_validation
 from presqt.api_v1.utilities.validation.transfer_post_body_validation import \
     transfer_post_body_validation
 from presqt.api_v1.utilities.utils.hash_tokens import hash_tokens
 from presqt.api_v1.utilities.depth_helpers.finite_depth_upload import finite_depth_upload_helper
 from presqt.api_v1.utilities.validation.structure_validation import structure_validation
 from presqt.api_v1.utilities.validation.query_validator import query_validator
+from presqt.api_v1.utilities.keyword_enhancement.scigraph_terms import get_scigraph_terms
+from presqt.api_v1.utilities.keyword_enhancement.local_vocabulary import get_local_terms
+from presqt.api_v1.utilities.keyword_enhancement.enhancer_backend import (
+    get_enhancer_terms, get_keyword_enhancer)
 from presqt.api_v1.utilities.utils.keyword_enhancer import keyword_enhancer
 from presqt.api_v1.utilities.validation.keyword_action_validation import keyword_action_validation
 from presqt.api_v1.utilities.keyword_enhancement.automatic_keywords import automatic_keywords
@@ -35,11 +47,26 @@ from presqt.api_v1.utilities.validation.get_keyword_support import get_keyword_s
 from presqt.api_v1.utilities.utils.page_links import page_links
 from presqt.api_v1.utilities.utils.update_or_create_process_info import update_or_create_process_info
 from presqt.api_v1.utilities.utils.calculate_job_percentage import calculate_job_percentage
+from presqt.api_v1.utilities.utils.disk_usage import (get_directory_size, disk_space_admission,
+                                                      wait_for_disk_space,
+                                                      update_disk_reservation)
+from presqt.api_v1.utilities.utils.job_index import (new_job_id, index_job, find_job,
+                                                     get_user_jobs, get_job_users,
+                                                     claim_job_slot, remove_indexed_job,
+                                                     add_job_user, ANONYMOUS_OWNER)
 from presqt.api_v1.utilities.validation.get_process_info_action import get_process_info_action
 from presqt.api_v1.utilities.validation.keyword_post_validation import keyword_post_validation
 from presqt.api_v1.utilities.keyword_enhancement.fetch_ontologies import fetch_ontologies
 from presqt.api_v1.utilities.service_helpers.fairshare_results import fairshare_results
+from presqt.api_v1.utilities.service_helpers.fairshare_evaluation import (
+    fairshare_evaluation, get_cached_fairshare_evaluation, FairshareEvaluationJob)
+from presqt.api_v1.utilities.service_helpers.fairshake_client import (
+    fairshake_assessment, fairshake_rubric_answers, fairshake_bulk_assessment)
 from presqt.api_v1.utilities.validation.fairshare_validation import fairshare_request_validator, fairshare_test_validator
 from presqt.api_v1.utilities.validation.fairshare_evaluator_validation import fairshare_evaluator_validation
 from presqt.api_v1.utilities.validation.fairshake_request_validator import fairshake_request_validator
 from presqt.api_v1.utilities.validation.fairshake_assessment_validator import fairshake_assessment_validator
+from presqt.api_v1.utilities.validation.fairshake_bulk_validator import fairshake_bulk_validator
+from presqt.api_v1.utilities.utils.target_status import get_target_statuses
+from presqt.api_v1.utilities.validation.bulk_keywords_validation import bulk_keywords_validation
+from presqt.api_v1.utilities.keyword_enhancement.bulk_keywords import BulkKeywordsJob
@@ -0,0 +1,61 @@
+def compare_to_baseline(results, baseline, tolerance=0.2, min_seconds=0.05,
+                        min_bytes=1024 ** 2):
+    """
+    Find the regressions in benchmark results compared to a baseline run. Scenarios that aren't
+    in the baseline are skipped.
+
+    Times, peak memory and bytes written regress when they grow by more than the tolerance. Small
+    changes are noise, so times must also grow by min_seconds and bytes by min_bytes. Request
+    counts don't depend on the machine, so any extra request is a regression.
+
+    Parameters
+    ----------
+    results : list
+        The scenario results of the new run.
+    baseline : list
+        The scenario results of the baseline run.
+    tolerance : float
+        Fraction a measurement may grow by before it's a regression.
+    min_seconds : float
+        Number of seconds a time must grow by before it's a regression.
+    min_bytes : int
+        Number of bytes a byte count must grow by before it's a regression.
+
+    Returns
+    -------
+    A list of messages describing each regression.
+    """
+    baseline_results = {result['name']: result for result in baseline}
+    regressions = []
+
+    def check(name, measurement, old, new, minimum_change):
+        if old is not None and new is not None and new > old * (1 + tolerance) \
+                and new - old >= minimum_change:
+            regressions.append('{}: {} went from {} to {}'.format(name, measurement, old, new))
+
+    for result in results:
+        name = result['name']
+        old_result = baseline_results.get(name)
+        if not old_result:
+            continue
+
+        if old_result['status'] == 'finished' and result['status'] != 'finished':
+            regressions.append('{}: the job {} instead of finishing'.format(
+                name, result['status']))
+            continue
+
+        check(name, 'wall_time', old_result.get('wall_time'), result.get('wall_time'),
+              min_seconds)
+        for phase, seconds in result.get('phases', {}).items():
+            check(name, '{} phase'.format(phase), old_result.get('phases', {}).get(phase),
+                  seconds, min_seconds)
+        check(name, 'peak_rss', old_result.get('peak_rss'), result.get('peak_rss'), min_bytes)
+        check(name, 'bytes_written', old_result.get('bytes_written'),
+              result.get('bytes_written'), min_bytes)
+
+        old_requests = old_result.get('http_requests', {})
+        for target, count in result.get('http_requests', {}).items():
+            if count > old_requests.get(target, 0):
+                regressions.append('{}: {} requests went from {} to {}'.format(
+                    name, target, old_requests.get(target, 0), count))
+    return regressions
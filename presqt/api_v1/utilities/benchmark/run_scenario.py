@@ -0,0 +1,240 @@
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+import bagit
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from config.settings.base import MEDIA_ROOT
+from presqt.targets.utilities import install_target_url_override
+from presqt.targets.utilities.mock_targets import MockTargetsServer
+from presqt.targets.utilities.mock_targets.dataset import PROJECT_ID_FORMATS
+from presqt.utilities import PresQTError, read_file, zip_directory
+
+# The name of the project each upload scenario creates
+UPLOAD_PROJECT_NAME = 'Bench Upload'
+# The rusage block counts are in units of 512 bytes
+BLOCK_SIZE = 512
+
+
+def run_scenario(scenario, timeout=600):
+    """
+    Run a benchmark scenario in its own process, so its peak memory isn't mixed up with the
+    scenarios run before it.
+
+    Parameters
+    ----------
+    scenario : dict
+        The scenario to run. See validate_scenarios.
+    timeout : int
+        Number of seconds to wait for the job to finish.
+
+    Returns
+    -------
+    The scenario's measurements.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_run_scenario_process,
+                                      args=(scenario, timeout, sender))
+    process.start()
+    # Only the scenario process writes to the pipe, so reading ends if it dies
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = {'name': scenario['name'], 'status': 'crashed'}
+    process.join()
+    return result
+
+
+def _run_scenario_process(scenario, timeout, sender):
+    try:
+        result = measure_scenario(scenario, timeout)
+    except Exception as e:
+        result = {'name': scenario['name'], 'status': 'error', 'error': str(e)}
+    sender.send(result)
+    sender.close()
+
+
+def measure_scenario(scenario, timeout=600):
+    """
+    Start a job through the PresQT API against the mock targets, wait for it to finish and
+    measure it. The job's process is forked from this one, so this should run in a process of
+    its own to get the job's peak memory.
+
+    Parameters
+    ----------
+    scenario : dict
+        The scenario to run. See validate_scenarios.
+    timeout : int
+        Number of seconds to wait for the job to finish.
+
+    Returns
+    -------
+    The scenario's measurements.
+    """
+    # The mock targets accept any token, but each scenario gets its own job directory
+    token = 'bench-{}'.format(scenario['name'])
+    shape = dict({'projects': 1}, **scenario.get('shape', {}))
+
+    with MockTargetsServer(shape, scenario.get('latency', 0)) as server, \
+            tempfile.TemporaryDirectory() as directory:
+        install_target_url_override(server.url)
+        zip_path = None
+        if scenario['action'] == 'upload':
+            zip_path = build_upload_zip(server.dataset, scenario['target'], directory)
+
+        usage_before = _get_usage()
+        start = time.monotonic()
+        ticket_number, action = _start_job(scenario, token, zip_path)
+        process_info_path = os.path.join(MEDIA_ROOT, 'jobs', ticket_number, 'process_info.json')
+        process_info = _wait_for_job(process_info_path, action, timeout)
+        wall_time = time.monotonic() - start
+
+        # Let the job and its watchdog exit so their resource usage is counted
+        for child in multiprocessing.active_children():
+            if process_info['status'] == 'timed_out':
+                child.terminate()
+            child.join()
+        usage_after = _get_usage()
+        request_counts = server.request_counts
+
+    shutil.rmtree(os.path.join(MEDIA_ROOT, 'jobs', ticket_number), ignore_errors=True)
+
+    spans = process_info.get('spans', {})
+    return {
+        'name': scenario['name'],
+        'action': scenario['action'],
+        'target': scenario['target'],
+        'destination': scenario.get('destination'),
+        'shape': shape,
+        'latency': scenario.get('latency', 0),
+        'status': process_info['status'],
+        'message': process_info.get('message'),
+        'files': process_info.get('download_total_files') or process_info.get(
+            'upload_total_files', 0),
+        'wall_time': round(wall_time, 4),
+        'peak_rss': usage_after['peak_rss'],
+        'bytes_read': usage_after['bytes_read'] - usage_before['bytes_read'],
+        'bytes_written': usage_after['bytes_written'] - usage_before['bytes_written'],
+        'http_requests': request_counts,
+        'phases': {name: span['seconds'] for name, span in spans.items()},
+        'spans': spans
+    }
+
+
+def build_upload_zip(dataset, target, directory):
+    """
+    Make a zipped bag of the first project of a mock target to upload.
+
+    Parameters
+    ----------
+    dataset : MockDataset
+        The mock targets' dataset.
+    target : str
+        The target whose project is bagged.
+    directory : str
+        Directory to write the bag and the zip file in.
+
+    Returns
+    -------
+    The path to the zip file.
+    """
+    project = dataset.get_project(target, PROJECT_ID_FORMATS[target](1))
+    bag_directory = os.path.join(directory, 'BenchUpload')
+    for file in project.walk():
+        file_path = os.path.join(bag_directory, UPLOAD_PROJECT_NAME, file.path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as upload_file:
+            upload_file.write(file.contents)
+
+    bagit.make_bag(bag_directory, checksums=['md5', 'sha1', 'sha256', 'sha512'])
+    zip_path = os.path.join(directory, 'BenchUpload.zip')
+    zip_directory(bag_directory, zip_path, directory)
+    return zip_path
+
+
+def _start_job(scenario, token, zip_path):
+    """
+    Start the scenario's job through the API.
+
+    Returns
+    -------
+    The job's ticket number and the action it's saved under in process_info.json.
+    """
+    client = APIClient()
+    target = scenario['target']
+    project_id = str(PROJECT_ID_FORMATS[target](1))
+
+    if scenario['action'] == 'download':
+        url = reverse('resource', kwargs={'target_name': target, 'resource_id': project_id,
+                                          'resource_format': 'zip'})
+        response = client.get(url, HTTP_PRESQT_SOURCE_TOKEN=token, HTTP_PRESQT_EMAIL_OPT_IN='')
+        action = 'resource_download'
+    elif scenario['action'] == 'upload':
+        url = reverse('resource_collection', kwargs={'target_name': target})
+        with open(zip_path, 'rb') as zip_file:
+            response = client.post(url, {'presqt-file': zip_file},
+                                   HTTP_PRESQT_DESTINATION_TOKEN=token,
+                                   HTTP_PRESQT_FILE_DUPLICATE_ACTION='ignore',
+                                   HTTP_PRESQT_EMAIL_OPT_IN='')
+        action = 'resource_upload'
+    else:
+        url = reverse('resource_collection', kwargs={'target_name': scenario['destination']})
+        response = client.post(url, {'source_target_name': target,
+                                     'source_resource_id': project_id,
+                                     'keywords': []},
+                               format='json',
+                               HTTP_PRESQT_SOURCE_TOKEN=token,
+                               HTTP_PRESQT_DESTINATION_TOKEN=token,
+                               HTTP_PRESQT_FILE_DUPLICATE_ACTION='ignore',
+                               HTTP_PRESQT_KEYWORD_ACTION='none',
+                               HTTP_PRESQT_EMAIL_OPT_IN='',
+                               HTTP_PRESQT_FAIRSHARE_EVALUATOR_OPT_IN='no')
+        action = 'resource_transfer_in'
+
+    if response.status_code != 202:
+        raise PresQTError('The {} job was not started: {}'.format(
+            scenario['action'], response.data))
+    return response.data['job_id'], action
+
+
+def _wait_for_job(process_info_path, action, timeout):
+    """
+    Wait for a job to stop being in progress.
+
+    Returns
+    -------
+    The job's process info.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            process_info = read_file(process_info_path, True)[action]
+        except json.decoder.JSONDecodeError:
+            # The job is writing to the file
+            process_info = {'status': 'in_progress'}
+        if process_info['status'] != 'in_progress':
+            return process_info
+        if time.monotonic() > deadline:
+            return dict(process_info, status='timed_out')
+        time.sleep(0.01)
+
+
+def _get_usage():
+    """
+    Get the peak memory and block I/O of this process and its finished children, in bytes.
+    """
+    own_usage = resource.getrusage(resource.RUSAGE_SELF)
+    children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss': max(own_usage.ru_maxrss, children_usage.ru_maxrss) * 1024,
+        'bytes_read': (own_usage.ru_inblock + children_usage.ru_inblock) * BLOCK_SIZE,
+        'bytes_written': (own_usage.ru_oublock + children_usage.ru_oublock) * BLOCK_SIZE
+    }
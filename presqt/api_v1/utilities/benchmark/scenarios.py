@@ -0,0 +1,69 @@
+from presqt.targets.utilities.mock_targets.dataset import MOCK_TARGETS
+from presqt.utilities import PresQTValidationError
+
+BENCHMARK_ACTIONS = ['download', 'upload', 'transfer']
+
+# Scenarios run by `manage.py bench` when no scenario file is given. 'shape' is the shape of
+# the dataset the mock targets are filled with, see DEFAULT_DATASET_SHAPE.
+DEFAULT_SCENARIOS = [
+    {'name': 'download-osf', 'action': 'download', 'target': 'osf',
+     'shape': {'depth': 2, 'folders': 2, 'files': 5, 'file_size': 4096}},
+    {'name': 'download-github-many-small-files', 'action': 'download', 'target': 'github',
+     'shape': {'depth': 1, 'folders': 4, 'files': 50, 'file_size': 512}},
+    {'name': 'download-gitlab-deep-tree', 'action': 'download', 'target': 'gitlab',
+     'shape': {'depth': 6, 'folders': 2, 'files': 1, 'file_size': 1024}},
+    {'name': 'download-zenodo-large-files', 'action': 'download', 'target': 'zenodo',
+     'shape': {'depth': 0, 'files': 4, 'file_size': [1024 ** 2, 8 * 1024 ** 2]}},
+    {'name': 'download-figshare-mixed-sizes', 'action': 'download', 'target': 'figshare',
+     'shape': {'depth': 1, 'folders': 3, 'files': 10, 'file_size': [512, 512, 64 * 1024]}},
+    {'name': 'download-curate_nd', 'action': 'download', 'target': 'curate_nd',
+     'shape': {'depth': 1, 'folders': 2, 'files': 5, 'file_size': 4096}},
+    {'name': 'upload-osf', 'action': 'upload', 'target': 'osf',
+     'shape': {'depth': 2, 'folders': 2, 'files': 5, 'file_size': 4096}},
+    {'name': 'upload-github', 'action': 'upload', 'target': 'github',
+     'shape': {'depth': 2, 'folders': 2, 'files': 5, 'file_size': 4096}},
+    {'name': 'upload-zenodo', 'action': 'upload', 'target': 'zenodo',
+     'shape': {'depth': 1, 'folders': 2, 'files': 5, 'file_size': 4096}},
+    {'name': 'transfer-github-to-osf', 'action': 'transfer', 'target': 'github',
+     'destination': 'osf', 'shape': {'depth': 2, 'folders': 2, 'files': 5, 'file_size': 4096}},
+    {'name': 'transfer-gitlab-to-zenodo', 'action': 'transfer', 'target': 'gitlab',
+     'destination': 'zenodo',
+     'shape': {'depth': 1, 'folders': 2, 'files': 5, 'file_size': 4096}},
+    {'name': 'transfer-osf-to-gitlab-with-latency', 'action': 'transfer', 'target': 'osf',
+     'destination': 'gitlab', 'latency': 0.02,
+     'shape': {'depth': 1, 'folders': 2, 'files': 5, 'file_size': 4096}}
+]
+
+
+def validate_scenarios(scenarios):
+    """
+    Check that benchmark scenarios can be run.
+
+    Parameters
+    ----------
+    scenarios : list
+        Scenario dictionaries with a 'name', an 'action' of 'download', 'upload' or 'transfer',
+        the 'target' to download from or upload to and, for transfers, the 'destination'
+        target. 'shape' and 'latency' are optional.
+    """
+    names = set()
+    for scenario in scenarios:
+        name = scenario.get('name')
+        if not name or name in names:
+            raise PresQTValidationError(
+                'Each scenario needs a unique name, {} is not.'.format(name), 400)
+        names.add(name)
+
+        if scenario.get('action') not in BENCHMARK_ACTIONS:
+            raise PresQTValidationError(
+                "Scenario '{}' has an action that isn't one of {}.".format(
+                    name, ', '.join(BENCHMARK_ACTIONS)), 400)
+
+        targets = [scenario.get('target')]
+        if scenario['action'] == 'transfer':
+            targets.append(scenario.get('destination'))
+        for target in targets:
+            if target not in MOCK_TARGETS:
+                raise PresQTValidationError(
+                    "Scenario '{}' uses '{}', which isn't one of the mock targets.".format(
+                        name, target), 400)
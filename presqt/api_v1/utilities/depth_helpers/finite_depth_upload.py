@@ -5,6 +5,9 @@ from uuid import uuid4
 from django.utils import timezone
 
 from presqt.api_v1.utilities import create_fts_metadata, get_target_data, hash_generator
+from presqt.api_v1.utilities.metadata.fts_metadata_builder import FTSMetadataBuilder
+from presqt.api_v1.utilities.depth_helpers.zipped_bag import (get_zipped_bag_contents,
+                                                             rewrite_zipped_bag)
 from presqt.utilities import zip_directory, write_file, read_file
 
 
@@ -19,7 +22,10 @@ def finite_depth_upload_helper(instance):
         Class we want to add the attributes to
     """
     # Get information about the data directory
-    os_path, folders, files = next(os.walk(instance.data_directory))
+    if instance.zipped_bag:
+        folders, files = get_zipped_bag_contents(instance.zipped_bag)
+    else:
+        os_path, folders, files = next(os.walk(instance.data_directory))
 
     # Make a directory to store the zipped items
     zip_format_path = os.path.join(instance.ticket_path, 'zip_format')
@@ -39,13 +45,21 @@ def finite_depth_upload_helper(instance):
         zip_path = '/{}'.format(zip_title)
         project_zip_path = zip_format_path
 
-    # Write the metadata file into the data directory of the bag
-    update_bagit_with_metadata(instance, zip_title)
-
-    # Zip the file and store it in the created `zip_format/<title>` directory
-    zip_directory(instance.resource_main_dir,
-                  '{}/{}'.format(project_zip_path, zip_title),
-                  instance.resource_main_dir)
+    if instance.zipped_bag:
+        # The uploaded bag was never extracted so copy it straight into the new zip file,
+        # adding the metadata file on the way.
+        rewrite_zipped_bag(instance.zipped_bag, '{}/{}'.format(project_zip_path, zip_title),
+                           create_zip_fts_metadata(instance, zip_title))
+        # From here on the upload works off of the zip file on disk
+        instance.zipped_bag = None
+    else:
+        # Write the metadata file into the data directory of the bag
+        update_bagit_with_metadata(instance, zip_title)
+
+        # Zip the file and store it in the created `zip_format/<title>` directory
+        zip_directory(instance.resource_main_dir,
+                      '{}/{}'.format(project_zip_path, zip_title),
+                      instance.resource_main_dir)
 
     # Since the metadata belonging with the files gets written inside of the zip,
     # Reset the metadata to associate with the zip file actually being uploaded
@@ -64,7 +78,8 @@ def finite_depth_upload_helper(instance):
     instance.file_hashes = {'{}/{}'.format(project_zip_path, zip_title): zip_hash}
 
     instance.source_fts_metadata_actions = []
-    instance.new_fts_metadata_files = [{
+    instance.fts_metadata_builder = FTSMetadataBuilder()
+    instance.fts_metadata_builder.add_file({
         'title': zip_title,
         'sourcePath': '/{}'.format(zip_title),
         'destinationPath': zip_path,
@@ -72,7 +87,7 @@ def finite_depth_upload_helper(instance):
         'destinationHashes': {},
         'failedFixityInfo': [],
         'extra': {}
-    }]
+    })
 
     instance.action_metadata = {
         'id': str(uuid4()),
@@ -85,7 +100,7 @@ def finite_depth_upload_helper(instance):
         'destinationUsername': None,
         'keywords': instance.action_metadata['keywords'],
         'files': {
-            'created': instance.new_fts_metadata_files,
+            'created': instance.fts_metadata_builder.files,
             'updated': [],
             'ignored': []
         }
@@ -106,18 +121,37 @@ def update_bagit_with_metadata(instance, zip_title):
     zip_title: str
         Title of the zipped resource
     """
-    for action_metadata in instance.action_metadata['files']['created']:
-        root_path = action_metadata['destinationPath']
-        action_metadata['destinationPath'] = '/{}/data{}'.format(
-            zip_title, root_path)
-    instance.action_metadata['destinationTargetName'] = 'Zip File'
-
-    final_fts_metadata_data = create_fts_metadata(instance.all_keywords,
-                                                  instance.action_metadata,
-                                                  instance.source_fts_metadata_actions,
-                                                  instance.extra_metadata)
+    final_fts_metadata_data = create_zip_fts_metadata(instance, zip_title)
     write_file(os.path.join(instance.data_directory, 'PRESQT_FTS_METADATA.json'),
                final_fts_metadata_data, True)
 
     # Update the bag
-    instance.bag.save(manifests=True)
\ No newline at end of file
+    instance.bag.save(manifests=True)
+
+
+def create_zip_fts_metadata(instance, zip_title):
+    """
+    Point the action's file metadata at the zip file and build the FTS metadata that gets
+    written inside of it.
+
+    Parameters
+    ----------
+    instance : BaseResource class instance
+        Class we want to add the attributes to
+    zip_title: str
+        Title of the zipped resource
+
+    Returns
+    -------
+    The FTS metadata dictionary.
+    """
+    instance.fts_metadata_builder.move_files(
+        [(action_metadata['destinationPath'],
+          '/{}/data{}'.format(zip_title, action_metadata['destinationPath']))
+         for action_metadata in instance.action_metadata['files']['created']])
+    instance.action_metadata['destinationTargetName'] = 'Zip File'
+
+    return create_fts_metadata(instance.all_keywords,
+                               instance.action_metadata,
+                               instance.source_fts_metadata_actions,
+                               instance.extra_metadata)
\ No newline at end of file
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import zipfile
+
+import bagit
+
+from presqt.api_v1.utilities.validation.bagit_validation import encode_manifest_path
+
+
+def save_uploaded_zip(uploaded_file, ticket_path):
+    """
+    Save the zip file provided in an upload request to the job's directory. If Django already
+    streamed the file to disk then hard link it instead of copying it.
+
+    Parameters
+    ----------
+    uploaded_file : django.core.files.uploadedfile.UploadedFile
+        The 'presqt-file' provided in the request.
+    ticket_path : str
+        Path to the job's directory.
+
+    Returns
+    -------
+    Path to the saved zip file.
+    """
+    os.makedirs(ticket_path, exist_ok=True)
+    zip_path = os.path.join(ticket_path, 'presqt_upload.zip')
+    if os.path.exists(zip_path):
+        os.remove(zip_path)
+
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        try:
+            os.link(uploaded_file.temporary_file_path(), zip_path)
+            return zip_path
+        except OSError:
+            # The temporary upload lives on a different file system
+            pass
+
+    uploaded_file.seek(0)
+    with open(zip_path, 'wb') as zip_file:
+        for chunk in uploaded_file.chunks():
+            zip_file.write(chunk)
+    return zip_path
+
+
+def get_zipped_bag_contents(zipped_bag):
+    """
+    Get the folders and files found at the top level of a zipped bag's data directory.
+    Mirrors the output of next(os.walk(data_directory)) for an extracted bag.
+
+    Parameters
+    ----------
+    zipped_bag : dict
+        Zipped bag dictionary returned by validate_zipped_bag
+
+    Returns
+    -------
+    Tuple of the top level folder names and file names.
+    """
+    folders = []
+    files = []
+    for path in list(zipped_bag['payload'].keys()) + zipped_bag['payload_directories']:
+        top_level, separator, rest = path[len('data/'):].partition('/')
+        if not top_level:
+            continue
+        if separator:
+            if top_level not in folders:
+                folders.append(top_level)
+        elif top_level not in files:
+            files.append(top_level)
+    return folders, files
+
+
+def rewrite_zipped_bag(zipped_bag, destination_path, fts_metadata_data):
+    """
+    Copy a zipped bag into a new zip file with the bag's root directory stripped and the PresQT
+    FTS metadata file added to its data directory. Payload members are streamed from one archive
+    to the other so nothing is extracted to disk. Manifests are rebuilt from the hashes gathered
+    during validation rather than by hashing the payload again.
+
+    Parameters
+    ----------
+    zipped_bag : dict
+        Zipped bag dictionary returned by validate_zipped_bag
+    destination_path : str
+        Path to save the new zip file
+    fts_metadata_data : dict
+        FTS metadata to write to 'data/PRESQT_FTS_METADATA.json'
+    """
+    bag_prefix = zipped_bag['bag_prefix']
+    removed = zipped_bag.get('removed', [])
+    renamed = zipped_bag.get('renamed', {})
+
+    metadata_path = 'data/PRESQT_FTS_METADATA.json'
+    metadata_contents = json.dumps(fts_metadata_data, indent=4).encode('utf-8')
+    payload = dict(zipped_bag['payload'])
+    payload[metadata_path] = {algorithm: hashlib.new(algorithm, metadata_contents).hexdigest()
+                              for algorithm in zipped_bag['algorithms']}
+
+    # Tag files are small so we keep their contents around to build the tag manifests.
+    # Start with the rebuilt payload manifests.
+    tag_files = {}
+    for algorithm in zipped_bag['algorithms']:
+        tag_files['manifest-{}.txt'.format(algorithm)] = build_manifest(
+            {path: hashes[algorithm] for path, hashes in payload.items()})
+    tag_manifest_algorithms = []
+
+    with zipfile.ZipFile(zipped_bag['zip_path']) as source_zip, \
+            zipfile.ZipFile(destination_path, 'w') as destination_zip:
+        for member in source_zip.infolist():
+            if not member.filename.startswith(bag_prefix) or member.filename == bag_prefix:
+                continue
+            name = member.filename[len(bag_prefix):]
+
+            if name.startswith('data/'):
+                if name in removed:
+                    continue
+                name = renamed.get(name, name)
+                if member.is_dir():
+                    destination_zip.writestr(name, '')
+                else:
+                    with source_zip.open(member) as source_file, \
+                            destination_zip.open(name, 'w', force_zip64=True) as destination_file:
+                        shutil.copyfileobj(source_file, destination_file, bagit.HASH_BLOCK_SIZE)
+            elif re.match(r'^tagmanifest-(.+)\.txt$', name):
+                tag_manifest_algorithms.append(re.match(r'^tagmanifest-(.+)\.txt$', name).group(1))
+            elif name == 'bag-info.txt':
+                # Update the Payload-Oxum like bagit.Bag.save() would
+                total_bytes = len(metadata_contents) + sum(
+                    info.file_size for info in source_zip.infolist()
+                    if renamed.get(info.filename[len(bag_prefix):],
+                                   info.filename[len(bag_prefix):]) in payload)
+                tag_files[name] = re.sub(
+                    r'^Payload-Oxum:.*$', 'Payload-Oxum: {}.{}'.format(total_bytes, len(payload)),
+                    source_zip.read(member).decode('utf-8'), flags=re.MULTILINE).encode('utf-8')
+            elif name not in tag_files and not member.is_dir():
+                tag_files[name] = source_zip.read(member)
+
+        destination_zip.writestr(metadata_path, metadata_contents)
+        for name, contents in tag_files.items():
+            destination_zip.writestr(name, contents)
+        for algorithm in tag_manifest_algorithms:
+            destination_zip.writestr('tagmanifest-{}.txt'.format(algorithm), build_manifest(
+                {name: hashlib.new(algorithm, contents).hexdigest()
+                 for name, contents in tag_files.items()}))
+
+
+def build_manifest(path_hashes):
+    """
+    Build the contents of a BagIt manifest. Payload and tag manifests both separate each hash
+    from its path with two spaces, like bagit.Bag.save() does for payload manifests.
+
+    Parameters
+    ----------
+    path_hashes : dict
+        Dictionary of paths, relative to the bag root, and their hashes.
+
+    Returns
+    -------
+    The manifest's contents as bytes.
+    """
+    return ''.join(['{}  {}\n'.format(path_hash, encode_manifest_path(path))
+                    for path, path_hash in sorted(path_hashes.items())]).encode('utf-8')
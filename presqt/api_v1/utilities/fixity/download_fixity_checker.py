@@ -1,5 +1,7 @@
 import hashlib
 
+import bagit
+
 from presqt.api_v1.utilities.fixity.hash_generator import hash_generator
 
 def download_fixity_checker(resource_dict):
@@ -32,7 +34,7 @@ def download_fixity_checker(resource_dict):
         # then this is the hash we will run our fixity checker against.
         if hash_value and hash_algorithm in hashlib.algorithms_available:
             # Run the file through the hash algorithm
-            hash_hex = hash_generator(resource_dict['file'], hash_algorithm)
+            hash_hex = resource_hash_generator(resource_dict, hash_algorithm)
 
             fixity_obj['hash_algorithm'] = hash_algorithm
             fixity_obj['presqt_hash'] = hash_hex
@@ -52,8 +54,7 @@ def download_fixity_checker(resource_dict):
         # If either there is no matching algorithms in hashlib or the provided hashes
         # don't have values then we assume fixity has remained and we calculate a new hash
         # using md5 to give to the user.
-        h = hashlib.md5(resource_dict['file'])
-        hash_hex = h.hexdigest()
+        hash_hex = resource_hash_generator(resource_dict, 'md5')
         fixity_obj['hash_algorithm'] = 'md5'
         fixity_obj['presqt_hash'] = hash_hex
         fixity_obj['fixity_details'] = (
@@ -61,3 +62,29 @@ def download_fixity_checker(resource_dict):
         fixity_match = False
 
     return fixity_obj, fixity_match
+
+
+def resource_hash_generator(resource_dict, hash_algorithm):
+    """
+    Generate a hash for a downloaded resource. Resources served from the content store are
+    hashed from their blob on disk.
+
+    Parameters
+    ----------
+    resource_dict: dict
+        Dictionary that contains binary_file, hashes, title, and path
+    hash_algorithm : str
+        Hash algorithm to use
+
+    Returns
+    -------
+    String of the file hash generated by the given hash algorithm.
+    """
+    if resource_dict['file'] is not None:
+        return hash_generator(resource_dict['file'], hash_algorithm)
+
+    h = hashlib.new(hash_algorithm)
+    with open(resource_dict['blob_path'], 'rb') as blob:
+        for block in iter(lambda: blob.read(bagit.HASH_BLOCK_SIZE), b''):
+            h.update(block)
+    return h.hexdigest()
@@ -48,3 +48,41 @@ def get_or_create_hashes_from_bag(self):
             file_hashes[file_path] = hash_generator(binary_file, hash_algorithm)
 
     return file_hashes, hash_algorithm
+
+
+def get_or_create_hashes_from_zipped_bag(self):
+    """
+    Create a hash dictionary to compare with the hashes returned from the target after upload
+    for a bag that was never extracted. Hashes for every algorithm the target supports were
+    gathered while the zipped bag was validated so nothing needs to be read again.
+
+    Parameters
+    ----------
+    self: class instance
+        Instance of the class we are getting the bag for
+
+    Returns
+    -------
+    file_hashes: dict
+        Dictionaries of file paths(key) and their hashes (value)
+    hash_algorithm: str
+        Hash algorithm used to calculate the hashes
+    """
+    target_supported_algorithms = get_target_data(self.destination_target_name)[
+        'supported_hash_algorithms']
+    matched_algorithms = set(target_supported_algorithms).intersection(
+        self.zipped_bag['algorithms'])
+
+    if matched_algorithms:
+        hash_algorithm = matched_algorithms.pop()
+    else:
+        try:
+            hash_algorithm = target_supported_algorithms[0]
+        except IndexError:
+            hash_algorithm = 'md5'
+
+    file_hashes = {}
+    for key, value in self.zipped_bag['payload'].items():
+        file_hashes['{}/{}'.format(self.resource_main_dir, key)] = value[hash_algorithm]
+
+    return file_hashes, hash_algorithm
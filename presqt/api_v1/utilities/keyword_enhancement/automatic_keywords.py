@@ -1,4 +1,4 @@
-from presqt.api_v1.utilities import FunctionRouter, keyword_enhancer
+from presqt.api_v1.utilities import FunctionRouter, get_keyword_enhancer, keyword_enhancer
 from presqt.utilities import PresQTResponseException
 
 
@@ -39,7 +39,7 @@ def automatic_keywords(self):
         'sourceKeywordsAdded': self.initial_keywords,
         'sourceKeywordsEnhanced': list(set(self.enhanced_keywords + self.keywords)),
         'ontologies': ontologies,
-        'enhancer': 'scigraph'
+        'enhancer': get_keyword_enhancer()
     }
 
     return keyword_dict
@@ -0,0 +1,241 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+from uuid import uuid4
+
+from dateutil.relativedelta import relativedelta
+from django.utils import timezone
+from rest_framework import status
+
+from presqt.api_v1.utilities.keyword_enhancement.enhancer_backend import (
+    get_enhancer_terms, get_keyword_enhancer)
+from presqt.api_v1.utilities.keyword_enhancement.fetch_ontologies import fetch_ontologies
+from presqt.api_v1.utilities.multiprocess.spawn_action_process import spawn_action_process
+from presqt.api_v1.utilities.utils.function_router import FunctionRouter
+from presqt.api_v1.utilities.utils.get_target_data import get_target_data
+from presqt.api_v1.utilities.utils.hash_tokens import hash_tokens
+from presqt.api_v1.utilities.utils.job_index import new_job_id, index_job, claim_job_slot
+from presqt.api_v1.utilities.utils.update_or_create_process_info import \
+    update_or_create_process_info
+from presqt.utilities import PresQTError, PresQTResponseException
+
+# Number of resources whose keywords are updated on the target at the same time
+BULK_KEYWORDS_WORKERS = 4
+
+JOB_SLOT_MESSAGE = "Waiting for the user's other jobs to finish..."
+
+
+class BulkKeywordsJob(object):
+    """
+    Adds keywords to many resources of a target as one job. The job is indexed under the hash
+    of the user's token and counts towards their PRESQT_USER_JOB_LIMIT. Its status and results
+    are kept under the 'bulk_keywords' action of its job id and served by the job_status
+    endpoint.
+    """
+    action = 'bulk_keywords'
+
+    def __init__(self, target_name, token, resources):
+        """
+        Parameters
+        ----------
+        target_name : str
+            The name of the target the resources are in.
+        token : str
+            The user's token for the target.
+        resources : list
+            Dictionaries of each resource's id and the keywords to add to it.
+        """
+        self.target_name = target_name
+        self.token = token
+        self.resources = resources
+        self.job_owner = hash_tokens(token)
+        self.ticket_number = new_job_id()
+        self.process_info_path = None
+        self.process_info_obj = None
+        # Made in the job's process so the job can be sent to a job worker
+        self.progress_lock = None
+
+    def start(self):
+        """
+        Spawn the job separate from the request server.
+
+        Returns
+        -------
+        The job's id.
+        """
+        self.process_info_obj = {
+            'status': 'in_progress',
+            'expiration': str(timezone.now() + relativedelta(hours=5)),
+            'message': 'Adding keywords to the resources...',
+            'status_code': None,
+            'function_process_id': None,
+            'target_name': self.target_name,
+            'total_resources': len(self.resources),
+            'resources_finished': 0,
+            'results': []
+        }
+        self.process_info_path = update_or_create_process_info(
+            self.process_info_obj, self.action, self.ticket_number)
+        index_job(self.ticket_number, self.job_owner, self.action)
+
+        spawn_action_process(self, self._run, self.action)
+        return self.ticket_number
+
+    def _run(self):
+        """
+        Add the keywords to every resource then write one metadata action per project. Any
+        error the job doesn't handle itself fails the job.
+        """
+        self.process_info_obj['function_process_id'] = self.function_process.pid
+        update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+
+        results = []
+        try:
+            self._wait_for_job_slot()
+            self.progress_lock = threading.Lock()
+            with ThreadPoolExecutor(max_workers=BULK_KEYWORDS_WORKERS) as executor:
+                results = list(executor.map(self._upload_keywords, self.resources))
+            self._upload_metadata(results)
+        except PresQTResponseException as e:
+            self._fail(e.data, e.status_code)
+        except Exception as e:
+            self._fail("PresQT Error: The bulk keywords job failed unexpectedly: {}".format(
+                repr(e)), status.HTTP_500_INTERNAL_SERVER_ERROR)
+        else:
+            self.process_info_obj['status'] = 'finished'
+            self.process_info_obj['status_code'] = '200'
+            self.process_info_obj['message'] = \
+                'Keywords have been added to {} of {} resources.'.format(
+                    sum('error' not in result for result in results), len(results))
+        self.process_info_obj['results'] = results
+        update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+
+    def _fail(self, message, status_code):
+        """
+        Mark the job as failed. Failed jobs are deleted sooner.
+        """
+        self.process_info_obj['status'] = 'failed'
+        self.process_info_obj['message'] = message
+        self.process_info_obj['status_code'] = status_code
+        self.process_info_obj['expiration'] = str(timezone.now() + relativedelta(hours=1))
+
+    def _wait_for_job_slot(self, interval=5):
+        """
+        Defer the job until the user has fewer than PRESQT_USER_JOB_LIMIT other jobs running.
+        PresQTJobStopped is raised if the job is cancelled or reaches its deadline while it
+        waits.
+
+        Parameters
+        ----------
+        interval : int
+            Number of seconds to wait between checks.
+        """
+        message = self.process_info_obj['message']
+        while not claim_job_slot(self.ticket_number):
+            self.job_control.check()
+            if self.process_info_obj['message'] != JOB_SLOT_MESSAGE:
+                self.process_info_obj['message'] = JOB_SLOT_MESSAGE
+                update_or_create_process_info(
+                    self.process_info_obj, self.action, self.ticket_number)
+            sleep(interval)
+
+        if self.process_info_obj['message'] == JOB_SLOT_MESSAGE:
+            self.process_info_obj['message'] = message
+            update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+
+    def _upload_keywords(self, resource):
+        """
+        Add keywords to one resource.
+
+        Parameters
+        ----------
+        resource : dict
+            The resource's id and the keywords to add to it.
+
+        Returns
+        -------
+        Dictionary of the resource's initial, added and final keywords along with the id of
+        the project it belongs to, or its error.
+        """
+        try:
+            initial_keywords = FunctionRouter.get_function(self.target_name, 'keywords')(
+                self.token, resource['resource_id'])
+            updated_keywords = FunctionRouter.get_function(self.target_name, 'keywords_upload')(
+                self.token, resource['resource_id'],
+                initial_keywords['keywords'] + resource['keywords'])
+        except PresQTResponseException as e:
+            result = {'resource_id': resource['resource_id'], 'error': e.data,
+                      'status_code': e.status_code}
+        else:
+            result = {
+                'resource_id': resource['resource_id'],
+                'project_id': updated_keywords['project_id'],
+                'initial_keywords': initial_keywords,
+                'keywords_added': resource['keywords'],
+                'final_keywords': updated_keywords['updated_keywords']
+            }
+
+        with self.progress_lock:
+            self.process_info_obj['resources_finished'] += 1
+            update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+        return result
+
+    def _upload_metadata(self, results):
+        """
+        Write one FTS metadata action to each project with resources that had keywords added.
+        The ontologies of every added keyword are looked up at once.
+
+        Parameters
+        ----------
+        results : list
+            The result of each resource's keyword upload.
+        """
+        projects = {}
+        for result in results:
+            if 'error' not in result:
+                projects.setdefault(result['project_id'], []).append(result)
+        if not projects:
+            return
+
+        terms = get_enhancer_terms(list({keyword for result in results if 'error' not in result
+                                         for keyword in result['keywords_added']}))
+        source_target_data = get_target_data(self.target_name)
+        metadata_func = FunctionRouter.get_function(self.target_name, 'metadata_upload')
+
+        for project_id, project_results in projects.items():
+            keywords = list(dict.fromkeys(keyword for result in project_results
+                                          for keyword in result['keywords_added']))
+            metadata_dict = {
+                "allKeywords": list({keyword for result in project_results
+                                     for keyword in result['final_keywords']}),
+                "actions": [{
+                    'id': str(uuid4()),
+                    'details': 'PresQT Enhance Keywords in {}'.format(
+                        source_target_data['readable_name']),
+                    'actionDateTime': str(timezone.now()),
+                    'actionType': 'keyword_enhancement',
+                    'sourceTargetName': self.target_name,
+                    'destinationTargetName': self.target_name,
+                    'sourceUsername': 'N/A',
+                    'destinationUsername': 'N/A',
+                    'keywords': {
+                        'sourceKeywordsAdded': [],
+                        'sourceKeywordsEnhanced': keywords,
+                        'ontologies': fetch_ontologies(
+                            keywords, {keyword: terms[keyword] for keyword in keywords}),
+                        'enhancer': get_keyword_enhancer()
+                    },
+                    'files': {
+                        'created': [],
+                        'updated': [],
+                        'ignored': []
+                    }
+                }]
+            }
+
+            try:
+                metadata_func(self.token, project_id, metadata_dict)
+            except PresQTError:
+                for result in project_results:
+                    result['metadata_error'] = "PresQT Error: Error updating the PresQT metadata file on {}. Keywords have been added successfully.".format(
+                        self.target_name)
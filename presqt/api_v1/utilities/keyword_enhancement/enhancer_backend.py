@@ -0,0 +1,49 @@
+from rest_framework import status
+
+from config.settings.base import PRESQT_KEYWORD_ENHANCER
+from presqt.api_v1.utilities.keyword_enhancement.local_vocabulary import get_local_terms
+from presqt.api_v1.utilities.keyword_enhancement.scigraph_terms import get_scigraph_terms
+from presqt.utilities import PresQTResponseException
+
+# Functions each keyword enhancer backend looks terms up with. Terms are dictionaries with the
+# 'labels', 'uri', 'fragment' and 'categories' keys of a SciGraph term.
+KEYWORD_ENHANCERS = {
+    'scigraph': get_scigraph_terms,
+    'local': get_local_terms
+}
+
+
+def get_keyword_enhancer():
+    """
+    Get the name of the keyword enhancer backend in use. This is the name recorded as the
+    'enhancer' in FTS metadata.
+
+    Returns
+    -------
+    The name of the keyword enhancer backend.
+    """
+    if PRESQT_KEYWORD_ENHANCER not in KEYWORD_ENHANCERS:
+        raise PresQTResponseException(
+            "PresQT Error: '{}' is not a valid keyword enhancer. The options are {}.".format(
+                PRESQT_KEYWORD_ENHANCER, list(KEYWORD_ENHANCERS.keys())),
+            status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return PRESQT_KEYWORD_ENHANCER
+
+
+def get_enhancer_terms(keywords):
+    """
+    Look up the term for each keyword with the keyword enhancer backend in use.
+
+    Parameters
+    ----------
+    keywords: list
+        List of keywords in string format
+
+    Returns
+    -------
+    Dictionary of each keyword and its term. The term is None if the backend doesn't know
+    the keyword.
+    """
+    if not keywords:
+        return {}
+    return KEYWORD_ENHANCERS[get_keyword_enhancer()](keywords)
@@ -1,7 +1,7 @@
-import requests
+from presqt.api_v1.utilities.keyword_enhancement.enhancer_backend import get_enhancer_terms
 
 
-def fetch_ontologies(enhanced_keywords):
+def fetch_ontologies(enhanced_keywords, terms=None):
     """
     Fetch the connected ontology for each enhanced keyword.
 
@@ -9,6 +9,8 @@ def fetch_ontologies(enhanced_keywords):
     ----------
     enhanced_keywords: list
         List of enhanced keywords in string format
+    terms: dict
+        The enhancer terms of the keywords if they've already been looked up.
 
     Returns
     -------
@@ -16,22 +18,22 @@ def fetch_ontologies(enhanced_keywords):
     """
 
     ontologies = []
+    if terms is None:
+        terms = get_enhancer_terms(enhanced_keywords)
 
     for keyword in enhanced_keywords:
-        response = requests.get(
-            'http://ec-scigraph.sdsc.edu:9000/scigraph/vocabulary/term/{}?limit=20'.format(keyword))
-
-        if response.status_code == 200:
+        term = terms[keyword]
+        if term:
             for entry in ontologies:
-                if response.json()[0]["uri"] == entry['ontology']:
+                if term["uri"] == entry['ontology']:
                     entry['keywords'].append(keyword)
                     break
             else:
                 ontologies.append({
                     "keywords": [keyword],
-                    "ontology": response.json()[0]["uri"],
-                    "ontology_id": response.json()[0]["fragment"],
-                    "categories": response.json()[0]['categories'],
+                    "ontology": term["uri"],
+                    "ontology_id": term["fragment"],
+                    "categories": term['categories'],
                 })
 
-    return ontologies
\ No newline at end of file
+    return ontologies
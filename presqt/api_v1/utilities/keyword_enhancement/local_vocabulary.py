@@ -0,0 +1,150 @@
+import json
+import os
+import sqlite3
+from contextlib import closing
+
+from rest_framework import status
+
+from config.settings.base import PRESQT_KEYWORD_VOCABULARY
+from presqt.utilities import PresQTResponseException
+
+OBO_PURL = 'http://purl.obolibrary.org/obo/{}'
+
+
+def read_obo_terms(dump_path):
+    """
+    Read the terms of an OBO vocabulary file in the same format SciGraph returns them.
+
+    Parameters
+    ----------
+    dump_path: str
+        Path to the OBO file.
+
+    Returns
+    -------
+    Iterator of term dictionaries.
+    """
+    term = None
+    with open(dump_path, encoding='utf-8') as dump_file:
+        for line in dump_file:
+            line = line.strip()
+            if line.startswith('['):
+                if term and not term.pop('obsolete'):
+                    yield term
+                term = {'labels': [], 'synonyms': [], 'categories': [], 'obsolete': False} \
+                    if line == '[Term]' else None
+                continue
+            if term is None or ':' not in line:
+                continue
+
+            tag, value = [part.strip() for part in line.split(':', 1)]
+            if tag == 'id':
+                term['fragment'] = value.replace(':', '_')
+                term['uri'] = OBO_PURL.format(term['fragment'])
+            elif tag == 'name':
+                term['labels'].append(value)
+            elif tag == 'synonym' and value.startswith('"'):
+                term['synonyms'].append(value[1:].split('"', 1)[0])
+            elif tag == 'namespace':
+                term['categories'].append(value)
+            elif tag == 'is_obsolete' and value == 'true':
+                term['obsolete'] = True
+    if term and not term.pop('obsolete'):
+        yield term
+
+
+def read_vocabulary_terms(dump_path):
+    """
+    Read the terms of a vocabulary dump. The dump is either an OBO file or a JSON list of terms
+    as returned by SciGraph's vocabulary endpoints.
+
+    Parameters
+    ----------
+    dump_path: str
+        Path to the vocabulary dump.
+
+    Returns
+    -------
+    Iterator of term dictionaries.
+    """
+    if dump_path.endswith('.obo'):
+        return read_obo_terms(dump_path)
+
+    with open(dump_path, encoding='utf-8') as dump_file:
+        return iter(json.load(dump_file))
+
+
+def build_vocabulary_index(dump_paths, index_path=PRESQT_KEYWORD_VOCABULARY):
+    """
+    Build the local vocabulary index from vocabulary dumps. The index is built next to the
+    existing one and swapped in once it's complete so lookups never see half an index.
+
+    Parameters
+    ----------
+    dump_paths: list
+        Paths to the vocabulary dumps.
+    index_path: str
+        Path to write the index to.
+
+    Returns
+    -------
+    The number of terms indexed.
+    """
+    build_path = '{}.build'.format(index_path)
+    if os.path.exists(build_path):
+        os.remove(build_path)
+
+    term_count = 0
+    with closing(sqlite3.connect(build_path)) as connection, connection:
+        connection.execute('CREATE TABLE terms (id INTEGER PRIMARY KEY, term TEXT NOT NULL)')
+        # Labels are matched before synonyms, the same way SciGraph ranks its terms
+        connection.execute(
+            'CREATE TABLE labels (label TEXT NOT NULL, priority INTEGER NOT NULL, '
+            'term_id INTEGER NOT NULL, PRIMARY KEY (label, priority, term_id)) WITHOUT ROWID')
+        for dump_path in dump_paths:
+            for term in read_vocabulary_terms(dump_path):
+                term = {'labels': term.get('labels', []), 'synonyms': term.get('synonyms', []),
+                        'uri': term['uri'], 'fragment': term['fragment'],
+                        'categories': term.get('categories', [])}
+                term_id = connection.execute('INSERT INTO terms (term) VALUES (?)',
+                                             (json.dumps(term),)).lastrowid
+                connection.executemany(
+                    'INSERT OR IGNORE INTO labels VALUES (?, ?, ?)',
+                    [(label.lower(), 0, term_id) for label in term['labels']] +
+                    [(synonym.lower(), 1, term_id) for synonym in term['synonyms']])
+                term_count += 1
+
+    os.replace(build_path, index_path)
+    return term_count
+
+
+def get_local_terms(keywords):
+    """
+    Get the term for each keyword from the local vocabulary index. A keyword matches a term
+    when it's one of the term's labels or synonyms.
+
+    Parameters
+    ----------
+    keywords: list
+        List of keywords in string format
+
+    Returns
+    -------
+    Dictionary of each keyword and its term. The term is None if the vocabulary doesn't
+    know the keyword.
+    """
+    if not os.path.exists(PRESQT_KEYWORD_VOCABULARY):
+        raise PresQTResponseException(
+            "PresQT Error: The local keyword vocabulary has not been built.",
+            status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    terms = {}
+    uri = 'file:{}?mode=ro'.format(PRESQT_KEYWORD_VOCABULARY)
+    with closing(sqlite3.connect(uri, uri=True)) as connection:
+        for keyword in keywords:
+            row = connection.execute(
+                'SELECT terms.term FROM labels JOIN terms ON terms.id = labels.term_id '
+                'WHERE labels.label = ? ORDER BY labels.priority, labels.term_id LIMIT 1',
+                (keyword.lower(),)).fetchone()
+            terms[keyword] = json.loads(row[0]) if row else None
+    return terms
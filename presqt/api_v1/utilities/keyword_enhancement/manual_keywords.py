@@ -1,4 +1,4 @@
-from presqt.api_v1.utilities import FunctionRouter
+from presqt.api_v1.utilities import FunctionRouter, get_keyword_enhancer
 from presqt.utilities import PresQTResponseException
 
 
@@ -28,5 +28,5 @@ def manual_keywords(self):
         'sourceKeywordsAdded': self.initial_keywords,
         'sourceKeywordsEnhanced': self.keywords,
         'ontologies': ontologies,
-        'enhancer': 'scigraph'
+        'enhancer': get_keyword_enhancer()
     }
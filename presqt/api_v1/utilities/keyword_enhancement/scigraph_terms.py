@@ -0,0 +1,129 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+import aiohttp
+
+from config.settings.base import (MEDIA_ROOT, PRESQT_SCIGRAPH_CACHE_TTL,
+                                  PRESQT_SCIGRAPH_NEGATIVE_CACHE_TTL)
+
+SCIGRAPH_TERM_URL = 'http://ec-scigraph.sdsc.edu:9000/scigraph/vocabulary/term/{}?limit=20'
+SCIGRAPH_CACHE_PATH = os.path.join(MEDIA_ROOT, 'scigraph_cache.sqlite3')
+
+
+def connect_scigraph_cache():
+    """
+    Open a connection to the SciGraph term cache, creating it if it doesn't exist yet.
+    The cache holds the first term SciGraph returns for each keyword, or NULL if SciGraph
+    doesn't know the keyword, along with when it was fetched.
+
+    Returns
+    -------
+    sqlite3.Connection
+    """
+    os.makedirs(os.path.dirname(SCIGRAPH_CACHE_PATH), exist_ok=True)
+    connection = sqlite3.connect(SCIGRAPH_CACHE_PATH, timeout=30)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS terms ('
+        'keyword TEXT PRIMARY KEY, term TEXT, fetched_at REAL NOT NULL)')
+    return connection
+
+
+async def async_get(keyword, session):
+    """
+    Coroutine that uses aiohttp to look up a keyword in SciGraph.
+
+    Parameters
+    ----------
+    keyword: str
+        Keyword to look up
+    session: ClientSession object
+        aiohttp ClientSession Object
+
+    Returns
+    -------
+    The keyword along with its first SciGraph term, None if SciGraph doesn't know the keyword
+    or False if the lookup failed.
+    """
+    try:
+        async with session.get(SCIGRAPH_TERM_URL.format(keyword)) as response:
+            if response.status == 404:
+                return keyword, None
+            if response.status != 200:
+                return keyword, False
+            content = await response.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        return keyword, False
+    return keyword, content[0] if content else None
+
+
+async def async_main(keywords):
+    """
+    Main coroutine method that will gather the SciGraph lookups to be made and will make them
+    asynchronously.
+
+    Parameters
+    ----------
+    keywords: list
+        List of keywords to look up
+
+    Returns
+    -------
+    List of (keyword, term) tuples.
+    """
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60)) as session:
+        return await asyncio.gather(*[async_get(keyword, session) for keyword in keywords])
+
+
+def get_scigraph_terms(keywords):
+    """
+    Get the SciGraph term for each keyword. Terms are served from the cache when they're fresh
+    and the rest are fetched from SciGraph at the same time.
+
+    Parameters
+    ----------
+    keywords: list
+        List of keywords in string format
+
+    Returns
+    -------
+    Dictionary of each keyword and its SciGraph term. The term is None if SciGraph doesn't
+    know the keyword or couldn't be reached.
+    """
+    keywords = list(dict.fromkeys(keywords))
+    terms = {}
+    now = time.time()
+
+    with closing(connect_scigraph_cache()) as connection:
+        for keyword in keywords:
+            row = connection.execute('SELECT term, fetched_at FROM terms WHERE keyword = ?',
+                                     (keyword,)).fetchone()
+            if not row:
+                continue
+            term, fetched_at = row
+            ttl = PRESQT_SCIGRAPH_CACHE_TTL if term else PRESQT_SCIGRAPH_NEGATIVE_CACHE_TTL
+            if now - fetched_at < ttl:
+                terms[keyword] = json.loads(term) if term else None
+
+    missing_keywords = [keyword for keyword in keywords if keyword not in terms]
+    if missing_keywords:
+        loop = asyncio.new_event_loop()
+        try:
+            fetched_terms = loop.run_until_complete(async_main(missing_keywords))
+        finally:
+            loop.close()
+
+        with closing(connect_scigraph_cache()) as connection, connection:
+            for keyword, term in fetched_terms:
+                # Failed lookups aren't cached so they're tried again next time
+                if term is False:
+                    terms[keyword] = None
+                    continue
+                terms[keyword] = term
+                connection.execute('INSERT OR REPLACE INTO terms VALUES (?, ?, ?)',
+                                   (keyword, json.dumps(term) if term else None, now))
+    return terms
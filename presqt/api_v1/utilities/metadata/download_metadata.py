@@ -1,6 +1,5 @@
-import json
 
-from presqt.json_schemas.schema_handlers import schema_validator
+from presqt.json_schemas.schema_handlers import load_and_validate_json
 
 
 def create_download_metadata(instance, resource, fixity_obj):
@@ -42,16 +41,17 @@ def create_download_metadata(instance, resource, fixity_obj):
         )
 
     # Append file metadata to fts metadata list
-    instance.new_fts_metadata_files.append(metadata)
+    instance.fts_metadata_builder.add_file(metadata)
 
     return False
 
 
 
 def validate_metadata(instance, resource):
-    source_fts_metadata_content = json.loads(resource['file'].decode())
+    source_fts_metadata_content, validation = load_and_validate_json(
+        'presqt/json_schemas/metadata_schema.json', resource['file'])
     # If the metadata is valid then grab it's contents and don't save it
-    if schema_validator('presqt/json_schemas/metadata_schema.json', source_fts_metadata_content) is True:
+    if validation is True:
         instance.source_fts_metadata_actions = instance.source_fts_metadata_actions + \
                                                source_fts_metadata_content['actions']
         instance.all_keywords = instance.all_keywords + \
@@ -0,0 +1,117 @@
+class FTSMetadataBuilder(object):
+    """
+    Collects the FTS file metadata of an action. Entries are indexed by their destination path
+    so each file's metadata can be found and updated without searching the whole list.
+    """
+    def __init__(self):
+        self.files = []
+        self._files_by_path = {}
+
+    def __len__(self):
+        return len(self.files)
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def add_file(self, file_metadata):
+        """
+        Add a file's metadata.
+
+        Parameters
+        ----------
+        file_metadata: dict
+            The file's FTS metadata.
+        """
+        self.files.append(file_metadata)
+        self._files_by_path[file_metadata['destinationPath']] = file_metadata
+
+    def get_file(self, destination_path):
+        """
+        Get a file's metadata by its destination path.
+
+        Parameters
+        ----------
+        destination_path: str
+            The destination path the file's metadata was added with.
+
+        Returns
+        -------
+        The file's FTS metadata or None if there is no file at that path.
+        """
+        return self._files_by_path.get(destination_path)
+
+    def move_files(self, moves):
+        """
+        Change the destination paths of several files. Every file is found before any are moved
+        so a file can move to a path another file is moving away from.
+
+        Parameters
+        ----------
+        moves: list
+            (destination path, new destination path) tuples.
+
+        Returns
+        -------
+        List of the moved files' FTS metadata in the same order as the moves.
+        """
+        moved_files = [self._files_by_path.pop(destination_path)
+                       for destination_path, new_destination_path in moves]
+        for file_metadata, (destination_path, new_destination_path) in zip(moved_files, moves):
+            file_metadata['destinationPath'] = new_destination_path
+            self._files_by_path[new_destination_path] = file_metadata
+        return moved_files
+
+    def file_lists(self, resources_ignored=(), resources_updated=(), path='destinationPath'):
+        """
+        Sort the file metadata into created, updated and ignored files.
+
+        Parameters
+        ----------
+        resources_ignored: list
+            List of resource string paths that were ignored during upload
+        resources_updated: list
+            List of resource string paths that were updated during upload
+        path: str
+            The path in the metadata we want to look for in the resources lists
+
+        Returns
+        -------
+        Dictionary of file lists.
+        """
+        return build_file_dict(self.files, resources_ignored, resources_updated, path)
+
+
+def build_file_dict(file_metadata, resources_ignored, resources_updated, path):
+    """
+    Add the metadata files to the correct file list.
+
+    Parameters
+    ----------
+    file_metadata: list
+        List of FTS file metadata.
+    resources_ignored: list
+        List of resource string paths that were ignored during upload
+    resources_updated: list
+        List of resource string paths that were updated during upload
+    path: str
+        The path in the metadata we want to look for in the resources lists
+
+    Returns
+    -------
+    Dictionary of file lists.
+    """
+    resources_ignored = set(resources_ignored)
+    resources_updated = set(resources_updated)
+    files = {
+        'created': [],
+        'updated': [],
+        'ignored': []
+    }
+    for metadata in file_metadata:
+        if metadata[path] in resources_ignored:
+            files['ignored'].append(metadata)
+        elif metadata[path] in resources_updated:
+            files['updated'].append(metadata)
+        else:
+            files['created'].append(metadata)
+    return files
@@ -1,10 +1,14 @@
+import json
 import os
+import zipfile
 from json.decoder import JSONDecodeError
 
 from rest_framework import status
 
+from presqt.api_v1.utilities.metadata.fts_metadata_builder import build_file_dict
 from presqt.json_schemas.schema_handlers import schema_validator
-from presqt.utilities import get_dictionary_from_list, PresQTError, read_file, PresQTValidationError
+from presqt.utilities import (PresQTError, read_file, PresQTValidationError,
+                              is_fts_metadata_file)
 
 
 def get_upload_source_metadata(instance, bag):
@@ -23,7 +27,7 @@ def get_upload_source_metadata(instance, bag):
     instance.all_keywords = []
     instance.extra_metadata = {}
     for bag_file in bag.payload_files():
-        if os.path.split(bag_file)[-1] == 'PRESQT_FTS_METADATA.json':
+        if is_fts_metadata_file(os.path.split(bag_file)[-1]):
             metadata_path = os.path.join(instance.resource_main_dir, bag_file)
             try:
                 source_metadata_content = read_file(metadata_path, True)
@@ -44,12 +48,60 @@ def get_upload_source_metadata(instance, bag):
                 bag.save(manifests=True)
             # If the FTS metadata is invalid then rename the file in the bag.
             else:
-                invalid_metadata_path = os.path.join(os.path.split(metadata_path)[0],
-                                                     'INVALID_PRESQT_FTS_METADATA.json')
+                invalid_metadata_path = os.path.join(
+                    os.path.split(metadata_path)[0],
+                    'INVALID_{}'.format(os.path.split(metadata_path)[1]))
                 os.rename(metadata_path, invalid_metadata_path)
                 bag.save(manifests=True)
 
 
+def get_zipped_upload_source_metadata(instance, zipped_bag):
+    """
+    Get all FTS metadata files in a zipped bag without extracting it. If they are valid then get
+    their contents and mark them to be left out of the bag, otherwise mark the invalid metadata
+    file to be renamed.
+
+    Parameters
+    ----------
+    instance: BaseResource class instance
+        Class we want to add the attributes to
+    zipped_bag: dict
+        Zipped bag dictionary returned by validate_zipped_bag
+    """
+    instance.source_fts_metadata_actions = []
+    instance.all_keywords = []
+    instance.extra_metadata = {}
+    zipped_bag['removed'] = []
+    zipped_bag['renamed'] = {}
+    with zipfile.ZipFile(zipped_bag['zip_path']) as bag_zip:
+        for bag_file in list(zipped_bag['payload'].keys()):
+            if is_fts_metadata_file(bag_file.rpartition('/')[2]):
+                try:
+                    source_metadata_content = json.loads(
+                        bag_zip.read('{}{}'.format(zipped_bag['bag_prefix'], bag_file)))
+                except JSONDecodeError:
+                    raise PresQTValidationError("PRESQT_FTS_METADATA.json is not valid JSON",
+                                                status.HTTP_400_BAD_REQUEST)
+                # If the FTS metadata is valid then leave it out of the bag and save the actions.
+                if schema_validator('presqt/json_schemas/metadata_schema.json',
+                                    source_metadata_content) is True:
+                    instance.source_fts_metadata_actions = instance.source_fts_metadata_actions + \
+                                                           source_metadata_content['actions']
+                    instance.all_keywords = instance.all_keywords + \
+                                            source_metadata_content['allKeywords']
+                    if 'extra_metadata' in source_metadata_content.keys():
+                        instance.extra_metadata = source_metadata_content['extra_metadata']
+                    zipped_bag['removed'].append(bag_file)
+                    zipped_bag['payload'].pop(bag_file)
+                # If the FTS metadata is invalid then rename the file in the bag.
+                else:
+                    invalid_metadata_path = '{}/INVALID_{}'.format(
+                        bag_file.rpartition('/')[0], bag_file.rpartition('/')[2])
+                    zipped_bag['renamed'][bag_file] = invalid_metadata_path
+                    zipped_bag['payload'][invalid_metadata_path] = zipped_bag['payload'].pop(
+                        bag_file)
+
+
 def create_upload_metadata(instance, file_metadata_list, action_metadata, project_id,
                            resources_ignored, resources_updated):
     """
@@ -81,18 +133,18 @@ def create_upload_metadata(instance, file_metadata_list, action_metadata, projec
     instance.action_metadata['files'] = build_file_dict(instance.action_metadata['files']['created'],
                                                         resources_ignored, resources_updated,
                                                         'destinationPath')
-    for resource in file_metadata_list:
-        # Get the resource's metadata dict that has already been created
-        fts_metadata_entry = get_dictionary_from_list(instance.new_fts_metadata_files,
-                                                      'destinationPath',
-                                                      resource['actionRootPath']
-                                                      [len(instance.data_directory):])
+
+    # Get the resources' metadata dicts that have already been created and point them at
+    # their destination paths
+    fts_metadata_entries = instance.fts_metadata_builder.move_files(
+        [(resource['actionRootPath'][len(instance.data_directory):], resource['destinationPath'])
+         for resource in file_metadata_list])
+    for resource, fts_metadata_entry in zip(file_metadata_list, fts_metadata_entries):
         # Add destination metadata
         fts_metadata_entry['destinationHashes'] = {}
         if resource['destinationHash']:
             fts_metadata_entry['destinationHashes'][instance.hash_algorithm] = resource['destinationHash']
 
-        fts_metadata_entry['destinationPath'] = resource['destinationPath']
         fts_metadata_entry['failedFixityInfo'] += resource['failed_fixity_info']
 
     # Create FTS metadata object
@@ -136,37 +188,3 @@ def write_and_validate_metadata(instance, project_id, fts_metadata_data):
         metadata_validation = schema_validator('presqt/json_schemas/metadata_schema.json',
                                                fts_metadata_data)
     return metadata_validation
-
-
-def build_file_dict(file_metadata, resources_ignored, resources_updated, path):
-    """
-    Add the metadata files to the correct file list.
-
-    Parameters
-    ----------
-    file_metadata: list
-        List of FTS file metadata.
-    resources_ignored: list
-        List of resource string paths that were ignored during upload
-    resources_updated: list
-        List of resource string paths that were updated during upload
-    path: str
-        The path in the metadata we want to look for in the resources lists
-
-    Returns
-    -------
-    Dictionary of file lists.
-    """
-    files = {
-        'created': [],
-        'updated': [],
-        'ignored': []
-    }
-    for metadata in file_metadata:
-        if metadata[path] in resources_ignored:
-            files['ignored'].append(metadata)
-        elif metadata[path] in resources_updated:
-            files['updated'].append(metadata)
-        else:
-            files['created'].append(metadata)
-    return files
@@ -0,0 +1,124 @@
+import functools
+import importlib
+import multiprocessing
+import pickle
+from urllib.parse import urljoin
+
+import django
+from django.apps import apps
+
+from presqt.api_v1.utilities.multiprocess.watchdog import process_watchdog
+from presqt.api_v1.utilities.utils.job_profile import run_profiled
+from presqt.utilities import run_with_job_control
+
+# Attributes of the object that started a job that only belong to the request that started it.
+# They are left out of the job spec. Django sets 'head' to the view's bound get method.
+REQUEST_ATTRIBUTES = {'request', 'args', 'kwargs', 'headers', 'format_kwarg', 'response', 'head',
+                      'function_process', 'watch_dog'}
+# Attributes holding the user's tokens. They are left out of job specs written to disk.
+TOKEN_ATTRIBUTES = {'source_token', 'destination_token'}
+
+
+class JobRequest(object):
+    """
+    Stands in for the request that started a job inside the job worker. Jobs only use the
+    request to build links to the server for their emails.
+    """
+    def __init__(self, base_uri):
+        self.base_uri = base_uri
+
+    def build_absolute_uri(self, location='/'):
+        return urljoin(self.base_uri, location)
+
+
+def build_job_spec(instance, method_to_call, action, profile_path=None, exclude=()):
+    """
+    Build the spec a job worker needs to run a job: the class and method of the job and the
+    state of the object that started it, without the request that started it.
+
+    Parameters
+    ----------
+    instance : object
+        The view or job object the job's method belongs to.
+    method_to_call : class method
+        The job's method.
+    action : str
+        The job's action, e.g. 'resource_download'.
+    profile_path : str
+        The collapsed stack file to write if the job is profiled.
+    exclude : iterable
+        Other attributes of the object to leave out of the spec.
+
+    Returns
+    -------
+    The pickled job spec, or None if the object's state can't be pickled.
+    """
+    request = getattr(instance, 'request', None)
+    spec = {
+        'job_class': '{}.{}'.format(type(instance).__module__, type(instance).__qualname__),
+        'method': method_to_call.__name__,
+        'action': action,
+        'process_info_path': instance.process_info_path,
+        'base_uri': request.build_absolute_uri('/') if request is not None else None,
+        'profile_path': profile_path,
+        'state': {name: value for name, value in vars(instance).items()
+                  if name not in REQUEST_ATTRIBUTES and name not in exclude}
+    }
+    try:
+        return pickle.dumps(spec)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+def load_job_spec(pickled_spec):
+    """
+    Rebuild the object that started a job from its job spec.
+
+    Parameters
+    ----------
+    pickled_spec : bytes
+        The job spec from build_job_spec.
+
+    Returns
+    -------
+    The job spec and the rebuilt object.
+    """
+    spec = pickle.loads(pickled_spec)
+    module_name, _, class_name = spec['job_class'].rpartition('.')
+    job_class = getattr(importlib.import_module(module_name), class_name)
+
+    # The object's state is restored as it was when the job was started
+    instance = job_class.__new__(job_class)
+    instance.__dict__.update(spec['state'])
+    if spec['base_uri'] is not None:
+        instance.request = JobRequest(spec['base_uri'])
+    return spec, instance
+
+
+def run_job_spec(pickled_spec, process_time):
+    """
+    Run a job in a job worker. The worker forks the job's process from itself and watches it
+    like the watchdog of a job started from the request server.
+
+    Parameters
+    ----------
+    pickled_spec : bytes
+        The job spec from build_job_spec.
+    process_time : int
+        Amount of seconds the job can run for.
+    """
+    # The forkserver has set Django up unless its preload failed
+    if not apps.ready:
+        django.setup()
+
+    spec, instance = load_job_spec(pickled_spec)
+    method_to_call = functools.partial(run_with_job_control, getattr(instance, spec['method']),
+                                       instance.job_control)
+    if spec['profile_path']:
+        method_to_call = functools.partial(run_profiled, method_to_call, spec['profile_path'])
+
+    function_process = multiprocessing.get_context('fork').Process(target=method_to_call)
+    instance.function_process = function_process
+    function_process.start()
+    process_watchdog(function_process, spec['process_info_path'], process_time, spec['action'])
+    function_process.join()
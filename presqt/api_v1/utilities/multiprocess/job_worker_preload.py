@@ -0,0 +1,14 @@
+"""
+Imported once by the forkserver job workers are forked from, so every job worker starts with
+Django set up and the views, jobs and target functions already imported.
+"""
+import django
+
+django.setup()
+
+import config.urls  # noqa: E402,F401
+from presqt.api_v1.utilities.multiprocess import job_spec  # noqa: E402,F401
+from presqt.api_v1.utilities.utils.function_router import FunctionRouter  # noqa: E402
+
+for function_name in FunctionRouter.get_registry():
+    getattr(FunctionRouter, function_name)
@@ -0,0 +1,68 @@
+import multiprocessing
+import os
+import signal
+import time
+
+from config.settings.base import PRESQT_JOB_START_METHOD, PRESQT_JOB_CANCEL_GRACE
+from presqt.api_v1.utilities.validation.get_process_info_data import get_process_info_data
+from presqt.utilities import CANCEL_SIGNAL
+
+
+def stop_job_process(process_id, ticket_number, action):
+    """
+    Ask a job's process to stop and wait for it to save its progress and mark itself as
+    stopped in its process_info file.
+
+    Parameters
+    ----------
+    process_id : int
+        The job process's id.
+    ticket_number : str
+        The job's ticket number.
+    action : str
+        The job's action, e.g. 'resource_download'.
+
+    Returns
+    -------
+    True if the job stopped itself within PRESQT_JOB_CANCEL_GRACE seconds, False otherwise.
+    """
+    try:
+        os.kill(process_id, CANCEL_SIGNAL)
+    except ProcessLookupError:
+        return False
+
+    deadline = time.monotonic() + PRESQT_JOB_CANCEL_GRACE
+    while time.monotonic() < deadline:
+        if get_process_info_data(ticket_number)[action]['status'] != 'in_progress':
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def kill_job_process(process_id):
+    """
+    Kill a job's process by the process id it wrote to its process_info file.
+
+    Parameters
+    ----------
+    process_id : int
+        The job process's id.
+
+    Returns
+    -------
+    True if the job's process was killed, False if it wasn't found.
+    """
+    for process in multiprocessing.active_children():
+        if process.pid == process_id:
+            process.kill()
+            process.join()
+            return True
+
+    # Jobs run by job workers aren't children of the request server
+    if PRESQT_JOB_START_METHOD == 'forkserver':
+        try:
+            os.kill(process_id, signal.SIGKILL)
+        except ProcessLookupError:
+            return False
+        return True
+    return False
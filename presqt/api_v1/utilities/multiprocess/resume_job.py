@@ -0,0 +1,61 @@
+import os
+import shutil
+
+from dateutil.relativedelta import relativedelta
+from django.utils import timezone
+from rest_framework import status
+
+from presqt.api_v1.utilities.multiprocess.job_spec import load_job_spec
+from presqt.api_v1.utilities.multiprocess.spawn_action_process import spawn_action_process
+from presqt.api_v1.utilities.utils.job_index import index_job
+from presqt.api_v1.utilities.utils.update_or_create_process_info import \
+    update_or_create_process_info
+from presqt.utilities import CheckpointJournal, PresQTValidationError
+
+
+def resume_job(request, ticket_path, tokens):
+    """
+    Start a job that failed, was cancelled or was killed again from the spec saved with its
+    checkpoint journal. The work its earlier attempts recorded in the journal is skipped:
+    downloads that still match their source hashes are reused and files already uploaded to
+    the destination aren't uploaded again.
+
+    Parameters
+    ----------
+    request : Request
+        The request resuming the job.
+    ticket_path : str
+        The job's ticket directory, e.g. '<MEDIA_ROOT>/jobs/<ticket_number>/download'.
+    tokens : dict
+        The user's tokens by the job's attribute names, since they aren't saved with the job.
+
+    Returns
+    -------
+    The job's action.
+    """
+    pickled_spec = CheckpointJournal.read_job_spec(ticket_path)
+    if pickled_spec is None:
+        raise PresQTValidationError("PresQT Error: This job can't be resumed.",
+                                    status.HTTP_400_BAD_REQUEST)
+    spec, instance = load_job_spec(pickled_spec)
+    instance.request = request
+    for name, token in tokens.items():
+        setattr(instance, name, token)
+
+    # The job starts again from the process_info it was first spawned with
+    instance.process_info_obj['expiration'] = str(timezone.now() + relativedelta(hours=5))
+    instance.process_info_path = update_or_create_process_info(
+        instance.process_info_obj, spec['action'], instance.ticket_number)
+    # The job waits for a slot within the user's job limit again. Jobs started before the job
+    # index existed aren't indexed.
+    if instance.job_owner is not None:
+        index_job(instance.ticket_number, instance.job_owner, spec['action'])
+
+    # Uploads are made from the files the user sent, downloads are made again
+    if spec['action'] != 'resource_upload':
+        instance.checkpoint_journal.keep_previous_files()
+    # Zip files for finite depth targets are made again
+    shutil.rmtree(os.path.join(instance.ticket_path, 'zip_format'), ignore_errors=True)
+
+    spawn_action_process(instance, getattr(instance, spec['method']), spec['action'])
+    return spec['action']
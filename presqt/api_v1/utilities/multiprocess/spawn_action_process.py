@@ -1,12 +1,48 @@
+import functools
 import multiprocessing
+import time
+from multiprocessing import forkserver
 
+from config.settings.base import (PRESQT_JOB_START_METHOD, PRESQT_JOB_TIMEOUT,
+                                  PRESQT_JOB_CANCEL_GRACE)
+from presqt.api_v1.utilities.multiprocess.job_spec import build_job_spec, run_job_spec
 from presqt.api_v1.utilities.multiprocess.watchdog import process_watchdog
+from presqt.api_v1.utilities.utils.job_profile import get_job_profile_path, run_profiled
+from presqt.utilities import JobControl, run_with_job_control
+
+# Modules the forkserver imports before job workers are forked from it
+JOB_WORKER_PRELOAD = ['presqt.api_v1.utilities.multiprocess.job_worker_preload']
+
+
+def get_job_worker_context():
+    """
+    Get the forkserver context job workers are started from. The forkserver is started on
+    first use and imports JOB_WORKER_PRELOAD once.
+    """
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(JOB_WORKER_PRELOAD)
+    return context
+
+
+def start_job_worker_server():
+    """
+    Start the forkserver job workers are forked from, so the first job doesn't wait for it
+    to start and preload the job code.
+    """
+    get_job_worker_context()
+    forkserver.ensure_running()
 
 
 def spawn_action_process(self, method_to_call, action):
     """
     Spawn a separate process on the Python kernel to run independently of the
     main request thread. This also starts a watch dog to supervise the spawned process.
+    Jobs with profile_job set sample their stacks into a collapsed stack file in the job
+    directory. The job's JobControl is set on the class with the job's deadline, and is
+    cancelled when the job's process gets CANCEL_SIGNAL.
+
+    With PRESQT_JOB_START_METHOD set to 'forkserver' the job is sent as a job spec to a job
+    worker instead, which runs the job and its watchdog away from the request server's memory.
 
     Parameters
     ----------
@@ -15,6 +51,27 @@ def spawn_action_process(self, method_to_call, action):
     method_to_call: class method
         Method to spawn
     """
+    profile_path = None
+    if getattr(self, 'profile_job', False):
+        profile_path = get_job_profile_path(self.ticket_number, action)
+    self.job_control = JobControl(action, time.time() + PRESQT_JOB_TIMEOUT)
+    # The watchdog gives the job time to stop itself at its deadline
+    process_time = PRESQT_JOB_TIMEOUT + PRESQT_JOB_CANCEL_GRACE
+
+    if PRESQT_JOB_START_METHOD == 'forkserver':
+        job_spec = build_job_spec(self, method_to_call, action, profile_path)
+        # Jobs holding state that can't be pickled are forked from the request server
+        if job_spec is not None:
+            job_worker = get_job_worker_context().Process(target=run_job_spec,
+                                                          args=(job_spec, process_time))
+            self.watch_dog = job_worker
+            job_worker.start()
+            return
+
+    method_to_call = functools.partial(run_with_job_control, method_to_call, self.job_control)
+    if profile_path:
+        method_to_call = functools.partial(run_profiled, method_to_call, profile_path)
+
     # Spawn job separate from request memory thread
     function_process = multiprocessing.Process(target=method_to_call)
     # Add the process obj to the base class so we can write the process id in the target function
@@ -23,6 +80,7 @@ def spawn_action_process(self, method_to_call, action):
 
     # Start the watchdog process that will monitor the spawned off process
     watch_dog = multiprocessing.Process(target=process_watchdog,
-                                        args=(function_process, self.process_info_path, 3600, action))
+                                        args=(function_process, self.process_info_path,
+                                              process_time, action))
     self.watch_dog = watch_dog
     watch_dog.start()
@@ -2,6 +2,7 @@ import json
 from time import sleep
 
 from presqt.utilities import read_file, write_file
+from presqt.utilities.utils.job_control import TIMEOUT_MESSAGE
 
 
 def process_watchdog(function_process, process_info_path, process_time, action):
@@ -44,6 +45,6 @@ def process_watchdog(function_process, process_info_path, process_time, action):
     # the monitored process and update the process_info.json file.
     function_process.terminate()
     process_info_data[action]['status'] = 'failed'
-    process_info_data[action]['message'] = 'The process took too long on the server.'
+    process_info_data[action]['message'] = TIMEOUT_MESSAGE
     process_info_data[action]['status_code'] = 504
     write_file(process_info_path, process_info_data, True)
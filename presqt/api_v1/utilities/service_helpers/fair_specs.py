@@ -0,0 +1,97 @@
+from presqt.utilities import PresQTError, read_file
+
+FAIRSHARE_SPEC_PATH = 'presqt/specs/services/fairshare/fairshare_description_fetch.json'
+FAIRSHAKE_RUBRIC_SPEC_PATH = 'presqt/specs/services/fairshake/fairshake_test_fetch.json'
+FAIRSHAKE_SCORE_SPEC_PATH = 'presqt/specs/services/fairshake/fairshake_score_translator.json'
+FAIRSHARE_FAIRSHAKE_SPEC_PATH = 'presqt/specs/services/fairshake/fairshare_fairshake_helper.json'
+
+
+def load_fairshare_tests():
+    """
+    Load the FAIRshare tests PresQT offers.
+
+    Returns
+    -------
+    Dictionary of each test's name, description and id keyed by its metric link and the
+    dictionary of metric links keyed by test id.
+    """
+    tests = {}
+    test_links = {}
+    for metric_link, test_info in read_file(FAIRSHARE_SPEC_PATH, True).items():
+        try:
+            test_id = int(metric_link.rpartition('/')[2])
+            tests[metric_link] = {'test_name': test_info['test_name'],
+                                  'description': test_info['description'],
+                                  'test_id': test_id}
+        except (ValueError, KeyError, TypeError):
+            raise PresQTError("{} has an invalid entry for '{}'.".format(
+                FAIRSHARE_SPEC_PATH, metric_link))
+        test_links[test_id] = metric_link
+    return tests, test_links
+
+
+def load_fairshake_rubrics(scores, fairshare_tests):
+    """
+    Load the FAIRshake rubrics PresQT offers along with how FAIRshare tests answer the
+    automatic rubric.
+
+    Parameters
+    ----------
+    scores : dict
+        The FAIRshake answer values and what they mean.
+    fairshare_tests : dict
+        The FAIRshare tests keyed by metric link.
+
+    Returns
+    -------
+    Dictionary of each rubric's metrics keyed by rubric id and the dictionary of FAIRshake
+    metrics keyed by the FAIRshare metric link that answers them.
+    """
+    rubrics = read_file(FAIRSHAKE_RUBRIC_SPEC_PATH, True)
+    for rubric_id, metrics in rubrics.items():
+        if not isinstance(metrics, dict) or not all(isinstance(text, str)
+                                                    for text in metrics.values()):
+            raise PresQTError("{} has invalid metrics for rubric '{}'.".format(
+                FAIRSHAKE_RUBRIC_SPEC_PATH, rubric_id))
+
+    fairshake_metrics = read_file(FAIRSHARE_FAIRSHAKE_SPEC_PATH, True)
+    for metric_link, metric_id in fairshake_metrics.items():
+        if metric_link not in fairshare_tests or metric_id not in rubrics.get('96', {}):
+            raise PresQTError("{} maps '{}' to '{}' which isn't a known test and metric.".format(
+                FAIRSHARE_FAIRSHAKE_SPEC_PATH, metric_link, metric_id))
+
+    if not all(isinstance(words, str) for words in scores.values()):
+        raise PresQTError("{} has an invalid score.".format(FAIRSHAKE_SCORE_SPEC_PATH))
+    return rubrics, fairshake_metrics
+
+
+def build_rubric_payload(metrics, scores):
+    """
+    Build the details of a rubric returned by FairshakeAssessment.get.
+
+    Parameters
+    ----------
+    metrics : dict
+        The rubric's metrics keyed by metric id.
+    scores : dict
+        The FAIRshake answer values and what they mean.
+
+    Returns
+    -------
+    Dictionary of the rubric's metrics and answer options.
+    """
+    return {
+        "metrics": [{'id': key, 'metric_value': value} for key, value in metrics.items()],
+        "answer_options": [{'value': key, 'value_text': value} for key, value in scores.items()]
+    }
+
+
+# The specs are loaded, checked and indexed once when the server starts
+FAIRSHARE_TESTS, FAIRSHARE_TEST_LINKS = load_fairshare_tests()
+FAIRSHARE_TEST_LIST = [{"test_name": test['test_name'],
+                        "description": test['description'],
+                        "test_id": test['test_id']} for test in FAIRSHARE_TESTS.values()]
+FAIRSHAKE_SCORES = read_file(FAIRSHAKE_SCORE_SPEC_PATH, True)
+FAIRSHAKE_RUBRICS, FAIRSHAKE_METRICS = load_fairshake_rubrics(FAIRSHAKE_SCORES, FAIRSHARE_TESTS)
+FAIRSHAKE_RUBRIC_PAYLOADS = {rubric_id: build_rubric_payload(metrics, FAIRSHAKE_SCORES)
+                             for rubric_id, metrics in FAIRSHAKE_RUBRICS.items()}
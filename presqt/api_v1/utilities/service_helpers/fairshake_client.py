@@ -0,0 +1,264 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import coreapi
+import requests
+from coreapi.codecs import CoreJSONCodec
+from coreapi.utils import negotiate_decoder
+from rest_framework import status
+
+from config.settings.base import FAIRSHAKE_TOKEN, MEDIA_ROOT, PRESQT_FAIRSHAKE_SCHEMA_TTL
+from presqt.api_v1.utilities.service_helpers.fair_specs import (
+    FAIRSHAKE_METRICS, FAIRSHAKE_RUBRICS, FAIRSHAKE_SCORES)
+from presqt.api_v1.utilities.service_helpers.fairshare_evaluation import fairshare_evaluation
+from presqt.api_v1.utilities.service_helpers.fairshare_results import fairshare_results
+from presqt.utilities import PresQTResponseException
+
+FAIRSHAKE_SCHEMA_URL = 'https://fairshake.cloud/coreapi/'
+FAIRSHAKE_SCHEMA_CACHE_PATH = os.path.join(MEDIA_ROOT, 'fairshake_schema.json')
+# The PresQT project id on FAIRshake
+FAIRSHAKE_PROJECT_ID = 116
+# The FAIRshare tests that answer the automatic rubric
+FAIRSHAKE_AUTOMATIC_TESTS = [1, 5, 8, 10, 17, 22]
+# Number of assessments of a bulk request posted to FAIRshake at the same time
+FAIRSHAKE_BULK_WORKERS = 4
+
+# The client and schema are shared by every assessment made in this process
+_session = None
+_client = None
+_schema = None
+_client_lock = threading.Lock()
+
+
+def get_fairshake_client():
+    """
+    Get the FAIRshake API client along with the API schema. The client keeps its HTTP session
+    open between assessments and the schema is only downloaded when the cached one is out of date.
+
+    Returns
+    -------
+    The coreapi client and the FAIRshake API schema document.
+    """
+    global _session, _client, _schema
+    with _client_lock:
+        if _client is None:
+            _session = requests.Session()
+            _client = coreapi.Client(
+                auth=coreapi.auth.TokenAuthentication(token=FAIRSHAKE_TOKEN, scheme='token'),
+                session=_session)
+            _schema = None
+        if _schema is None or time.time() - _schema[1] > PRESQT_FAIRSHAKE_SCHEMA_TTL:
+            _schema = (get_fairshake_schema(_session, _client.decoders), time.time())
+        return _client, _schema[0]
+
+
+def get_fairshake_schema(session, decoders):
+    """
+    Get the FAIRshake API schema from the disk cache. Once the cache is older than
+    PRESQT_FAIRSHAKE_SCHEMA_TTL, or was written by another version of coreapi, FAIRshake is asked
+    whether the schema has changed and it's only downloaded again if it has.
+
+    Parameters
+    ----------
+    session : requests.Session
+        The FAIRshake API client's session.
+    decoders : list
+        The FAIRshake API client's codecs.
+
+    Returns
+    -------
+    The FAIRshake API schema document.
+    """
+    codec = CoreJSONCodec()
+    try:
+        with open(FAIRSHAKE_SCHEMA_CACHE_PATH, 'r') as cache_file:
+            cache = json.load(cache_file)
+    except (FileNotFoundError, ValueError):
+        cache = None
+    if cache and cache['coreapi_version'] != coreapi.__version__:
+        cache = None
+
+    if cache and time.time() - cache['checked_at'] < PRESQT_FAIRSHAKE_SCHEMA_TTL:
+        return codec.decode(cache['schema'].encode(), base_url=FAIRSHAKE_SCHEMA_URL)
+
+    headers = {'Accept': ', '.join(decoder.media_type for decoder in decoders)}
+    if cache and cache['etag']:
+        headers['If-None-Match'] = cache['etag']
+    if cache and cache['last_modified']:
+        headers['If-Modified-Since'] = cache['last_modified']
+
+    try:
+        response = session.get(FAIRSHAKE_SCHEMA_URL, headers=headers)
+    except requests.RequestException:
+        # Keep using the cached schema until FAIRshake can be reached again
+        if cache:
+            return codec.decode(cache['schema'].encode(), base_url=FAIRSHAKE_SCHEMA_URL)
+        response = None
+    not_modified = cache is not None and response is not None and response.status_code == 304
+    if not not_modified and (response is None or not response.ok):
+        raise PresQTResponseException("FAIRshake Error: Invalid token provided in code.",
+                                      status.HTTP_400_BAD_REQUEST)
+
+    if not_modified:
+        schema = codec.decode(cache['schema'].encode(), base_url=FAIRSHAKE_SCHEMA_URL)
+    else:
+        decoder = negotiate_decoder(decoders, response.headers.get('content-type'))
+        schema = decoder.decode(response.content, base_url=FAIRSHAKE_SCHEMA_URL)
+        cache = {
+            'coreapi_version': coreapi.__version__,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'schema': codec.encode(schema).decode()
+        }
+    cache['checked_at'] = time.time()
+
+    os.makedirs(os.path.dirname(FAIRSHAKE_SCHEMA_CACHE_PATH), exist_ok=True)
+    build_path = '{}.build'.format(FAIRSHAKE_SCHEMA_CACHE_PATH)
+    with open(build_path, 'w') as cache_file:
+        json.dump(cache, cache_file)
+    os.replace(build_path, FAIRSHAKE_SCHEMA_CACHE_PATH)
+    return schema
+
+
+def fairshake_rubric_answers(rubric_id, rubric_answers, project_url, project_title):
+    """
+    Build the answers of an assessment. The automatic rubric is answered from the project's
+    FAIRshare evaluation and the others from the answers the user gave.
+
+    Parameters
+    ----------
+    rubric_id : str
+        The id of the rubric the assessment answers.
+    rubric_answers : dict
+        The user's answers keyed by metric id. None for the automatic rubric.
+    project_url : str
+        The url of the digital object.
+    project_title : str
+        The title of the digital object.
+
+    Returns
+    -------
+    List of answers to post with the assessment.
+    """
+    if rubric_id != '96':
+        # Need to translate the JSON strings to ints and floats
+        return [{'metric': int(key), 'answer': float(value)}
+                for key, value in rubric_answers.items()]
+
+    response_json = fairshare_evaluation(project_url, f"{project_title} FAIR Evaluation")
+    assessment_answers = []
+    for result in fairshare_results(response_json, FAIRSHAKE_AUTOMATIC_TESTS):
+        # Translate successes and failures to yes's and no's
+        if result['successes']:
+            answer = 1.0
+        elif result['failures']:
+            answer = 0.0
+        else:
+            answer = 0.5
+        assessment_answers.append({
+            'metric': FAIRSHAKE_METRICS[result['metric_link']],
+            'answer': answer
+        })
+    return assessment_answers
+
+
+def fairshake_assessment(rubric_id, digital_object_type, project_url, project_title,
+                         assessment_answers):
+    """
+    Register a digital object with FAIRshake and post an assessment of it.
+
+    Parameters
+    ----------
+    rubric_id : str
+        The id of the rubric the assessment answers.
+    digital_object_type : str
+        The FAIRshake type of the digital object.
+    project_url : str
+        The url of the digital object.
+    project_title : str
+        The title of the digital object.
+    assessment_answers : list
+        The metric ids and answers of the assessment.
+
+    Returns
+    -------
+    Dictionary of the digital object's id and the assessment's scores.
+    """
+    client, schema = get_fairshake_client()
+    try:
+        digital_object = client.action(schema, ['digital_object', 'create'], params=dict(
+            url=project_url,
+            title=project_title,
+            projects=[FAIRSHAKE_PROJECT_ID],
+            type=digital_object_type,
+            rubrics=[int(rubric_id)]
+        ))
+        digital_object_id = digital_object['id']
+    except coreapi.exceptions.ErrorMessage:
+        raise PresQTResponseException(
+            "FAIRshake Error: Returned an error trying to register digital object.",
+            status.HTTP_400_BAD_REQUEST)
+
+    try:
+        assessment = client.action(schema, ['assessment', 'create'], params=dict(
+            project=FAIRSHAKE_PROJECT_ID,
+            target=digital_object_id,
+            rubric=int(rubric_id),
+            methodology="self",
+            answers=assessment_answers,
+            published=True))
+    except coreapi.exceptions.ErrorMessage:
+        raise PresQTResponseException(
+            "FAIRshake Error: Returned an error trying to post manual assessment.",
+            status.HTTP_400_BAD_REQUEST)
+
+    results = []
+    for score in assessment['answers']:
+        score_number = str(score['answer'])
+        results.append({
+            "metric": FAIRSHAKE_RUBRICS[rubric_id][str(score['metric'])],
+            "score": score_number,
+            "score_explanation": FAIRSHAKE_SCORES[score_number]
+        })
+
+    return {
+        "digital_object_id": digital_object_id,
+        "rubric_responses": results
+    }
+
+
+def fairshake_bulk_assessment(assessments):
+    """
+    Register and assess several digital objects at once. The assessments share the client's
+    session and schema and are posted to FAIRshake at the same time.
+
+    Parameters
+    ----------
+    assessments : list
+        Dictionaries of each assessment's rubric id, digital object type, project url,
+        project title and rubric answers.
+
+    Returns
+    -------
+    List of each assessment's digital object id and scores, or its error, in the same order as
+    the assessments.
+    """
+    # Any problem with the client itself fails every assessment so raise it up front
+    get_fairshake_client()
+
+    def assess(assessment):
+        try:
+            assessment_answers = fairshake_rubric_answers(
+                assessment['rubric_id'], assessment['rubric_answers'],
+                assessment['project_url'], assessment['project_title'])
+            return fairshake_assessment(
+                assessment['rubric_id'], assessment['digital_object_type'],
+                assessment['project_url'], assessment['project_title'], assessment_answers)
+        except PresQTResponseException as e:
+            return {'error': e.data, 'status_code': e.status_code}
+
+    with ThreadPoolExecutor(max_workers=FAIRSHAKE_BULK_WORKERS) as executor:
+        return list(executor.map(assess, assessments))
@@ -0,0 +1,277 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+import requests
+from dateutil.relativedelta import relativedelta
+from django.utils import timezone
+from rest_framework import status
+
+from config.settings.base import MEDIA_ROOT, PRESQT_FAIRSHARE_CACHE_TTL
+from presqt.api_v1.utilities.multiprocess.spawn_action_process import spawn_action_process
+from presqt.api_v1.utilities.service_helpers.fairshare_results import fairshare_results
+from presqt.api_v1.utilities.utils.job_index import (new_job_id, is_job_in_progress, index_job,
+                                                     add_job_user, ANONYMOUS_OWNER)
+from presqt.api_v1.utilities.utils.send_email import email_blaster
+from presqt.api_v1.utilities.utils.update_or_create_process_info import \
+    update_or_create_process_info
+from presqt.utilities import PresQTResponseException
+
+# 16 is the id of the PresQT test collection
+FAIRSHARE_COLLECTION = '16'
+FAIRSHARE_EVALUATE_URL = 'https://w3id.org/FAIR_Evaluator/collections/{}/evaluate'
+FAIRSHARE_CACHE_PATH = os.path.join(MEDIA_ROOT, 'fairshare_cache.sqlite3')
+
+
+def connect_fairshare_cache():
+    """
+    Open a connection to the FAIRshare evaluation cache, creating it if it doesn't exist yet.
+    'evaluations' holds FAIRshare's response for each evaluated resource. 'evaluation_jobs' holds
+    the latest evaluation job started for each resource and list of tests, and
+    'evaluation_job_emails' the addresses to email each job's results to.
+
+    Returns
+    -------
+    sqlite3.Connection
+    """
+    os.makedirs(os.path.dirname(FAIRSHARE_CACHE_PATH), exist_ok=True)
+    connection = sqlite3.connect(FAIRSHARE_CACHE_PATH, timeout=30)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS evaluations (resource TEXT NOT NULL, collection TEXT NOT NULL, '
+        'response TEXT NOT NULL, evaluated_at REAL NOT NULL, PRIMARY KEY (resource, collection))')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS evaluation_jobs (resource TEXT NOT NULL, '
+        'collection TEXT NOT NULL, tests TEXT NOT NULL, job_id TEXT NOT NULL, '
+        'PRIMARY KEY (resource, collection, tests))')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS evaluation_job_emails (job_id TEXT NOT NULL, '
+        'email TEXT NOT NULL, PRIMARY KEY (job_id, email))')
+    return connection
+
+
+def get_cached_fairshare_evaluation(resource_id, collection=FAIRSHARE_COLLECTION):
+    """
+    Get a resource's FAIRshare evaluation from the cache.
+
+    Parameters
+    ----------
+    resource_id : str
+        The url or DOI of the evaluated resource.
+    collection : str
+        The id of the FAIRshare test collection the resource was evaluated with.
+
+    Returns
+    -------
+    The dictionary FAIRshare returned for the evaluation or None if there's no fresh evaluation.
+    """
+    with closing(connect_fairshare_cache()) as connection:
+        row = connection.execute(
+            'SELECT response, evaluated_at FROM evaluations WHERE resource = ? AND collection = ?',
+            (resource_id, collection)).fetchone()
+    if row and time.time() - row[1] < PRESQT_FAIRSHARE_CACHE_TTL:
+        return json.loads(row[0])
+    return None
+
+
+def fairshare_evaluation(resource_id, title="PresQT Fair Evaluation",
+                         collection=FAIRSHARE_COLLECTION):
+    """
+    Evaluate a resource with FAIRshare. Evaluations are served from the cache when there's a
+    fresh one as FAIRshare can take several minutes to run them.
+
+    Parameters
+    ----------
+    resource_id : str
+        The url or DOI of the resource to evaluate.
+    title : str
+        The title given to the evaluation on FAIRshare.
+    collection : str
+        The id of the FAIRshare test collection to evaluate the resource with.
+
+    Returns
+    -------
+    The dictionary FAIRshare returned for the evaluation.
+    """
+    response_json = get_cached_fairshare_evaluation(resource_id, collection)
+    if response_json:
+        return response_json
+
+    data = {
+        'resource': resource_id,
+        'executor': "PresQT",
+        'title': title
+    }
+    response = requests.post(
+        FAIRSHARE_EVALUATE_URL.format(collection),
+        headers={"Content-Type": "application/json", "Accept": "application/json"},
+        data=json.dumps(data))
+    if response.status_code != 200:
+        raise PresQTResponseException(
+            "FAIRshare returned a {} error trying to process the request".format(
+                response.status_code), status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    response_json = response.json()
+    with closing(connect_fairshare_cache()) as connection, connection:
+        connection.execute('INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?)',
+                           (resource_id, collection, json.dumps(response_json), time.time()))
+    return response_json
+
+
+class FairshareEvaluationJob(object):
+    """
+    Runs a FAIRshare evaluation as its own job. The job's status and results are kept under
+    the 'fairshare_evaluation' action of its job id and served by the job_status endpoint.
+    Requests for a resource and list of tests that are already being evaluated join the running
+    job rather than starting another. Jobs are indexed under the hash of each requesting user's
+    token, if they gave one.
+    """
+    action = 'fairshare_evaluation'
+
+    def __init__(self, resource_id, test_list, title="PresQT Fair Evaluation", email=None,
+                 user_hash=None):
+        """
+        Parameters
+        ----------
+        resource_id : str
+            The url or DOI of the resource to evaluate.
+        test_list : list
+            The ids of the tests to return results for.
+        title : str
+            The title given to the evaluation on FAIRshare.
+        email : str
+            Address to email the results to once the evaluation finishes.
+        user_hash : str
+            Hash of the requesting user's token, if they gave one.
+        """
+        self.resource_id = resource_id
+        self.test_list = test_list
+        self.title = title
+        self.email = email
+        self.user_hash = user_hash
+        self.ticket_number = None
+        self.process_info_path = None
+        self.process_info_obj = None
+
+    def start(self):
+        """
+        Spawn the evaluation separate from the request server, or join the job already
+        evaluating the resource with the same tests.
+
+        Returns
+        -------
+        The job's id.
+        """
+        tests = json.dumps(sorted(self.test_list))
+        with closing(connect_fairshare_cache()) as connection:
+            # Only one request at a time looks for a running job or starts one
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                row = connection.execute(
+                    'SELECT job_id FROM evaluation_jobs '
+                    'WHERE resource = ? AND collection = ? AND tests = ?',
+                    (self.resource_id, FAIRSHARE_COLLECTION, tests)).fetchone()
+                if row and is_job_in_progress(row[0], self.action):
+                    self.ticket_number = row[0]
+                    self._add_email(connection)
+                    if self.user_hash:
+                        add_job_user(self.ticket_number, self.user_hash)
+                    return self.ticket_number
+
+                self.ticket_number = new_job_id()
+                self._add_email(connection)
+                connection.execute('INSERT OR REPLACE INTO evaluation_jobs VALUES (?, ?, ?, ?)',
+                                   (self.resource_id, FAIRSHARE_COLLECTION, tests,
+                                    self.ticket_number))
+                self._write_process_info()
+                index_job(self.ticket_number, self.user_hash or ANONYMOUS_OWNER, self.action)
+            finally:
+                connection.commit()
+
+        spawn_action_process(self, self._evaluate, self.action)
+        return self.ticket_number
+
+    def _add_email(self, connection):
+        """
+        Add the request's email address to the ones the job's results are sent to.
+        """
+        if self.email:
+            connection.execute('INSERT OR IGNORE INTO evaluation_job_emails VALUES (?, ?)',
+                               (self.ticket_number, self.email))
+
+    def _write_process_info(self):
+        """
+        Write the process_info file of a new job.
+        """
+        self.process_info_obj = {
+            'status': 'in_progress',
+            'expiration': str(timezone.now() + relativedelta(hours=5)),
+            'message': "Running FAIRshare Evaluator Service, this may take several minutes...",
+            'status_code': None,
+            'function_process_id': None,
+            'resource_id': self.resource_id,
+            'fairshare_evaluation_results': []
+        }
+        self.process_info_path = update_or_create_process_info(
+            self.process_info_obj, self.action, self.ticket_number)
+
+    def _evaluate(self):
+        """
+        Run the evaluation and save its results to the process_info file.
+        """
+        self.process_info_obj['function_process_id'] = self.function_process.pid
+        update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+
+        try:
+            response_json = fairshare_evaluation(self.resource_id, self.title)
+        except PresQTResponseException as e:
+            self.process_info_obj['status'] = 'failed'
+            self.process_info_obj['message'] = e.data
+            self.process_info_obj['status_code'] = e.status_code
+            self.process_info_obj['expiration'] = str(timezone.now() + relativedelta(hours=1))
+            self._finish()
+            return
+
+        results = fairshare_results(response_json, self.test_list)
+        self.process_info_obj['status'] = 'finished'
+        self.process_info_obj['message'] = "FAIRshare Evaluator Service finished."
+        self.process_info_obj['status_code'] = '200'
+        self.process_info_obj['fairshare_evaluation_results'] = results
+        emails = self._finish()
+
+        for email in emails:
+            message = "The FAIRshare Evaluator process you started on PresQT for identifier '{}' has finished.".format(
+                self.resource_id)
+            context = {
+                "fairshare_message": message,
+                "results_list": results
+            }
+            email_blaster(email, "PresQT FAIRshare Evaluator Results", context,
+                          "emails/fair_email.html")
+
+    def _finish(self):
+        """
+        Save the job's final status. This happens while no request can join the job, so every
+        request that joined it is either emailed or starts a new job.
+
+        Returns
+        -------
+        The addresses to email the job's results to.
+        """
+        with closing(connect_fairshare_cache()) as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                update_or_create_process_info(
+                    self.process_info_obj, self.action, self.ticket_number)
+                emails = [row[0] for row in connection.execute(
+                    'SELECT email FROM evaluation_job_emails WHERE job_id = ?',
+                    (self.ticket_number,))]
+                connection.execute('DELETE FROM evaluation_job_emails WHERE job_id = ?',
+                                   (self.ticket_number,))
+                connection.execute('DELETE FROM evaluation_jobs WHERE job_id = ?',
+                                   (self.ticket_number,))
+            finally:
+                connection.commit()
+        return emails
@@ -1,6 +1,6 @@
 import json
 
-from presqt.utilities import read_file
+from presqt.api_v1.utilities.service_helpers.fair_specs import FAIRSHARE_TESTS
 
 
 def fairshare_results(response_json, test_list):
@@ -21,17 +21,17 @@ def fairshare_results(response_json, test_list):
     evaluation_results = response_json['evaluationResult']
     evaluation_results_json = json.loads(evaluation_results)
     results_list = []
-    fairshare_test_info = read_file("presqt/specs/services/fairshare/fairshare_description_fetch.json",
-                                    True)
+    test_ids = set(test_list)
 
     # Loop through evaluations and build some dicts
     for metric, results in evaluation_results_json.items():
+        test_info = FAIRSHARE_TESTS.get(metric)
         # Only return results for the tests specified by the user...
-        if int(metric.rpartition("/")[2]) in test_list:
+        if test_info and test_info['test_id'] in test_ids:
             result_dict = {
                 'metric_link': metric,
-                'test_name': fairshare_test_info[metric]['test_name'],
-                'description': fairshare_test_info[metric]['description'],
+                'test_name': test_info['test_name'],
+                'description': test_info['description'],
                 'successes': [],
                 'failures': [],
                 'warnings': []
@@ -0,0 +1,224 @@
+import os
+import shutil
+from contextlib import closing
+from time import sleep
+
+from rest_framework import status
+
+from config.settings.base import MEDIA_ROOT, PRESQT_DISK_RESERVE, PRESQT_USER_DISK_QUOTA
+from presqt.api_v1.utilities.utils.job_index import (connect_job_index, get_job_users,
+                                                     get_user_jobs, is_job_in_progress)
+from presqt.utilities import PresQTValidationError, read_file, write_file, PROCESS_INFO_LOCK
+
+JOBS_DIRECTORY = os.path.join(MEDIA_ROOT, 'jobs')
+
+DISK_SPACE_MESSAGE = 'Waiting for free disk space on the server...'
+
+
+def get_directory_size(path):
+    """
+    Get the total size of all files in a directory.
+
+    Parameters
+    ----------
+    path : str
+        Path to the directory.
+
+    Returns
+    -------
+    The size of the directory in bytes.
+    """
+    total_size = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total_size += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                # The file was removed while we were walking the directory
+                pass
+    return total_size
+
+
+def get_reserved_disk_space(connection, ticket_number=None):
+    """
+    Get the disk space that in progress jobs have been admitted with but haven't written yet.
+    Reservations of jobs that are no longer in progress are released.
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection
+        Connection to the job index.
+    ticket_number : str
+        Ticket number of a job to leave out of the count.
+
+    Returns
+    -------
+    The reserved disk space in bytes.
+    """
+    reserved = 0
+    for job_id, action, projected_size in connection.execute(
+            'SELECT job_id, action, projected_size FROM disk_reservations').fetchall():
+        if job_id == ticket_number:
+            continue
+        if not is_job_in_progress(job_id, action):
+            connection.execute('DELETE FROM disk_reservations WHERE job_id = ?', (job_id,))
+            continue
+        reserved += max(projected_size - get_directory_size(os.path.join(JOBS_DIRECTORY, job_id)),
+                        0)
+    return reserved
+
+
+def reserve_disk_space(ticket_number, action, projected_size):
+    """
+    Reserve disk space for a job if there is enough of it. The free space on the mediafiles
+    volume has to cover the reserve, the space already promised to other in progress jobs and
+    the job's projected size.
+
+    Parameters
+    ----------
+    ticket_number : str
+        Ticket number of the job asking for space.
+    action : str
+        The job's action, e.g. 'resource_download'.
+    projected_size : int
+        The disk space the job is expected to use in bytes.
+
+    Returns
+    -------
+    True if the space was reserved.
+    """
+    os.makedirs(JOBS_DIRECTORY, exist_ok=True)
+    with closing(connect_job_index()) as connection:
+        # Only one job at a time reserves space
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            available = shutil.disk_usage(JOBS_DIRECTORY).free - PRESQT_DISK_RESERVE - \
+                get_reserved_disk_space(connection, ticket_number)
+            if projected_size > available:
+                return False
+
+            connection.execute('INSERT OR REPLACE INTO disk_reservations VALUES (?, ?, ?)',
+                               (ticket_number, action, projected_size))
+            return True
+        finally:
+            connection.commit()
+
+
+def update_disk_reservation(ticket_number, action, projected_size):
+    """
+    Set a job's reservation without checking the free space. Used once a job knows how much
+    space it actually needs and that fits in what it was admitted with or is already written.
+
+    Parameters
+    ----------
+    ticket_number : str
+        Ticket number of the job.
+    action : str
+        The job's action, e.g. 'resource_download'.
+    projected_size : int
+        The disk space the job is expected to use in bytes.
+    """
+    with closing(connect_job_index()) as connection, connection:
+        connection.execute('INSERT OR REPLACE INTO disk_reservations VALUES (?, ?, ?)',
+                           (ticket_number, action, projected_size))
+
+
+def get_user_disk_usage(user_hash):
+    """
+    Get the disk space used by all of a user's jobs. Transfers count towards both the source
+    and destination users.
+
+    Parameters
+    ----------
+    user_hash : str
+        Hash of the user's token.
+
+    Returns
+    -------
+    The user's disk usage in bytes.
+    """
+    if not os.path.isdir(JOBS_DIRECTORY):
+        return 0
+
+    # Jobs started before the job index existed are named after their users' token hashes
+    tickets = {job_id for job_id, action, created in get_user_jobs([user_hash])}
+    tickets.update(ticket for ticket in next(os.walk(JOBS_DIRECTORY))[1]
+                   if user_hash in ticket.split('_'))
+    return sum(get_directory_size(os.path.join(JOBS_DIRECTORY, ticket)) for ticket in tickets)
+
+
+def check_user_disk_quota(ticket_number, projected_size):
+    """
+    Verify that a job won't push any of the users it belongs to over their disk quota.
+
+    Parameters
+    ----------
+    ticket_number : str
+        Ticket number of the job, or its owner's token hashes if it isn't indexed yet.
+    projected_size : int
+        The disk space the job is expected to use in bytes.
+    """
+    if not PRESQT_USER_DISK_QUOTA:
+        return
+
+    for user_hash in get_job_users(ticket_number):
+        if get_user_disk_usage(user_hash) + projected_size > PRESQT_USER_DISK_QUOTA:
+            raise PresQTValidationError(
+                "PresQT Error: This request would exceed the user's disk quota of {} bytes on the "
+                "server.".format(PRESQT_USER_DISK_QUOTA), status.HTTP_507_INSUFFICIENT_STORAGE)
+
+
+def disk_space_admission(ticket_number, action, projected_size):
+    """
+    Admission control for jobs started inside of a request. The request is rejected if there
+    isn't enough disk space for it right now, otherwise the space is reserved for the job.
+
+    Parameters
+    ----------
+    ticket_number : str
+        Ticket number of the job.
+    action : str
+        The job's action, e.g. 'resource_upload'.
+    projected_size : int
+        The disk space the job is expected to use in bytes.
+    """
+    check_user_disk_quota(ticket_number, projected_size)
+
+    if not reserve_disk_space(ticket_number, action, projected_size):
+        raise PresQTValidationError(
+            "PresQT Error: The server does not have enough disk space for this request right now. "
+            "Please try again later.", status.HTTP_507_INSUFFICIENT_STORAGE)
+
+
+def wait_for_disk_space(ticket_number, projected_size, process_info_path, action,
+                        job_control=None, interval=5):
+    """
+    Admission control for spawned jobs. The job is deferred until there is enough disk space
+    for it, which is then reserved for the job.
+
+    Parameters
+    ----------
+    ticket_number : str
+        Ticket number of the job.
+    projected_size : int
+        The disk space the job is expected to use in bytes.
+    process_info_path : str
+        Path to the process_info.json file for the job.
+    action : str
+        The action to update in the process_info.json object.
+    job_control : JobControl
+        The job's JobControl. PresQTJobStopped is raised if the job is stopped while it waits.
+    interval : int
+        Number of seconds to wait between disk space checks.
+    """
+    check_user_disk_quota(ticket_number, projected_size)
+
+    while not reserve_disk_space(ticket_number, action, projected_size):
+        if job_control is not None:
+            job_control.check()
+        with PROCESS_INFO_LOCK:
+            process_info_data = read_file(process_info_path, True)
+            if process_info_data[action]['message'] != DISK_SPACE_MESSAGE:
+                process_info_data[action]['message'] = DISK_SPACE_MESSAGE
+                write_file(process_info_path, process_info_data, True)
+        sleep(interval)
@@ -0,0 +1,119 @@
+import os
+import sqlite3
+from contextlib import closing
+
+from dateutil.parser import parse
+from django.utils import timezone
+
+from config.settings.base import MEDIA_ROOT
+
+EXPIRY_INDEX_PATH = os.path.join(MEDIA_ROOT, 'expiry_index.sqlite3')
+
+
+def connect_expiry_index():
+    """
+    Open a connection to the expiry index, creating it if it doesn't exist yet.
+    The index holds one row per action in a mediafiles directory along with the action's
+    expiration so expired directories can be found with a range query.
+
+    Returns
+    -------
+    sqlite3.Connection
+    """
+    os.makedirs(os.path.dirname(EXPIRY_INDEX_PATH), exist_ok=True)
+    connection = sqlite3.connect(EXPIRY_INDEX_PATH, timeout=30)
+    # Job processes, request workers and the sweeper all use the index at the same time
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS expirations ('
+        'directory TEXT NOT NULL, action TEXT NOT NULL, expiration REAL NOT NULL, '
+        'PRIMARY KEY (directory, action))')
+    connection.execute(
+        'CREATE INDEX IF NOT EXISTS expirations_expiration ON expirations (expiration)')
+    return connection
+
+
+def index_expiration(directory, action, expiration):
+    """
+    Add or update the expiration of an action in the expiry index.
+
+    Parameters
+    ----------
+    directory : str
+        Directory the action's files are saved in, relative to the mediafiles directory.
+        Example: 'jobs/1234'
+    action : str
+        The action the expiration belongs to.
+    expiration : str or datetime
+        When the action's files can be deleted.
+    """
+    if isinstance(expiration, str):
+        expiration = parse(expiration)
+
+    with closing(connect_expiry_index()) as connection, connection:
+        connection.execute('INSERT OR REPLACE INTO expirations VALUES (?, ?, ?)',
+                           (directory, action, expiration.timestamp()))
+
+
+def index_process_info(directory, process_info_data):
+    """
+    Add or update the expirations of every action in a process_info.json file.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the process_info.json file, relative to the mediafiles directory.
+    process_info_data : dict
+        Contents of the process_info.json file.
+    """
+    for action, value in process_info_data.items():
+        if isinstance(value, dict) and 'expiration' in value:
+            index_expiration(directory, action, value['expiration'])
+
+
+def get_expired_directories(now=None):
+    """
+    Get the directories where every action has expired. A directory with any action that
+    hasn't expired yet, such as a job that is still running, is never returned.
+
+    Parameters
+    ----------
+    now : datetime
+        The time to compare expirations to. Defaults to the current time.
+
+    Returns
+    -------
+    List of directories relative to the mediafiles directory.
+    """
+    now = (now or timezone.now()).timestamp()
+    with closing(connect_expiry_index()) as connection:
+        rows = connection.execute(
+            'SELECT DISTINCT directory FROM expirations WHERE expiration <= ? AND directory NOT IN '
+            '(SELECT directory FROM expirations WHERE expiration > ?)', (now, now)).fetchall()
+    return [row[0] for row in rows]
+
+
+def get_indexed_directories():
+    """
+    Get every directory in the expiry index.
+
+    Returns
+    -------
+    Set of directories relative to the mediafiles directory.
+    """
+    with closing(connect_expiry_index()) as connection:
+        rows = connection.execute('SELECT DISTINCT directory FROM expirations').fetchall()
+    return {row[0] for row in rows}
+
+
+def remove_indexed_directory(directory):
+    """
+    Remove all of a directory's actions from the expiry index.
+
+    Parameters
+    ----------
+    directory : str
+        Directory relative to the mediafiles directory.
+    """
+    with closing(connect_expiry_index()) as connection, connection:
+        connection.execute('DELETE FROM expirations WHERE directory = ?', (directory,))
@@ -1,45 +1,52 @@
-from presqt.targets.github.functions.fetch import github_fetch_resources, github_fetch_resource
-from presqt.targets.github.functions.download import github_download_resource
-from presqt.targets.github.functions.upload import github_upload_resource
-from presqt.targets.github.functions.upload_metadata import github_upload_metadata
-from presqt.targets.github.functions.keywords import github_fetch_keywords, github_upload_keywords
+import importlib
 
-from presqt.targets.curate_nd.functions.fetch import (
-    curate_nd_fetch_resources, curate_nd_fetch_resource)
-from presqt.targets.curate_nd.functions.download import curate_nd_download_resource
-from presqt.targets.curate_nd.functions.keywords import curate_nd_fetch_keywords
+from presqt.utilities import read_file
 
-from presqt.targets.osf.functions.fetch import osf_fetch_resources, osf_fetch_resource
-from presqt.targets.osf.functions.download import osf_download_resource
-from presqt.targets.osf.functions.upload import osf_upload_resource
-from presqt.targets.osf.functions.upload_metadata import osf_upload_metadata
-from presqt.targets.osf.functions.keywords import osf_fetch_keywords, osf_upload_keywords
-
-from presqt.targets.zenodo.functions.fetch import zenodo_fetch_resources, zenodo_fetch_resource
-from presqt.targets.zenodo.functions.download import zenodo_download_resource
-from presqt.targets.zenodo.functions.upload import zenodo_upload_resource
-from presqt.targets.zenodo.functions.upload_metadata import zenodo_upload_metadata
-from presqt.targets.zenodo.functions.keywords import zenodo_fetch_keywords, zenodo_upload_keywords
-
-from presqt.targets.gitlab.functions.fetch import gitlab_fetch_resources, gitlab_fetch_resource
-from presqt.targets.gitlab.functions.download import gitlab_download_resource
-from presqt.targets.gitlab.functions.upload import gitlab_upload_resource
-from presqt.targets.gitlab.functions.upload_metadata import gitlab_upload_metadata
-from presqt.targets.gitlab.functions.keywords import gitlab_fetch_keywords, gitlab_upload_keywords
-
-from presqt.targets.figshare.functions.fetch import figshare_fetch_resources, figshare_fetch_resource
-from presqt.targets.figshare.functions.download import figshare_download_resource
-from presqt.targets.figshare.functions.upload import figshare_upload_resource
-from presqt.targets.figshare.functions.upload_metadata import figshare_upload_metadata
-from presqt.targets.figshare.functions.keywords import figshare_fetch_keywords, figshare_upload_keywords
 
+class LazyFunctionRegistry(type):
+    """
+    Resolve FunctionRouter attributes from the 'functions' of each target in targets.json.
+    A target's module is only imported the first time one of its functions is used, so
+    processes don't pay for importing every target when they start.
+    """
+    # {'{target_name}_{action}': 'dotted.path.to.function'}, read from targets.json on first use
+    _registry = None
 
-class FunctionRouter(object):
+    def get_registry(cls):
+        """
+        Get the dotted path of every target function by '{target_name}_{action}'.
+        """
+        if cls._registry is None:
+            cls._registry = {
+                '{}_{}'.format(target['name'], action): function_path
+                for target in read_file('presqt/specs/targets.json', True)
+                for action, function_path in target.get('functions', {}).items()}
+        return cls._registry
+
+    def __getattr__(cls, name):
+        # Only called for attributes that aren't set yet
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            function_path = cls.get_registry()[name]
+        except KeyError:
+            raise AttributeError(
+                "FunctionRouter has no function '{}' in targets.json".format(name))
+
+        module_name, _, function_name = function_path.rpartition('.')
+        function = getattr(importlib.import_module(module_name), function_name)
+        # Later lookups get the function without going through the registry again
+        setattr(cls, name, function)
+        return function
+
+
+class FunctionRouter(object, metaclass=LazyFunctionRegistry):
     """
     This class acts as a router to allow dynamic function calls based on a given variable.
 
-    Each attribute links to a function. Naming conventions are important. They must match the keys
-    we keep in the target.json config file. They are as follows:
+    Each attribute links to a function. The functions are listed in the 'functions' of each
+    target in targets.json, by action. Naming conventions are important. The actions must match
+    the keys we keep in the target.json config file. They are as follows:
 
     Target Resources Collection:
         {target_name}_resource_collection
@@ -64,48 +71,3 @@ class FunctionRouter(object):
         is easier to work with.
         """
         return getattr(cls, '{}_{}'.format(target_name, action))
-
-    osf_resource_collection = osf_fetch_resources
-    osf_resource_detail = osf_fetch_resource
-    osf_resource_download = osf_download_resource
-    osf_resource_upload = osf_upload_resource
-    osf_metadata_upload = osf_upload_metadata
-    osf_keywords = osf_fetch_keywords
-    osf_keywords_upload = osf_upload_keywords
-
-    curate_nd_resource_collection = curate_nd_fetch_resources
-    curate_nd_resource_detail = curate_nd_fetch_resource
-    curate_nd_resource_download = curate_nd_download_resource
-    curate_nd_keywords = curate_nd_fetch_keywords
-
-    github_resource_collection = github_fetch_resources
-    github_resource_detail = github_fetch_resource
-    github_resource_download = github_download_resource
-    github_resource_upload = github_upload_resource
-    github_metadata_upload = github_upload_metadata
-    github_keywords = github_fetch_keywords
-    github_keywords_upload = github_upload_keywords
-
-    zenodo_resource_collection = zenodo_fetch_resources
-    zenodo_resource_detail = zenodo_fetch_resource
-    zenodo_resource_download = zenodo_download_resource
-    zenodo_resource_upload = zenodo_upload_resource
-    zenodo_metadata_upload = zenodo_upload_metadata
-    zenodo_keywords = zenodo_fetch_keywords
-    zenodo_keywords_upload = zenodo_upload_keywords
-
-    gitlab_resource_collection = gitlab_fetch_resources
-    gitlab_resource_detail = gitlab_fetch_resource
-    gitlab_resource_download = gitlab_download_resource
-    gitlab_resource_upload = gitlab_upload_resource
-    gitlab_metadata_upload = gitlab_upload_metadata
-    gitlab_keywords = gitlab_fetch_keywords
-    gitlab_keywords_upload = gitlab_upload_keywords
-
-    figshare_resource_collection = figshare_fetch_resources
-    figshare_resource_detail = figshare_fetch_resource
-    figshare_resource_download = figshare_download_resource
-    figshare_resource_upload = figshare_upload_resource
-    figshare_metadata_upload = figshare_upload_metadata
-    figshare_keywords = figshare_fetch_keywords
-    figshare_keywords_upload = figshare_upload_keywords
\ No newline at end of file
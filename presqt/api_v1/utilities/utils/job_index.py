@@ -0,0 +1,250 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from uuid import uuid4
+
+from rest_framework import status
+
+from config.settings.base import MEDIA_ROOT, PRESQT_USER_JOB_LIMIT
+from presqt.utilities import PresQTValidationError, read_file
+
+JOB_INDEX_PATH = os.path.join(MEDIA_ROOT, 'job_index.sqlite3')
+
+# Owner of jobs started without a user's token. They can only be found by their job id.
+ANONYMOUS_OWNER = 'anonymous'
+
+
+def connect_job_index():
+    """
+    Open a connection to the job index, creating it if it doesn't exist yet.
+    'jobs' holds the owner and action of every download, upload and transfer job. The owner is
+    the hash of the user's token, or both hashes joined by '_' for transfers, which is what the
+    ticket number of a user's job used to be. 'job_users' maps each job to the hash of every
+    user it belongs to. 'disk_reservations' holds the disk space each admitted job is expected
+    to use.
+
+    Returns
+    -------
+    sqlite3.Connection
+    """
+    os.makedirs(os.path.dirname(JOB_INDEX_PATH), exist_ok=True)
+    connection = sqlite3.connect(JOB_INDEX_PATH, timeout=30)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS jobs ('
+        'job_id TEXT PRIMARY KEY, owner TEXT NOT NULL, action TEXT NOT NULL, '
+        'created REAL NOT NULL, started INTEGER NOT NULL DEFAULT 0)')
+    connection.execute('CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, action, created)')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS job_users ('
+        'job_id TEXT NOT NULL, user_hash TEXT NOT NULL, PRIMARY KEY (user_hash, job_id))')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS disk_reservations ('
+        'job_id TEXT PRIMARY KEY, action TEXT NOT NULL, projected_size INTEGER NOT NULL)')
+    return connection
+
+
+def new_job_id():
+    """
+    Get a new job id. Job ids are the names of the jobs' directories in mediafiles/jobs.
+    """
+    return uuid4().hex
+
+
+def index_job(job_id, owner, action):
+    """
+    Add a job to the job index, or move a resumed job back to the end of its owner's jobs.
+
+    Parameters
+    ----------
+    job_id : str
+        The job's id.
+    owner : str
+        Hash of the user's token, or both hashes joined by '_' for transfers.
+    action : str
+        The job's action, e.g. 'resource_download'.
+    """
+    with closing(connect_job_index()) as connection, connection:
+        connection.execute('INSERT OR REPLACE INTO jobs (job_id, owner, action, created) '
+                           'VALUES (?, ?, ?, ?)', (job_id, owner, action, time.time()))
+        connection.executemany('INSERT OR IGNORE INTO job_users VALUES (?, ?)',
+                               [(job_id, user_hash) for user_hash in owner.split('_')])
+
+
+def add_job_user(job_id, user_hash):
+    """
+    Add a user to a job that's already indexed, e.g. when they join a running job.
+
+    Parameters
+    ----------
+    job_id : str
+        The job's id.
+    user_hash : str
+        Hash of the user's token.
+    """
+    with closing(connect_job_index()) as connection, connection:
+        connection.execute('INSERT OR IGNORE INTO job_users VALUES (?, ?)', (job_id, user_hash))
+
+
+def remove_indexed_job(job_id):
+    """
+    Remove a job from the job index.
+
+    Parameters
+    ----------
+    job_id : str
+        The job's id.
+    """
+    with closing(connect_job_index()) as connection, connection:
+        connection.execute('DELETE FROM jobs WHERE job_id = ?', (job_id,))
+        connection.execute('DELETE FROM job_users WHERE job_id = ?', (job_id,))
+        connection.execute('DELETE FROM disk_reservations WHERE job_id = ?', (job_id,))
+
+
+def find_job(owner, action, job_id=None):
+    """
+    Find the job a status request is for. Requests without a job id are for the owner's latest
+    job with the action, so clients polling by token alone keep working. Requests without an
+    owner must give a job id.
+
+    Parameters
+    ----------
+    owner : str
+        Hash of the user's token, both hashes joined by '_' for transfers, or None to find a
+        job by its id alone.
+    action : str
+        The job's action, e.g. 'resource_download'.
+    job_id : str
+        The job id given in the request, if any.
+
+    Returns
+    -------
+    The job's ticket number. This is the owner itself if the owner has no indexed jobs, for
+    jobs started before the job index existed.
+    """
+    with closing(connect_job_index()) as connection:
+        if owner is None:
+            row = connection.execute('SELECT job_id FROM jobs WHERE job_id = ? AND action = ?',
+                                     (job_id, action)).fetchone()
+            if row is None:
+                raise PresQTValidationError(
+                    "PresQT Error: Invalid job id, '{}'.".format(job_id),
+                    status.HTTP_404_NOT_FOUND)
+        elif job_id is not None:
+            row = connection.execute(
+                'SELECT job_id FROM jobs WHERE job_id = ? AND owner = ? AND action = ?',
+                (job_id, owner, action)).fetchone()
+            if row is None:
+                raise PresQTValidationError(
+                    "PresQT Error: Invalid job id, '{}'.".format(job_id),
+                    status.HTTP_404_NOT_FOUND)
+        else:
+            row = connection.execute(
+                'SELECT job_id FROM jobs WHERE owner = ? AND action = ? '
+                'ORDER BY created DESC LIMIT 1', (owner, action)).fetchone()
+    return row[0] if row else owner
+
+
+def get_user_jobs(user_hashes):
+    """
+    Get the jobs that belong to any of a set of users, newest first.
+
+    Parameters
+    ----------
+    user_hashes : list
+        Hashes of the users' tokens.
+
+    Returns
+    -------
+    List of (job_id, action, created) tuples.
+    """
+    with closing(connect_job_index()) as connection:
+        return connection.execute(
+            'SELECT DISTINCT jobs.job_id, jobs.action, jobs.created FROM jobs '
+            'JOIN job_users ON jobs.job_id = job_users.job_id '
+            'WHERE job_users.user_hash IN ({}) ORDER BY jobs.created DESC'.format(
+                ', '.join('?' * len(user_hashes))), list(user_hashes)).fetchall()
+
+
+def get_job_users(ticket_number):
+    """
+    Get the hashes of the users a job belongs to.
+
+    Parameters
+    ----------
+    ticket_number : str
+        The job's id, or the ticket number of a job started before the job index existed.
+
+    Returns
+    -------
+    List of user hashes.
+    """
+    with closing(connect_job_index()) as connection:
+        rows = connection.execute('SELECT user_hash FROM job_users WHERE job_id = ?',
+                                  (str(ticket_number),)).fetchall()
+    return [row[0] for row in rows] or str(ticket_number).split('_')
+
+
+def claim_job_slot(job_id):
+    """
+    Mark a job as started if none of its users already have PRESQT_USER_JOB_LIMIT jobs running.
+    Jobs only count as running while their process_info.json file says they're in progress.
+
+    Parameters
+    ----------
+    job_id : str
+        The job's id.
+
+    Returns
+    -------
+    True if the job can start.
+    """
+    with closing(connect_job_index()) as connection:
+        # Only one job at a time claims a slot
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            user_hashes = [row[0] for row in connection.execute(
+                'SELECT user_hash FROM job_users WHERE job_id = ?', (job_id,))]
+            for user_hash in user_hashes if PRESQT_USER_JOB_LIMIT else []:
+                started_jobs = connection.execute(
+                    'SELECT jobs.job_id, jobs.action FROM jobs '
+                    'JOIN job_users ON jobs.job_id = job_users.job_id '
+                    'WHERE job_users.user_hash = ? AND jobs.started = 1 AND jobs.job_id != ?',
+                    (user_hash, job_id)).fetchall()
+                running_jobs = [started_job_id for started_job_id, action in started_jobs
+                                if is_job_in_progress(started_job_id, action)]
+                if len(running_jobs) >= PRESQT_USER_JOB_LIMIT:
+                    return False
+
+            connection.execute('UPDATE jobs SET started = 1 WHERE job_id = ?', (job_id,))
+            return True
+        finally:
+            connection.commit()
+
+
+def is_job_in_progress(job_id, action):
+    """
+    Whether a job's process_info.json file says it's in progress.
+
+    Parameters
+    ----------
+    job_id : str
+        The job's id.
+    action : str
+        The job's action, e.g. 'resource_download'.
+
+    Returns
+    -------
+    True if the job is still running.
+    """
+    try:
+        process_info = read_file(
+            os.path.join(MEDIA_ROOT, 'jobs', job_id, 'process_info.json'), True)
+    except FileNotFoundError:
+        return False
+    except json.decoder.JSONDecodeError:
+        # The process_info.json file is being written to so the job is still live
+        return True
+    return process_info.get(action, {}).get('status') == 'in_progress'
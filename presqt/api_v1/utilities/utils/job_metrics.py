@@ -0,0 +1,160 @@
+import os
+import sqlite3
+from contextlib import closing
+
+from config.settings.base import MEDIA_ROOT
+from presqt.targets.utilities import LATENCY_BUCKETS
+
+JOB_METRICS_PATH = os.path.join(MEDIA_ROOT, 'job_metrics.sqlite3')
+
+# The span totals exported as Prometheus counters, with their help text
+SPAN_METRICS = [
+    ('count', 'presqt_job_span_count_total', 'Number of times each job span ran.'),
+    ('seconds', 'presqt_job_span_seconds_total', 'Seconds spent in each job span.'),
+    ('bytes', 'presqt_job_span_bytes_total', 'Bytes handled in each job span.'),
+    ('http_requests', 'presqt_job_span_http_requests_total',
+     'HTTP requests made while each job span was open.'),
+    ('http_retries', 'presqt_job_span_http_retries_total',
+     'HTTP requests repeating a failed request of the job while each job span was open.')
+]
+
+
+def connect_job_metrics():
+    """
+    Open a connection to the job metrics, creating them if they don't exist yet.
+    The metrics hold the number of jobs that ended with each status and the span totals of
+    every job, by action, and the HTTP requests the jobs made to each target endpoint.
+
+    Returns
+    -------
+    sqlite3.Connection
+    """
+    os.makedirs(os.path.dirname(JOB_METRICS_PATH), exist_ok=True)
+    connection = sqlite3.connect(JOB_METRICS_PATH, timeout=30)
+    # Every job process adds to the metrics when it ends
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS jobs ('
+        'action TEXT NOT NULL, status TEXT NOT NULL, count INTEGER NOT NULL, '
+        'PRIMARY KEY (action, status))')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS spans ('
+        'action TEXT NOT NULL, span TEXT NOT NULL, count INTEGER NOT NULL, '
+        'seconds REAL NOT NULL, bytes INTEGER NOT NULL, http_requests INTEGER NOT NULL, '
+        'http_retries INTEGER NOT NULL, PRIMARY KEY (action, span))')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS target_requests ('
+        'target TEXT NOT NULL, method TEXT NOT NULL, endpoint TEXT NOT NULL, '
+        'status TEXT NOT NULL, count INTEGER NOT NULL, '
+        'PRIMARY KEY (target, method, endpoint, status))')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS target_latency ('
+        'target TEXT NOT NULL, method TEXT NOT NULL, endpoint TEXT NOT NULL, '
+        'le TEXT NOT NULL, count INTEGER NOT NULL, seconds REAL NOT NULL, '
+        'PRIMARY KEY (target, method, endpoint, le))')
+    return connection
+
+
+def record_job_metrics(action, status, spans, http_requests=None):
+    """
+    Add a job that has ended to the metrics.
+
+    Parameters
+    ----------
+    action : str
+        The job's action, e.g. 'resource_download'.
+    status : str
+        The status the job ended with.
+    spans : dict
+        The job's span totals, from JobSpans.to_dict().
+    http_requests : dict
+        The job's HTTP request summary, from HttpAccounting.to_dict().
+    """
+    with closing(connect_job_metrics()) as connection, connection:
+        connection.execute(
+            'INSERT INTO jobs VALUES (?, ?, 1) '
+            'ON CONFLICT (action, status) DO UPDATE SET count = count + 1', (action, status))
+        for span, totals in spans.items():
+            connection.execute(
+                'INSERT INTO spans VALUES (?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (action, span) DO UPDATE SET count = count + excluded.count, '
+                'seconds = seconds + excluded.seconds, bytes = bytes + excluded.bytes, '
+                'http_requests = http_requests + excluded.http_requests, '
+                'http_retries = http_retries + excluded.http_retries',
+                (action, span, totals['count'], totals['seconds'], totals['bytes'],
+                 totals['http_requests'], totals['http_retries']))
+
+        for target, target_summary in (http_requests or {}).get('targets', {}).items():
+            for endpoint in target_summary['endpoints']:
+                labels = (target, endpoint['method'], endpoint['endpoint'])
+                for status_code, count in endpoint['statuses'].items():
+                    connection.execute(
+                        'INSERT INTO target_requests VALUES (?, ?, ?, ?, ?) '
+                        'ON CONFLICT (target, method, endpoint, status) '
+                        'DO UPDATE SET count = count + excluded.count',
+                        labels + (status_code, count))
+                # The +Inf bucket holds the request count and the sum of their seconds
+                for le, count in endpoint['latency'].items():
+                    connection.execute(
+                        'INSERT INTO target_latency VALUES (?, ?, ?, ?, ?, ?) '
+                        'ON CONFLICT (target, method, endpoint, le) '
+                        'DO UPDATE SET count = count + excluded.count, '
+                        'seconds = seconds + excluded.seconds',
+                        labels + (le, count, endpoint['seconds'] if le == '+Inf' else 0))
+
+
+def get_prometheus_metrics():
+    """
+    Get the job metrics in the Prometheus text format.
+
+    Returns
+    -------
+    The metrics as a string.
+    """
+    with closing(connect_job_metrics()) as connection:
+        jobs = connection.execute(
+            'SELECT action, status, count FROM jobs ORDER BY action, status').fetchall()
+        spans = connection.execute(
+            'SELECT action, span, count, seconds, bytes, http_requests, http_retries '
+            'FROM spans ORDER BY action, span').fetchall()
+        target_requests = connection.execute(
+            'SELECT target, method, endpoint, status, count FROM target_requests '
+            'ORDER BY target, endpoint, method, status').fetchall()
+        target_latency = connection.execute(
+            'SELECT target, method, endpoint, le, count, seconds FROM target_latency '
+            'ORDER BY target, endpoint, method').fetchall()
+
+    lines = ['# HELP presqt_jobs_total Number of jobs that ended with each status.',
+             '# TYPE presqt_jobs_total counter']
+    lines.extend('presqt_jobs_total{{action="{}",status="{}"}} {}'.format(*job) for job in jobs)
+    for index, (column, name, help_text) in enumerate(SPAN_METRICS):
+        lines.append('# HELP {} {}'.format(name, help_text))
+        lines.append('# TYPE {} counter'.format(name))
+        lines.extend('{}{{action="{}",span="{}"}} {}'.format(name, span[0], span[1],
+                                                             span[index + 2])
+                     for span in spans)
+
+    lines.append('# HELP presqt_target_http_requests_total '
+                 'HTTP requests made by jobs to each target endpoint, by status code.')
+    lines.append('# TYPE presqt_target_http_requests_total counter')
+    lines.extend('presqt_target_http_requests_total'
+                 '{{target="{}",method="{}",endpoint="{}",status="{}"}} {}'.format(*row)
+                 for row in target_requests)
+
+    name = 'presqt_target_http_request_duration_seconds'
+    lines.append('# HELP {} Latency of the HTTP requests made by jobs to each target '
+                 'endpoint.'.format(name))
+    lines.append('# TYPE {} histogram'.format(name))
+    bucket_order = [str(upper_bound) for upper_bound in LATENCY_BUCKETS] + ['+Inf']
+    histograms = {}
+    for target, method, endpoint, le, count, seconds in target_latency:
+        histograms.setdefault((target, method, endpoint), {})[le] = (count, seconds)
+    for (target, method, endpoint), buckets in histograms.items():
+        labels = 'target="{}",method="{}",endpoint="{}"'.format(target, method, endpoint)
+        for le in bucket_order:
+            lines.append('{}_bucket{{{},le="{}"}} {}'.format(
+                name, labels, le, buckets.get(le, (0, 0))[0]))
+        count, seconds = buckets.get('+Inf', (0, 0))
+        lines.append('{}_sum{{{}}} {}'.format(name, labels, round(seconds, 4)))
+        lines.append('{}_count{{{}}} {}'.format(name, labels, count))
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,37 @@
+import os
+
+from config.settings.base import MEDIA_ROOT, PRESQT_PROFILE_INTERVAL
+from presqt.utilities import StackSampler
+
+
+def get_job_profile_path(ticket_number, action):
+    """
+    Get the path of the collapsed stack file a profiled job writes in its job directory.
+
+    Parameters
+    ----------
+    ticket_number : str
+        The job's ticket number.
+    action : str
+        The job's action, e.g. 'resource_transfer_in'.
+
+    Returns
+    -------
+    The path to the job's profile.
+    """
+    return os.path.join(MEDIA_ROOT, 'jobs', str(ticket_number), '{}.collapsed'.format(action))
+
+
+def run_profiled(method_to_call, profile_path):
+    """
+    Run a job's method while sampling the stacks of its process into a collapsed stack file.
+
+    Parameters
+    ----------
+    method_to_call : class method
+        The job's method.
+    profile_path : str
+        The collapsed stack file to write.
+    """
+    with StackSampler(profile_path, PRESQT_PROFILE_INTERVAL):
+        method_to_call()
@@ -1,11 +1,12 @@
-import requests
 from rest_framework import status
+
+from presqt.api_v1.utilities.keyword_enhancement.enhancer_backend import get_enhancer_terms
 from presqt.utilities import PresQTResponseException
 
 
 def keyword_enhancer(keywords):
     """
-    Send a list of keywords to SciGraph to be enhanced.
+    Send a list of keywords to the keyword enhancer to be enhanced.
 
     Parameters
     ----------
@@ -23,14 +24,12 @@ def keyword_enhancer(keywords):
     new_list_of_keywords = []
     final_list_of_keywords = []
     keyword_lower_case = [keyword.lower() for keyword in keywords]
-    # Get the new keyword suggestions from Sci-Graph
+    # Get the 'term' keyword suggestions from the keyword enhancer
+    terms = get_enhancer_terms(keyword_lower_case)
     for keyword in keyword_lower_case:
         final_list_of_keywords.append(keyword)
-        # Get SciGraph 'term' keyword suggestions
-        response = requests.get(
-            'http://ec-scigraph.sdsc.edu:9000/scigraph/vocabulary/term/{}?limit=20'.format(keyword))
-        if response.status_code == 200:
-            for label in response.json()[0]['labels']:
+        if terms[keyword]:
+            for label in terms[keyword]['labels']:
                 label_lower_case = label.lower()
                 if label_lower_case not in keyword_lower_case:
                     new_list_of_keywords.append(label_lower_case)
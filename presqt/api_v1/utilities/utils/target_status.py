@@ -0,0 +1,211 @@
+import fcntl
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.utils import timezone
+
+from config.settings.base import MEDIA_ROOT, PRESQT_STATUS_CACHE_TTL, PRESQT_STATUS_WINDOW
+from presqt.utilities import read_file
+
+STATUS_CACHE_PATH = os.path.join(MEDIA_ROOT, 'target_statuses.json')
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+_refresh_requested = threading.Event()
+
+
+def probe_target(target):
+    """
+    Check whether a target's status url can be reached.
+
+    Parameters
+    ----------
+    target : dict
+        The target's dictionary from targets.json.
+
+    Returns
+    -------
+    Dictionary with the probe's status, detail, time and latency in milliseconds.
+    """
+    checked_at = str(timezone.now())
+    start = time.monotonic()
+    try:
+        response = requests.get(target['status_url'], timeout=10)
+        response.raise_for_status()
+    except requests.ConnectTimeout:
+        status = "timeout"
+        detail = "The request timed out while trying to connect to the remote server."
+    except requests.ReadTimeout:
+        status = "timeout"
+        detail = "The server did not send any data in the allotted amount of time."
+    except requests.exceptions.SSLError:
+        status = "ssl_error"
+        detail = "An SSL error occurred."
+    except requests.HTTPError as e:
+        status = "http_error"
+        detail = f"An HTTP {e.response.status_code} error occured"
+    except requests.RequestException as e:
+        # TooManyRedirects, InvalidURL etc.
+        status = "error"
+        detail = f"Some other request exception occured: {e}"
+    else:
+        status = "ok"
+        detail = "Connected to server successfully"
+
+    return {
+        "status": status,
+        "detail": detail,
+        "checked_at": checked_at,
+        "latency_ms": round((time.monotonic() - start) * 1000, 1)
+    }
+
+
+def read_status_cache():
+    """
+    Read the cached probes of every target.
+
+    Returns
+    -------
+    Dictionary with the time of the last refresh and each target's recent probes, oldest first.
+    None if no probes have been cached yet.
+    """
+    try:
+        return read_file(STATUS_CACHE_PATH, True)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def refresh_target_statuses():
+    """
+    Probe every target at the same time and add the results to the cache. If another process
+    is already refreshing the cache this waits for it to finish instead of probing again.
+
+    Returns
+    -------
+    The refreshed cache.
+    """
+    os.makedirs(os.path.dirname(STATUS_CACHE_PATH), exist_ok=True)
+    with open('{}.lock'.format(STATUS_CACHE_PATH), 'w') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            cache = read_status_cache()
+            if cache:
+                return cache
+
+        targets = read_file("presqt/specs/targets.json", True)
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            probes = list(executor.map(probe_target, targets))
+
+        cache = read_status_cache() or {'targets': {}}
+        for target, probe in zip(targets, probes):
+            window = cache['targets'].get(target['name'], []) + [probe]
+            cache['targets'][target['name']] = window[-PRESQT_STATUS_WINDOW:]
+        cache['refreshed_at'] = time.time()
+
+        build_path = '{}.build'.format(STATUS_CACHE_PATH)
+        with open(build_path, 'w') as cache_file:
+            json.dump(cache, cache_file)
+        os.replace(build_path, STATUS_CACHE_PATH)
+    return cache
+
+
+def latency_percentile(latencies, percentile):
+    """
+    Get a percentile of a sorted list of latencies using the nearest rank.
+    """
+    if not latencies:
+        return None
+    return latencies[max(math.ceil(percentile / 100 * len(latencies)) - 1, 0)]
+
+
+def summarize_probes(target, probes):
+    """
+    Summarize a target's recent probes.
+
+    Parameters
+    ----------
+    target : dict
+        The target's dictionary from targets.json.
+    probes : list
+        The target's recent probes, oldest first.
+
+    Returns
+    -------
+    Dictionary with the target's latest status, its latency percentiles and availability.
+    """
+    latest = probes[-1]
+    ok_latencies = sorted(probe['latency_ms'] for probe in probes if probe['status'] == 'ok')
+    return {
+        "service": target["name"],
+        "readable_name": target["readable_name"],
+        "status": latest["status"],
+        "detail": latest["detail"],
+        "checked_at": latest["checked_at"],
+        "latency_ms": latest["latency_ms"],
+        "latency_percentiles_ms": {
+            "p50": latency_percentile(ok_latencies, 50),
+            "p95": latency_percentile(ok_latencies, 95),
+            "p99": latency_percentile(ok_latencies, 99)
+        },
+        "availability": {
+            "window_start": probes[0]["checked_at"],
+            "probes": len(probes),
+            "ratio": round(len(ok_latencies) / len(probes), 3)
+        }
+    }
+
+
+def get_target_statuses():
+    """
+    Get the status of every target from the cache. The cache is refreshed in the background
+    once it's older than PRESQT_STATUS_CACHE_TTL, so probes only hold up the request when a
+    target hasn't been probed yet.
+
+    Returns
+    -------
+    List of each target's status summary in the order of targets.json.
+    """
+    start_status_scheduler()
+    targets = read_file("presqt/specs/targets.json", True)
+
+    cache = read_status_cache()
+    if not cache or any(target['name'] not in cache['targets'] for target in targets):
+        cache = refresh_target_statuses()
+    elif time.time() - cache['refreshed_at'] > PRESQT_STATUS_CACHE_TTL:
+        _refresh_requested.set()
+
+    return [summarize_probes(target, cache['targets'][target['name']]) for target in targets]
+
+
+def start_status_scheduler():
+    """
+    Start the thread that keeps the status cache fresh in this process, if it isn't running.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None or not _scheduler.is_alive():
+            _scheduler = threading.Thread(target=_run_status_scheduler, daemon=True)
+            _scheduler.start()
+
+
+def _run_status_scheduler():
+    while True:
+        _refresh_requested.wait(PRESQT_STATUS_CACHE_TTL)
+        _refresh_requested.clear()
+
+        cache = read_status_cache()
+        # Another process may have refreshed the cache already
+        if cache and time.time() - cache['refreshed_at'] < PRESQT_STATUS_CACHE_TTL:
+            continue
+        try:
+            refresh_target_statuses()
+        except Exception:
+            # Keep serving the cached statuses and try again next time
+            pass
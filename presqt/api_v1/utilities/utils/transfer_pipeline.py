@@ -0,0 +1,292 @@
+import os
+import threading
+
+from rest_framework import status
+
+from config.settings.base import PRESQT_TRANSFER_QUEUE_SIZE
+from presqt.api_v1.utilities.fixity.download_fixity_checker import resource_hash_generator
+from presqt.api_v1.utilities.utils.function_router import FunctionRouter
+from presqt.api_v1.utilities.utils.get_target_data import get_target_data
+from presqt.api_v1.utilities.validation.structure_validation import (structure_validation,
+                                                                     top_level_validation)
+from presqt.utilities import (PROCESS_INFO_LOCK, ResourceStream, PresQTResponseException,
+                              close_download_stream, close_upload_stream, open_download_stream,
+                              open_upload_stream, read_file, is_fts_metadata_file)
+
+
+class TransferPipeline(object):
+    """
+    Runs the download and upload of a transfer to an infinite depth target at the same time.
+    Each file goes from the source's download function, through its fixity check on the job's
+    own thread, to the destination's upload function through bounded queues. The bag that a
+    regular transfer uploads from is never made. Fixity and FTS metadata are put together once
+    both ends are done.
+
+    The structure of the upload is checked as each file is queued, so nothing is uploaded that
+    would make it invalid, and again on the complete tree once the download is done. Errors on
+    either thread fail the job.
+    """
+    def __init__(self, instance):
+        """
+        Parameters
+        ----------
+        instance : BaseResource class instance
+            The transfer being run. Its download and upload attributes must already be set.
+        """
+        self.instance = instance
+        self.download_stream = ResourceStream(PRESQT_TRANSFER_QUEUE_SIZE)
+        self.upload_stream = ResourceStream(PRESQT_TRANSFER_QUEUE_SIZE)
+        self.download_thread = None
+        self.download_func_dict = None
+        self.download_error = None
+        self.upload_thread = None
+        self.upload_func_dict = None
+        self.upload_error = None
+        self.streamed_paths = set()
+        # FTS metadata files are held back so a transfer of only FTS metadata is never uploaded
+        self.held_back_files = []
+
+        self.file_hashes = {}
+        self.hash_algorithm = self.get_hash_algorithm()
+
+    def get_hash_algorithm(self):
+        """
+        Pick the hash algorithm used to check fixity after upload. This is the same algorithm a
+        regular transfer would pick from the bag's manifests.
+
+        Returns
+        -------
+        The name of the hash algorithm.
+        """
+        target_supported_algorithms = get_target_data(self.instance.destination_target_name)[
+            'supported_hash_algorithms']
+        for algorithm in target_supported_algorithms:
+            if algorithm in ['md5', 'sha1', 'sha256', 'sha512']:
+                return algorithm
+        try:
+            return target_supported_algorithms[0]
+        except IndexError:
+            return 'md5'
+
+    def run_download(self, func):
+        """
+        Run the source's download function on its own thread and save each downloaded resource
+        as it arrives. Files are passed on to the upload as soon as they are saved.
+
+        Parameters
+        ----------
+        func : function
+            The source target's download function.
+
+        Returns
+        -------
+        The dictionary returned by the download function.
+        """
+        open_download_stream(self.download_stream)
+        self.download_thread = threading.Thread(target=self._download, args=(func,), daemon=True)
+        self.download_thread.start()
+        try:
+            resource = self.download_stream.get()
+            while resource is not None:
+                self.save_resource(resource)
+                resource = self.download_stream.get()
+
+            # Don't leave the download thread waiting on a full queue
+            self.download_stream.stop()
+            self.download_thread.join()
+            close_download_stream()
+            if self.download_error:
+                raise self.download_error
+
+            # Save the resources that weren't streamed. These are either served from the content
+            # store or come from a download function that only returns once everything is fetched.
+            for resource in self.download_func_dict['resources']:
+                if resource['path'] not in self.streamed_paths:
+                    self.save_resource(resource)
+        except BaseException:
+            self.download_stream.stop()
+            close_download_stream()
+            self.abort()
+            raise
+        return self.download_func_dict
+
+    def _download(self, func):
+        instance = self.instance
+        try:
+            self.download_func_dict = func(instance.source_token, instance.source_resource_id,
+                                           instance.process_info_path, instance.action,
+                                           instance.job_control)
+        except Exception as e:
+            self.download_error = get_job_error(e, 'download')
+        finally:
+            self.download_stream.finish()
+
+    def save_resource(self, resource):
+        """
+        Check a downloaded resource's fixity, save it to disk and queue it for upload.
+
+        Parameters
+        ----------
+        resource : dict
+            Resource dictionary returned by the source's download function.
+        """
+        self.streamed_paths.add(resource['path'])
+        title = resource['title']
+        file_path, fixity_obj = self.instance._save_downloaded_resource(resource)
+        if not file_path:
+            return
+
+        if fixity_obj['hash_algorithm'] == self.hash_algorithm:
+            self.file_hashes[file_path] = fixity_obj['presqt_hash']
+        else:
+            self.file_hashes[file_path] = resource_hash_generator(resource, self.hash_algorithm)
+
+        if is_fts_metadata_file(title):
+            self.held_back_files.append(file_path)
+        else:
+            self.stream_path(os.path.dirname(file_path), [os.path.basename(file_path)])
+
+    def stream_path(self, directory, files):
+        """
+        Queue a file or an empty directory for upload, starting the upload first if needed.
+
+        Parameters
+        ----------
+        directory : str
+            Directory of the file or the empty directory itself.
+        files : list
+            The name of the file or an empty list for an empty directory.
+        """
+        self.validate_path(directory, files)
+        if not self.upload_thread:
+            self.start_upload()
+        self.upload_stream.put((directory, [], files))
+
+    def validate_path(self, directory, files):
+        """
+        Add a file or an empty directory to the top level of the upload and check that the
+        structure is still valid. Adding to the upload can only make its structure invalid,
+        never valid again, so everything queued before a passing check is valid to upload.
+
+        Parameters
+        ----------
+        directory : str
+            Directory of the file or the empty directory itself.
+        files : list
+            The name of the file or an empty list for an empty directory.
+        """
+        relative_directory = os.path.relpath(directory, self.instance.data_directory)
+        if relative_directory == '.':
+            self.upload_stream.top_level_files.extend(
+                name for name in files if name not in self.upload_stream.top_level_files)
+        else:
+            folder = relative_directory.split(os.sep)[0]
+            if folder not in self.upload_stream.top_level_folders:
+                self.upload_stream.top_level_folders.append(folder)
+        top_level_validation(self.instance, self.upload_stream.top_level_folders,
+                             self.upload_stream.top_level_files)
+
+    def start_upload(self):
+        """
+        Start the destination's upload function on its own thread. It walks the files queued
+        for upload instead of the disk.
+        """
+        instance = self.instance
+        # Progress is measured against every file the download is expected to return
+        with PROCESS_INFO_LOCK:
+            process_info = read_file(instance.process_info_path, True)[instance.action]
+        self.upload_stream.total_files = max(process_info['download_total_files'],
+                                             len(self.streamed_paths))
+
+        open_upload_stream(instance.data_directory, self.upload_stream)
+        self.upload_thread = threading.Thread(target=self._upload, daemon=True)
+        self.upload_thread.start()
+
+    def _upload(self):
+        instance = self.instance
+        func = FunctionRouter.get_function(instance.destination_target_name, 'resource_upload')
+        try:
+            self.upload_func_dict = func(instance.destination_token,
+                                         instance.destination_resource_id,
+                                         instance.data_directory, self.hash_algorithm,
+                                         instance.file_duplicate_action,
+                                         instance.process_info_path, instance.action,
+                                         instance.job_control)
+        except Exception as e:
+            self.upload_error = get_job_error(e, 'upload')
+        finally:
+            # Don't leave the job waiting on a full queue
+            self.upload_stream.stop()
+
+    def finish_download(self, empty_containers):
+        """
+        Queue the held back files and the empty containers, validate the structure of the
+        complete tree, then let the upload know that every file has been queued. If the
+        structure is invalid the upload is stopped and the error is raised by wait_for_upload.
+
+        Parameters
+        ----------
+        empty_containers : list
+            Paths to the empty containers, already written to disk.
+        """
+        try:
+            for file_path in self.held_back_files:
+                self.stream_path(os.path.dirname(file_path), [os.path.basename(file_path)])
+            for container_path in empty_containers:
+                self.stream_path(container_path.rstrip('/'), [])
+
+            if not self.upload_thread:
+                self.start_upload()
+            structure_validation(self.instance)
+        except PresQTResponseException as e:
+            self.abort()
+            self.upload_error = e
+            return
+        self.upload_stream.finish()
+
+    def abort(self):
+        """
+        Stop the upload because the download failed.
+        """
+        self.upload_stream.abort()
+        if self.upload_thread:
+            self.upload_thread.join()
+        close_upload_stream(self.instance.data_directory)
+
+    def wait_for_upload(self):
+        """
+        Wait for the destination's upload function to finish.
+
+        Returns
+        -------
+        The dictionary returned by the upload function.
+        """
+        if self.upload_thread:
+            self.upload_thread.join()
+        close_upload_stream(self.instance.data_directory)
+        if self.upload_error:
+            raise self.upload_error
+        return self.upload_func_dict
+
+
+def get_job_error(error, stage):
+    """
+    Get the error a pipelined transfer fails with for an exception raised on one of its threads.
+    Exceptions that aren't PresQT errors are turned into one so the job is marked as failed.
+
+    Parameters
+    ----------
+    error : Exception
+        The exception raised on the thread.
+    stage : str
+        'download' or 'upload'.
+
+    Returns
+    -------
+    The PresQTResponseException to raise on the job's thread.
+    """
+    if isinstance(error, PresQTResponseException):
+        return error
+    return PresQTResponseException(
+        "PresQT Error: The transfer's {} failed unexpectedly: {}".format(stage, repr(error)),
+        status.HTTP_500_INTERNAL_SERVER_ERROR)
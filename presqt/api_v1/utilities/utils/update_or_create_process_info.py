@@ -1,6 +1,8 @@
 import os
 
-from presqt.utilities import read_file, write_file
+from config.settings.base import MEDIA_ROOT
+from presqt.api_v1.utilities.utils.expiry_index import index_expiration
+from presqt.utilities import read_file, write_file, PROCESS_INFO_LOCK
 
 
 def update_or_create_process_info(process_obj, action, ticket_number):
@@ -20,14 +22,20 @@ def update_or_create_process_info(process_obj, action, ticket_number):
     -------
     Returns the path to the process_info.json file
     """
-    process_info_path = os.path.join('mediafiles', 'jobs', str(ticket_number), 'process_info.json')
-    # If there already exists a process_info.json file for this user then add to the process dict
-    if os.path.isfile(process_info_path):
-        file_obj = read_file(process_info_path, True)
-        file_obj[action] = process_obj
-    # If no process_info.json file exists for this user than create a new process dict
-    else:
-        file_obj = {action: process_obj}
+    process_info_path = os.path.join(MEDIA_ROOT, 'jobs', str(ticket_number), 'process_info.json')
+    with PROCESS_INFO_LOCK:
+        # If there already exists a process_info.json file for this user then add to the process dict
+        if os.path.isfile(process_info_path):
+            file_obj = read_file(process_info_path, True)
+            file_obj[action] = process_obj
+        # If no process_info.json file exists for this user than create a new process dict
+        else:
+            file_obj = {action: process_obj}
 
-    write_file(process_info_path, file_obj, True)
+        write_file(process_info_path, file_obj, True)
+
+    # Keep the expiry index in step so the job directory isn't cleaned up while it's in use
+    if 'expiration' in process_obj:
+        index_expiration(os.path.join('jobs', str(ticket_number)), action,
+                         process_obj['expiration'])
     return process_info_path
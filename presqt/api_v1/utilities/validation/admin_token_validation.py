@@ -0,0 +1,33 @@
+import hmac
+
+from rest_framework import status
+
+from config.settings.base import PRESQT_ADMIN_TOKEN
+from presqt.utilities import PresQTValidationError
+
+
+def admin_token_validation(request):
+    """
+    Perform validation for the presqt-admin-token header of admin endpoints.
+
+    Parameters
+    ----------
+    request : HTTP request object
+
+    Raises a PresQTValidationError if admin endpoints are off or the token doesn't match.
+    """
+    if not PRESQT_ADMIN_TOKEN:
+        raise PresQTValidationError(
+            "PresQT Error: Admin endpoints are not enabled on this server.",
+            status.HTTP_403_FORBIDDEN)
+
+    try:
+        token = request.META['HTTP_PRESQT_ADMIN_TOKEN']
+    except KeyError:
+        raise PresQTValidationError(
+            "PresQT Error: 'presqt-admin-token' missing in the request headers.",
+            status.HTTP_401_UNAUTHORIZED)
+
+    if not hmac.compare_digest(token.encode('utf-8'), PRESQT_ADMIN_TOKEN.encode('utf-8')):
+        raise PresQTValidationError(
+            "PresQT Error: 'presqt-admin-token' is not valid.", status.HTTP_401_UNAUTHORIZED)
@@ -1,3 +1,7 @@
+import hashlib
+import re
+import zipfile
+
 import bagit
 from rest_framework import status
 
@@ -25,4 +29,245 @@ def validate_bag(bag):
             else:
                 raise PresQTValidationError(str(e.details[0]), status.HTTP_400_BAD_REQUEST)
         else:
-            raise PresQTValidationError(str(e), status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            raise PresQTValidationError(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+def validate_zipped_bag(zip_path, extra_algorithms=None):
+    """
+    Validate a zipped bag without extracting it to disk. Every member is streamed out of the
+    archive once and run through all of the manifest hash algorithms at the same time.
+
+    Parameters
+    ----------
+    zip_path : str
+        Path to the zip file holding the bag.
+    extra_algorithms : list
+        Hash algorithms to calculate for each payload file on top of the ones in the manifests.
+
+    Returns
+    -------
+    Dictionary with the following keys: values
+        'zip_path': Path to the zip file holding the bag.
+        'bag_prefix': Member prefix of the bag's root directory. Example: 'BagName/'
+        'base_directory_name': Name of the bag's root directory.
+        'algorithms': List of hash algorithms found in the bag's payload manifests.
+        'payload': Dictionary of payload paths, relative to the bag root, and their hashes.
+                   Example: {'data/project/file.jpg': {'md5': 'the_hash', 'sha256': 'the_hash'}}
+        'payload_directories': List of payload directory paths relative to the bag root.
+    """
+    with zipfile.ZipFile(zip_path) as bag_zip:
+        members = bag_zip.infolist()
+        bag_prefix = get_zipped_bag_prefix(members)
+
+        member_dict = {}
+        for member in members:
+            if member.filename.startswith(bag_prefix) and member.filename != bag_prefix:
+                member_dict[member.filename[len(bag_prefix):]] = member
+
+        if 'bagit.txt' not in member_dict:
+            raise PresQTValidationError(
+                "Expected bagit.txt does not exist: {}bagit.txt".format(bag_prefix),
+                status.HTTP_400_BAD_REQUEST)
+
+        manifests = {}
+        tag_manifests = {}
+        for name in member_dict:
+            manifest_match = re.match(r'^(tag)?manifest-(.+)\.txt$', name)
+            if manifest_match:
+                entries = parse_zipped_manifest(bag_zip.read(member_dict[name]))
+                if manifest_match.group(1):
+                    tag_manifests[manifest_match.group(2)] = entries
+                else:
+                    manifests[manifest_match.group(2)] = entries
+
+        if not manifests:
+            raise PresQTValidationError("No manifest files found", status.HTTP_400_BAD_REQUEST)
+
+        # The algorithms are named by the manifests' file names
+        for algorithm in sorted(set(manifests) | set(tag_manifests)):
+            if algorithm not in hashlib.algorithms_available:
+                raise PresQTValidationError(
+                    "Unsupported manifest hash algorithm: {}".format(algorithm),
+                    status.HTTP_400_BAD_REQUEST)
+
+        payload_files = [name for name, member in member_dict.items()
+                         if name.startswith('data/') and not member.is_dir()]
+        payload_directories = [name for name, member in member_dict.items()
+                               if name.startswith('data/') and member.is_dir()]
+
+        # Verify the payload byte and file counts against the bag's Payload-Oxum, if one exists
+        if 'bag-info.txt' in member_dict:
+            oxum = re.search(r'^Payload-Oxum:\s*(\d+)\.(\d+)\s*$',
+                             bag_zip.read(member_dict['bag-info.txt']).decode('utf-8'),
+                             re.MULTILINE)
+            if oxum:
+                total_bytes = sum(member_dict[path].file_size for path in payload_files)
+                if (int(oxum.group(1)), int(oxum.group(2))) != (total_bytes, len(payload_files)):
+                    raise PresQTValidationError(
+                        "Payload-Oxum validation failed. Expected {} files and {} bytes but found "
+                        "{} files and {} bytes".format(oxum.group(2), oxum.group(1),
+                                                       len(payload_files), total_bytes),
+                        status.HTTP_400_BAD_REQUEST)
+
+        # Verify that there are no unexpected or missing files
+        manifest_paths = set()
+        [manifest_paths.update(entries.keys()) for entries in manifests.values()]
+        for path in sorted(manifest_paths):
+            if path not in member_dict:
+                raise PresQTValidationError(
+                    "{} exists in manifest but was not found on filesystem".format(path),
+                    status.HTTP_400_BAD_REQUEST)
+        for path in payload_files:
+            if path not in manifest_paths:
+                raise PresQTValidationError(
+                    "{} exists on filesystem but is not in the manifest".format(path),
+                    status.HTTP_400_BAD_REQUEST)
+
+        # Verify that checksums still match
+        payload_algorithms = list(manifests.keys())
+        for algorithm in extra_algorithms or []:
+            if algorithm not in payload_algorithms and algorithm in hashlib.algorithms_available:
+                payload_algorithms.append(algorithm)
+
+        payload = {}
+        for path in payload_files:
+            payload[path] = hash_zip_member(bag_zip, member_dict[path], payload_algorithms)
+            for algorithm, entries in manifests.items():
+                if entries.get(path) != payload[path][algorithm]:
+                    raise PresQTValidationError("Checksums failed to validate.",
+                                                status.HTTP_400_BAD_REQUEST)
+
+        for algorithm, entries in tag_manifests.items():
+            for path, tag_hash in entries.items():
+                if path not in member_dict:
+                    raise PresQTValidationError(
+                        "{} exists in manifest but was not found on filesystem".format(path),
+                        status.HTTP_400_BAD_REQUEST)
+                if hash_zip_member(bag_zip, member_dict[path], [algorithm])[algorithm] != tag_hash:
+                    raise PresQTValidationError("Checksums failed to validate.",
+                                                status.HTTP_400_BAD_REQUEST)
+
+    return {
+        'zip_path': zip_path,
+        'bag_prefix': bag_prefix,
+        'base_directory_name': bag_prefix.rstrip('/'),
+        'algorithms': list(manifests.keys()),
+        'payload': payload,
+        'payload_directories': payload_directories
+    }
+
+
+def get_zipped_bag_prefix(members):
+    """
+    Find the root directory of the bag inside of a zip file.
+
+    Parameters
+    ----------
+    members : list
+        List of zipfile.ZipInfo objects found in the zip file.
+
+    Returns
+    -------
+    The member prefix of the bag's root directory. Example: 'BagName/'
+    """
+    top_level_directories = []
+    for member in members:
+        top_level, separator, rest = member.filename.partition('/')
+        # Ignore the resource forks added by macOS when zipping files
+        if separator and top_level != '__MACOSX' and top_level not in top_level_directories:
+            top_level_directories.append(top_level)
+
+    if not top_level_directories:
+        raise PresQTValidationError("Bag is not formatted properly.",
+                                    status.HTTP_400_BAD_REQUEST)
+
+    # Prefer the directory holding the bag declaration if there is more than one
+    for top_level in top_level_directories:
+        if '{}/bagit.txt'.format(top_level) in [member.filename for member in members]:
+            return '{}/'.format(top_level)
+    return '{}/'.format(top_level_directories[0])
+
+
+def parse_zipped_manifest(manifest_contents):
+    """
+    Parse the contents of a BagIt manifest file.
+
+    Parameters
+    ----------
+    manifest_contents : bytes
+        Contents of the manifest file.
+
+    Returns
+    -------
+    Dictionary of file paths and their hashes.
+    """
+    entries = {}
+    for line in manifest_contents.decode('utf-8-sig').splitlines():
+        line = line.strip()
+        # Ignore blank lines and comments.
+        if line == '' or line.startswith('#'):
+            continue
+
+        entry = line.split(None, 1)
+        if len(entry) != 2:
+            continue
+        entries[decode_manifest_path(entry[1].lstrip('*'))] = entry[0].lower()
+    return entries
+
+
+def encode_manifest_path(path):
+    """
+    Percent encode the line breaks in a path so it fits on one line of a BagIt manifest.
+
+    Parameters
+    ----------
+    path : str
+        Path relative to the bag's root.
+
+    Returns
+    -------
+    The path as it's written in a manifest.
+    """
+    return path.replace('\r', '%0D').replace('\n', '%0A')
+
+
+def decode_manifest_path(manifest_path):
+    """
+    Decode a path written in a BagIt manifest. The reverse of encode_manifest_path.
+
+    Parameters
+    ----------
+    manifest_path : str
+        The path as it's written in a manifest.
+
+    Returns
+    -------
+    Path relative to the bag's root.
+    """
+    return re.sub('%0A', '\n', re.sub('%0D', '\r', manifest_path, flags=re.IGNORECASE),
+                  flags=re.IGNORECASE)
+
+
+def hash_zip_member(bag_zip, member, hash_algorithms):
+    """
+    Stream a member out of a zip file and run it through each of the given hash algorithms.
+
+    Parameters
+    ----------
+    bag_zip : zipfile.ZipFile
+        The open zip file.
+    member : zipfile.ZipInfo
+        The member to hash.
+    hash_algorithms : list
+        List of hash algorithms to use.
+
+    Returns
+    -------
+    Dictionary of hash algorithms and the member's hash.
+    """
+    hashers = {algorithm: hashlib.new(algorithm) for algorithm in hash_algorithms}
+    with bag_zip.open(member) as member_file:
+        for block in iter(lambda: member_file.read(bagit.HASH_BLOCK_SIZE), b''):
+            for hasher in hashers.values():
+                hasher.update(block)
+    return {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
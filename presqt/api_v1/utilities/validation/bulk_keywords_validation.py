@@ -0,0 +1,59 @@
+from rest_framework import status
+
+from presqt.utilities import PresQTValidationError
+
+# Most resources whose keywords can be updated in one bulk request
+BULK_KEYWORDS_LIMIT = 500
+
+
+def bulk_keywords_validation(request_data):
+    """
+    Validate the resources and keywords in the POST body of a bulk keywords request.
+
+    Parameters
+    ----------
+    request_data : dict
+        The body of the request.
+
+    Returns
+    -------
+    List of dictionaries with each resource's id and the keywords to add to it.
+    """
+    try:
+        resources = request_data['resources']
+    except KeyError:
+        raise PresQTValidationError(
+            "PresQT Error: 'resources' is missing from the request body.",
+            status.HTTP_400_BAD_REQUEST)
+
+    if type(resources) is not list or not resources:
+        raise PresQTValidationError(
+            "PresQT Error: 'resources' must be a list with at least one resource.",
+            status.HTTP_400_BAD_REQUEST)
+
+    if len(resources) > BULK_KEYWORDS_LIMIT:
+        raise PresQTValidationError(
+            f"PresQT Error: At most {BULK_KEYWORDS_LIMIT} resources can be updated at once.",
+            status.HTTP_400_BAD_REQUEST)
+
+    validated_resources = []
+    for index, resource in enumerate(resources):
+        if type(resource) is not dict or 'resource_id' not in resource:
+            raise PresQTValidationError(
+                f"Resource {index}: PresQT Error: 'resource_id' is missing from the resource.",
+                status.HTTP_400_BAD_REQUEST)
+        if 'keywords' not in resource:
+            raise PresQTValidationError(
+                f"Resource {index}: PresQT Error: 'keywords' is missing from the resource.",
+                status.HTTP_400_BAD_REQUEST)
+        if type(resource['keywords']) is not list:
+            raise PresQTValidationError(
+                f"Resource {index}: PresQT Error: 'keywords' must be in list format.",
+                status.HTTP_400_BAD_REQUEST)
+
+        validated_resources.append({
+            'resource_id': str(resource['resource_id']),
+            'keywords': resource['keywords']
+        })
+
+    return validated_resources
@@ -0,0 +1,30 @@
+from rest_framework import status
+
+from config.settings.base import PRESQT_DELETE_AFTER_DELIVER
+from presqt.utilities import PresQTValidationError
+
+
+def get_delete_after_deliver_opt(request):
+    """
+    Perform validation for the optional presqt-delete-after-deliver header.
+
+    Parameters
+    ----------
+    request : HTTP request object
+
+    Returns
+    -------
+    Returns whether the job's files should be deleted as soon as they are delivered.
+    """
+    try:
+        choice = request.META['HTTP_PRESQT_DELETE_AFTER_DELIVER']
+    except KeyError:
+        # If it's not in the headers, fall back to the server default
+        return PRESQT_DELETE_AFTER_DELIVER
+
+    if choice not in ['yes', 'no']:
+        raise PresQTValidationError(
+            "PresQT Error: 'presqt-delete-after-deliver' must be 'yes' or 'no'.",
+            status.HTTP_400_BAD_REQUEST)
+
+    return choice == 'yes'
@@ -1,15 +1,17 @@
 from rest_framework import status
 
-from presqt.utilities import PresQTValidationError, read_file
+from presqt.api_v1.utilities.service_helpers.fair_specs import FAIRSHAKE_RUBRICS, FAIRSHAKE_SCORES
+from presqt.utilities import PresQTValidationError
 
 
-def fairshake_assessment_validator(request, rubric_id):
+def fairshake_assessment_validator(request_data, rubric_id):
     """
     Perform fairshake validation for required fields.
 
     Parameters
     ----------
-    request : HTTP request object
+    request_data : dict
+        The body of the request.
     rubric_id: str
         The ID of the rubric the requesting user would like to use
 
@@ -20,7 +22,7 @@ def fairshake_assessment_validator(request, rubric_id):
     rubric_answers = None
     if rubric_id != '96':
         try:
-            rubric_answers = request.data['rubric_answers']
+            rubric_answers = request_data['rubric_answers']
         except KeyError:
             raise PresQTValidationError(
                 "PresQT Error: 'rubric_answers' missing in POST body.",
@@ -34,10 +36,8 @@ def fairshake_assessment_validator(request, rubric_id):
                 status.HTTP_400_BAD_REQUEST
             )
 
-        test_translator = read_file(
-            'presqt/specs/services/fairshake/fairshake_test_fetch.json', True)[rubric_id]
-        score_translator = read_file(
-            'presqt/specs/services/fairshake/fairshake_score_translator.json', True)
+        test_translator = FAIRSHAKE_RUBRICS[rubric_id]
+        score_translator = FAIRSHAKE_SCORES
 
         for key, value in test_translator.items():
             if key not in rubric_answers.keys():
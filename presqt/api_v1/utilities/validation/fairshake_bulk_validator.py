@@ -0,0 +1,70 @@
+from rest_framework import status
+
+from presqt.api_v1.utilities.validation.fairshake_assessment_validator import \
+    fairshake_assessment_validator
+from presqt.api_v1.utilities.validation.fairshake_request_validator import \
+    fairshake_request_validator
+from presqt.utilities import PresQTValidationError
+
+# Most assessments that can be made in one bulk request
+FAIRSHAKE_BULK_LIMIT = 50
+
+
+def fairshake_bulk_validator(request_data):
+    """
+    Perform fairshake validation for each assessment of a bulk request.
+
+    Parameters
+    ----------
+    request_data : dict
+        The body of the request.
+
+    Returns
+    -------
+    Returns a list of dictionaries with each assessment's rubric id, digital object type,
+    project url, project title and rubric answers.
+    """
+    try:
+        assessments = request_data['assessments']
+    except KeyError:
+        raise PresQTValidationError(
+            "PresQT Error: 'assessments' missing in POST body.",
+            status.HTTP_400_BAD_REQUEST)
+
+    if type(assessments) is not list or not assessments:
+        raise PresQTValidationError(
+            "PresQT Error: 'assessments' must be a list with at least one assessment.",
+            status.HTTP_400_BAD_REQUEST)
+
+    if len(assessments) > FAIRSHAKE_BULK_LIMIT:
+        raise PresQTValidationError(
+            f"PresQT Error: At most {FAIRSHAKE_BULK_LIMIT} assessments can be made at once.",
+            status.HTTP_400_BAD_REQUEST)
+
+    validated_assessments = []
+    for index, assessment in enumerate(assessments):
+        try:
+            if type(assessment) is not dict:
+                raise PresQTValidationError("PresQT Error: Assessments must be objects.",
+                                            status.HTTP_400_BAD_REQUEST)
+            try:
+                rubric_id = str(assessment['rubric_id'])
+            except KeyError:
+                raise PresQTValidationError("PresQT Error: 'rubric_id' missing in assessment.",
+                                            status.HTTP_400_BAD_REQUEST)
+
+            rubric_id, digital_object_type, project_url, project_title = \
+                fairshake_request_validator(assessment, rubric_id)
+            rubric_answers = fairshake_assessment_validator(assessment, rubric_id)
+        except PresQTValidationError as e:
+            raise PresQTValidationError(f"Assessment {index}: {e.data}", e.status_code)
+
+        validated_assessments.append({
+            'rubric_id': rubric_id,
+            'digital_object_type': digital_object_type,
+            'project_url': project_url,
+            'project_title': project_title,
+            'rubric_answers': rubric_answers
+        })
+
+    return validated_assessments
@@ -3,13 +3,14 @@ from rest_framework import status
 from presqt.utilities import PresQTValidationError
 
 
-def fairshake_request_validator(request, rubric_id):
+def fairshake_request_validator(request_data, rubric_id):
     """
     Perform fairshake validation for required fields.
 
     Parameters
     ----------
-    request : HTTP request object
+    request_data : dict
+        The body of the request.
     rubric_id: str
         The ID of the rubric the requesting user would like to use
 
@@ -28,8 +29,6 @@ def fairshake_request_validator(request, rubric_id):
             f"PresQT Error: '{rubric_id}' is not a valid rubric id. Options are: ['93', '94', '95', '96']",
             status.HTTP_400_BAD_REQUEST)
 
-    request_data = request.data
-
     try:
         project_url = request_data['project_url']
     except KeyError:
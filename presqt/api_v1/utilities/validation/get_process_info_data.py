@@ -1,6 +1,9 @@
 import json
+import os
 
 from rest_framework import status
+
+from config.settings.base import MEDIA_ROOT
 from presqt.utilities import read_file
 from presqt.utilities import PresQTValidationError
 
@@ -20,7 +23,8 @@ def get_process_info_data(ticket_number):
     """
     while True:
         try:
-            return read_file('mediafiles/jobs/{}/process_info.json'.format(ticket_number), True)
+            return read_file(
+                os.path.join(MEDIA_ROOT, 'jobs', ticket_number, 'process_info.json'), True)
         except json.decoder.JSONDecodeError:
             pass
         except FileNotFoundError:
@@ -0,0 +1,30 @@
+from rest_framework import status
+
+from config.settings.base import PRESQT_PROFILE_JOBS
+from presqt.utilities import PresQTValidationError
+
+
+def get_profile_opt(request):
+    """
+    Perform validation for the optional presqt-profile header.
+
+    Parameters
+    ----------
+    request : HTTP request object
+
+    Returns
+    -------
+    Returns whether the stacks of the job's process should be sampled.
+    """
+    try:
+        choice = request.META['HTTP_PRESQT_PROFILE']
+    except KeyError:
+        # If it's not in the headers, fall back to the server default
+        return PRESQT_PROFILE_JOBS
+
+    if choice not in ['yes', 'no']:
+        raise PresQTValidationError(
+            "PresQT Error: 'presqt-profile' must be 'yes' or 'no'.",
+            status.HTTP_400_BAD_REQUEST)
+
+    return choice == 'yes'
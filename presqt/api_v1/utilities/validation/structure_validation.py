@@ -2,6 +2,7 @@ import os
 
 from rest_framework import status
 
+from presqt.api_v1.utilities.depth_helpers.zipped_bag import get_zipped_bag_contents
 from presqt.utilities import PresQTResponseException
 
 
@@ -15,8 +16,28 @@ def structure_validation(instance):
         Class we want to add the attributes to
     """
     # Get information about the data directory
-    os_path, folders, files = next(os.walk(instance.data_directory))
+    if instance.zipped_bag:
+        folders, files = get_zipped_bag_contents(instance.zipped_bag)
+    else:
+        os_path, folders, files = next(os.walk(instance.data_directory))
 
+    top_level_validation(instance, folders, files)
+
+
+def top_level_validation(instance, folders, files):
+    """
+    Ensure that the folders and files at the top level of the data directory are valid to
+    upload.
+
+    Parameters
+    ----------
+    instance: BaseResource class instance
+        The upload or transfer being validated.
+    folders: list
+        Names of the folders at the top level.
+    files: list
+        Names of the files at the top level.
+    """
     if len(folders) > 1:
         raise PresQTResponseException(
             "PresQT Error: Repository is not formatted correctly. Multiple directories exist at the top level.",
@@ -0,0 +1,113 @@
+import glob
+import os
+import re
+
+from django.http import FileResponse
+from django.urls import reverse
+from rest_framework import renderers, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from presqt.api_v1.utilities import admin_token_validation
+from presqt.api_v1.utilities.utils.job_profile import get_job_profile_path
+from presqt.utilities import PresQTValidationError
+
+# Ticket numbers and actions are part of the profile's path
+PATH_PART_PATTERN = re.compile(r'^[\w-]+$')
+
+
+class JobProfileCollection(APIView):
+    """
+    **Supported HTTP Methods**
+
+    * Get: List the collapsed stack files written by profiled jobs.
+    """
+
+    renderer_classes = [renderers.JSONRenderer]
+
+    def get(self, request):
+        """
+        List the profiles of jobs whose files are still on the server.
+
+        Returns
+        -------
+        200 : OK
+        [
+            {
+                "ticket_number": "a1b2c3_d4e5f6",
+                "action": "resource_transfer_in",
+                "size": 20480,
+                "modified": 1571500000.0,
+                "link": "https://presqt-prod.crc.nd.edu/api_v1/admin/jobs/a1b2c3_d4e5f6/profiles/resource_transfer_in/"
+            }
+        ]
+
+        401: Unauthorized
+        {
+            "error": "PresQT Error: 'presqt-admin-token' is not valid."
+        }
+        """
+        try:
+            admin_token_validation(request)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        profiles = []
+        for profile_path in sorted(glob.glob(get_job_profile_path('*', '*'))):
+            ticket_number = os.path.basename(os.path.dirname(profile_path))
+            action = os.path.splitext(os.path.basename(profile_path))[0]
+            profiles.append({
+                'ticket_number': ticket_number,
+                'action': action,
+                'size': os.path.getsize(profile_path),
+                'modified': os.path.getmtime(profile_path),
+                'link': request.build_absolute_uri(reverse(
+                    'job_profile', kwargs={'ticket_number': ticket_number, 'action': action}))
+            })
+        return Response(data=profiles, status=status.HTTP_200_OK)
+
+
+class JobProfile(APIView):
+    """
+    **Supported HTTP Methods**
+
+    * Get: Retrieve the collapsed stack file of a profiled job.
+    """
+
+    renderer_classes = [renderers.JSONRenderer]
+
+    def get(self, request, ticket_number, action):
+        """
+        Retrieve a job's collapsed stack file, to render with flamegraph.pl or speedscope.
+
+        Returns
+        -------
+        200 : OK
+        MainThread;_bootstrap (threading.py:870);run (threading.py:855);... 12
+
+        401: Unauthorized
+        {
+            "error": "PresQT Error: 'presqt-admin-token' missing in the request headers."
+        }
+
+        404: Not Found
+        {
+            "error": "PresQT Error: No profile found for the 'resource_download' job of ticket 'a1b2c3'."
+        }
+        """
+        try:
+            admin_token_validation(request)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        profile_path = get_job_profile_path(ticket_number, action)
+        if not (PATH_PART_PATTERN.match(ticket_number) and PATH_PART_PATTERN.match(action)
+                and os.path.isfile(profile_path)):
+            return Response(
+                data={'error': "PresQT Error: No profile found for the '{}' job of ticket "
+                               "'{}'.".format(action, ticket_number)},
+                status=status.HTTP_404_NOT_FOUND)
+
+        return FileResponse(open(profile_path, 'rb'), content_type='text/plain; charset=utf-8',
+                            as_attachment=True,
+                            filename='{}_{}.collapsed'.format(ticket_number, action))
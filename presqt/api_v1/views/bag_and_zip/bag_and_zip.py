@@ -3,11 +3,14 @@ import zipfile
 from uuid import uuid4
 
 import bagit
+from dateutil.relativedelta import relativedelta
 from django.http import HttpResponse
+from django.utils import timezone
 from rest_framework import renderers
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from presqt.api_v1.utilities.utils.expiry_index import index_expiration
 from presqt.api_v1.utilities.validation.file_validation import file_validation
 from presqt.utilities import PresQTValidationError, zip_directory
 
@@ -50,6 +53,9 @@ class BagAndZip(APIView):
         ticket_number = uuid4()
         ticket_path = os.path.join("mediafiles", 'bag_tool', str(ticket_number))
         data_path = os.path.join(ticket_path, 'presqt_bag')
+        # Register the directory before creating it so it isn't cleaned up mid-request
+        index_expiration(os.path.join('bag_tool', str(ticket_number)), 'bag_and_zip',
+                         timezone.now() + relativedelta(hours=1))
 
         # Extract each file in the zip file to disk
         with zipfile.ZipFile(request_file) as myzip:
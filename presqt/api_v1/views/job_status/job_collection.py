@@ -0,0 +1,111 @@
+from rest_framework import status, renderers
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+
+from presqt.api_v1.utilities import (get_process_info_data, hash_tokens, get_user_jobs,
+                                     calculate_job_percentage)
+from presqt.utilities import PresQTValidationError
+
+# The action of each job in the process_info file and in the job_status url
+JOB_ACTIONS = {
+    'resource_download': 'download',
+    'resource_upload': 'upload',
+    'resource_transfer_in': 'transfer',
+    'bulk_keywords': 'bulk_keywords',
+    'fairshare_evaluation': 'fairshare_evaluation'
+}
+
+
+class JobCollection(APIView):
+    """
+    **Supported HTTP Methods**
+
+    * Get: List a user's jobs
+    """
+
+    renderer_classes = [renderers.JSONRenderer]
+
+    def get(self, request):
+        """
+        List the download, upload, transfer, bulk keywords and FAIRshare evaluation jobs of the
+        users whose tokens are given that are still on the server, newest first. Transfers are
+        listed for both their source and destination users.
+
+        Returns
+        -------
+        200: OK
+        [
+            {
+                "job_id": "5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0",
+                "action": "download",
+                "status": "in_progress",
+                "message": "Download is being processed on the server",
+                "job_percentage": 40,
+                "created": 1571500000.0,
+                "job_status": "https://localhost/api_v1/job_status/download/?job_id=5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0"
+            }
+        ]
+
+        400: Bad Request
+        {
+            "error": "PresQT Error: 'presqt-source-token' or 'presqt-destination-token' missing in the request headers."
+        }
+        """
+        user_hashes = [hash_tokens(request.META[header])
+                       for header in ['HTTP_PRESQT_SOURCE_TOKEN', 'HTTP_PRESQT_DESTINATION_TOKEN']
+                       if header in request.META]
+        if not user_hashes:
+            return Response(
+                data={'error': "PresQT Error: 'presqt-source-token' or 'presqt-destination-token' "
+                               "missing in the request headers."},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        jobs = []
+        for job_id, action, created in get_user_jobs(user_hashes):
+            try:
+                process_data = get_process_info_data(job_id)[action]
+            except (PresQTValidationError, KeyError):
+                # The job's files have been deleted
+                continue
+
+            reversed_url = reverse('job_status', kwargs={'action': JOB_ACTIONS[action]})
+            jobs.append({
+                'job_id': job_id,
+                'action': JOB_ACTIONS[action],
+                'status': process_data['status'],
+                'message': process_data['message'],
+                'job_percentage': get_job_percentage(process_data),
+                'created': created,
+                'job_status': '{}?job_id={}'.format(request.build_absolute_uri(reversed_url),
+                                                    job_id)
+            })
+        return Response(data=jobs, status=status.HTTP_200_OK)
+
+
+def get_job_percentage(process_data):
+    """
+    Get the percentage of a job's files that are finished. Transfers are half downloading and
+    half uploading. Bulk keywords jobs count their resources and FAIRshare evaluations are a
+    single step.
+
+    Parameters
+    ----------
+    process_data: dict
+        The job's action in the process_info file.
+
+    Returns
+    -------
+    An int representation of the job percentage
+    """
+    if 'total_resources' in process_data:
+        return calculate_job_percentage(process_data['total_resources'],
+                                        process_data['resources_finished'])
+    if 'fairshare_evaluation_results' in process_data:
+        return 100 if process_data['status'] == 'finished' else 0
+
+    percentages = [calculate_job_percentage(process_data['{}_total_files'.format(stage)],
+                                            process_data['{}_files_finished'.format(stage)])
+                   for stage in ['download', 'upload']
+                   if '{}_total_files'.format(stage) in process_data]
+    return round(sum(percentages) / len(percentages))
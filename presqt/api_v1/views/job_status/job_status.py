@@ -1,6 +1,6 @@
 import json
-import multiprocessing
 import os
+import shutil
 
 from dateutil.relativedelta import relativedelta
 from django.utils.datastructures import MultiValueDictKeyError
@@ -9,10 +9,13 @@ from django.utils import timezone
 from rest_framework import status, renderers
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 
+from config.settings.base import MEDIA_ROOT
 from presqt.api_v1.utilities import (get_source_token, get_process_info_data, hash_tokens,
                                      update_or_create_process_info, get_destination_token,
-                                     calculate_job_percentage)
+                                     calculate_job_percentage, kill_job_process,
+                                     stop_job_process, resume_job, find_job)
 from presqt.utilities import PresQTValidationError
 
 
@@ -21,6 +24,7 @@ class JobStatus(APIView):
     **Supported HTTP Methods**
 
     * Get: Retrieve the status of a job
+    * Post: Resume a job
     * Patch: Cancel a job
     """
 
@@ -40,6 +44,11 @@ class JobStatus(APIView):
         response_format:
             Optional parameter for specifying the response format for downloads
 
+        Query Parameters
+        ----------------
+        job_id: str
+            Optional id of the job. Defaults to the user's latest job for the action.
+
         Returns
         -------
         200: OK
@@ -61,6 +70,15 @@ class JobStatus(APIView):
         {
             "error": "PresQT Error: Invalid ticket number, '1234'."
         }
+        or
+        {
+            "error": "PresQT Error: Invalid job id, '1234'."
+        }
+
+        410: Gone
+        {
+            "error": "PresQT Error: The zip file has already been delivered and removed from the server."
+        }
         """
         self.response_format = response_format
 
@@ -78,19 +96,23 @@ class JobStatus(APIView):
         Will return either a json object or a file bytes depending on the 'resource_format' url
         parameter
         """
-        if self.request.query_params:
+        query_params = self.request.query_params
+        if 'HTTP_PRESQT_SOURCE_TOKEN' not in self.request.META and \
+                ('job_id' in query_params or 'ticket_number' in query_params):
             try:
-                # This check will run for the email links we generate
-                self.ticket_number = self.request.query_params['ticket_number']
+                # This check will run for the email links we generate, which are opened without
+                # the user's token. Links sent before jobs had ids name the ticket number.
+                self.ticket_number = query_params.get('job_id') or query_params['ticket_number']
                 self.process_data = get_process_info_data(self.ticket_number)
             except (MultiValueDictKeyError, PresQTValidationError):
-                return Response(data={'error': "'ticket_number' not found as query parameter or invalid 'ticket_number' provided."},
+                return Response(data={'error': "'job_id' not found as query parameter or invalid 'job_id' provided."},
                                 status=status.HTTP_400_BAD_REQUEST)
         else:
             # Perform token validation. Read data from the process_info file.
             try:
                 source_token = get_source_token(self.request)
-                self.ticket_number = hash_tokens(source_token)
+                self.ticket_number = find_job(hash_tokens(source_token), 'resource_download',
+                                              self.request.query_params.get('job_id'))
                 self.process_data = get_process_info_data(self.ticket_number)
             except PresQTValidationError as e:
                 return Response(data={'error': e.data}, status=e.status_code)
@@ -121,10 +143,21 @@ class JobStatus(APIView):
             if self.response_format == 'zip':
                 # Path to the file to be downloaded
                 zip_name = download_process_data['zip_name']
-                zip_file_path = os.path.join('mediafiles', 'jobs', self.ticket_number,
+                zip_file_path = os.path.join(MEDIA_ROOT, 'jobs', self.ticket_number,
                                              'download', zip_name)
+                try:
+                    zip_file = open(zip_file_path, 'rb')
+                except FileNotFoundError:
+                    return Response(
+                        data={'error': 'PresQT Error: The zip file has already been delivered and '
+                                       'removed from the server.'},
+                        status=status.HTTP_410_GONE)
 
-                response = HttpResponse(open(zip_file_path, 'rb'), content_type='application/zip')
+                # The open file handle keeps the zip readable after it's removed from disk
+                if download_process_data.get('delete_after_deliver'):
+                    shutil.rmtree(os.path.dirname(zip_file_path))
+
+                response = HttpResponse(zip_file, content_type='application/zip')
                 response['Content-Disposition'] = 'attachment; filename={}'.format(zip_name)
             else:
                 response = Response(data={'status_code': status_code,
@@ -132,7 +165,9 @@ class JobStatus(APIView):
                                           'zip_name': download_process_data['zip_name'],
                                           'failed_fixity': download_process_data['failed_fixity'],
                                           'job_percentage': download_job_percentage,
-                                          'status': download_status
+                                          'status': download_status,
+                                          'http_requests': download_process_data.get(
+                                              'http_requests', {})
                                           },
                                     status=status.HTTP_200_OK)
             return response
@@ -146,7 +181,8 @@ class JobStatus(APIView):
                             data={'job_percentage': download_job_percentage,
                                   'status': download_status,
                                   'status_code': status_code,
-                                  'message': message
+                                  'message': message,
+                                  'http_requests': download_process_data.get('http_requests', {})
                                   })
 
     def upload_get(self):
@@ -156,7 +192,8 @@ class JobStatus(APIView):
         # Perform token validation. Read data from the process_info file.
         try:
             destination_token = get_destination_token(self.request)
-            self.ticket_number = hash_tokens(destination_token)
+            self.ticket_number = find_job(hash_tokens(destination_token), 'resource_upload',
+                                          self.request.query_params.get('job_id'))
             self.process_data = get_process_info_data(self.ticket_number)
         except PresQTValidationError as e:
             return Response(data={'error': e.data}, status=e.status_code)
@@ -177,7 +214,8 @@ class JobStatus(APIView):
             'status_code': upload_process_data['status_code'],
             'status': upload_status,
             'message': upload_process_data['message'],
-            'job_percentage': job_percentage
+            'job_percentage': job_percentage,
+            'http_requests': upload_process_data.get('http_requests', {})
         }
 
         if upload_status == 'finished':
@@ -205,8 +243,9 @@ class JobStatus(APIView):
         try:
             destination_token = get_destination_token(self.request)
             source_token = get_source_token(self.request)
-            self.ticket_number = '{}_{}'.format(hash_tokens(source_token),
-                                                hash_tokens(destination_token))
+            owner = '{}_{}'.format(hash_tokens(source_token), hash_tokens(destination_token))
+            self.ticket_number = find_job(owner, 'resource_transfer_in',
+                                          self.request.query_params.get('job_id'))
             self.process_data = get_process_info_data(self.ticket_number)
         except PresQTValidationError as e:
             return Response(data={'error': e.data}, status=e.status_code)
@@ -227,6 +266,7 @@ class JobStatus(APIView):
                 'status': transfer_status,
                 'message': transfer_process_data['message'],
                 'job_percentage': round((upload_job_percentage + download_job_percentage) / 2),
+                'http_requests': transfer_process_data.get('http_requests', {})
                 }
 
         if transfer_status == 'finished':
@@ -249,6 +289,243 @@ class JobStatus(APIView):
 
         return Response(status=http_status, data=data)
 
+    def fairshare_evaluation_get(self):
+        """
+        Get the status of a FAIRshare evaluation job. Evaluations can be started without a
+        token so they are found by their job id alone, or by the user's token for their latest
+        evaluation. Links sent before jobs had ids name the ticket number.
+        """
+        query_params = self.request.query_params
+        job_id = query_params.get('job_id') or query_params.get('ticket_number')
+        if job_id is None and 'HTTP_PRESQT_SOURCE_TOKEN' not in self.request.META:
+            return Response(data={'error': "'job_id' not found as query parameter or invalid 'job_id' provided."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            owner = None
+            if job_id is None:
+                owner = hash_tokens(get_source_token(self.request))
+            self.ticket_number = find_job(owner, 'fairshare_evaluation', job_id)
+            self.process_data = get_process_info_data(self.ticket_number)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        try:
+            evaluation_process_data = self.process_data['fairshare_evaluation']
+        except KeyError:
+            return Response(
+                data={'error': 'PresQT Error: "fairshare_evaluation" not found in process_info file.'},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        evaluation_status = evaluation_process_data['status']
+        data = {'status_code': evaluation_process_data['status_code'],
+                'status': evaluation_status,
+                'message': evaluation_process_data['message'],
+                'resource_id': evaluation_process_data['resource_id']}
+
+        if evaluation_status == 'finished':
+            http_status = status.HTTP_200_OK
+            data['fairshare_evaluation_results'] = evaluation_process_data[
+                'fairshare_evaluation_results']
+        elif evaluation_status == 'in_progress':
+            http_status = status.HTTP_202_ACCEPTED
+        else:
+            http_status = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        return Response(status=http_status, data=data)
+
+    def bulk_keywords_get(self):
+        """
+        Get the status of a bulk keywords job.
+        """
+        # Perform token validation. Read data from the process_info file.
+        try:
+            source_token = get_source_token(self.request)
+            self.ticket_number = find_job(hash_tokens(source_token), 'bulk_keywords',
+                                          self.request.query_params.get('job_id'))
+            self.process_data = get_process_info_data(self.ticket_number)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        try:
+            keywords_process_data = self.process_data['bulk_keywords']
+        except KeyError:
+            return Response(
+                data={'error': 'PresQT Error: "bulk_keywords" not found in process_info file.'},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        keywords_status = keywords_process_data['status']
+        data = {'status_code': keywords_process_data['status_code'],
+                'status': keywords_status,
+                'message': keywords_process_data['message'],
+                'job_percentage': calculate_job_percentage(
+                    keywords_process_data['total_resources'],
+                    keywords_process_data['resources_finished'])}
+
+        if keywords_status == 'finished':
+            http_status = status.HTTP_200_OK
+            data['results'] = keywords_process_data['results']
+        elif keywords_status == 'in_progress':
+            http_status = status.HTTP_202_ACCEPTED
+        else:
+            http_status = status.HTTP_500_INTERNAL_SERVER_ERROR
+            data['results'] = keywords_process_data['results']
+
+        return Response(status=http_status, data=data)
+
+    def post(self, request, action, response_format=None):
+        """
+        Resume a job that failed, was cancelled or was killed. Work recorded in the job's
+        checkpoint journal is skipped.
+
+        Handler for all action status jobs...will route to the correct action class method
+        depending on the action url parameter, 'action'.
+
+        Path Parameters
+        ---------------
+        action: str
+            The action to resume
+        response_format:
+            Optional parameter for specifying the response format for downloads
+
+        Query Parameters
+        ----------------
+        job_id: str
+            Optional id of the job. Defaults to the user's latest job for the action.
+
+        Returns
+        -------
+        202: Accepted
+        {
+            "message": "The server is resuming the job.",
+            "job_id": "5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0",
+            "download_job": "https://localhost/api_v1/job_status/download/?job_id=5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0"
+        }
+
+        400: Bad Request
+        {
+            "error": "PresQT Error: 'presqt-source-token' missing in the request headers."
+        }
+        or
+        {
+            "error": "PresQT Error: {} is not a valid acton."
+        }
+        or
+        {
+            "error": "PresQT Error: The job is in_progress and can't be resumed."
+        }
+        or
+        {
+            "error": "PresQT Error: This job can't be resumed."
+        }
+        404  Not Found
+        {
+            "error": "PresQT Error: Invalid ticket number, '1234'."
+        }
+        or
+        {
+            "error": "PresQT Error: Invalid job id, '1234'."
+        }
+        """
+        self.response_format = response_format
+
+        try:
+            func = getattr(self, '{}_resume'.format(action))
+        except AttributeError:
+            return Response(data={"error": "PresQT Error: {} is not a valid acton.".format(action)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            return func()
+
+    def download_resume(self):
+        """
+        Resume a download job.
+        """
+        # Perform token validation. Read data from the process_info file.
+        try:
+            source_token = get_source_token(self.request)
+            self.ticket_number = find_job(hash_tokens(source_token), 'resource_download',
+                                          self.request.query_params.get('job_id'))
+            self.process_data = get_process_info_data(self.ticket_number)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        return self._resume_job('resource_download', 'download', {'source_token': source_token})
+
+    def upload_resume(self):
+        """
+        Resume an upload job.
+        """
+        # Perform token validation. Read data from the process_info file.
+        try:
+            destination_token = get_destination_token(self.request)
+            self.ticket_number = find_job(hash_tokens(destination_token), 'resource_upload',
+                                          self.request.query_params.get('job_id'))
+            self.process_data = get_process_info_data(self.ticket_number)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        return self._resume_job('resource_upload', 'upload',
+                                {'destination_token': destination_token})
+
+    def transfer_resume(self):
+        """
+        Resume a transfer job.
+        """
+        # Perform token validation. Read data from the process_info file.
+        try:
+            destination_token = get_destination_token(self.request)
+            source_token = get_source_token(self.request)
+            owner = '{}_{}'.format(hash_tokens(source_token), hash_tokens(destination_token))
+            self.ticket_number = find_job(owner, 'resource_transfer_in',
+                                          self.request.query_params.get('job_id'))
+            self.process_data = get_process_info_data(self.ticket_number)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        return self._resume_job('resource_transfer_in', 'transfer',
+                                {'source_token': source_token,
+                                 'destination_token': destination_token})
+
+    def _resume_job(self, process_action, action, tokens):
+        """
+        Resume the job found in the process_info file if it has stopped without finishing.
+
+        Parameters
+        ----------
+        process_action: str
+            The job's action in the process_info file, e.g. 'resource_download'
+        action: str
+            The job's action in the job_status url, e.g. 'download'
+        tokens: dict
+            The user's tokens by the job's attribute names
+        """
+        try:
+            job_status = self.process_data[process_action]['status']
+        except KeyError:
+            return Response(
+                data={'error': 'PresQT Error: "{}" not found in process_info file.'.format(
+                    process_action)},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        if job_status != 'failed':
+            return Response(
+                data={'error': "PresQT Error: The job is {} and can't be resumed.".format(
+                    job_status)},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        ticket_path = os.path.join(MEDIA_ROOT, 'jobs', self.ticket_number, action)
+        try:
+            resume_job(self.request, ticket_path, tokens)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        reversed_url = reverse('job_status', kwargs={'action': action})
+        return Response(status=status.HTTP_202_ACCEPTED,
+                        data={'message': 'The server is resuming the job.',
+                              'job_id': self.ticket_number,
+                              '{}_job'.format(action): '{}?job_id={}'.format(
+                                  self.request.build_absolute_uri(reversed_url),
+                                  self.ticket_number)})
+
     def patch(self, request, action, response_format=None):
         """
         Cancel a job
@@ -263,6 +540,11 @@ class JobStatus(APIView):
         response_format:
             Optional parameter for specifying the response format for downloads
 
+        Query Parameters
+        ----------------
+        job_id: str
+            Optional id of the job. Defaults to the user's latest job for the action.
+
         Returns
         -------
         200: OK
@@ -284,6 +566,10 @@ class JobStatus(APIView):
         {
             "error": "PresQT Error: Invalid ticket number, '1234'."
         }
+        or
+        {
+            "error": "PresQT Error: Invalid job id, '1234'."
+        }
         """
         self.response_format = response_format
 
@@ -301,7 +587,8 @@ class JobStatus(APIView):
         # Perform token validation. Read data from the process_info file.
         try:
             source_token = get_source_token(self.request)
-            self.ticket_number = hash_tokens(source_token)
+            self.ticket_number = find_job(hash_tokens(source_token), 'resource_download',
+                                          self.request.query_params.get('job_id'))
             self.process_data = get_process_info_data(self.ticket_number)
         except PresQTValidationError as e:
             return Response(data={'error': e.data}, status=e.status_code)
@@ -325,22 +612,24 @@ class JobStatus(APIView):
 
         # If download is still in progress then cancel the subprocess
         if download_process_data['status'] == 'in_progress':
-            for process in multiprocessing.active_children():
-                if process.pid == download_process_data['function_process_id']:
-                    process.kill()
-                    process.join()
-                    download_process_data['status'] = 'failed'
-                    download_process_data['message'] = 'Download was cancelled by the user'
-                    download_process_data['status_code'] = '499'
-                    download_process_data['expiration'] = str(
-                        timezone.now() + relativedelta(hours=1))
-                    update_or_create_process_info(
-                        download_process_data, 'resource_download', self.ticket_number)
-
-                return Response(
-                    data={
-                        'status_code': download_process_data['status_code'], 'message': download_process_data['message']},
-                    status=status.HTTP_200_OK)
+            # Give the job a chance to stop cleanly and save its progress first
+            if stop_job_process(download_process_data['function_process_id'],
+                                self.ticket_number, 'resource_download'):
+                download_process_data = get_process_info_data(
+                    self.ticket_number)['resource_download']
+            elif kill_job_process(download_process_data['function_process_id']):
+                download_process_data['status'] = 'failed'
+                download_process_data['message'] = 'Download was cancelled by the user'
+                download_process_data['status_code'] = '499'
+                download_process_data['expiration'] = str(
+                    timezone.now() + relativedelta(hours=1))
+                update_or_create_process_info(
+                    download_process_data, 'resource_download', self.ticket_number)
+
+            return Response(
+                data={
+                    'status_code': download_process_data['status_code'], 'message': download_process_data['message']},
+                status=status.HTTP_200_OK)
         # If download is finished then don't attempt to cancel subprocess
         else:
             return Response(
@@ -355,7 +644,8 @@ class JobStatus(APIView):
         # Perform token validation. Read data from the process_info file.
         try:
             destination_token = get_destination_token(self.request)
-            self.ticket_number = hash_tokens(destination_token)
+            self.ticket_number = find_job(hash_tokens(destination_token), 'resource_upload',
+                                          self.request.query_params.get('job_id'))
             self.process_data = get_process_info_data(self.ticket_number)
         except PresQTValidationError as e:
             return Response(data={'error': e.data}, status=e.status_code)
@@ -372,20 +662,22 @@ class JobStatus(APIView):
 
         # If upload is still in progress then cancel the subprocess
         if upload_process_data['status'] == 'in_progress':
-            for process in multiprocessing.active_children():
-                if process.pid == upload_process_data['function_process_id']:
-                    process.kill()
-                    process.join()
-                    upload_process_data['status'] = 'failed'
-                    upload_process_data['message'] = 'Upload was cancelled by the user'
-                    upload_process_data['status_code'] = '499'
-                    upload_process_data['expiration'] = str(timezone.now() + relativedelta(hours=1))
-                    update_or_create_process_info(
-                        upload_process_data, 'resource_upload', self.ticket_number)
-                    return Response(
-                        data={
-                            'status_code': upload_process_data['status_code'], 'message': upload_process_data['message']},
-                        status=status.HTTP_200_OK)
+            # Give the job a chance to stop cleanly and save its progress first
+            if stop_job_process(upload_process_data['function_process_id'],
+                                self.ticket_number, 'resource_upload'):
+                upload_process_data = get_process_info_data(
+                    self.ticket_number)['resource_upload']
+            elif kill_job_process(upload_process_data['function_process_id']):
+                upload_process_data['status'] = 'failed'
+                upload_process_data['message'] = 'Upload was cancelled by the user'
+                upload_process_data['status_code'] = '499'
+                upload_process_data['expiration'] = str(timezone.now() + relativedelta(hours=1))
+                update_or_create_process_info(
+                    upload_process_data, 'resource_upload', self.ticket_number)
+            return Response(
+                data={
+                    'status_code': upload_process_data['status_code'], 'message': upload_process_data['message']},
+                status=status.HTTP_200_OK)
         # If upload is finished then don't attempt to cancel subprocess
         else:
             return Response(
@@ -401,8 +693,9 @@ class JobStatus(APIView):
         try:
             destination_token = get_destination_token(self.request)
             source_token = get_source_token(self.request)
-            self.ticket_number = '{}_{}'.format(hash_tokens(source_token),
-                                                hash_tokens(destination_token))
+            owner = '{}_{}'.format(hash_tokens(source_token), hash_tokens(destination_token))
+            self.ticket_number = find_job(owner, 'resource_transfer_in',
+                                          self.request.query_params.get('job_id'))
             process_data = get_process_info_data(self.ticket_number)
         except PresQTValidationError as e:
             return Response(data={'error': e.data}, status=e.status_code)
@@ -419,21 +712,23 @@ class JobStatus(APIView):
 
         # If transfer is still in progress then cancel the subprocess
         if transfer_process_data['status'] == 'in_progress':
-            for process in multiprocessing.active_children():
-                if process.pid == transfer_process_data['function_process_id']:
-                    process.kill()
-                    process.join()
-                    transfer_process_data['status'] = 'failed'
-                    transfer_process_data['message'] = 'Transfer was cancelled by the user'
-                    transfer_process_data['status_code'] = '499'
-                    transfer_process_data['expiration'] = str(
-                        timezone.now() + relativedelta(hours=1))
-                    update_or_create_process_info(
-                        transfer_process_data, 'resource_transfer_in', self.ticket_number)
-                    return Response(
-                        data={
-                            'status_code': transfer_process_data['status_code'], 'message': transfer_process_data['message']},
-                        status=status.HTTP_200_OK)
+            # Give the job a chance to stop cleanly and save its progress first
+            if stop_job_process(transfer_process_data['function_process_id'],
+                                self.ticket_number, 'resource_transfer_in'):
+                transfer_process_data = get_process_info_data(
+                    self.ticket_number)['resource_transfer_in']
+            elif kill_job_process(transfer_process_data['function_process_id']):
+                transfer_process_data['status'] = 'failed'
+                transfer_process_data['message'] = 'Transfer was cancelled by the user'
+                transfer_process_data['status_code'] = '499'
+                transfer_process_data['expiration'] = str(
+                    timezone.now() + relativedelta(hours=1))
+                update_or_create_process_info(
+                    transfer_process_data, 'resource_transfer_in', self.ticket_number)
+            return Response(
+                data={
+                    'status_code': transfer_process_data['status_code'], 'message': transfer_process_data['message']},
+                status=status.HTTP_200_OK)
         # If transfer is finished then don't attempt to cancel subprocess
         else:
             return Response(
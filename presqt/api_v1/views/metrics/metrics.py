@@ -0,0 +1,33 @@
+from django.http import HttpResponse
+from rest_framework import renderers
+from rest_framework.views import APIView
+
+from presqt.api_v1.utilities.utils.job_metrics import get_prometheus_metrics
+
+
+class Metrics(APIView):
+    """
+    **Supported HTTP Methods**
+
+    * Get: Retrieve the job metrics in the Prometheus text format.
+    """
+
+    renderer_classes = [renderers.JSONRenderer]
+
+    def get(self, request):
+        """
+        Retrieve the totals of every job that has ended.
+
+        Returns
+        -------
+        200 : OK
+        # HELP presqt_jobs_total Number of jobs that ended with each status.
+        # TYPE presqt_jobs_total counter
+        presqt_jobs_total{action="resource_download",status="finished"} 12
+        # HELP presqt_job_span_seconds_total Seconds spent in each job span.
+        # TYPE presqt_job_span_seconds_total counter
+        presqt_job_span_seconds_total{action="resource_download",span="fetch"} 41.2
+        ...
+        """
+        return HttpResponse(get_prometheus_metrics(),
+                            content_type='text/plain; version=0.0.4; charset=utf-8')
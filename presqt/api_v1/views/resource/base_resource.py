@@ -1,8 +1,7 @@
 import os
 import shutil
 import zipfile
-import requests
-import json
+from time import sleep
 from uuid import uuid4
 
 import bagit
@@ -15,12 +14,14 @@ from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
+from config.settings.base import MEDIA_ROOT, PRESQT_PIPELINED_TRANSFER
 from presqt.api_v1.utilities import (target_validation, transfer_target_validation,
                                      get_destination_token, file_duplicate_action_validation,
                                      FunctionRouter, get_source_token,
                                      transfer_post_body_validation,
                                      spawn_action_process, get_or_create_hashes_from_bag,
                                      create_fts_metadata, create_download_metadata,
+                                     FTSMetadataBuilder,
                                      create_upload_metadata, get_action_message,
                                      get_upload_source_metadata, hash_tokens,
                                      finite_depth_upload_helper, structure_validation,
@@ -28,16 +29,38 @@ from presqt.api_v1.utilities import (target_validation, transfer_target_validati
                                      automatic_keywords, update_targets_keywords, manual_keywords,
                                      get_target_data, get_keyword_support,
                                      update_or_create_process_info, get_user_email_opt,
-                                     fairshare_evaluator_validation, fairshare_results)
+                                     fairshare_evaluator_validation, fairshare_results,
+                                     fairshare_evaluation,
+                                     get_delete_after_deliver_opt, get_profile_opt,
+                                     disk_space_admission,
+                                     wait_for_disk_space, update_disk_reservation,
+                                     get_directory_size, new_job_id,
+                                     index_job, claim_job_slot, remove_indexed_job)
+from presqt.api_v1.utilities.depth_helpers.zipped_bag import save_uploaded_zip
 from presqt.api_v1.utilities.fixity import download_fixity_checker
+from presqt.api_v1.utilities.fixity.get_or_create_hashes_from_bag import \
+    get_or_create_hashes_from_zipped_bag
 from presqt.api_v1.utilities.metadata.download_metadata import validate_metadata
-from presqt.api_v1.utilities.validation.bagit_validation import validate_bag
+from presqt.api_v1.utilities.metadata.upload_metadata import get_zipped_upload_source_metadata
+from presqt.api_v1.utilities.multiprocess.job_spec import build_job_spec, TOKEN_ATTRIBUTES
+from presqt.api_v1.utilities.validation.bagit_validation import validate_bag, validate_zipped_bag
 from presqt.api_v1.utilities.validation.file_validation import file_validation
+from presqt.api_v1.utilities.utils.job_metrics import record_job_metrics
 from presqt.api_v1.utilities.utils.send_email import email_blaster
+from presqt.api_v1.utilities.utils.transfer_pipeline import TransferPipeline
 from presqt.json_schemas.schema_handlers import schema_validator
+from presqt.targets.utilities import HttpAccounting, open_http_accounting
 from presqt.utilities import (PresQTValidationError, PresQTResponseException, write_file,
+                              is_fts_metadata_file,
                               zip_directory, read_file, update_process_info_message,
-                              increment_process_info, PresQTError)
+                              increment_process_info, PresQTError, write_resource_file,
+                              PROCESS_INFO_LOCK, JobSpans, open_job_spans, PresQTJobStopped,
+                              JobControl, ResourceStream, open_download_stream,
+                              close_download_stream, CheckpointJournal, open_checkpoint_journal,
+                              open_download_admission, close_download_admission)
+
+# Message shown while a job waits for the user's other jobs to finish
+JOB_SLOT_MESSAGE = "Waiting for the user's other jobs to finish..."
 
 
 class BaseResource(APIView):
@@ -45,6 +68,24 @@ class BaseResource(APIView):
     Base View for Resource views. Handles shared POSTs (upload and transfer) and download methods.
     """
     renderer_classes = [renderers.JSONRenderer]
+    # Only set for pipelined transfers
+    transfer_pipeline = None
+    # Whether the job's process samples its stacks, from the presqt-profile header
+    profile_job = False
+    # Totals of each span of the job, set when the first span starts
+    job_spans = None
+    # Counts of the HTTP requests made by the job's process, set when the job starts
+    http_accounting = None
+    # Cancellation token and deadline handed to the target functions, set when the job is spawned
+    job_control = None
+    # Paths of the files saved before the job was stopped
+    partial_files = []
+    # Record of the files the job has finished so it can be resumed, set when the job is spawned
+    checkpoint_journal = None
+    # Hash of the user's token the job is indexed under, both hashes joined by '_' for transfers
+    job_owner = None
+    # Whether the job has started running within the user's job limit
+    job_slot_claimed = False
 
     def post(self, request, target_name, resource_id=None):
         """
@@ -62,9 +103,9 @@ class BaseResource(APIView):
         -------
         202: Accepted
         {
-            "ticket_number": "ba025c37-3b33-461c-88a1-659a33f3cf47",
             "message": "The server is processing the request.",
-            "upload_job": "https://localhost/api_v1/uploads/ba025c37-3b33-461c-88a1-659a33f3cf47/"
+            "job_id": "ba025c373b33461c88a1659a33f3cf47",
+            "upload_job": "https://localhost/api_v1/job_status/upload/?job_id=ba025c373b33461c88a1659a33f3cf47"
         }
 
         400: Bad Request
@@ -155,7 +196,7 @@ class BaseResource(APIView):
         }
         or
         {
-            "error": "User currently has processes in progress."
+            "error": "PresQT Error: 'presqt-delete-after-deliver' must be 'yes' or 'no'."
         }
 
         401: Unauthorized
@@ -177,11 +218,18 @@ class BaseResource(APIView):
         {
             "error": "The requested resource is no longer available."
         }
+
+        507: Insufficient Storage
+        {
+            "error": "PresQT Error: The server does not have enough disk space for this request right now. Please try again later."
+        }
         """
         # Set class attributes that are used in POST methods
         self.request = request
         self.destination_target_name = target_name
         self.destination_resource_id = resource_id
+        # Only set for uploads to finite depth targets, where the uploaded bag is never extracted
+        self.zipped_bag = None
         # Route to upload POST method
         if request.FILES:
             self.action = 'resource_upload'
@@ -204,21 +252,26 @@ class BaseResource(APIView):
             self.destination_token = get_destination_token(self.request)
             self.file_duplicate_action = file_duplicate_action_validation(self.request)
             self.email = get_user_email_opt(self.request)
+            self.delete_after_deliver = get_delete_after_deliver_opt(self.request)
+            self.profile_job = get_profile_opt(self.request)
             target_valid, self.infinite_depth = target_validation(
                 self.destination_target_name, self.action)
             resource = file_validation(self.request)
         except PresQTValidationError as e:
             return Response(data={'error': e.data}, status=e.status_code)
 
-        self.ticket_number = hash_tokens(self.destination_token)
-        ticket_path = os.path.join('mediafiles', 'jobs', str(self.ticket_number))
-
-        self.ticket_path = os.path.join('mediafiles', 'jobs', str(self.ticket_number), 'upload')
+        # Each job gets its own ticket number, indexed under the user's token hash
+        self.job_owner = hash_tokens(self.destination_token)
+        self.ticket_number = new_job_id()
+        self.ticket_path = os.path.join(MEDIA_ROOT, 'jobs', str(self.ticket_number), 'upload')
 
-        # Remove any resources that already exist in this user's job directory
-        if os.path.exists(self.ticket_path):
-            for folder in next(os.walk(self.ticket_path))[1]:
-                shutil.rmtree(os.path.join(self.ticket_path, folder))
+        # Make sure there is room on disk for everything this upload will write. Finite depth
+        # targets keep the uploaded zip and write a new one, otherwise the zip is extracted.
+        if self.infinite_depth is False:
+            projected_disk_usage = resource.size * 2
+        else:
+            with zipfile.ZipFile(resource) as myzip:
+                projected_disk_usage = sum(member.file_size for member in myzip.infolist())
 
         # Write process_info.json file
         self.process_info_obj = {
@@ -229,102 +282,206 @@ class BaseResource(APIView):
             'status_code': None,
             'function_process_id': None,
             'upload_total_files': 0,
-            'upload_files_finished': 0
+            'upload_files_finished': 0,
+            'delete_after_deliver': self.delete_after_deliver
         }
 
         self.process_info_path = update_or_create_process_info(
             self.process_info_obj, self.action, self.ticket_number)
+        index_job(self.ticket_number, self.job_owner, self.action)
+        try:
+            disk_space_admission(self.ticket_number, self.action, projected_disk_usage)
+        except PresQTValidationError as e:
+            return self._abort_upload(e.data, e.status_code)
 
-        # Save files to disk and check their fixity integrity. If BagIt validation fails, attempt
-        # to save files to disk again. If BagIt validation fails after 3 attempts return an error.
-        for index in range(3):
-            # Extract each file in the zip file to disk
-            with zipfile.ZipFile(resource) as myzip:
-                myzip.extractall(self.ticket_path)
-
+        # Finite depth targets receive the bag as a single zip file so the bag doesn't need to be
+        # extracted. Validate it by streaming its files out of the uploaded zip instead.
+        if self.infinite_depth is False:
+            target_supported_algorithms = get_target_data(self.destination_target_name)[
+                'supported_hash_algorithms']
+            try:
+                with self._span('bag'):
+                    self.zipped_bag = validate_zipped_bag(
+                        save_uploaded_zip(resource, self.ticket_path),
+                        target_supported_algorithms or ['md5'])
+            except PresQTValidationError as e:
+                return self._abort_upload('PresQT Error: {}'.format(e.data), e.status_code)
+            # Collect any existing source metadata and mark it to be removed from the bag
             try:
-                self.base_directory_name = next(os.walk(self.ticket_path))[1][0]
-            except IndexError:
-                self.process_info_obj['status'] = 'failure'
-                self.process_info_obj['expiration'] = str(timezone.now())
-                self.process_info_obj['status_code'] = 400
-                self.process_info_obj['message'] = 'PresQT Error: Bag is not formatted properly.'
-                self.process_info_path = update_or_create_process_info(
-                    self.process_info_obj, self.action, self.ticket_number)
-                return Response(data={'error': 'PresQT Error: Bag is not formatted properly.'}, status=status.HTTP_400_BAD_REQUEST)
+                get_zipped_upload_source_metadata(self, self.zipped_bag)
+            except PresQTValidationError as e:
+                return self._abort_upload(e.data, e.status_code)
 
+            self.base_directory_name = self.zipped_bag['base_directory_name']
             self.resource_main_dir = os.path.join(self.ticket_path, self.base_directory_name)
 
-            # Validate the 'bag' and check for checksum mismatches
-            try:
-                self.bag = bagit.Bag(self.resource_main_dir)
-                validate_bag(self.bag)
-            except PresQTValidationError as e:
-                shutil.rmtree(self.ticket_path)
-                # If we've reached the maximum number of attempts then return an error response
-                if index == 2:
-                    return Response(data={'error': 'PresQT Error: {}'.format(e.data)}, status=e.status_code)
-            except bagit.BagError as e:
-                shutil.rmtree(self.ticket_path)
-                # If we've reached the maximum number of attempts then return an error response
-                if index == 2:
-                    return Response(data={'error': 'PresQT Error: {}'.format(e.args[0])}, status=status.HTTP_400_BAD_REQUEST)
-            else:
-                # Collect and remove any existing source metadata
+            # Hashes for the target's supported algorithms were gathered during validation
+            with self._span('fixity'):
+                self.file_hashes, self.hash_algorithm = get_or_create_hashes_from_zipped_bag(self)
+        else:
+            # Save files to disk and check their fixity integrity. If BagIt validation fails, attempt
+            # to save files to disk again. If BagIt validation fails after 3 attempts return an error.
+            for index in range(3):
+                # Extract each file in the zip file to disk
+                with self._span('zip'), zipfile.ZipFile(resource) as myzip:
+                    myzip.extractall(self.ticket_path)
+
                 try:
-                    get_upload_source_metadata(self, self.bag)
-                except PresQTValidationError as e:
-                    return Response(data={'error': e.data}, status=e.status_code)
-                # If the bag validated successfully then break from the loop
-                break
+                    self.base_directory_name = next(os.walk(self.ticket_path))[1][0]
+                except IndexError:
+                    return self._abort_upload('PresQT Error: Bag is not formatted properly.',
+                                              status.HTTP_400_BAD_REQUEST)
 
-        # Create a hash dictionary to compare with the hashes returned from the target after upload
-        # If the destination target supports a hash provided by the bag then use those hashes
-        # otherwise create new hashes with a target supported hash.
-        self.file_hashes, self.hash_algorithm = get_or_create_hashes_from_bag(self)
+                self.resource_main_dir = os.path.join(self.ticket_path, self.base_directory_name)
+
+                # Validate the 'bag' and check for checksum mismatches
+                try:
+                    with self._span('bag'):
+                        self.bag = bagit.Bag(self.resource_main_dir)
+                        validate_bag(self.bag)
+                except PresQTValidationError as e:
+                    shutil.rmtree(self.ticket_path)
+                    # If we've reached the maximum number of attempts then return an error response
+                    if index == 2:
+                        return self._abort_upload('PresQT Error: {}'.format(e.data), e.status_code)
+                except bagit.BagError as e:
+                    shutil.rmtree(self.ticket_path)
+                    # If we've reached the maximum number of attempts then return an error response
+                    if index == 2:
+                        return self._abort_upload('PresQT Error: {}'.format(e.args[0]),
+                                                  status.HTTP_400_BAD_REQUEST)
+                else:
+                    # Collect and remove any existing source metadata
+                    try:
+                        get_upload_source_metadata(self, self.bag)
+                    except PresQTValidationError as e:
+                        return self._abort_upload(e.data, e.status_code)
+                    # If the bag validated successfully then break from the loop
+                    break
+
+            # Create a hash dictionary to compare with the hashes returned from the target after upload
+            # If the destination target supports a hash provided by the bag then use those hashes
+            # otherwise create new hashes with a target supported hash.
+            with self._span('fixity'):
+                self.file_hashes, self.hash_algorithm = get_or_create_hashes_from_bag(self)
 
         # Spawn the upload_resource method separate from the request server by using multiprocess.
+        self._start_checkpoint_journal(self._upload_resource)
         spawn_action_process(self, self._upload_resource, 'resource_upload')
 
         reversed_url = reverse('job_status', kwargs={'action': 'upload'})
-        upload_hyperlink = self.request.build_absolute_uri(reversed_url)
+        upload_hyperlink = '{}?job_id={}'.format(
+            self.request.build_absolute_uri(reversed_url), self.ticket_number)
 
         return Response(status=status.HTTP_202_ACCEPTED,
                         data={'message': 'The server is processing the request.',
+                              'job_id': self.ticket_number,
                               'upload_job': upload_hyperlink})
 
+    def _abort_upload(self, error, status_code):
+        """
+        End an upload that failed before its job was spawned. The job's id was never given to
+        the user, so its directory and its entry in the job index are removed rather than left
+        behind as a job that's still in progress.
+
+        Parameters
+        ----------
+        error : str
+            The error message to return.
+        status_code : int
+            The status code to return.
+
+        Returns
+        -------
+        The error Response
+        """
+        shutil.rmtree(os.path.dirname(self.ticket_path), ignore_errors=True)
+        remove_indexed_job(self.ticket_number)
+        return Response(data={'error': error}, status=status_code)
+
     def _download_resource(self):
         """
         Downloads the resources from the target, performs a fixity check,
         zips them up in BagIt format.
         """
         action = 'resource_download'
+        self._open_job_spans()
 
         # Write the process id to the process_info file
         self.process_info_obj['function_process_id'] = self.function_process.pid
-        update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+        self._update_process_info()
+        if not self._wait_for_job_slot():
+            return False
 
         # Fetch the proper function to call
         func = FunctionRouter.get_function(self.source_target_name, action)
 
+        # The directory all files should be saved in.
+        self.resource_main_dir = os.path.join(self.ticket_path, self.base_directory_name)
+        if self.transfer_pipeline:
+            # There is no bag so the files are saved straight to the directory uploaded from
+            self.data_directory = '{}/data'.format(self.resource_main_dir)
+            self.resource_directory = self.data_directory
+        else:
+            self.resource_directory = self.resource_main_dir
+
+        # For each resource, perform fixity check, gather metadata, and save it to disk.
+        self.fixity_info = []
+        self.download_fixity = True
+        self.download_failed_fixity = []
+        self.source_fts_metadata_actions = []
+        self.fts_metadata_builder = FTSMetadataBuilder()
+        self.all_keywords = []
+        self.initial_keywords = []
+        self.manual_keywords = []
+        self.enhanced_keywords = []
+
         # Fetch the resources. func_dict is in the format:
         #   {
         #       'resources': files,
         #       'empty_containers': empty_containers,
         #       'action_metadata': action_metadata
         #   }
+        # Targets that list the sizes of their files wait for disk space before fetching them
+        self.admitted_disk_usage = None
+        open_download_admission(self._admit_download)
         try:
-            func_dict = func(self.source_token, self.source_resource_id,
-                             self.process_info_path, self.action)
+            with self._span('fetch') as span:
+                if self.transfer_pipeline:
+                    # Resources are checked, saved and uploaded while the download is running
+                    func_dict = self.transfer_pipeline.run_download(func)
+                else:
+                    func_dict = self._run_download_function(func)
+                span.add_bytes(sum(len(resource['file']) for resource in func_dict['resources']
+                                   if resource['file'] is not None))
             # If the resource is being transferred, has only one file, and that file is the
             # PresQT metadata then raise an error.
             if self.action == 'resource_transfer_in' and \
                     len(func_dict['resources']) == 1 \
-                    and func_dict['resources'][0]['title'] == 'PRESQT_FTS_METADATA.json':
+                    and is_fts_metadata_file(func_dict['resources'][0]['title']):
                 raise PresQTResponseException(
                     'PresQT Error: PresQT FTS metadata cannot not be transferred by itself.',
                     status.HTTP_400_BAD_REQUEST)
+
+            # Reconcile the job's reservation with the size of the files it actually fetched.
+            # Jobs whose target didn't list sizes defer writing the resources until there is
+            # room for them on disk. Pipelined transfers have already written their resources.
+            projected_disk_usage = self._get_projected_disk_usage(sum(
+                len(resource['file']) if resource['file'] is not None
+                else os.path.getsize(resource['blob_path'])
+                for resource in func_dict['resources']))
+            if self.transfer_pipeline or (self.admitted_disk_usage is not None and
+                                          projected_disk_usage <= self.admitted_disk_usage):
+                update_disk_reservation(self.ticket_number, self.action, projected_disk_usage)
+            else:
+                wait_for_disk_space(self.ticket_number, projected_disk_usage,
+                                    self.process_info_path, self.action, self.job_control)
         except PresQTResponseException as e:
+            if self.transfer_pipeline:
+                self.transfer_pipeline.abort()
+                self.partial_files = sorted(self.transfer_pipeline.streamed_paths)
+            if isinstance(e, PresQTJobStopped):
+                self._keep_partial_progress()
             # TODO: Functionalize this error section
             # Catch any errors that happen within the target fetch.
             # Update the server process_info file appropriately.
@@ -336,61 +493,35 @@ class BaseResource(APIView):
             # Update the expiration from 5 hours to 1 hour from now. We can delete this faster because
             # it's an incomplete/failed directory.
             self.process_info_obj['expiration'] = str(timezone.now() + relativedelta(hours=1))
-            update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+            self._update_process_info()
 
             return False
+        finally:
+            close_download_admission()
 
         # Get the latest contents of the job's process_info.json file
-        self.process_info_obj = read_file(self.process_info_path, True)[self.action]
-
-        # The directory all files should be saved in.
-        self.resource_main_dir = os.path.join(self.ticket_path, self.base_directory_name)
-        update_process_info_message(self.process_info_path, self.action,
-                                    'Performing fixity checks and gathering metadata...')
+        with PROCESS_INFO_LOCK:
+            self.process_info_obj = read_file(self.process_info_path, True)[self.action]
 
         self.extra_metadata = func_dict['extra_metadata']
-        # For each resource, perform fixity check, gather metadata, and save it to disk.
-        fixity_info = []
-        self.download_fixity = True
-        self.download_failed_fixity = []
-        self.source_fts_metadata_actions = []
-        self.new_fts_metadata_files = []
-        self.all_keywords = []
-        self.initial_keywords = []
-        self.manual_keywords = []
-        self.enhanced_keywords = []
-        for resource in func_dict['resources']:
-            # Perform the fixity check and add extra info to the returned fixity object.
-            # Note: This method of calling the function needs to stay this way for test Mock
-            fixity_obj, self.download_fixity = download_fixity_checker.download_fixity_checker(
-                resource)
-            fixity_info.append(fixity_obj)
-
-            if not fixity_obj['fixity']:
-                self.download_failed_fixity.append(resource['path'])
-
-            # Create metadata for this resource or validate the metadata file
-            if resource['title'] == 'PRESQT_FTS_METADATA.json':
-                is_valid = validate_metadata(self, resource)
-                if not is_valid:
-                    resource['path'] = resource['path'].replace('PRESQT_FTS_METADATA.json',
-                                                                'INVALID_PRESQT_FTS_METADATA.json')
-                    create_download_metadata(self, resource, fixity_obj)
-                    write_file('{}{}'.format(self.resource_main_dir,
-                                             resource['path']), resource['file'])
-            else:
-                create_download_metadata(self, resource, fixity_obj)
-                write_file('{}{}'.format(self.resource_main_dir,
-                                         resource['path']), resource['file'])
+        if not self.transfer_pipeline:
+            update_process_info_message(self.process_info_path, self.action,
+                                        'Performing fixity checks and gathering metadata...')
+            for resource in func_dict['resources']:
+                self._save_downloaded_resource(resource)
+        # The files kept from the job's earlier attempts have all been linked in by now
+        if self.checkpoint_journal is not None:
+            self.checkpoint_journal.remove_previous_files()
 
         # Enhance the source keywords
         self.keyword_dict = {}
         if self.action == 'resource_transfer_in':
             if self.supports_keywords:
-                if self.keyword_action == 'automatic':
-                    self.keyword_dict = automatic_keywords(self)
-                elif self.keyword_action == 'manual':
-                    self.keyword_dict = manual_keywords(self)
+                with self._span('keywords'):
+                    if self.keyword_action == 'automatic':
+                        self.keyword_dict = automatic_keywords(self)
+                    elif self.keyword_action == 'manual':
+                        self.keyword_dict = manual_keywords(self)
         self.keyword_enhancement_successful = True
 
         # Create PresQT action metadata
@@ -417,7 +548,7 @@ class BaseResource(APIView):
             'destinationUsername': None,
             'keywords': self.keyword_dict,
             'files': {
-                'created': self.new_fts_metadata_files,
+                'created': self.fts_metadata_builder.files,
                 'updated': [],
                 'ignored': []
             }
@@ -432,14 +563,22 @@ class BaseResource(APIView):
                 container_path += '/'
             if container_path[0] != '/':
                 container_path = '/' + container_path
-            os.makedirs(os.path.dirname('{}{}'.format(self.resource_main_dir, container_path)))
+            os.makedirs(os.path.dirname('{}{}'.format(self.resource_directory, container_path)))
 
         # If we are transferring the downloaded resource then bag it for the resource_upload method
         if self.action == 'resource_transfer_in':
             self.action_metadata['destinationTargetName'] = self.destination_target_name
 
-            # Make a BagIt 'bag' of the resources.
-            bagit.make_bag(self.resource_main_dir, checksums=['md5', 'sha1', 'sha256', 'sha512'])
+            if self.transfer_pipeline:
+                # The files are already being uploaded so let the upload finish instead
+                self.transfer_pipeline.finish_download(
+                    ['{}/{}'.format(self.data_directory, container_path.strip('/'))
+                     for container_path in func_dict['empty_containers']])
+            else:
+                # Make a BagIt 'bag' of the resources.
+                with self._span('bag'):
+                    bagit.make_bag(self.resource_main_dir,
+                                   checksums=['md5', 'sha1', 'sha256', 'sha512'])
             self.process_info_obj['download_status'] = get_action_message(self, 'Download',
                                                                           self.download_fixity, True,
                                                                           self.action_metadata)
@@ -448,42 +587,54 @@ class BaseResource(APIView):
         # and update the server process file.
         else:
             # Create Metadata file
-            final_fts_metadata_data = create_fts_metadata(self.all_keywords, self.action_metadata,
-                                                          self.source_fts_metadata_actions, self.extra_metadata)
-
-            # Validate the final metadata
-            metadata_validation = schema_validator('presqt/json_schemas/metadata_schema.json',
-                                                   final_fts_metadata_data)
+            with self._span('metadata'):
+                final_fts_metadata_data = create_fts_metadata(
+                    self.all_keywords, self.action_metadata, self.source_fts_metadata_actions,
+                    self.extra_metadata)
+
+                # Validate the final metadata
+                metadata_validation = schema_validator('presqt/json_schemas/metadata_schema.json',
+                                                       final_fts_metadata_data)
             self.process_info_obj['message'] = get_action_message(self, 'Download', self.download_fixity,
                                                                   metadata_validation, self.action_metadata)
 
             # Make a BagIt 'bag' of the resources.
-            bagit.make_bag(self.resource_main_dir, checksums=['md5', 'sha1', 'sha256', 'sha512'])
+            with self._span('bag'):
+                bagit.make_bag(self.resource_main_dir,
+                               checksums=['md5', 'sha1', 'sha256', 'sha512'])
 
             # Write metadata file.
-            write_file(os.path.join(self.resource_main_dir, 'PRESQT_FTS_METADATA.json'),
-                       final_fts_metadata_data, True)
+            with self._span('metadata'):
+                write_file(os.path.join(self.resource_main_dir, 'PRESQT_FTS_METADATA.json'),
+                           final_fts_metadata_data, True)
 
             # Add the fixity file to the disk directory
-            write_file(os.path.join(self.resource_main_dir, 'fixity_info.json'), fixity_info, True)
+            write_file(os.path.join(self.resource_main_dir, 'fixity_info.json'), self.fixity_info,
+                       True)
 
             # Zip the BagIt 'bag' to send forward.
-            zip_directory(self.resource_main_dir, "{}.zip".format(self.resource_main_dir),
-                          self.ticket_path)
+            with self._span('zip') as span:
+                zip_directory(self.resource_main_dir, "{}.zip".format(self.resource_main_dir),
+                              self.ticket_path)
+                span.add_bytes(os.path.getsize("{}.zip".format(self.resource_main_dir)))
+            self.process_info_obj['disk_usage'] = get_directory_size(self.ticket_path)
+            # Only the zip file is delivered so the bag can be removed right away
+            if self.delete_after_deliver:
+                shutil.rmtree(self.resource_main_dir)
 
             # Everything was a success so update the server metadata file.
             self.process_info_obj['status_code'] = '200'
             self.process_info_obj['status'] = 'finished'
             self.process_info_obj['zip_name'] = '{}.zip'.format(self.base_directory_name)
             self.process_info_obj['failed_fixity'] = self.download_failed_fixity
-            update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+            self._update_process_info()
             if self.email:
                 # Build link to retrieve the download
                 download_reverse = reverse('job_status', kwargs={
                     "action": "download",
                     "response_format": "zip"})
                 download_url = self.request.build_absolute_uri(download_reverse)
-                final_download_url = "{}?ticket_number={}".format(download_url, self.ticket_number)
+                final_download_url = "{}?job_id={}".format(download_url, self.ticket_number)
                 context = {
                     "download_url": final_download_url,
                     "download_message": self.process_info_obj['message'],
@@ -494,17 +645,142 @@ class BaseResource(APIView):
 
         return True
 
+    def _run_download_function(self, func):
+        """
+        Run the source target's download function. If the job is stopped before the download
+        has finished, the files that were already downloaded are saved to the job's directory
+        so they aren't lost.
+
+        Parameters
+        ----------
+        func : function
+            The source target's download function.
+
+        Returns
+        -------
+        The dictionary returned by the download function.
+        """
+        # Targets pass each file to the download stream as soon as its contents arrive
+        downloaded_resources = ResourceStream(0)
+        open_download_stream(downloaded_resources)
+        try:
+            return func(self.source_token, self.source_resource_id, self.process_info_path,
+                        self.action, self.job_control)
+        except PresQTJobStopped:
+            self.partial_files = []
+            for resource in downloaded_resources.drain():
+                try:
+                    if self._save_downloaded_resource(resource)[0]:
+                        self.partial_files.append(resource['path'])
+                except PresQTResponseException:
+                    pass
+            raise
+        finally:
+            close_download_stream()
+
+    def _get_projected_disk_usage(self, byte_count):
+        """
+        Get the disk space a job needs for the files it fetches. Downloads keep both the bag and
+        its zip as do transfers to finite depth targets. Files served from the content store
+        are copied into the bag.
+
+        Parameters
+        ----------
+        byte_count : int
+            The size of the fetched files in bytes.
+
+        Returns
+        -------
+        The projected disk usage in bytes.
+        """
+        if self.action == 'resource_download' or self.infinite_depth is False:
+            return byte_count * 2
+        return byte_count
+
+    def _admit_download(self, byte_count):
+        """
+        Wait until there is disk space for the files the source target is about to fetch, using
+        the sizes the target listed for them, and reserve it for the job.
+
+        Parameters
+        ----------
+        byte_count : int
+            The size the target listed for the files in bytes.
+        """
+        self.admitted_disk_usage = self._get_projected_disk_usage(byte_count)
+        wait_for_disk_space(self.ticket_number, self.admitted_disk_usage, self.process_info_path,
+                            self.action, self.job_control)
+
+    def _keep_partial_progress(self):
+        """
+        Reload the progress the target functions saved to process_info.json before the job was
+        stopped, along with the files saved so far, so the job can be picked up again.
+        """
+        with PROCESS_INFO_LOCK:
+            self.process_info_obj = read_file(self.process_info_path, True)[self.action]
+        self.process_info_obj['partial_files'] = self.partial_files
+
+    def _save_downloaded_resource(self, resource):
+        """
+        Perform the fixity check for a downloaded resource, gather its metadata and save it to disk.
+
+        Parameters
+        ----------
+        resource : dict
+            Resource dictionary returned by the source target's download function.
+
+        Returns
+        -------
+        The path the resource was saved to, or None for a valid FTS metadata file, along with
+        the resource's fixity object.
+        """
+        # Perform the fixity check and add extra info to the returned fixity object.
+        # Note: This method of calling the function needs to stay this way for test Mock
+        with self._span('fixity') as span:
+            fixity_obj, self.download_fixity = download_fixity_checker.download_fixity_checker(
+                resource)
+            if resource['file'] is not None:
+                span.add_bytes(len(resource['file']))
+        self.fixity_info.append(fixity_obj)
+
+        if not fixity_obj['fixity']:
+            self.download_failed_fixity.append(resource['path'])
+
+        # Create metadata for this resource or validate the metadata file
+        if is_fts_metadata_file(resource['title']):
+            is_valid = validate_metadata(self, resource)
+            if is_valid:
+                return None, fixity_obj
+
+            resource['path'] = '{}/INVALID_{}'.format(resource['path'].rpartition('/')[0],
+                                                      resource['title'])
+            create_download_metadata(self, resource, fixity_obj)
+            file_path = '{}{}'.format(self.resource_directory, resource['path'])
+            write_file(file_path, resource['file'])
+        else:
+            create_download_metadata(self, resource, fixity_obj)
+            file_path = '{}{}'.format(self.resource_directory, resource['path'])
+            write_resource_file(file_path, resource, fixity_obj)
+            if self.checkpoint_journal is not None:
+                self.checkpoint_journal.record_download(resource, file_path)
+        return file_path, fixity_obj
+
     def _upload_resource(self):
         """
         Upload resources to the target and perform a fixity check on the resulting hashes.
         """
         action = 'resource_upload'
+        self._open_job_spans()
         # This doesn't happen during an upload, so it won't be an error. If there is an error during
         # transfer this will be overwritten.
         self.keyword_enhancement_successful = True
-        # Write the process id to the process_info file
-        self.process_info_obj['function_process_id'] = self.function_process.pid
-        update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+        # Write the process id to the process_info file. Pipelined transfers are already
+        # uploading, so writing the whole object now would undo their progress.
+        if not self.transfer_pipeline:
+            self.process_info_obj['function_process_id'] = self.function_process.pid
+            self._update_process_info()
+        if not self._wait_for_job_slot():
+            return False
 
         # Data directory in the bag
         self.data_directory = '{}/data'.format(self.resource_main_dir)
@@ -514,18 +790,23 @@ class BaseResource(APIView):
         if self.action == 'resource_upload':
             update_process_info_message(self.process_info_path, self.action,
                                         "Creating PRESQT_FTS_METADATA...")
-            self.new_fts_metadata_files = []
-            for path, subdirs, files in os.walk(self.data_directory):
-                for name in files:
-                    self.new_fts_metadata_files.append({
-                        'destinationHashes': {},
-                        'destinationPath': os.path.join(path, name)[len(self.data_directory):],
-                        'failedFixityInfo': [],
-                        'title': name,
-                        'sourceHashes': {self.hash_algorithm:
-                                         self.file_hashes[os.path.join(path, name)]},
-                        'sourcePath': os.path.join(path, name)[len(self.data_directory):],
-                        'extra': {}})
+            self.fts_metadata_builder = FTSMetadataBuilder()
+            if self.zipped_bag:
+                file_paths = ['{}/{}'.format(self.resource_main_dir, key)
+                              for key in self.zipped_bag['payload'].keys()]
+            else:
+                file_paths = [os.path.join(path, name)
+                              for path, subdirs, files in os.walk(self.data_directory)
+                              for name in files]
+            for file_path in file_paths:
+                self.fts_metadata_builder.add_file({
+                    'destinationHashes': {},
+                    'destinationPath': file_path[len(self.data_directory):],
+                    'failedFixityInfo': [],
+                    'title': file_path.rpartition('/')[2],
+                    'sourceHashes': {self.hash_algorithm: self.file_hashes[file_path]},
+                    'sourcePath': file_path[len(self.data_directory):],
+                    'extra': {}})
 
             destination_target_data = get_target_data(self.destination_target_name)
             self.details = "PresQT Upload to {}".format(destination_target_data['readable_name'])
@@ -540,7 +821,7 @@ class BaseResource(APIView):
                 'destinationUsername': None,
                 'keywords': {},
                 'files': {
-                    'created': self.new_fts_metadata_files,
+                    'created': self.fts_metadata_builder.files,
                     'updated': [],
                     'ignored': []}}
 
@@ -550,7 +831,8 @@ class BaseResource(APIView):
         if self.infinite_depth is False:
             try:
                 structure_validation(self)
-                finite_depth_upload_helper(self)
+                with self._span('zip'):
+                    finite_depth_upload_helper(self)
             except PresQTResponseException as e:
                 # Catch any errors that happen within the target fetch.
                 # Update the server process_info file appropriately.
@@ -562,8 +844,7 @@ class BaseResource(APIView):
                 # Update the expiration from 5 hours to 1 hour from now. We can delete this faster because
                 # it's an incomplete/failed directory.
                 self.process_info_obj['expiration'] = str(timezone.now() + relativedelta(hours=1))
-                update_or_create_process_info(
-                    self.process_info_obj, self.action, self.ticket_number)
+                self._update_process_info()
                 return False
 
         # Fetch the proper function to call
@@ -578,11 +859,24 @@ class BaseResource(APIView):
         #        'project_id': title
         #    }
         try:
-            structure_validation(self)
-            self.func_dict = func(self.destination_token, self.destination_resource_id,
-                                  self.data_directory, self.hash_algorithm, self.file_duplicate_action,
-                                  self.process_info_path, self.action)
+            with self._span('upload') as span:
+                if self.transfer_pipeline:
+                    self.func_dict = self.transfer_pipeline.wait_for_upload()
+                else:
+                    structure_validation(self)
+                    if self.checkpoint_journal is not None:
+                        # Files uploaded by earlier attempts are only skipped if they still
+                        # have the same contents
+                        self.checkpoint_journal.file_hashes = self.file_hashes
+                    self.func_dict = func(self.destination_token, self.destination_resource_id,
+                                          self.data_directory, self.hash_algorithm,
+                                          self.file_duplicate_action, self.process_info_path,
+                                          self.action, self.job_control)
+                span.add_bytes(sum(os.path.getsize(file_path) for file_path in self.file_hashes
+                                   if os.path.isfile(file_path)))
         except PresQTResponseException as e:
+            if isinstance(e, PresQTJobStopped):
+                self._keep_partial_progress()
             # Catch any errors that happen within the target fetch.
             # Update the server process_info file appropriately.
             self.process_info_obj['status_code'] = e.status_code
@@ -593,7 +887,7 @@ class BaseResource(APIView):
             # Update the expiration from 5 hours to 1 hour from now. We can delete this faster
             # because it's an incomplete/failed directory.
             self.process_info_obj['expiration'] = str(timezone.now() + relativedelta(hours=1))
-            update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+            self._update_process_info()
             return False
 
         self.process_info_obj = read_file(self.process_info_path, True)[self.action]
@@ -603,10 +897,11 @@ class BaseResource(APIView):
         self.upload_fixity = True
         self.upload_failed_fixity = []
 
+        ignored_paths = set(self.func_dict['resources_ignored'])
         for resource in self.func_dict['file_metadata_list']:
             resource['failed_fixity_info'] = []
             if resource['destinationHash'] != self.file_hashes[resource['actionRootPath']] \
-                    and resource['actionRootPath'] not in self.func_dict['resources_ignored']:
+                    and resource['actionRootPath'] not in ignored_paths:
                 self.upload_fixity = False
                 self.upload_failed_fixity.append(resource['actionRootPath']
                                                  [len(self.data_directory):])
@@ -629,18 +924,17 @@ class BaseResource(APIView):
             if not self.destination_resource_id:
                 self.destination_resource_id = self.func_dict['project_id']
             if self.supports_keywords:
-                self.keyword_enhancement_successful, self.destination_initial_keywords = update_targets_keywords(
-                    self, self.func_dict['project_id'])
+                with self._span('keywords'):
+                    self.keyword_enhancement_successful, self.destination_initial_keywords = \
+                        update_targets_keywords(self, self.func_dict['project_id'])
 
                 # Add the destination initial keywords to all keywords for accurate metadata list
                 self.all_keywords = self.all_keywords + self.destination_initial_keywords
 
-        self.metadata_validation = create_upload_metadata(self,
-                                                          self.func_dict['file_metadata_list'],
-                                                          self.func_dict['action_metadata'],
-                                                          self.func_dict['project_id'],
-                                                          resources_ignored,
-                                                          resources_updated)
+        with self._span('metadata'):
+            self.metadata_validation = create_upload_metadata(
+                self, self.func_dict['file_metadata_list'], self.func_dict['action_metadata'],
+                self.func_dict['project_id'], resources_ignored, resources_updated)
         # Increment process_info one last time
         increment_process_info(self.process_info_path, self.action, 'upload')
 
@@ -659,7 +953,12 @@ class BaseResource(APIView):
             self.process_info_obj['failed_fixity'] = self.upload_failed_fixity
             self.process_info_obj['upload_status'] = upload_message
             self.process_info_obj['link_to_resource'] = self.func_dict["project_link"]
-            update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+            self.process_info_obj['disk_usage'] = get_directory_size(self.ticket_path)
+            self._update_process_info()
+
+            # The resources are on the target now so the upload files aren't needed anymore
+            if self.delete_after_deliver:
+                shutil.rmtree(self.ticket_path)
 
             if self.email:
                 context = {
@@ -684,6 +983,8 @@ class BaseResource(APIView):
             self.destination_token = get_destination_token(self.request)
             self.source_token = get_source_token(self.request)
             self.email = get_user_email_opt(self.request)
+            self.delete_after_deliver = get_delete_after_deliver_opt(self.request)
+            self.profile_job = get_profile_opt(self.request)
             self.file_duplicate_action = file_duplicate_action_validation(self.request)
             self.keyword_action = keyword_action_validation(self.request)
             self.fairshare_evaluator_action = fairshare_evaluator_validation(self.request)
@@ -698,12 +999,11 @@ class BaseResource(APIView):
         except PresQTValidationError as e:
             return Response(data={'error': e.data}, status=e.status_code)
 
-        # Generate ticket number
-        self.ticket_number = '{}_{}'.format(hash_tokens(
+        # Generate ticket number. Each job gets its own, indexed under both users' token hashes.
+        self.job_owner = '{}_{}'.format(hash_tokens(
             self.source_token), hash_tokens(self.destination_token))
-        ticket_path = os.path.join("mediafiles", "jobs", str(self.ticket_number))
-
-        self.ticket_path = os.path.join('mediafiles', 'jobs', str(self.ticket_number), 'transfer')
+        self.ticket_number = new_job_id()
+        self.ticket_path = os.path.join(MEDIA_ROOT, 'jobs', str(self.ticket_number), 'transfer')
 
         # Create directory and process_info json file
         self.process_info_obj = {
@@ -719,37 +1019,46 @@ class BaseResource(APIView):
             'upload_total_files': 0,
             'upload_files_finished': 0,
             'download_total_files': 0,
-            'download_files_finished': 0
+            'download_files_finished': 0,
+            'delete_after_deliver': self.delete_after_deliver
         }
         self.process_info_path = update_or_create_process_info(
             self.process_info_obj, self.action, self.ticket_number)
+        index_job(self.ticket_number, self.job_owner, self.action)
 
         self.base_directory_name = '{}_{}_transfer_{}'.format(self.source_target_name,
                                                               self.destination_target_name,
                                                               self.source_resource_id)
 
-        # Remove any resources that already exist in this user's job directory
-        if os.path.exists(self.ticket_path):
-            for folder in next(os.walk(self.ticket_path))[1]:
-                shutil.rmtree(os.path.join(self.ticket_path, folder))
-
         # Spawn the transfer_resource method separate from the request server by using multiprocess.
+        self._start_checkpoint_journal(self._transfer_resource)
         spawn_action_process(self, self._transfer_resource, self.action)
 
         reversed_url = reverse('job_status', kwargs={'action': 'transfer'})
-        transfer_hyperlink = self.request.build_absolute_uri(reversed_url)
+        transfer_hyperlink = '{}?job_id={}'.format(
+            self.request.build_absolute_uri(reversed_url), self.ticket_number)
 
         return Response(status=status.HTTP_202_ACCEPTED,
                         data={'message': 'The server is processing the request.',
+                              'job_id': self.ticket_number,
                               'transfer_job': transfer_hyperlink})
 
     def _transfer_resource(self):
         """
         Transfer resources from the source target to the destination target.
         """
+        self._open_job_spans()
         # Write the process id to the process_info file
         self.process_info_obj['function_process_id'] = self.function_process.pid
-        update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+        self._update_process_info()
+        if not self._wait_for_job_slot():
+            return
+
+        # Infinite depth targets can take each file as soon as it's downloaded
+        if self.infinite_depth and PRESQT_PIPELINED_TRANSFER:
+            self.transfer_pipeline = TransferPipeline(self)
+            if self.checkpoint_journal is not None:
+                self.checkpoint_journal.file_hashes = self.transfer_pipeline.file_hashes
 
         ####### DOWNLOAD THE RESOURCES #######
         download_status = self._download_resource()
@@ -758,18 +1067,25 @@ class BaseResource(APIView):
         if not download_status:
             return
 
-        ####### PREPARE UPLOAD FROM DOWNLOAD BAG #######
-        # Validate the 'bag' and check for checksum mismatches
-        self.bag = bagit.Bag(self.resource_main_dir)
-        try:
-            validate_bag(self.bag)
-        except PresQTValidationError as e:
-            return Response(data={'error': e.data}, status=e.status_code)
+        if self.transfer_pipeline:
+            # The hashes were made as each file was saved
+            self.file_hashes = self.transfer_pipeline.file_hashes
+            self.hash_algorithm = self.transfer_pipeline.hash_algorithm
+        else:
+            ####### PREPARE UPLOAD FROM DOWNLOAD BAG #######
+            # Validate the 'bag' and check for checksum mismatches
+            try:
+                with self._span('bag'):
+                    self.bag = bagit.Bag(self.resource_main_dir)
+                    validate_bag(self.bag)
+            except PresQTValidationError as e:
+                return Response(data={'error': e.data}, status=e.status_code)
 
-        # Create a hash dictionary to compare with the hashes returned from the target after upload
-        # If the destination target supports a hash provided by the self. then use those hashes,
-        # otherwise create new hashes with a target supported hash.
-        self.file_hashes, self.hash_algorithm = get_or_create_hashes_from_bag(self)
+            # Create a hash dictionary to compare with the hashes returned from the target after
+            # upload. If the destination target supports a hash provided by the bag then use
+            # those hashes, otherwise create new hashes with a target supported hash.
+            with self._span('fixity'):
+                self.file_hashes, self.hash_algorithm = get_or_create_hashes_from_bag(self)
 
         ####### UPLOAD THE RESOURCES #######
         upload_status = self._upload_resource()
@@ -802,26 +1118,18 @@ class BaseResource(APIView):
         else:
             self.process_info_obj['message'] = "Making final metadata updates..."
 
-        update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+        self._update_process_info()
 
         if self.fairshare_evaluator_action:
             # Do the evaluation on the newly created project's url
-            data = {
-                'resource': self.func_dict["project_link"],
-                'executor': "PresQT",
-                'title': "PresQT Fair Evaluation"
-            }
-
-            # 16 is the id of the PresQT test collection
-            response = requests.post(
-                'https://w3id.org/FAIR_Evaluator/collections/16/evaluate',
-                headers={"Content-Type": "application/json", "Accept": "application/json"},
-                data=json.dumps(data))
-            if response.status_code != 200:
+            try:
+                with self._span('fair_evaluation'):
+                    response_json = fairshare_evaluation(self.func_dict["project_link"])
+            except PresQTResponseException:
                 results = [{"error": "FAIRshare returned an error trying to process your request."}]
             else:
                 results = fairshare_results(
-                    response.json(), [1, 2, 4, 5, 6, 7, 8, 10, 13, 17, 19, 22])
+                    response_json, [1, 2, 4, 5, 6, 7, 8, 10, 13, 17, 19, 22])
 
         else:
             results = []
@@ -831,7 +1139,12 @@ class BaseResource(APIView):
         self.process_info_obj['status'] = 'finished'
         self.process_info_obj['fairshare_evaluation_results'] = results
         self.process_info_obj['link_to_resource'] = self.func_dict["project_link"]
-        update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+        self.process_info_obj['disk_usage'] = get_directory_size(self.ticket_path)
+        self._update_process_info()
+
+        # The resources are on the destination target now so the transfer files aren't needed
+        if self.delete_after_deliver:
+            shutil.rmtree(self.ticket_path)
 
         if self.email:
             context = {
@@ -846,3 +1159,115 @@ class BaseResource(APIView):
                           context, "emails/transfer_email.html")
 
         return
+
+    def _span(self, name):
+        """
+        Time a span of the job. The totals of each span are saved in process_info.json and
+        added to the job metrics when the job ends.
+
+        Parameters
+        ----------
+        name : str
+            The name of the span, e.g. 'fetch', 'fixity', 'bag', 'zip', 'upload' or 'metadata'.
+
+        Returns
+        -------
+        A context manager that times its with block and yields a Span to add byte counts to.
+        """
+        if self.job_spans is None:
+            self.job_spans = JobSpans()
+        return self.job_spans.span(name)
+
+    def _start_checkpoint_journal(self, method_to_call):
+        """
+        Start the job's checkpoint journal in its ticket directory and save the job's spec next to
+        it so the job can be resumed. The user's tokens are left out of the saved spec, a resumed
+        job gets them from the resume request.
+
+        Parameters
+        ----------
+        method_to_call : class method
+            The job's method.
+        """
+        self.checkpoint_journal = CheckpointJournal(
+            os.path.join(self.ticket_path, CheckpointJournal.DIRECTORY_NAME),
+            os.path.join(self.ticket_path, self.base_directory_name))
+        self.checkpoint_journal.start(
+            build_job_spec(self, method_to_call, self.action, exclude=TOKEN_ATTRIBUTES))
+
+    def _open_job_spans(self):
+        """
+        Record the spans of the target functions and the HTTP requests made in the job's
+        process with the job's spans, and count the requests by target endpoint. Jobs that
+        weren't spawned get a JobControl without a deadline. The target functions record their
+        work in the job's checkpoint journal if it has one.
+        """
+        if self.job_control is None:
+            self.job_control = JobControl(self.action)
+        if self.job_spans is None:
+            self.job_spans = JobSpans()
+        open_job_spans(self.job_spans)
+        if self.http_accounting is None:
+            self.http_accounting = HttpAccounting()
+        open_http_accounting(self.http_accounting)
+        if self.checkpoint_journal is not None:
+            open_checkpoint_journal(self.checkpoint_journal)
+
+    def _wait_for_job_slot(self, interval=5):
+        """
+        Defer the job until its users have fewer than PRESQT_USER_JOB_LIMIT other jobs running,
+        so each user's jobs run concurrently up to the limit. If the job is cancelled or reaches
+        its deadline while it waits it is marked as failed without ever taking a slot.
+
+        Parameters
+        ----------
+        interval : int
+            Number of seconds to wait between checks.
+
+        Returns
+        -------
+        True if the job can run, False if it was stopped while waiting.
+        """
+        if self.job_slot_claimed:
+            return True
+
+        message = self.process_info_obj['message']
+        while not claim_job_slot(self.ticket_number):
+            try:
+                self.job_control.check()
+            except PresQTJobStopped as e:
+                self.process_info_obj['status_code'] = e.status_code
+                self.process_info_obj['status'] = 'failed'
+                if self.action == 'resource_transfer_in':
+                    self.process_info_obj['download_status'] = 'failed'
+                self.process_info_obj['message'] = e.data
+                # Nothing was written so the directory can be deleted sooner
+                self.process_info_obj['expiration'] = str(
+                    timezone.now() + relativedelta(hours=1))
+                self._update_process_info()
+                return False
+            if self.process_info_obj['message'] != JOB_SLOT_MESSAGE:
+                self.process_info_obj['message'] = JOB_SLOT_MESSAGE
+                self._update_process_info()
+            sleep(interval)
+
+        self.job_slot_claimed = True
+        if self.process_info_obj['message'] == JOB_SLOT_MESSAGE:
+            self.process_info_obj['message'] = message
+            self._update_process_info()
+        return True
+
+    def _update_process_info(self):
+        """
+        Save the job's process_info object along with its span totals and HTTP request
+        summary so far. Once the job has ended it's added to the job metrics.
+        """
+        if self.job_spans is not None:
+            self.process_info_obj['spans'] = self.job_spans.to_dict()
+        if self.http_accounting is not None:
+            self.process_info_obj['http_requests'] = self.http_accounting.to_dict()
+        update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+        if self.process_info_obj['status'] != 'in_progress':
+            record_job_metrics(self.action, self.process_info_obj['status'],
+                               self.process_info_obj.get('spans', {}),
+                               self.process_info_obj.get('http_requests'))
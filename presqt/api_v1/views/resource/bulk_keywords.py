@@ -0,0 +1,84 @@
+from rest_framework import status, renderers
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
+
+from presqt.api_v1.utilities import (get_source_token, target_validation,
+                                     bulk_keywords_validation, BulkKeywordsJob)
+from presqt.utilities import PresQTValidationError
+
+
+class BulkResourceKeywords(APIView):
+    """
+    **Supported HTTP Methods**
+
+    * POST
+        -  Upload new keywords to many resources of a target as a job.
+    """
+
+    renderer_classes = [renderers.JSONRenderer]
+
+    def post(self, request, target_name):
+        """
+        Upload keywords to many resources of a target. The keywords are added in the
+        background and the results are served by the 'bulk_keywords' job status.
+
+        Parameters
+        ----------
+        target_name : str
+            The string name of the Target the resources are in.
+
+        Request Body
+        ------------
+        {
+            "resources": [
+                {
+                    "resource_id": "cmn5z",
+                    "keywords": ["eggs", "ham"]
+                },
+                {
+                    "resource_id": "q5xmw",
+                    "keywords": ["water"]
+                }, ...
+            ]
+        }
+
+        Returns
+        -------
+        202 : ACCEPTED
+        {
+            "message": "The server is processing the request.",
+            "job_id": "5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0",
+            "bulk_keywords_job": "https://localhost/api_v1/job_status/bulk_keywords/?job_id=5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0"
+        }
+
+        400: Bad Request
+        {
+            "error": "PresQT Error: 'new_target' does not support the action 'keywords_upload'."
+        }
+        or
+        {
+            "error": "PresQT Error: 'resources' is missing from the request body."
+        }
+        or
+        {
+            "error": "Resource 1: PresQT Error: 'keywords' must be in list format."
+        }
+        """
+        try:
+            token = get_source_token(request)
+            target_validation(target_name, 'keywords_upload')
+            target_validation(target_name, 'keywords')
+            resources = bulk_keywords_validation(request.data)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        job_id = BulkKeywordsJob(target_name, token, resources).start()
+
+        reversed_url = reverse('job_status', kwargs={'action': 'bulk_keywords'})
+        bulk_keywords_hyperlink = '{}?job_id={}'.format(
+            self.request.build_absolute_uri(reversed_url), job_id)
+        return Response(status=status.HTTP_202_ACCEPTED,
+                        data={'message': 'The server is processing the request.',
+                              'job_id': job_id,
+                              'bulk_keywords_job': bulk_keywords_hyperlink})
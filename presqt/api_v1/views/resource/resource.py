@@ -1,5 +1,4 @@
 import os
-import shutil
 
 from dateutil.relativedelta import relativedelta
 from django.utils import timezone
@@ -7,10 +6,13 @@ from rest_framework import status, renderers
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 
+from config.settings.base import MEDIA_ROOT
 from presqt.api_v1.serializers.resource import ResourceSerializer
 from presqt.api_v1.utilities import (get_source_token, target_validation, FunctionRouter,
                                      spawn_action_process, hash_tokens,
-                                     update_or_create_process_info, get_user_email_opt)
+                                     update_or_create_process_info, get_user_email_opt,
+                                     get_delete_after_deliver_opt, get_profile_opt, new_job_id,
+                                     index_job)
 from presqt.api_v1.views.resource.base_resource import BaseResource
 from presqt.utilities import PresQTValidationError, PresQTResponseException
 
@@ -90,9 +92,10 @@ class Resource(BaseResource):
         202: Accepted
         'zip' format success response.
         {
-            "ticket_number": "1234567890"
             "message": "The server is processing the request.",
-            "download_job": "http://localhost/api_v1/downloads/twqhg1-43r12ewdsqw-1231wq"
+            "job_id": "5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0",
+            "download_job_zip": "https://localhost/api_v1/job_status/download.zip/?job_id=5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0",
+            "download_job_json": "https://localhost/api_v1/job_status/download.json/?job_id=5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0"
         }
 
         400: Bad Request
@@ -111,10 +114,6 @@ class Resource(BaseResource):
         {
             "error": "PresQT Error: csv is not a valid format for this endpoint."
         }
-        or
-        {
-            "error": "User currently has processes in progress."
-        }
 
         401: Unauthorized
         {
@@ -201,15 +200,16 @@ class Resource(BaseResource):
         try:
             self.source_token = get_source_token(self.request)
             self.email = get_user_email_opt(self.request)
+            self.delete_after_deliver = get_delete_after_deliver_opt(self.request)
+            self.profile_job = get_profile_opt(self.request)
             target_validation(self.source_target_name, self.action)
         except PresQTValidationError as e:
             return Response(data={'error': e.data}, status=e.status_code)
 
-        # Generate ticket number
-        self.ticket_number = hash_tokens(self.source_token)
-        ticket_path = os.path.join('mediafiles', 'jobs', str(self.ticket_number))
-
-        self.ticket_path = os.path.join('mediafiles', 'jobs', str(self.ticket_number), 'download')
+        # Generate ticket number. Each job gets its own, indexed under the user's token hash.
+        self.job_owner = hash_tokens(self.source_token)
+        self.ticket_number = new_job_id()
+        self.ticket_path = os.path.join(MEDIA_ROOT, 'jobs', str(self.ticket_number), 'download')
 
         # Create directory and process_info json file
         self.process_info_obj = {
@@ -220,33 +220,34 @@ class Resource(BaseResource):
             'status_code': None,
             'function_process_id': None,
             'download_total_files': 0,
-            'download_files_finished': 0
+            'download_files_finished': 0,
+            'delete_after_deliver': self.delete_after_deliver
         }
         self.process_info_path = update_or_create_process_info(
             self.process_info_obj, self.action, self.ticket_number)
+        index_job(self.ticket_number, self.job_owner, self.action)
 
         self.base_directory_name = '{}_download_{}'.format(self.source_target_name,
                                                            self.source_resource_id)
 
-        # Remove any resources that already exist in this user's job download directory
-        if os.path.exists(self.ticket_path):
-            for folder in next(os.walk(self.ticket_path))[1]:
-                shutil.rmtree(os.path.join(self.ticket_path, folder))
-
         # Spawn the upload_resource method separate from the request server by using multiprocess.
+        self._start_checkpoint_journal(self._download_resource)
         spawn_action_process(self, self._download_resource, 'resource_download')
 
         # Get the download url for zip format
         reversed_url = reverse('job_status', kwargs={
                                'action': 'download', 'response_format': 'zip'})
-        download_zip_hyperlink = self.request.build_absolute_uri(reversed_url)
+        download_zip_hyperlink = '{}?job_id={}'.format(
+            self.request.build_absolute_uri(reversed_url), self.ticket_number)
 
         # Get the download url for json format
         reversed_url = reverse('job_status', kwargs={
                                'action': 'download', 'response_format': 'json'})
-        download_json_hyperlink = self.request.build_absolute_uri(reversed_url)
+        download_json_hyperlink = '{}?job_id={}'.format(
+            self.request.build_absolute_uri(reversed_url), self.ticket_number)
 
         return Response(status=status.HTTP_202_ACCEPTED,
                         data={'message': 'The server is processing the request.',
+                              'job_id': self.ticket_number,
                               'download_job_zip': download_zip_hyperlink,
                               'download_job_json': download_json_hyperlink})
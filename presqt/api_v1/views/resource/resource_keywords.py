@@ -7,7 +7,7 @@ from rest_framework.views import APIView
 
 from presqt.api_v1.utilities import (
     get_source_token, target_validation, FunctionRouter, keyword_enhancer, get_target_data,
-    keyword_post_validation, fetch_ontologies)
+    keyword_post_validation, fetch_ontologies, get_keyword_enhancer)
 from presqt.utilities import PresQTValidationError, PresQTResponseException, PresQTError
 
 
@@ -95,7 +95,7 @@ class ResourceKeywords(APIView):
             # Catch any errors that happen
             return Response(data={'error': e.data}, status=e.status_code)
 
-        # Call function which calls SciGraph for keyword suggestions.
+        # Call function which calls the keyword enhancer for keyword suggestions.
         try:
             # Return a new keyword list and a final list.
             new_list_of_keywords, final_list_of_keywords = keyword_enhancer(keywords['keywords'])
@@ -246,7 +246,7 @@ class ResourceKeywords(APIView):
                     'sourceKeywordsAdded': [],
                     'sourceKeywordsEnhanced': keywords,
                     'ontologies': ontologies,
-                    'enhancer': 'scigraph'
+                    'enhancer': get_keyword_enhancer()
                 },
                 'files': {
                     'created': [],
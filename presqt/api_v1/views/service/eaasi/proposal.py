@@ -9,7 +9,7 @@ from rest_framework.reverse import reverse
 from rest_framework import status, renderers
 
 from presqt.api_v1.utilities import (get_process_info_data, get_source_token, hash_tokens,
-                                     get_process_info_action)
+                                     get_process_info_action, find_job)
 from presqt.utilities import write_file, PresQTValidationError
 
 
@@ -54,11 +54,11 @@ class Proposals(APIView):
             "error": "PresQT Error: A resource_download does not exist for this user on the server."
         }
         """
-        # Get the source token from the request, hash it to get the ticket_number, get the
-        # process_info.json file connected with the ticket_number.
+        # Get the source token from the request, hash it to find the user's latest download job,
+        # get the process_info.json file connected with the job's ticket_number.
         try:
             source_token = get_source_token(self.request)
-            ticket_number = hash_tokens(source_token)
+            ticket_number = find_job(hash_tokens(source_token), 'resource_download')
             process_info_data = get_process_info_data(ticket_number)
             download_data = get_process_info_action(process_info_data, 'resource_download')
         except PresQTValidationError as e:
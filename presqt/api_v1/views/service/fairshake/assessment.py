@@ -1,15 +1,14 @@
-import coreapi
-import json
-import requests
-
 from rest_framework import status, renderers
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
-from config.settings.base import FAIRSHAKE_TOKEN
 from presqt.api_v1.utilities import (
-    fairshake_request_validator, fairshake_assessment_validator, fairshare_results)
-from presqt.utilities import PresQTValidationError, read_file
+    fairshake_request_validator, fairshake_assessment_validator, fairshake_assessment,
+    fairshake_rubric_answers, get_cached_fairshare_evaluation, FairshareEvaluationJob)
+from presqt.api_v1.utilities.service_helpers.fair_specs import FAIRSHAKE_RUBRIC_PAYLOADS
+from presqt.api_v1.utilities.service_helpers.fairshake_client import FAIRSHAKE_AUTOMATIC_TESTS
+from presqt.utilities import PresQTValidationError, PresQTResponseException
 
 
 class FairshakeAssessment(APIView):
@@ -58,29 +57,8 @@ class FairshakeAssessment(APIView):
                 'error': f"PresQT Error: '{rubric_id}' is not a valid rubric id. Choices are: {rubrics}"},
                 status=status.HTTP_400_BAD_REQUEST)
 
-        metrics = read_file(
-            'presqt/specs/services/fairshake/fairshake_test_fetch.json', True)[rubric_id]
-        answer_options = read_file(
-            'presqt/specs/services/fairshake/fairshake_score_translator.json', True)
-        # Make these dicts for FE ease
-        new_metrics = []
-        for key, value in metrics.items():
-            new_metrics.append({
-                'id': key,
-                'metric_value': value
-            })
-
-        new_answer_options = []
-        for key, value in answer_options.items():
-            new_answer_options.append({
-                'value': key,
-                'value_text': value
-            })
-
-        payload = {
-            "metrics": new_metrics,
-            "answer_options": new_answer_options
-        }
+        # Metrics and answer options are listed as dicts for FE ease
+        payload = FAIRSHAKE_RUBRIC_PAYLOADS[rubric_id]
 
         return Response(data=payload, status=status.HTTP_200_OK)
 
@@ -103,6 +81,15 @@ class FairshakeAssessment(APIView):
             ]
         }
 
+        202: Accepted (Rubric 96 only)
+        The resource hasn't been evaluated by FAIRshare recently. Post the assessment again once
+        the evaluation job has finished.
+        {
+            "message": "The FAIRshare evaluation this assessment needs is being run.",
+            "job_id": "5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0",
+            "fairshare_evaluation_job": "https://localhost/api_v1/job_status/fairshare_evaluation/?job_id=5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0"
+        }
+
         400: Bad Request
         {
             "error": "PresQT Error: 'eggs' is not a valid rubric id. Options are: ['93', '94', '95', '96']"
@@ -138,115 +125,33 @@ class FairshakeAssessment(APIView):
         """
         try:
             rubric_id, digital_object_type, project_url, project_title = fairshake_request_validator(
-                request, rubric_id)
-            rubric_answers = fairshake_assessment_validator(request, rubric_id)
+                request.data, rubric_id)
+            rubric_answers = fairshake_assessment_validator(request.data, rubric_id)
         except PresQTValidationError as e:
             return Response(data={'error': e.data}, status=e.status_code)
 
-        # First we need to register our new `digital_object` using this information
-        # The PresQT project id on FAIRshake is 116
-        project_id = 116
+        # The automatic rubric is answered from a FAIRshare evaluation, which can take several
+        # minutes. Run it as a job first rather than holding the request.
+        if rubric_id == '96' and get_cached_fairshare_evaluation(project_url) is None:
+            job_id = FairshareEvaluationJob(
+                project_url, FAIRSHAKE_AUTOMATIC_TESTS, f"{project_title} FAIR Evaluation").start()
+
+            reversed_url = reverse('job_status', kwargs={'action': 'fairshare_evaluation'})
+            evaluation_hyperlink = '{}?job_id={}'.format(
+                self.request.build_absolute_uri(reversed_url), job_id)
+            return Response(status=status.HTTP_202_ACCEPTED,
+                            data={'message': 'The FAIRshare evaluation this assessment needs is being run.',
+                                  'job_id': job_id,
+                                  'fairshare_evaluation_job': evaluation_hyperlink})
+
+        # Register our new `digital_object` with FAIRshake and post its assessment
         try:
-            client = coreapi.Client(auth=coreapi.auth.TokenAuthentication(
-                token=FAIRSHAKE_TOKEN, scheme='token'))
-            schema = client.get('https://fairshake.cloud/coreapi/')
-        except coreapi.exceptions.ErrorMessage:
-            return Response(data={'error': "FAIRshake Error: Invalid token provided in code."},
-                            status=status.HTTP_400_BAD_REQUEST)
-        try:
-            digital_object = client.action(schema, ['digital_object', 'create'], params=dict(
-                url=project_url,
-                title=project_title,
-                projects=[project_id],
-                type=digital_object_type,
-                rubrics=[int(rubric_id)]
-            ))
-            digital_object_id = digital_object['id']
-        except coreapi.exceptions.ErrorMessage:
-            return Response(data={'error': "FAIRshake Error: Returned an error trying to register digital object."},
-                            status=status.HTTP_400_BAD_REQUEST)
-
-        if rubric_id != '96':
-            # Do the manual assessment here
-            assessment_answers = []
-            # Need to translate the JSON strings to ints and floats
-            for key, value in rubric_answers.items():
-                assessment_answers.append({
-                    'metric': int(key),
-                    'answer': float(value)
-                })
-        else:
-            # We gonna try and do automatic stuff
-            data = {
-                'resource': project_url,
-                'executor': 'PresQT',
-                'title': f"{project_title} FAIR Evaluation"
-            }
-            # Send the data to FAIRshare to run automatic tests
-            response = requests.post(
-                'https://w3id.org/FAIR_Evaluator/collections/16/evaluate',
-                headers={"Content-Type": "application/json", "Accept": "application/json"},
-                data=json.dumps(data))
-            if response.status_code != 200:
-                return Response(data={'error': "FAIRshare returned a {} error trying to process the request".format(response.status_code)},
-                                status=status.HTTP_503_SERVICE_UNAVAILABLE)
-
-            response_json = response.json()
-            results = fairshare_results(response_json, [1, 5, 8, 10, 17, 22])
-
-            rubric_translator = read_file(
-                'presqt/specs/services/fairshake/fairshare_fairshake_helper.json', True)
-            assessment_answers = []
-            for result in results:
-                # We need to build a dict for the assessment.
-                # Translate test to rubric number
-                metric = rubric_translator[result['metric_link']]
-                # Translate successes and failures to yes's and no's
-                if result['successes']:
-                    answer = 1.0
-                elif result['failures']:
-                    answer = 0.0
-                else:
-                    answer = 0.5
-                assessment_answers.append({
-                    'metric': metric,
-                    'answer': answer
-                })
-        try:
-            # Do the assessment
-            assessment = client.action(schema, ['assessment', 'create'], params=dict(
-                project=project_id,
-                target=digital_object_id,
-                rubric=int(rubric_id),
-                methodology="self",
-                answers=assessment_answers,
-                published=True))
-        except coreapi.exceptions.ErrorMessage:
-            return Response(data={'error': "FAIRshake Error: Returned an error trying to post manual assessment."},
-                            status=status.HTTP_400_BAD_REQUEST)
-
-        # Bring in our translation files...
-        test_translator = read_file(
-            'presqt/specs/services/fairshake/fairshake_test_fetch.json', True)[rubric_id]
-        score_translator = read_file(
-            'presqt/specs/services/fairshake/fairshake_score_translator.json', True)
-
-        results = []
-        for score in assessment['answers']:
-            metric = test_translator[str(score['metric'])]
-            score_number = str(score['answer'])
-            score_words = 'not applicable'
-            score_words = score_translator[score_number]
-            results.append({
-                "metric": metric,
-                "score": score_number,
-                "score_explanation": score_words
-            })
-
-        payload = {
-            "digital_object_id": digital_object_id,
-            "rubric_responses": results
-        }
+            assessment_answers = fairshake_rubric_answers(
+                rubric_id, rubric_answers, project_url, project_title)
+            payload = fairshake_assessment(rubric_id, digital_object_type, project_url,
+                                           project_title, assessment_answers)
+        except PresQTResponseException as e:
+            return Response(data={'error': e.data}, status=e.status_code)
 
         return Response(status=status.HTTP_200_OK,
                         data=payload)
@@ -0,0 +1,131 @@
+from rest_framework import status, renderers
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
+
+from presqt.api_v1.utilities import (
+    fairshake_bulk_validator, fairshake_bulk_assessment, get_cached_fairshare_evaluation,
+    FairshareEvaluationJob)
+from presqt.api_v1.utilities.service_helpers.fairshake_client import FAIRSHAKE_AUTOMATIC_TESTS
+from presqt.utilities import PresQTValidationError, PresQTResponseException
+
+
+class FairshakeBulkAssessment(APIView):
+    """
+    **Supported HTTP Methods**
+
+    * Post: Register and assess several digital objects with FAIRshake at once.
+    """
+
+    renderer_classes = [renderers.JSONRenderer]
+
+    def post(self, request):
+        """
+        Returns the results of each assessment in the order they were given.
+
+        Assessments using the automatic rubric (96) of a project that hasn't been evaluated by
+        FAIRshare recently start an evaluation job instead. Include them in a later request
+        once the job has finished.
+
+        Request Body
+        ------------
+        {
+            "assessments": [
+                {
+                    "rubric_id": "93",
+                    "project_url": "https://osf.io/egg/",
+                    "project_title": "Egg",
+                    "rubric_answers": {"30": "0.0", "31": "1.0", ...}
+                },
+                {
+                    "rubric_id": "96",
+                    "project_url": "https://osf.io/ham/",
+                    "project_title": "Ham"
+                }, ...
+            ]
+        }
+
+        Returns
+        -------
+        200: OK
+        {
+            "assessments": [
+                {
+                    "project_url": "https://osf.io/egg/",
+                    "digital_object_id": 166055,
+                    "rubric_responses": [
+                        {
+                            "metric": "The structure of the repository permits efficient discovery of data and metadata by end users.",
+                            "score": "0.0",
+                            "score_explanation": "no"
+                        },
+                        ...
+                    ]
+                },
+                {
+                    "project_url": "https://osf.io/ham/",
+                    "message": "The FAIRshare evaluation this assessment needs is being run.",
+                    "job_id": "5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0",
+                    "fairshare_evaluation_job": "https://localhost/api_v1/job_status/fairshare_evaluation/?job_id=5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0"
+                },
+                {
+                    "project_url": "https://osf.io/spam/",
+                    "error": "FAIRshake Error: Returned an error trying to register digital object.",
+                    "status_code": 400
+                }, ...
+            ]
+        }
+
+        400: Bad Request
+        {
+            "error": "PresQT Error: 'assessments' missing in POST body."
+        }
+        or
+        {
+            "error": "Assessment 1: PresQT Error: 'project_url' missing in POST body."
+        }
+        or
+        {
+            "error": "FAIRshake Error: Invalid token provided in code."
+        }
+        """
+        try:
+            assessments = fairshake_bulk_validator(request.data)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        results = [None] * len(assessments)
+        ready_indexes = []
+        evaluation_jobs = {}
+        for index, assessment in enumerate(assessments):
+            project_url = assessment['project_url']
+            if (assessment['rubric_id'] == '96' and
+                    get_cached_fairshare_evaluation(project_url) is None):
+                # Only one evaluation job is needed per project
+                if project_url not in evaluation_jobs:
+                    job_id = FairshareEvaluationJob(
+                        project_url, FAIRSHAKE_AUTOMATIC_TESTS,
+                        f"{assessment['project_title']} FAIR Evaluation").start()
+                    reversed_url = reverse('job_status',
+                                           kwargs={'action': 'fairshare_evaluation'})
+                    evaluation_jobs[project_url] = {
+                        'message': 'The FAIRshare evaluation this assessment needs is being run.',
+                        'job_id': job_id,
+                        'fairshare_evaluation_job': '{}?job_id={}'.format(
+                            self.request.build_absolute_uri(reversed_url), job_id)}
+                results[index] = evaluation_jobs[project_url]
+            else:
+                ready_indexes.append(index)
+
+        if ready_indexes:
+            try:
+                assessed = fairshake_bulk_assessment(
+                    [assessments[index] for index in ready_indexes])
+            except PresQTResponseException as e:
+                return Response(data={'error': e.data}, status=e.status_code)
+            for index, result in zip(ready_indexes, assessed):
+                results[index] = result
+
+        return Response(status=status.HTTP_200_OK, data={'assessments': [
+            dict({'project_url': assessment['project_url']}, **result)
+            for assessment, result in zip(assessments, results)]})
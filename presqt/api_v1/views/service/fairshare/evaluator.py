@@ -1,14 +1,14 @@
-import json
-
-import requests
 from rest_framework import status, renderers
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
 from presqt.api_v1.utilities import (
-    fairshare_results, fairshare_request_validator, fairshare_test_validator, get_user_email_opt)
+    fairshare_results, fairshare_request_validator, fairshare_test_validator, get_user_email_opt,
+    get_cached_fairshare_evaluation, FairshareEvaluationJob, hash_tokens)
 from presqt.api_v1.utilities.utils.send_email import email_blaster
-from presqt.utilities import PresQTValidationError, read_file
+from presqt.api_v1.utilities.service_helpers.fair_specs import FAIRSHARE_TESTS, FAIRSHARE_TEST_LIST
+from presqt.utilities import PresQTValidationError
 
 
 class FairshareEvaluator(APIView):
@@ -37,23 +37,26 @@ class FairshareEvaluator(APIView):
             }...
         ]
         """
-        fairshare_test_info = read_file("presqt/specs/services/fairshare/fairshare_description_fetch.json",
-                                        True)
-        test_list = [
-            {"test_name": value['test_name'],
-             "description": value['description'],
-             "test_id": int(key.rpartition("/")[2])
-             } for key, value in fairshare_test_info.items()]
-
-        return Response(status=status.HTTP_200_OK, data=test_list)
+        return Response(status=status.HTTP_200_OK, data=FAIRSHARE_TEST_LIST)
 
     def post(self, request):
         """
-        Send an evaluation request to FAIRshare.
+        Send an evaluation request to FAIRshare. FAIRshare can take several minutes to evaluate
+        a resource so the evaluation runs as a job unless there's a recent evaluation of the
+        resource cached. Requests for a resource and tests that are already being evaluated are
+        given the running job's id. Jobs started with a 'presqt-source-token' header are listed
+        in the user's jobs.
 
         Returns
         -------
-        200: OK
+        202: Accepted
+        {
+            "message": "The server is processing the request.",
+            "job_id": "5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0",
+            "fairshare_evaluation_job": "https://localhost/api_v1/job_status/fairshare_evaluation/?job_id=5b8d3c1e9f0a4c27b6d2e8f1a7c4b9e0"
+        }
+        or
+        200: OK (The resource was recently evaluated)
         [
             {
                 "metric_link": "https://w3id.org/FAIR_Evaluator/metrics/1",
@@ -101,43 +104,32 @@ class FairshareEvaluator(APIView):
         {
             "error": "PresQT Error: 'eggs' not a valid test name. Options are: [.......]"
         }
-        or
-        503: Service Unavailable
-        {
-            "error": "FAIRshare returned a <status_code> error trying to process the request"
-        }
-
-
         """
         try:
             resource_id, tests = fairshare_request_validator(request)
             email = get_user_email_opt(request)
         except PresQTValidationError as e:
             return Response(data={'error': e.data}, status=e.status_code)
-        fairshare_test_info = read_file("presqt/specs/services/fairshare/fairshare_description_fetch.json",
-                                        True)
         try:
-            test_list = fairshare_test_validator(tests, fairshare_test_info)
+            test_list = fairshare_test_validator(tests, FAIRSHARE_TESTS)
         except PresQTValidationError as e:
             return Response(data={'error': e.data}, status=e.status_code)
 
-        data = {
-            'resource': resource_id,
-            'executor': "PresQT",
-            'title': "PresQT Fair Evaluation"
-        }
-
-        # 16 is the id of the PresQT test collection
-        response = requests.post(
-            'https://w3id.org/FAIR_Evaluator/collections/16/evaluate',
-            headers={"Content-Type": "application/json", "Accept": "application/json"},
-            data=json.dumps(data))
-
-        if response.status_code != 200:
-            return Response(data={'error': "FAIRshare returned a {} error trying to process the request".format(response.status_code)},
-                            status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        response_json = get_cached_fairshare_evaluation(resource_id)
+        if response_json is None:
+            user_hash = (hash_tokens(request.META['HTTP_PRESQT_SOURCE_TOKEN'])
+                         if 'HTTP_PRESQT_SOURCE_TOKEN' in request.META else None)
+            job_id = FairshareEvaluationJob(resource_id, test_list, email=email,
+                                            user_hash=user_hash).start()
+
+            reversed_url = reverse('job_status', kwargs={'action': 'fairshare_evaluation'})
+            evaluation_hyperlink = '{}?job_id={}'.format(
+                self.request.build_absolute_uri(reversed_url), job_id)
+            return Response(status=status.HTTP_202_ACCEPTED,
+                            data={'message': 'The server is processing the request.',
+                                  'job_id': job_id,
+                                  'fairshare_evaluation_job': evaluation_hyperlink})
 
-        response_json = response.json()
         results = fairshare_results(response_json, test_list)
 
         if email:
@@ -52,7 +52,7 @@ class KeywordEnhancement(APIView):
     except PresQTValidationError as e:
       return Response(data={'error': e.data}, status=e.status_code)
 
-    # Call function which calls SciGraph for keyword suggestions.
+    # Call function which calls the keyword enhancer for keyword suggestions.
     try:
       # Return a new keyword list and a final list.
       new_list_of_keywords, final_list_of_keywords = keyword_enhancer(keywords)
@@ -1,9 +1,8 @@
-import requests
 from rest_framework import renderers
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from presqt.utilities import read_file
+from presqt.api_v1.utilities import get_target_statuses
 
 
 class StatusCollection(APIView):
@@ -23,60 +22,32 @@ class StatusCollection(APIView):
         Returns
         -------
         200 : OK
-        A list-like JSON representation of each Target's status.
+        A list-like JSON representation of each Target's status. Statuses are cached and
+        refreshed in the background. The latency percentiles and availability cover the
+        target's recent probes.
         [
             {
                 "service": "osf",
+                "readable_name": "OSF",
                 "status": "ok",
-                "detail": "Connected to server successfully"
+                "detail": "Connected to server successfully",
+                "checked_at": "2020-06-01 15:41:03.541292+00:00",
+                "latency_ms": 212.4,
+                "latency_percentiles_ms": {"p50": 198.2, "p95": 402.7, "p99": 611.0},
+                "availability": {
+                    "window_start": "2020-06-01 14:42:01.008237+00:00",
+                    "probes": 60,
+                    "ratio": 0.983
+                }
             },
             {
                 "service": "curate_nd",
+                "readable_name": "CurateND",
                 "status": "timeout"
-                "detail": "The request timed out while trying to connect to the remote server."
+                "detail": "The request timed out while trying to connect to the remote server.",
+                ...
             }, ...
         ]
         """
 
-        response_data = []
-
-        json_data = read_file("presqt/specs/targets.json", True)
-
-        # Find the JSON dictionary for the target_name provided
-        for json_datum in json_data:
-            service = json_datum["name"]
-            readable_name = json_datum["readable_name"]
-            url = json_datum["status_url"]
-            try:
-                response: requests.Response = requests.get(url, timeout=10)
-                response.raise_for_status()
-            except requests.ConnectTimeout as e:
-                status = "timeout"
-                detail = "The request timed out while trying to connect to the remote server."
-            except requests.ReadTimeout as e:
-                status = "timeout"
-                detail = "The server did not send any data in the allotted amount of time."
-            except requests.exceptions.SSLError as e:
-                status = "ssl_error"
-                detail = "An SSL error occurred."
-            except requests.HTTPError as e:
-                status = "http_error"
-                detail = f"An HTTP {e.response.status_code} error occured"
-            except requests.RequestException as e:
-                # TooManyRedirects, InvalidURL etc.
-                status = "error"
-                detail = f"Some other request exception occured: {e}"
-            else:
-                status = "ok"
-                detail = "Connected to server successfully"
-
-            response_data.append(
-                {
-                    "service": service,
-                    "readable_name": readable_name,
-                    "status": status,
-                    "detail": detail,
-                }
-            )
-
-        return Response(response_data)
+        return Response(get_target_statuses())
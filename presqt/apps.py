@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class PresQTConfig(AppConfig):
+    name = 'presqt'
+
+    def ready(self):
+        from config.settings.base import PRESQT_TARGET_BASE_URL
+
+        # Send target API requests to a mock target server when one is configured
+        if PRESQT_TARGET_BASE_URL:
+            from presqt.targets.utilities.utils.target_urls import install_target_url_override
+            install_target_url_override(PRESQT_TARGET_BASE_URL)
@@ -1,13 +1,40 @@
 import json
+from functools import lru_cache
 
-from jsonschema import validate, ValidationError
+from jsonschema import validators
 from presqt.utilities import PresQTError
 
 
+@lru_cache(maxsize=None)
+def get_schema_validator(json_schema_path):
+    """
+    Get the validator for a JSONSchema. Each schema is loaded, checked and compiled into a
+    validator once per process.
+
+    Parameters
+    ----------
+    json_schema_path : str
+        Path of the JSONSchema file
+
+    Returns
+    -------
+        The jsonschema validator instance for the schema
+    """
+    with open(json_schema_path) as json_schema_file:
+        json_schema = json.load(json_schema_file)
+
+    validator_class = validators.validator_for(json_schema)
+    validator_class.check_schema(json_schema)
+    return validator_class(json_schema)
+
+
 def schema_validator(json_schema_path, json_data):
     """
     Uses JSONSchema validator to validate JSON file against JSONSchema provided.
 
+    Validation stops at the first error found so large documents, such as FTS metadata with
+    long lists of files, aren't walked in full once they're known to be invalid.
+
     Parameters
     ----------
     json_file_path : str
@@ -21,23 +48,37 @@ def schema_validator(json_schema_path, json_data):
         True if the validation passes
         ValidationError object if the validation fails
     """
-    with open(json_schema_path) as json_schema_file:
-        json_schema = json.load(json_schema_file)
+    validator = get_schema_validator(json_schema_path)
 
     if isinstance(json_data, str):
         try:
             with open(json_data) as json_file:
                 json_data = json.load(json_file)
-            validate(instance=json_data, schema=json_schema)
-        except (ValidationError, FileNotFoundError) as e:
+        except FileNotFoundError as e:
             return e
-        else:
-            return True
 
-    elif isinstance(json_data, dict):
-        try:
-            validate(instance=json_data, schema=json_schema)
-        except ValidationError as e:
-            return e
-        else:
-            return True
+    if isinstance(json_data, (dict, list)):
+        error = next(validator.iter_errors(json_data), None)
+        return error if error else True
+
+
+def load_and_validate_json(json_schema_path, contents):
+    """
+    Parse JSON contents and validate them against the JSONSchema provided. Bytes are parsed
+    directly so the contents aren't decoded into a second copy first.
+
+    Parameters
+    ----------
+    json_schema_path : str
+        Path of the JSONSchema file
+
+    contents : bytes or str
+        The JSON document
+
+    Returns
+    -------
+        The parsed document along with True if the validation passes or the ValidationError
+        object if it fails
+    """
+    json_data = json.loads(contents)
+    return json_data, schema_validator(json_schema_path, json_data)
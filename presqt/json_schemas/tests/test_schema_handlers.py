@@ -1,10 +1,14 @@
 import json
 import os
 
+from unittest.mock import patch
+
+import jsonschema
 from django.test import SimpleTestCase
 from rest_framework.exceptions import ValidationError
 
-from presqt.json_schemas.schema_handlers import schema_validator
+from presqt.json_schemas.schema_handlers import (get_schema_validator, load_and_validate_json,
+                                                 schema_validator)
 
 
 class TestSchemaValidator(SimpleTestCase):
@@ -38,4 +42,30 @@ class TestSchemaValidator(SimpleTestCase):
         self.assertRaises(ValidationError)
 
         # Delete the test JSON file
-        os.remove(invalid_path)
\ No newline at end of file
+        os.remove(invalid_path)
+
+    def test_validator_compiled_once(self):
+        """
+        Each schema should only be loaded and checked once however often it's used.
+        """
+        get_schema_validator.cache_clear()
+        with patch.object(jsonschema.Draft7Validator, 'check_schema') as check_schema:
+            for _ in range(3):
+                self.assertEqual(schema_validator(self.schema_path, self.target_json_path), True)
+        self.assertEqual(check_schema.call_count, 1)
+        get_schema_validator.cache_clear()
+
+    def test_load_and_validate_json(self):
+        """
+        Return the parsed document along with the first validation error found.
+        """
+        schema_path = 'presqt/json_schemas/metadata_schema.json'
+        content, validation = load_and_validate_json(
+            schema_path, b'{"allKeywords": [], "actions": []}')
+        self.assertEqual(content, {'allKeywords': [], 'actions': []})
+        self.assertEqual(validation, True)
+
+        content, validation = load_and_validate_json(
+            schema_path, '{"allKeywords": [1, 2, 3], "actions": []}')
+        self.assertIsInstance(validation, jsonschema.ValidationError)
+        self.assertEqual(list(validation.path), ['allKeywords', 0])
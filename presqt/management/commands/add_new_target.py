@@ -191,35 +191,26 @@ class Command(BaseCommand):
             with open('{}download.py'.format(target_function_dir), 'w') as file:
                 resource_download_function ='{}_download_resource'.format(target_name)
                 target_functions['download'] = {'{}_resource_download'.format(target_name): resource_download_function}
-                file.write('def {}(token, resource_id):\n\tpass'.format(resource_download_function))
+                file.write('def {}(token, resource_id, process_info_path, action, job_control):\n\tpass'.format(
+                    resource_download_function))
                 print('File created: {}download.py'.format(target_function_dir))
 
         if resource_upload:
             with open('{}upload.py'.format(target_function_dir), 'w') as file:
                 resource_upload_function = '{}_upload_resource'.format(target_name)
                 target_functions['upload'] = {'{}_resource_upload'.format(target_name): resource_upload_function}
-                file.write('def {}(token, resource_id, resource_main_dir, hash_algorithm, file_duplicate_action):\n\tpass'.format(resource_upload_function))
+                file.write('def {}(token, resource_id, resource_main_dir, hash_algorithm, file_duplicate_action, '
+                           'process_info_path, action, job_control):\n\tpass'.format(resource_upload_function))
                 print('File created: {}upload.py'.format(target_function_dir))
 
-        ##### Write to function_router.py #####
-        with open('presqt/api_v1/utilities/utils/function_router.py', 'a') as file:
-            if target_functions:
-                file.write('\n')
-
-            for file_name, file_name_dict in target_functions.items():
-                for variable_name, function_name in file_name_dict.items():
-                    file.write('    {} = {}\n'.format(variable_name, function_name))
-
-        with open('presqt/api_v1/utilities/utils/function_router.py', 'r+') as file:
-            content = file.read()
-            file.seek(0, 0)
-
-            new_imports = ''
-            for file_name, file_name_dict in target_functions.items():
-                new_imports += 'from presqt.targets.{}.functions.{} import {}\n'.format(target_name, file_name, ', '.join(file_name_dict.values()))
-
-            file.write(new_imports + content)
-        print('File updated: presqt/api_v1/utilities/utils/function_router.py')
+        ##### Build the FunctionRouter entries #####
+        # FunctionRouter imports each function from its dotted path in targets.json
+        function_paths = {}
+        for file_name, file_name_dict in target_functions.items():
+            for variable_name, function_name in file_name_dict.items():
+                action = variable_name[len(target_name) + 1:]
+                function_paths[action] = 'presqt.targets.{}.functions.{}.{}'.format(
+                    target_name, file_name, function_name)
 
         ##### Write to targets.json #####
         target_dict = {
@@ -234,6 +225,7 @@ class Command(BaseCommand):
                 "resource_transfer_in": resource_transfer_in,
                 "resource_transfer_out": resource_transfer_out
             },
+            "functions": function_paths,
             "supported_transfer_partners": {
                 "transfer_in": transfer_in,
                 "transfer_out": transfer_out
@@ -0,0 +1,110 @@
+import os
+import platform
+
+from django.core.management import BaseCommand, CommandError
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+from presqt.api_v1.utilities.benchmark.baseline import compare_to_baseline
+from presqt.api_v1.utilities.benchmark.run_scenario import run_scenario
+from presqt.api_v1.utilities.benchmark.scenarios import DEFAULT_SCENARIOS, validate_scenarios
+from presqt.utilities import PresQTValidationError, read_file, write_file
+
+
+class Command(BaseCommand):
+    help = ('Benchmark downloads, uploads and transfers against the mock targets and compare '
+            'the results to a baseline.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenarios',
+            help='JSON file with a list of scenarios to run instead of the default ones.')
+        parser.add_argument('--only', nargs='+', help='Names of the scenarios to run.')
+        parser.add_argument(
+            '--repeat', type=int, default=1,
+            help='Number of times to run each scenario. The run with the median time is kept.')
+        parser.add_argument(
+            '--timeout', type=int, default=600,
+            help='Number of seconds to wait for each job to finish.')
+        parser.add_argument('--output', help='Path to write the results to as JSON.')
+        parser.add_argument('--baseline', help='Path of the baseline results to compare to.')
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help='Save the results as the baseline instead of comparing to it.')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Fraction a measurement may grow by before it counts as a regression.')
+
+    def handle(self, *args, **options):
+        """
+        Run each scenario, write the results and fail if anything regressed from the baseline.
+        """
+        scenarios = DEFAULT_SCENARIOS
+        if options['scenarios']:
+            scenarios = read_file(options['scenarios'], True)
+        if options['only']:
+            scenarios = [scenario for scenario in scenarios
+                         if scenario.get('name') in options['only']]
+        try:
+            validate_scenarios(scenarios)
+        except PresQTValidationError as e:
+            raise CommandError(e.data)
+        if options['save_baseline'] and not options['baseline']:
+            raise CommandError('--save-baseline needs the --baseline path to save to.')
+
+        # The jobs are started with the test client, like the view tests do
+        setup_test_environment()
+
+        results = []
+        for scenario in scenarios:
+            runs = sorted((run_scenario(scenario, options['timeout'])
+                           for _ in range(options['repeat'])),
+                          key=lambda run: run.get('wall_time', float('inf')))
+            result = runs[(len(runs) - 1) // 2]
+            results.append(result)
+            self.stdout.write(self.format_result(result))
+
+        results_obj = {
+            'created': str(timezone.now()),
+            'python': platform.python_version(),
+            'repeat': options['repeat'],
+            'scenarios': results
+        }
+        if options['output']:
+            write_file(options['output'], results_obj, True)
+
+        if options['baseline']:
+            if options['save_baseline']:
+                write_file(options['baseline'], results_obj, True)
+                self.stdout.write('Saved the baseline to {}'.format(options['baseline']))
+            elif not os.path.isfile(options['baseline']):
+                raise CommandError('The baseline {} does not exist.'.format(options['baseline']))
+            else:
+                regressions = compare_to_baseline(
+                    results, read_file(options['baseline'], True)['scenarios'],
+                    options['tolerance'])
+                for regression in regressions:
+                    self.stderr.write(regression)
+                if regressions:
+                    raise CommandError('{} regressions from the baseline.'.format(
+                        len(regressions)))
+                self.stdout.write('No regressions from the baseline.')
+
+        failed = [result['name'] for result in results if result['status'] != 'finished']
+        if failed:
+            raise CommandError('Scenarios did not finish: {}'.format(', '.join(failed)))
+
+    @staticmethod
+    def format_result(result):
+        """
+        Summarize a scenario's result on one line.
+        """
+        if 'wall_time' not in result:
+            return '{}: {} {}'.format(result['name'], result['status'], result.get('error', ''))
+        phases = ' '.join('{}={:.3f}s'.format(phase, seconds)
+                          for phase, seconds in sorted(result['phases'].items()))
+        return ('{}: {} in {:.3f}s, {} files, peak RSS {:.1f} MB, {} requests, {} bytes read, '
+                '{} bytes written. {}'.format(
+                    result['name'], result['status'], result['wall_time'], result['files'],
+                    result['peak_rss'] / 1024 ** 2, sum(result['http_requests'].values()),
+                    result['bytes_read'], result['bytes_written'], phases))
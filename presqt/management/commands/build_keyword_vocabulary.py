@@ -0,0 +1,23 @@
+from django.core.management import BaseCommand
+
+from config.settings.base import PRESQT_KEYWORD_VOCABULARY
+from presqt.api_v1.utilities.keyword_enhancement.local_vocabulary import build_vocabulary_index
+
+
+class Command(BaseCommand):
+    help = 'Build the vocabulary index used by the local keyword enhancer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'dumps', nargs='+',
+            help='OBO files or JSON lists of SciGraph terms to index.')
+        parser.add_argument(
+            '--output', default=PRESQT_KEYWORD_VOCABULARY,
+            help='Path to write the index to.')
+
+    def handle(self, *args, **options):
+        """
+        Index the terms of each vocabulary dump by their labels and synonyms.
+        """
+        term_count = build_vocabulary_index(options['dumps'], options['output'])
+        self.stdout.write('Indexed {} terms into {}'.format(term_count, options['output']))
@@ -1,4 +1,6 @@
+import json
 import os
+from time import sleep
 
 from dateutil.parser import parse
 from glob import glob
@@ -7,40 +9,137 @@ import shutil
 from django.core.management import BaseCommand
 from django.utils import timezone
 
+from config.settings.base import MEDIA_ROOT
+from presqt.api_v1.utilities.utils.expiry_index import (
+    get_expired_directories, get_indexed_directories, index_process_info,
+    remove_indexed_directory)
+from presqt.api_v1.utilities.utils.job_index import remove_indexed_job
 from presqt.utilities import read_file
 
 
 class Command(BaseCommand):
+    help = 'Delete all mediafiles that have run past their expiration date.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--continuous', action='store_true',
+            help='Keep sweeping for expired mediafiles at a low priority instead of running once.')
+        parser.add_argument(
+            '--interval', type=int, default=300,
+            help='Number of seconds to wait between sweeps when running continuously.')
+
     def handle(self, *args, **kwargs):
         """
         Delete all mediafiles that have run past their expiration date.
         """
-        if os.environ['ENVIRONMENT'] == 'development':
+        development = os.environ['ENVIRONMENT'] == 'development'
+        if development:
             print('***delete_outdated_mediafiles is running in development mode.***')
 
-        directories_list = [
-            '/usr/src/app/mediafiles/jobs/*/',
-            '/usr/src/app/mediafiles/bag_tool/*/'
-        ]
-        directories = []
-        [directories.extend(glob(directory)) for directory in directories_list]
+        # Index any directories written before the expiry index existed
+        self.index_directories()
+
+        if not kwargs['continuous']:
+            if development:
+                self.delete_all_directories()
+            else:
+                self.delete_expired_directories()
+            return
+
+        # Stay out of the way of the jobs running on the same machine
+        os.nice(10)
+        while True:
+            self.delete_expired_directories()
+            sleep(kwargs['interval'])
+
+    def index_directories(self):
+        """
+        Add the expirations of every job and bag tool directory that isn't in the expiry index
+        yet. Directories without a process_info.json file are deleted.
+        """
+        indexed_directories = get_indexed_directories()
+        for directory in self.get_directories():
+            relative_directory = os.path.relpath(directory, MEDIA_ROOT)
+            if relative_directory in indexed_directories:
+                continue
 
-        for directory in directories:
             try:
                 data = read_file('{}process_info.json'.format(directory), True)
             except (FileNotFoundError, KeyError):
                 shutil.rmtree(directory)
                 print('{} has been deleted. No process_info.json file found'.format(directory))
+            except json.decoder.JSONDecodeError:
+                # The process_info.json file is being written to so it will be indexed by its writer
+                pass
             else:
-                for key, value in data.items():
-                    if 'expiration' in value.keys():
-                        if parse(value['expiration']) <= timezone.now() or os.environ['ENVIRONMENT'] == 'development':
-                            shutil.rmtree(directory)
-                            print('{} has been deleted.'.format(directory))
-                            break
-                else:
-                    if os.environ['ENVIRONMENT'] == 'development':
-                        shutil.rmtree(directory)
-                        print('{} has been deleted.'.format(directory))
-                    else:
-                        print('{} has been retained.'.format(directory))
+                index_process_info(relative_directory, data)
+                if not any('expiration' in value for value in data.values()):
+                    print('{} has been retained.'.format(directory))
+
+    def delete_expired_directories(self):
+        """
+        Delete the directories where every action has expired. This is a range query on the
+        expiry index, only the directories returned have their process_info.json file read.
+        Directories of jobs that are still in progress are kept even once they've expired.
+        """
+        for relative_directory in get_expired_directories():
+            directory = os.path.join(MEDIA_ROOT, relative_directory, '')
+
+            # Double check the process_info.json file in case it was written to without
+            # updating the expiry index.
+            try:
+                data = read_file('{}process_info.json'.format(directory), True)
+            except FileNotFoundError:
+                data = {}
+            except json.decoder.JSONDecodeError:
+                # The process_info.json file is being written to so the job is still live
+                continue
+
+            if any(parse(value['expiration']) > timezone.now() for value in data.values()
+                   if 'expiration' in value) or \
+                    any(value.get('status') == 'in_progress' for value in data.values()):
+                index_process_info(relative_directory, data)
+                print('{} has been retained.'.format(directory))
+                continue
+
+            shutil.rmtree(directory, ignore_errors=True)
+            self.remove_indexed(relative_directory)
+            print('{} has been deleted.'.format(directory))
+
+    def delete_all_directories(self):
+        """
+        Delete every job and bag tool directory. Only used in development mode.
+        """
+        for directory in self.get_directories():
+            shutil.rmtree(directory)
+            self.remove_indexed(os.path.relpath(directory, MEDIA_ROOT))
+            print('{} has been deleted.'.format(directory))
+
+    def remove_indexed(self, relative_directory):
+        """
+        Remove a deleted directory from the expiry index, and from the job index if it was a job.
+
+        Parameters
+        ----------
+        relative_directory : str
+            Path of the directory relative to MEDIA_ROOT, e.g. 'jobs/<ticket_number>'.
+        """
+        remove_indexed_directory(relative_directory)
+        if os.path.dirname(relative_directory) == 'jobs':
+            remove_indexed_job(os.path.basename(relative_directory))
+
+    def get_directories(self):
+        """
+        Get every job and bag tool directory.
+
+        Returns
+        -------
+        List of directory paths
+        """
+        directories_list = [
+            os.path.join(MEDIA_ROOT, 'jobs', '*', ''),
+            os.path.join(MEDIA_ROOT, 'bag_tool', '*', '')
+        ]
+        directories = []
+        [directories.extend(glob(directory)) for directory in directories_list]
+        return directories
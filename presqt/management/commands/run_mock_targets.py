@@ -0,0 +1,33 @@
+from aiohttp import web
+from django.core.management import BaseCommand
+
+from presqt.targets.utilities.mock_targets import create_mock_targets_app, DEFAULT_DATASET_SHAPE
+
+
+class Command(BaseCommand):
+    help = ('Run a server that emulates the target APIs for offline tests and benchmarks. Point '
+            'PRESQT_TARGET_BASE_URL at it to send target requests to it.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Host to serve on.')
+        parser.add_argument('--port', type=int, default=8100, help='Port to serve on.')
+        parser.add_argument(
+            '--latency', type=float, default=0,
+            help='Number of seconds every response is delayed by.')
+        parser.add_argument(
+            '--rate-limit', type=int, default=0,
+            help='Number of requests each target answers each second. 0 means no limit.')
+        for key, value in DEFAULT_DATASET_SHAPE.items():
+            parser.add_argument(
+                '--{}'.format(key.replace('_', '-')), type=int, default=value,
+                help='Dataset shape: {} (default {}).'.format(key.replace('_', ' '), value))
+
+    def handle(self, *args, **options):
+        """
+        Serve every mock target until the command is stopped.
+        """
+        shape = {key: options[key] for key in DEFAULT_DATASET_SHAPE}
+        app = create_mock_targets_app(shape, options['latency'], options['rate_limit'])
+        self.stdout.write('Serving mock targets at http://{}:{}'.format(
+            options['host'], options['port']))
+        web.run_app(app, host=options['host'], port=options['port'], print=None)
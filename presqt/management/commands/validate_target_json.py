@@ -40,12 +40,12 @@ class Command(BaseCommand):
                     exit(1)
                     break
                 # Verify that all actions for this target which are 'true' have a corresponding
-                # function in FunctionRouter for it.
+                # function in FunctionRouter for it that can be imported.
                 for key, value in data['supported_actions'].items():
                     if key in keys_to_validate and value is True:
                         try:
                             getattr(FunctionRouter, f"{data['name']}_{key}")
-                        except AttributeError:
+                        except (AttributeError, ImportError):
                             print(f"{data['name']} does not have a corresponding function in FunctionRouter for "
                                   f"the attribute {key}")
                             exit(2)
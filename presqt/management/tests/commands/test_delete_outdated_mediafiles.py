@@ -1,6 +1,7 @@
 import glob
 import json
 import os
+import shutil
 
 from dateutil.relativedelta import relativedelta
 from unittest.mock import patch
@@ -9,6 +10,8 @@ from django.core.management import call_command
 from django.test import SimpleTestCase
 from django.utils import timezone
 
+from presqt.api_v1.utilities import update_or_create_process_info
+from presqt.api_v1.utilities.utils.expiry_index import index_expiration, remove_indexed_directory
 from presqt.utilities import read_file, write_file
 
 
@@ -60,7 +63,8 @@ class TestDeleteMediaFiles(SimpleTestCase):
             # These steps are required to alter the timestamp inside our process_info.json
             data = read_file('{}process_info.json'.format(self.directory), True)
 
-            # Set the expiration date to be yesterday
+            # Set the expiration date of the finished job to be yesterday
+            data['resource_upload']['status'] = 'finished'
             data['resource_upload']['expiration'] = str(timezone.now() - relativedelta(days=1))
 
             # Write the data JSON back to the process_info file
@@ -86,3 +90,78 @@ class TestDeleteMediaFiles(SimpleTestCase):
             # Check that the folder has been deleted
             data_post_command = glob.glob('mediafiles/jobs/test_command/')
             self.assertEqual(len(data_post_command), 0)
+
+    def test_live_job_retained(self):
+        """
+        This test is to ensure that a directory is retained if one of its actions has expired but
+        another action is still in progress.
+        """
+        with self.env:
+            data = read_file('{}process_info.json'.format(self.directory), True)
+            data['resource_download'] = dict(data['resource_upload'])
+            data['resource_download']['status'] = 'finished'
+            data['resource_download']['expiration'] = str(timezone.now() - relativedelta(days=1))
+            write_file('{}process_info.json'.format(self.directory), data, True)
+
+            call_command('delete_outdated_mediafiles')
+
+            # Ensure that the folder and files have been retained
+            data_post_command = glob.glob('mediafiles/jobs/test_command/')
+            self.assertEqual(len(data_post_command), 1)
+
+            # Once every action has expired the folder is deleted
+            update_or_create_process_info(
+                dict(data['resource_upload'], status='finished',
+                     expiration=str(timezone.now() - relativedelta(hours=1))),
+                'resource_upload', 'test_command')
+
+            call_command('delete_outdated_mediafiles')
+
+            data_post_command = glob.glob('mediafiles/jobs/test_command/')
+            self.assertEqual(len(data_post_command), 0)
+
+    def test_expired_job_in_progress_retained(self):
+        """
+        This test is to ensure that a job running past its expiration isn't deleted until it has
+        finished.
+        """
+        with self.env:
+            update_or_create_process_info(
+                dict(self.data['resource_upload'],
+                     expiration=str(timezone.now() - relativedelta(hours=1))),
+                'resource_upload', 'test_command')
+
+            call_command('delete_outdated_mediafiles')
+
+            data_post_command = glob.glob('mediafiles/jobs/test_command/')
+            self.assertEqual(len(data_post_command), 1)
+
+            update_or_create_process_info(
+                dict(self.data['resource_upload'], status='finished',
+                     expiration=str(timezone.now() - relativedelta(hours=1))),
+                'resource_upload', 'test_command')
+
+            call_command('delete_outdated_mediafiles')
+
+            data_post_command = glob.glob('mediafiles/jobs/test_command/')
+            self.assertEqual(len(data_post_command), 0)
+
+    def test_indexed_bag_tool_directory_retained(self):
+        """
+        This test is to ensure that bag tool directories registered in the expiry index aren't
+        deleted while their request is being processed.
+        """
+        shutil.rmtree(self.directory)
+        bag_tool_directory = 'mediafiles/bag_tool/test_command/'
+        index_expiration('bag_tool/test_command', 'bag_and_zip',
+                         timezone.now() + relativedelta(hours=1))
+        os.makedirs(bag_tool_directory)
+
+        with self.env:
+            call_command('delete_outdated_mediafiles')
+
+            data_post_command = glob.glob(bag_tool_directory)
+            self.assertEqual(len(data_post_command), 1)
+
+        shutil.rmtree(bag_tool_directory)
+        remove_indexed_directory('bag_tool/test_command')
@@ -1,4 +1,5 @@
 import asyncio
+import time
 
 import aiohttp
 import requests
@@ -8,8 +9,8 @@ from rest_framework import status
 from presqt.targets.curate_nd.utilities import get_curate_nd_resource, extra_metadata_helper
 from presqt.targets.curate_nd.classes.main import CurateND
 from presqt.utilities import (PresQTInvalidTokenError, PresQTValidationError,
-                              get_dictionary_from_list, update_process_info, increment_process_info,
-                              update_process_info_message)
+                              get_dictionary_index, update_process_info, increment_process_info,
+                              update_process_info_message, record_span)
 
 
 async def async_get(url, session, token, process_info_path, action):
@@ -34,10 +35,12 @@ async def async_get(url, session, token, process_info_path, action):
     -------
     Response JSON
     """
+    start = time.monotonic()
     async with session.get(url, headers={'X-Api-Token': token}) as response:
         assert response.status == 200
         content = await response.read()
         # Increment the number of files done in the process info file.
+        record_span('file_download', time.monotonic() - start, len(content))
         increment_process_info(process_info_path, action, 'download')
         return {'url': url, 'binary_content': content}
 
@@ -66,7 +69,7 @@ async def async_main(url_list, token, process_info_path, action):
         return await asyncio.gather(*[async_get(url, session, token, process_info_path, action) for url in url_list])
 
 
-def curate_nd_download_resource(token, resource_id, process_info_path, action):
+def curate_nd_download_resource(token, resource_id, process_info_path, action, job_control):
     """
     Fetch the requested resource from CurateND along with its hash information.
 
@@ -80,6 +83,8 @@ def curate_nd_download_resource(token, resource_id, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    job_control: JobControl
+        The job's cancellation token and deadline
 
     Returns
     -------
@@ -176,9 +181,10 @@ def curate_nd_download_resource(token, resource_id, process_info_path, action):
 
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            download_data = loop.run_until_complete(
+            download_data = job_control.run_until_complete(loop,
                 async_main(file_urls, token, process_info_path, action))
 
+            file_metadata_index = get_dictionary_index(file_metadata, 'title')
             for file in download_data:
                 title = title_helper[file['url']]
                 hash = hash_helper[file['url']]
@@ -188,7 +194,7 @@ def curate_nd_download_resource(token, resource_id, process_info_path, action):
                     'title': title,
                     "source_path": '/{}/{}'.format(project_title, title),
                     'path': '/{}/{}'.format(resource.title, title),
-                    'extra_metadata': get_dictionary_from_list(file_metadata, 'title', title)['extra']})
+                    'extra_metadata': file_metadata_index[title]['extra']})
 
     return {
         'resources': files,
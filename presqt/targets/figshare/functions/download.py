@@ -1,4 +1,5 @@
 import asyncio
+import time
 import aiohttp
 import requests
 
@@ -7,9 +8,11 @@ from rest_framework import status
 from presqt.targets.figshare.utilities.validation_check import validation_check
 from presqt.targets.figshare.utilities.helpers.download_content import download_project, download_article
 from presqt.targets.figshare.utilities.helpers.extra_metadata_helper import extra_metadata_helper
-from presqt.utilities import (PresQTResponseException, get_dictionary_from_list,
+from presqt.utilities import (PresQTResponseException, get_dictionary_index,
                               update_process_info,
-                              increment_process_info, update_process_info_message)
+                              increment_process_info, update_process_info_message,
+                              get_uncached_resources, stream_resources,
+                              stream_downloaded_contents, record_span, admit_download)
 
 
 async def async_get(url, session, header, process_info_path, action):
@@ -34,11 +37,15 @@ async def async_get(url, session, header, process_info_path, action):
     -------
     Response JSON
     """
+    start = time.monotonic()
     async with session.get(url, headers=header) as response:
         assert response.status == 200
         content = await response.read()
         # Increment the number of files done in the process info file.
+        record_span('file_download', time.monotonic() - start, len(content))
         increment_process_info(process_info_path, action, 'download')
+        # Pass the file on right away if this is a pipelined transfer
+        await stream_downloaded_contents(url, content)
         return {'url': url, 'binary_content': content}
 
 
@@ -66,7 +73,7 @@ async def async_main(url_list, header, process_info_path, action):
         return await asyncio.gather(*[async_get(url, session, header, process_info_path, action) for url in url_list])
 
 
-def figshare_download_resource(token, resource_id, process_info_path, action):
+def figshare_download_resource(token, resource_id, process_info_path, action, job_control):
     """
     Fetch the requested resource from FigShare along with its hash information.
 
@@ -80,6 +87,8 @@ def figshare_download_resource(token, resource_id, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    job_control: JobControl
+        The job's cancellation token and deadline
 
     Returns
     -------
@@ -184,6 +193,13 @@ def figshare_download_resource(token, resource_id, process_info_path, action):
                 raise PresQTResponseException("The resource could not be found by the requesting user.",
                                               status.HTTP_404_NOT_FOUND)
     if file_urls:
+        # Files already in the content store don't need to be downloaded again
+        files_to_download = get_uncached_resources(files)
+        file_urls = [file['file'] for file in files_to_download]
+        stream_resources(files_to_download, file_urls)
+        # Wait for disk space for the files before fetching them
+        admit_download(files, lambda file: file['extra_metadata']['size'])
+
         update_process_info_message(process_info_path, action, 'Downloading files from FigShare...')
         # Add the total number of articles to the process info file.
         # This is necessary to keep track of the progress of the request.
@@ -192,13 +208,13 @@ def figshare_download_resource(token, resource_id, process_info_path, action):
         # Start the async calls for project or article downloads
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        download_data = loop.run_until_complete(async_main(
+        download_data = job_control.run_until_complete(loop, async_main(
             file_urls, headers, process_info_path, action))
 
         # Go through the file dictionaries and replace the file path with the binary_content
-        for file in files:
-            file['file'] = get_dictionary_from_list(
-                download_data, 'url', file['file'])['binary_content']
+        download_index = get_dictionary_index(download_data, 'url')
+        for file in files_to_download:
+            file['file'] = download_index[file['file']]['binary_content']
 
     return {
         'resources': files,
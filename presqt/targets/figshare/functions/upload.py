@@ -10,11 +10,13 @@ from presqt.targets.figshare.utilities.validation_check import validation_check
 from presqt.targets.figshare.utilities.helpers.create_project import create_project
 from presqt.targets.figshare.utilities.helpers.create_article import create_article
 from presqt.targets.figshare.utilities.helpers.upload_helpers import figshare_file_upload_process
-from presqt.utilities import PresQTResponseException, update_process_info, increment_process_info, update_process_info_message
+from presqt.utilities import (PresQTResponseException, update_process_info, increment_process_info,
+                              update_process_info_message, checkpointed_destination,
+                              get_checkpointed_upload, checkpoint_uploaded_file)
 from presqt.targets.utilities import get_duplicate_title, upload_total_files
 
 
-def figshare_upload_resource(token, resource_id, resource_main_dir, hash_algorithm, file_duplicate_action, process_info_path, action):
+def figshare_upload_resource(token, resource_id, resource_main_dir, hash_algorithm, file_duplicate_action, process_info_path, action, job_control):
     """
     Upload the files found in the resource_main_dir to the target.
 
@@ -34,6 +36,8 @@ def figshare_upload_resource(token, resource_id, resource_main_dir, hash_algorit
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    job_control: JobControl
+        The job's cancellation token and deadline
 
     Returns
     -------
@@ -89,9 +93,11 @@ def figshare_upload_resource(token, resource_id, resource_main_dir, hash_algorit
     if not resource_id:
         project_title = os_path[1][0]
         # Create a new project with the name being the top level directory's name.
-        project_name, project_id = create_project(project_title, headers, token)
+        # A resumed job keeps uploading to the project and article its first attempt created.
+        project_name, project_id = checkpointed_destination(
+            create_project, project_title, headers, token)
         # Create article, for now we'll name it the same as the project
-        article_id = create_article(project_title, headers, project_id)
+        article_id = checkpointed_destination(create_article, project_title, headers, project_id)
     else:
         # Upload to an existing project
         split_id = str(resource_id).split(":")
@@ -112,7 +118,7 @@ def figshare_upload_resource(token, resource_id, resource_main_dir, hash_algorit
                                     headers=headers).json()
             article_titles = [article['title'] for article in articles]
             new_title = get_duplicate_title(project_title, article_titles, "(PresQT*)")
-            article_id = create_article(new_title, headers, resource_id)
+            article_id = checkpointed_destination(create_article, new_title, headers, resource_id)
         elif len(split_id) == 2:
             article_id = split_id[1]
         else:
@@ -133,17 +139,25 @@ def figshare_upload_resource(token, resource_id, resource_main_dir, hash_algorit
     # Get md5, size and name of zip file to be uploaded
     for path, subdirs, files in os.walk(resource_main_dir):
         for name in files:
+            job_control.check()
+            checkpointed_upload = get_checkpointed_upload(
+                os.path.join(path, name), process_info_path, action)
+            if checkpointed_upload:
+                file_metadata_list.append(checkpointed_upload[0])
+                continue
             file_info = open(os.path.join(path, name), 'rb')
             zip_hash = hash_generator(file_info.read(), 'md5')
 
             figshare_file_upload_process(file_info, headers, name, article_id, file_type='zip',
                                          path=path)
 
-            file_metadata_list.append({
+            file_metadata = {
                 'actionRootPath': os.path.join(path, name),
                 'destinationPath': '/{}/{}/{}'.format(project_title, article_title, name),
                 'title': name,
-                'destinationHash': zip_hash})
+                'destinationHash': zip_hash}
+            file_metadata_list.append(file_metadata)
+            checkpoint_uploaded_file(file_metadata)
             increment_process_info(process_info_path, action, 'upload')
 
     return {
@@ -1,5 +1,4 @@
 import requests
-import itertools
 
 from rest_framework import status
 
@@ -8,7 +7,10 @@ from presqt.targets.figshare.utilities.helpers.upload_helpers import figshare_fi
 from presqt.targets.figshare.utilities.upload_extra_metadata import upload_extra_metadata
 from presqt.targets.figshare.utilities.validation_check import validation_check
 from presqt.targets.figshare.utilities.helpers.create_article import create_article
-from presqt.utilities import PresQTResponseException
+from presqt.utilities import (PresQTResponseException, FTS_METADATA_FILE_NAME,
+                              fts_metadata_needs_compaction, get_fts_metadata_delta_name,
+                              is_fts_metadata_file, load_valid_fts_metadata,
+                              merge_fts_metadata)
 
 
 def figshare_upload_metadata(token, article_id, metadata_dict):
@@ -30,7 +32,7 @@ def figshare_upload_metadata(token, article_id, metadata_dict):
         raise PresQTResponseException("Token is invalid. Response returned a 401 status code.",
                                       status.HTTP_401_UNAUTHORIZED)
     split_id = str(article_id).split(":")
-    file_name = 'PRESQT_FTS_METADATA.json'
+    file_name = FTS_METADATA_FILE_NAME
 
     # We need to check for a metadata article.
     article_list = requests.get(
@@ -41,17 +43,20 @@ def figshare_upload_metadata(token, article_id, metadata_dict):
         if article['title'] == "PRESQT_FTS_METADATA":
             # Check for metadata file
             project_files = requests.get("{}/files".format(article['url']), headers=headers).json()
+            delta_files = [file for file in project_files if file['name'] != file_name
+                           and is_fts_metadata_file(file['name'])]
             for file in project_files:
                 if file['name'] == "PRESQT_FTS_METADATA.json":
-                    # Download file, delete old file, mixem up, have a time.
+                    # Download file, mixem up, have a time.
                     file_contents = requests.get(file['download_url'], headers=headers).json()
                     # Load the existing metadata to be updated.
                     updated_metadata = file_contents
-                    requests.delete("https://api.figshare.com/v2/account/articles/{}/files/{}".format(
-                        article['id'], file['id']),
-                        headers=headers)
 
                     if schema_validator('presqt/json_schemas/metadata_schema.json', updated_metadata) is not True:
+                        requests.delete(
+                            "https://api.figshare.com/v2/account/articles/{}/files/{}".format(
+                                article['id'], file['id']),
+                            headers=headers)
                         # Make old metadata invalid
                         figshare_file_upload_process(
                             updated_metadata, headers, "INVALID_PRESQT_FTS_METADATA.json", article['id'])
@@ -60,16 +65,39 @@ def figshare_upload_metadata(token, article_id, metadata_dict):
                             metadata_dict, headers, "PRESQT_FTS_METADATA.json", article['id'])
                         return
 
-                    # Loop through each 'action' in both metadata files and make a new list of them.
-                    joined_actions = [entry for entry in itertools.chain(metadata_dict['actions'],
-                                                                         updated_metadata['actions'])]
-                    joined_keywords = [entry for entry in itertools.chain(metadata_dict['allKeywords'],
-                                                                          updated_metadata['allKeywords'])]
-                    updated_metadata['actions'] = joined_actions
-                    updated_metadata['allKeywords'] = list(set(joined_keywords))
+                    # Only this action's metadata is uploaded until there are enough delta files
+                    # to compact them into the existing metadata file.
+                    if not fts_metadata_needs_compaction(len(delta_files)):
+                        figshare_file_upload_process(metadata_dict, headers,
+                                                     get_fts_metadata_delta_name(metadata_dict),
+                                                     article['id'])
+                        return
+
+                    # Merge the delta files and this action's metadata into the existing
+                    # metadata. Invalid delta files are left where they are.
+                    metadata_documents = [updated_metadata]
+                    compacted_files = []
+                    for delta_file in delta_files:
+                        delta_metadata = load_valid_fts_metadata(
+                            requests.get(delta_file['download_url'], headers=headers).content)
+                        if delta_metadata:
+                            metadata_documents.append(delta_metadata)
+                            compacted_files.append(delta_file)
+                    metadata_documents.append(metadata_dict)
 
-                    figshare_file_upload_process(updated_metadata, headers,
+                    requests.delete("https://api.figshare.com/v2/account/articles/{}/files/{}".format(
+                        article['id'], file['id']),
+                        headers=headers)
+                    figshare_file_upload_process(merge_fts_metadata(metadata_documents), headers,
                                                  "PRESQT_FTS_METADATA.json", article['id'])
+
+                    # Actions left behind by a failed delete are merged only once at the next
+                    # compaction
+                    for delta_file in compacted_files:
+                        requests.delete(
+                            "https://api.figshare.com/v2/account/articles/{}/files/{}".format(
+                                article['id'], delta_file['id']),
+                            headers=headers)
                     return
 
     # Make a PRESQT_FTS_METADATA article...
@@ -8,7 +8,6 @@ from rest_framework.test import APIClient
 
 from presqt.utilities import read_file
 from presqt.targets.utilities import shared_call_get_resource_zip
-from presqt.api_v1.utilities import hash_tokens
 
 from config.settings.base import FIGSHARE_TEST_USER_TOKEN
 
@@ -73,7 +72,7 @@ class TestDownload(SimpleTestCase):
         self.assertEqual(count_of_file_references, 1)
 
         # Delete corresponding folder
-        shutil.rmtree('mediafiles/jobs/{}'.format(hash_tokens(self.token)))
+        shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
 
     def test_success_download_public_project(self):
         """
@@ -112,7 +111,7 @@ class TestDownload(SimpleTestCase):
         self.assertEqual(count_of_file_references, 1)
 
         # Delete corresponding folder
-        shutil.rmtree('mediafiles/jobs/{}'.format(hash_tokens(self.token)))
+        shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
 
     def test_success_download_private_article(self):
         """
@@ -151,7 +150,7 @@ class TestDownload(SimpleTestCase):
         self.assertEqual(count_of_file_references, 1)
 
         # Delete corresponding folder
-        shutil.rmtree('mediafiles/jobs/{}'.format(hash_tokens(self.token)))
+        shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
 
     def test_success_download_public_article(self):
         """
@@ -182,7 +181,7 @@ class TestDownload(SimpleTestCase):
             self.assertEqual(len(zip_json), 2)
 
         # Delete corresponding folder
-        shutil.rmtree('mediafiles/jobs/{}'.format(hash_tokens(self.token)))
+        shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
 
     def test_success_download_private_file(self):
         """
@@ -221,7 +220,7 @@ class TestDownload(SimpleTestCase):
         self.assertEqual(count_of_file_references, 1)
 
         # Delete corresponding folder
-        shutil.rmtree('mediafiles/jobs/{}'.format(hash_tokens(self.token)))
+        shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
 
     def test_success_download_public_file(self):
         """
@@ -260,7 +259,7 @@ class TestDownload(SimpleTestCase):
         self.assertEqual(count_of_file_references, 1)
 
         # Delete corresponding folder
-        shutil.rmtree('mediafiles/jobs/{}'.format(hash_tokens(self.token)))
+        shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
 
     def test_error_500_401(self):
         """
@@ -273,7 +272,8 @@ class TestDownload(SimpleTestCase):
         response = self.client.get(
             url, **{'HTTP_PRESQT_SOURCE_TOKEN': 'eggs', 'HTTP_PRESQT_EMAIL_OPT_IN': ''})
         download_url = response.data['download_job_zip']
-        process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(hash_tokens('eggs'))
+        ticket_number = response.data['job_id']
+        process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(ticket_number)
         process_info = read_file(process_info_path, True)
 
         while process_info['resource_download']['status'] == 'in_progress':
@@ -291,7 +291,7 @@ class TestDownload(SimpleTestCase):
                          "Token is invalid. Response returned a 401 status code.")
 
         # Delete corresponding folder
-        shutil.rmtree('mediafiles/jobs/{}'.format(hash_tokens('eggs')))
+        shutil.rmtree('mediafiles/jobs/{}'.format(ticket_number))
 
     def test_error_500_404_bad_project_id(self):
         """
@@ -303,7 +303,8 @@ class TestDownload(SimpleTestCase):
 
         response = self.client.get(url, **self.header)
         download_url = response.data['download_job_zip']
-        process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(hash_tokens(self.token))
+        ticket_number = response.data['job_id']
+        process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(ticket_number)
         process_info = read_file(process_info_path, True)
 
         while process_info['resource_download']['status'] == 'in_progress':
@@ -321,7 +322,7 @@ class TestDownload(SimpleTestCase):
                          "The resource could not be found by the requesting user.")
 
         # Delete corresponding folder
-        shutil.rmtree('mediafiles/jobs/{}'.format(hash_tokens(self.token)))
+        shutil.rmtree('mediafiles/jobs/{}'.format(ticket_number))
 
     def test_error_500_404_bad_article_id(self):
         """
@@ -332,7 +333,7 @@ class TestDownload(SimpleTestCase):
                                           'resource_format': 'zip'})
 
         response = self.client.get(url, **self.header)
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         download_url = response.data['download_job_zip']
         process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(ticket_number)
         process_info = read_file(process_info_path, True)
@@ -363,7 +364,7 @@ class TestDownload(SimpleTestCase):
                                           'resource_format': 'zip'})
 
         response = self.client.get(url, **self.header)
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         download_url = response.data['download_job_zip']
         process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(ticket_number)
         process_info = read_file(process_info_path, True)
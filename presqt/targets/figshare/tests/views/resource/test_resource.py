@@ -14,7 +14,6 @@ from presqt.targets.figshare.utilities.helpers.create_article import create_arti
 from presqt.targets.figshare.utilities.helpers.create_project import create_project
 from presqt.targets.utilities import process_wait
 from presqt.utilities import read_file, PresQTError
-from presqt.api_v1.utilities import hash_tokens
 
 
 class TestResourceGETJSON(SimpleTestCase):
@@ -259,7 +258,6 @@ class TestResourcePost(SimpleTestCase):
     def setUp(self):
         self.client = APIClient()
         self.token = FIGSHARE_TEST_USER_TOKEN
-        self.ticket_number = hash_tokens(self.token)
         self.headers = {'HTTP_PRESQT_DESTINATION_TOKEN': self.token,
                         'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
                         'HTTP_PRESQT_EMAIL_OPT_IN': ''}
@@ -287,7 +285,7 @@ class TestResourcePost(SimpleTestCase):
         response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(response.status_code, 202)
@@ -326,7 +324,7 @@ class TestResourcePost(SimpleTestCase):
         url = reverse('resource', kwargs={'target_name': 'figshare', 'resource_id': project_id})
         existing_response = self.client.post(
             url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(existing_response.status_code, 202)
@@ -357,7 +355,7 @@ class TestResourcePost(SimpleTestCase):
 
         existing_article_response = self.client.post(
             article_url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(existing_article_response.status_code, 202)
@@ -394,7 +392,7 @@ class TestResourcePost(SimpleTestCase):
         response = self.client.post(
             self.url, {'presqt-file': open('presqt/api_v1/tests/resources/upload/Upload_Extra_Metadata.zip', 'rb')}, **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(response.status_code, 202)
@@ -438,7 +436,7 @@ class TestResourcePost(SimpleTestCase):
         self.url = reverse('resource_collection', kwargs={'target_name': 'figshare'})
         response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')}, **headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(hash_tokens('eggyboi'))
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -463,7 +461,7 @@ class TestResourcePost(SimpleTestCase):
         url = reverse('resource', kwargs={'target_name': 'figshare',
                                           'resource_id': "83375:12533801:23301149"})
         response = self.client.post(url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -488,7 +486,7 @@ class TestResourcePost(SimpleTestCase):
         url = reverse('resource', kwargs={'target_name': 'figshare',
                                           'resource_id': "itsbad"})
         response = self.client.post(url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -513,7 +511,7 @@ class TestResourcePost(SimpleTestCase):
         url = reverse('resource', kwargs={'target_name': 'figshare',
                                           'resource_id': "83375:itsbad"})
         response = self.client.post(url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -559,7 +557,7 @@ class TestResourcePost(SimpleTestCase):
         response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(response.status_code, 202)
@@ -619,7 +617,7 @@ class TestResourcePost(SimpleTestCase):
         response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(response.status_code, 202)
@@ -671,7 +669,7 @@ class TestResourcePost(SimpleTestCase):
         url = reverse('resource', kwargs={'target_name': 'figshare', 'resource_id': project_id})
         existing_response = self.client.post(
             url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(existing_response.status_code, 202)
@@ -704,7 +702,7 @@ class TestResourcePost(SimpleTestCase):
         response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(response.status_code, 202)
@@ -732,7 +730,7 @@ class TestResourcePost(SimpleTestCase):
         response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(response.status_code, 202)
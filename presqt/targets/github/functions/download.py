@@ -1,4 +1,5 @@
 import asyncio
+import time
 
 import aiohttp
 import requests
@@ -7,8 +8,10 @@ from rest_framework import status
 
 from presqt.targets.github.utilities import (
     validation_check, download_content, download_directory, download_file, extra_metadata_helper)
-from presqt.utilities import (PresQTResponseException, get_dictionary_from_list,
-                              update_process_info, increment_process_info, update_process_info_message)
+from presqt.utilities import (PresQTResponseException, get_dictionary_index,
+                              update_process_info, increment_process_info, update_process_info_message,
+                              stream_resources, stream_downloaded_contents, record_span,
+                              admit_download)
 
 
 async def async_get(url, session, header, process_info_path, action):
@@ -33,11 +36,15 @@ async def async_get(url, session, header, process_info_path, action):
     -------
     Response JSON
     """
+    start = time.monotonic()
     async with session.get(url, headers=header) as response:
         assert response.status == 200
         content = await response.read()
         # Increment the number of files done in the process info file.
+        record_span('file_download', time.monotonic() - start, len(content))
         increment_process_info(process_info_path, action, 'download')
+        # Pass the file on right away if this is a pipelined transfer
+        await stream_downloaded_contents(url, content)
         return {'url': url, 'binary_content': content}
 
 
@@ -65,7 +72,7 @@ async def async_main(url_list, header, process_info_path, action):
         return await asyncio.gather(*[async_get(url, session, header, process_info_path, action) for url in url_list])
 
 
-def github_download_resource(token, resource_id, process_info_path, action):
+def github_download_resource(token, resource_id, process_info_path, action, job_control):
     """
     Fetch the requested resource from GitHub along with its hash information.
 
@@ -79,6 +86,8 @@ def github_download_resource(token, resource_id, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    job_control: JobControl
+        The job's cancellation token and deadline
 
 
     Returns
@@ -128,6 +137,9 @@ def github_download_resource(token, resource_id, process_info_path, action):
         files, empty_containers, action_metadata = download_content(
             username, contents_url, header, repo_name, [])
         file_urls = [file['file'] for file in files]
+        stream_resources(files, file_urls)
+        # Wait for disk space for the files before fetching them
+        admit_download(files, lambda file: file['extra_metadata']['size'])
 
         update_process_info_message(process_info_path, action, 'Downloading files from GitHub...')
         # Add the total number of repository to the process info file.
@@ -136,13 +148,13 @@ def github_download_resource(token, resource_id, process_info_path, action):
 
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        download_data = loop.run_until_complete(
+        download_data = job_control.run_until_complete(loop,
             async_main(file_urls, header, process_info_path, action))
 
         # Go through the file dictionaries and replace the file path with the binary_content
+        download_index = get_dictionary_index(download_data, 'url')
         for file in files:
-            file['file'] = get_dictionary_from_list(
-                download_data, 'url', file['file'])['binary_content']
+            file['file'] = download_index[file['file']]['binary_content']
 
         extra_metadata = extra_metadata_helper(response.json(), repo_name, header)
 
@@ -193,7 +205,8 @@ def github_download_resource(token, resource_id, process_info_path, action):
         if isinstance(resource_data, list):
             update_process_info_message(process_info_path, action,
                                         'Downloading files from GitHub...')
-            files = download_directory(header, path_to_file, repo_data, process_info_path, action)
+            files = download_directory(header, path_to_file, repo_data, process_info_path, action,
+                                       job_control)
         # If the resource to get is a file
         elif resource_data['type'] == 'file':
             update_process_info_message(process_info_path, action,
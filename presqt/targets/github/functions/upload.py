@@ -6,11 +6,14 @@ import requests
 from rest_framework import status
 
 from presqt.targets.github.utilities import validation_check, create_repository
-from presqt.utilities import PresQTResponseException, update_process_info, increment_process_info, update_process_info_message
+from presqt.utilities import (PresQTResponseException, update_process_info, increment_process_info,
+                              update_process_info_message, walk_upload_directory,
+                              list_upload_directory, checkpointed_destination, get_checkpointed_upload,
+                              checkpoint_uploaded_file)
 from presqt.targets.utilities import upload_total_files
 
 
-def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm, file_duplicate_action, process_info_path, action):
+def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm, file_duplicate_action, process_info_path, action, job_control):
     """
     Upload the files found in the resource_main_dir to the target.
 
@@ -30,6 +33,8 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    job_control: JobControl
+        The job's cancellation token and deadline
 
     Returns
     -------
@@ -63,7 +68,7 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
     except PresQTResponseException:
         raise PresQTResponseException("Token is invalid. Response returned a 401 status code.",
                                       status.HTTP_401_UNAUTHORIZED)
-    os_path = next(os.walk(resource_main_dir))
+    os_path = list_upload_directory(resource_main_dir)
     # Get total amount of files
     total_files = upload_total_files(resource_main_dir)
     update_process_info(process_info_path, total_files, action, 'upload')
@@ -74,15 +79,23 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
         # Create a new repository with the name being the top level directory's name.
         # Note: GitHub doesn't allow spaces, or circlebois in repo_names
         repo_title = os_path[1][0].replace(' ', '_').replace("(", "-").replace(")", "-").replace(":", "-")
-        repo_name, repo_id, repo_url = create_repository(repo_title, token)
+        # A resumed job keeps uploading to the repository its first attempt created
+        repo_name, repo_id, repo_url = checkpointed_destination(
+            create_repository, repo_title, token)
         resources_ignored = []
         resources_updated = []
         action_metadata = {"destinationUsername": username}
         file_metadata_list = []
-        for path, subdirs, files in os.walk(resource_main_dir):
+        for path, subdirs, files in walk_upload_directory(resource_main_dir):
             if not subdirs and not files:
                 resources_ignored.append(path)
             for name in files:
+                job_control.check()
+                checkpointed_upload = get_checkpointed_upload(
+                    os.path.join(path, name), process_info_path, action)
+                if checkpointed_upload:
+                    file_metadata_list.append(checkpointed_upload[0])
+                    continue
                 # Extract and encode the file bytes in the way expected by GitHub.
                 file_bytes = open(os.path.join(path, name), 'rb').read()
                 encoded_file = base64.b64encode(file_bytes).decode('utf-8')
@@ -90,11 +103,11 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
                 path_to_add = os.path.join(path.partition('/data/')[2], name)
                 path_to_add_to_url = path_to_add.partition('/')[2].replace(' ', '_')
                 finished_path = '/' + repo_name + '/' + path_to_add_to_url
-                file_metadata_list.append({
+                file_metadata = {
                     "actionRootPath": os.path.join(path, name),
                     "destinationPath": finished_path,
                     "title": name,
-                    "destinationHash": None})
+                    "destinationHash": None}
                 put_url = "https://api.github.com/repos/{}/{}/contents/{}".format(
                     username, repo_name, path_to_add_to_url)
                 data = {
@@ -108,6 +121,8 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
                 if file_response.status_code != 201:
                     raise PresQTResponseException("Github returned the following error: '{}'".format(str(file_response.json()['message'])), status.HTTP_400_BAD_REQUEST)
 
+                file_metadata_list.append(file_metadata)
+                checkpoint_uploaded_file(file_metadata)
                 # Increment the file counter
                 increment_process_info(process_info_path, action, 'upload')
     else:
@@ -158,10 +173,21 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
         sha = None
         action_metadata = {"destinationUsername": username}
 
-        for path, subdirs, files in os.walk(resource_main_dir):
+        for path, subdirs, files in walk_upload_directory(resource_main_dir):
             if not subdirs and not files:
                 resources_ignored.append(path)
             for name in files:
+                job_control.check()
+                # Files uploaded by an earlier attempt are in the repository now, so they're
+                # skipped before they're compared with its files
+                checkpointed_upload = get_checkpointed_upload(
+                    os.path.join(path, name), process_info_path, action)
+                if checkpointed_upload:
+                    file_metadata_list.append(checkpointed_upload[0])
+                    if checkpointed_upload[1] == 'updated':
+                        resources_updated.append(os.path.join(path, name))
+                    continue
+                file_action = 'created'
                 path_to_file = os.path.join('/', path.partition('/data/')
                                             [2], name).replace(' ', '_')
 
@@ -173,6 +199,7 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
                         continue
                     else:
                         resources_updated.append(os.path.join(path, name))
+                        file_action = 'updated'
                         # Get the sha
                         sha_url = 'https://api.github.com/repos/{}/contents{}'.format(
                             repo_data['full_name'], full_file_path)
@@ -183,11 +210,11 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
                 file_bytes = open(os.path.join(path, name), 'rb').read()
                 encoded_file = base64.b64encode(file_bytes).decode('utf-8')
                 # A relative path to the file is what is added to the GitHub PUT address
-                file_metadata_list.append({
+                file_metadata = {
                     "actionRootPath": os.path.join(path, name),
                     "destinationPath": '/{}{}{}'.format(repo_name, path_to_upload_to, path_to_file),
                     "title": name,
-                    "destinationHash": None})
+                    "destinationHash": None}
                 put_url = 'https://api.github.com/repos/{}/contents{}{}'.format(
                     repo_data['full_name'], path_to_upload_to, path_to_file)
 
@@ -206,6 +233,8 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
                         'Upload failed with a status code of {}'.format(
                             upload_response.status_code),
                         status.HTTP_400_BAD_REQUEST)
+                file_metadata_list.append(file_metadata)
+                checkpoint_uploaded_file(file_metadata, file_action)
                 # Increment the file counter
                 increment_process_info(process_info_path, action, 'upload')
 
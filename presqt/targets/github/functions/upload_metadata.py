@@ -1,12 +1,14 @@
 import base64
-import itertools
 import json
 import requests
 
 from presqt.json_schemas.schema_handlers import schema_validator
 from presqt.targets.github.utilities import validation_check
 from presqt.targets.github.utilities.utils.upload_extra_metadata import upload_extra_metadata
-from presqt.utilities import PresQTError
+from presqt.utilities import (PresQTError, FTS_METADATA_FILE_NAME, encode_fts_metadata,
+                              fts_metadata_needs_compaction, get_fts_metadata_delta_name,
+                              is_fts_metadata_file, load_valid_fts_metadata,
+                              merge_fts_metadata)
 
 
 def github_upload_metadata(token, project_id, metadata_dict):
@@ -66,15 +68,41 @@ def github_upload_metadata(token, project_id, metadata_dict):
                     "The request to rename the invalid metadata file has returned a {} error code from Github.".format(
                         response.status_code))
         else:
-            # Loop through each 'action' in both metadata files and make a new list of them.
-            joined_actions = [entry for entry in itertools.chain(metadata_dict['actions'],
-                                                                 updated_metadata['actions'])]
-            joined_keywords = [entry for entry in itertools.chain(metadata_dict['allKeywords'],
-                                                                  updated_metadata['allKeywords'])]
-            updated_metadata['actions'] = joined_actions
-            updated_metadata['allKeywords'] = list(set(joined_keywords))
-
-            updated_metadata_bytes = json.dumps(updated_metadata, indent=4).encode('utf-8')
+            # Only this action's metadata is uploaded until there are enough delta files to
+            # compact them into the existing metadata file.
+            root_contents = requests.get(base_put_url, headers=header).json()
+            delta_files = [data for data in root_contents if data['name'] != FTS_METADATA_FILE_NAME
+                           and is_fts_metadata_file(data['name'])]
+            if not fts_metadata_needs_compaction(len(delta_files)):
+                delta_payload = {
+                    "message": "PresQT Upload",
+                    "committer": {
+                        "name": "PresQT",
+                        "email": "N/A"},
+                    "content": base64.b64encode(encode_fts_metadata(metadata_dict)).decode('utf-8')}
+                response = requests.put('{}{}'.format(base_put_url,
+                                                      get_fts_metadata_delta_name(metadata_dict)),
+                                        headers=header,
+                                        data=json.dumps(delta_payload))
+                if response.status_code != 201:
+                    raise PresQTError(
+                        "The request to create a metadata delta file has resulted in a {} error code from GitHub.".format(
+                            response.status_code))
+                return
+
+            # Merge the delta files and this action's metadata into the existing metadata.
+            # Invalid delta files are left where they are.
+            metadata_documents = [updated_metadata]
+            compacted_files = []
+            for delta_file in delta_files:
+                delta_metadata = load_valid_fts_metadata(
+                    requests.get(delta_file['download_url'], headers=header).content)
+                if delta_metadata:
+                    metadata_documents.append(delta_metadata)
+                    compacted_files.append(delta_file)
+            metadata_documents.append(metadata_dict)
+
+            updated_metadata_bytes = encode_fts_metadata(merge_fts_metadata(metadata_documents))
             updated_base64_metadata = base64.b64encode(updated_metadata_bytes).decode('utf-8')
 
             update_payload = {
@@ -95,6 +123,17 @@ def github_upload_metadata(token, project_id, metadata_dict):
                 raise PresQTError(
                     "The request to create a metadata file has resulted in a {} error code from GitHub.".format(
                         response.status_code))
+
+            # Actions left behind by a failed delete are merged only once at the next compaction
+            for delta_file in compacted_files:
+                delete_payload = {
+                    "message": "PresQT Update",
+                    "committer": {
+                        "name": "PresQT",
+                        "email": "N/A"},
+                    "sha": delta_file['sha']}
+                requests.delete('{}{}'.format(base_put_url, delta_file['name']), headers=header,
+                                data=json.dumps(delete_payload))
             return
 
     metadata_bytes = json.dumps(metadata_dict, indent=4).encode('utf-8')
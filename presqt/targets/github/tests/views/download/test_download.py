@@ -6,7 +6,6 @@ from django.test import SimpleTestCase
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
-from presqt.api_v1.utilities import hash_tokens
 from presqt.utilities import read_file
 from presqt.targets.utilities import shared_call_get_resource_zip
 
@@ -305,7 +304,7 @@ class TestDownload(SimpleTestCase):
 
         response = self.client.get(url, **{'HTTP_PRESQT_SOURCE_TOKEN': 'eggs',
                                            'HTTP_PRESQT_EMAIL_OPT_IN': ''})
-        ticket_number = hash_tokens('eggs')
+        ticket_number = response.data['job_id']
         download_url = response.data['download_job_zip']
         process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(ticket_number)
         process_info = read_file(process_info_path, True)
@@ -336,7 +335,7 @@ class TestDownload(SimpleTestCase):
                                           'resource_format': 'zip'})
 
         response = self.client.get(url, **self.header)
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         download_url = response.data['download_job_zip']
         process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(ticket_number)
         process_info = read_file(process_info_path, True)
@@ -13,7 +13,6 @@ from presqt.targets.github.functions.upload_metadata import github_upload_metada
 from presqt.targets.github.utilities import delete_github_repo
 from presqt.targets.utilities import shared_upload_function_github, process_wait
 from presqt.utilities import read_file, PresQTError
-from presqt.api_v1.utilities import hash_tokens
 
 
 class TestResourceGETJSON(SimpleTestCase):
@@ -155,7 +154,6 @@ class TestResourcePOST(SimpleTestCase):
     def setUp(self):
         self.client = APIClient()
         self.token = GITHUB_TEST_USER_TOKEN
-        self.ticket_number = hash_tokens(self.token)
         self.headers = {'HTTP_PRESQT_DESTINATION_TOKEN': self.token,
                         'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
                         'HTTP_PRESQT_EMAIL_OPT_IN': ''}
@@ -268,7 +266,7 @@ class TestResourcePOST(SimpleTestCase):
         response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
 
-        self.ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        self.ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(response.status_code, 202)
@@ -458,7 +456,7 @@ class TestResourcePOST(SimpleTestCase):
         response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
 
-        self.ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        self.ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(response.status_code, 202)
@@ -518,7 +516,7 @@ class TestResourcePOST(SimpleTestCase):
             response = self.client.post(self.url, {'presqt-file': open(
                 self.file, 'rb')}, **self.headers)
 
-            self.ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+            self.ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
             # Verify status code and message
             self.assertEqual(response.status_code, 202)
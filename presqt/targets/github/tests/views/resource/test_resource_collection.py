@@ -12,7 +12,6 @@ from presqt.targets.github.functions.upload_metadata import github_upload_metada
 from presqt.targets.github.utilities import delete_github_repo
 from presqt.targets.utilities import shared_upload_function_github
 from presqt.utilities import read_file, PresQTError
-from presqt.api_v1.utilities import hash_tokens
 
 
 class TestResourceCollection(SimpleTestCase):
@@ -179,7 +178,6 @@ class TestResourceCollectionPOST(SimpleTestCase):
     def setUp(self):
         self.client = APIClient()
         self.token = GITHUB_TEST_USER_TOKEN
-        self.ticket_number = hash_tokens(self.token)
         self.headers = {'HTTP_PRESQT_DESTINATION_TOKEN': self.token,
                         'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
                         'HTTP_PRESQT_EMAIL_OPT_IN': ''}
@@ -230,7 +228,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         response = self.client.post(self.url, {'presqt-file': open(bag_with_empty_directory, 'rb')},
                                     **self.headers)
 
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
         # Wait until the spawned off process finishes in the background
@@ -279,7 +277,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
 
-        ticket_number = hash_tokens(GITHUB_TEST_USER_TOKEN)
+        ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
         # Wait until the spawned off process finishes in the background
@@ -307,7 +305,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -418,7 +416,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         response = self.client.post(self.url, {'presqt-file': open(bag_with_bad_metadata, 'rb')},
                                     **self.headers)
 
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
         # Wait until the spawned off process finishes in the background
@@ -447,7 +445,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         bag_with_good_metadata = 'presqt/api_v1/tests/resources/upload/Valid_Metadata_Upload.zip'
         response = self.client.post(self.url, {'presqt-file': open(bag_with_good_metadata, 'rb')},
                                     **self.headers)
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
         # Wait until the spawned off process finishes in the background
@@ -480,7 +478,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
                    'HTTP_PRESQT_EMAIL_OPT_IN': ''}
         response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')}, **headers)
 
-        ticket_number = hash_tokens('eggyboi')
+        ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
         # Wait until the spawned off process finishes in the background
@@ -511,7 +509,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         self.headers['HTTP_PRESQT_FILE_DUPLICATE_ACTION'] = self.duplicate_action
         response = self.client.post(self.url, {'presqt-file': open(bad_bag, 'rb')}, **self.headers)
 
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
         # Wait until the spawned off process finishes in the background
@@ -541,6 +539,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
         process_info = read_file('{}/process_info.json'.format(ticket_path), True)
         while process_info['resource_upload']['status'] == 'in_progress':
             try:
@@ -575,7 +574,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
             response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')},
                                         **self.headers)
 
-            ticket_number = hash_tokens(self.token)
+            ticket_number = response.data['job_id']
             ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
             # Wait until the spawned off process finishes in the background
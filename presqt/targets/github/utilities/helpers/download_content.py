@@ -2,7 +2,8 @@ import base64
 
 import requests
 
-from presqt.utilities import increment_process_info, update_process_info, update_process_info_message
+from presqt.utilities import (increment_process_info, update_process_info,
+                              update_process_info_message, admit_download)
 
 
 def download_content(username, url, header, repo_name, files):
@@ -50,7 +51,8 @@ def download_content(username, url, header, repo_name, files):
     return files, [], action_metadata
 
 
-def download_directory(header, path_to_resource, repo_data, process_info_path, action):
+def download_directory(header, path_to_resource, repo_data, process_info_path, action,
+                       job_control):
     """
     Go through a repo's tree and download all files inside of a given resource directory path.
 
@@ -66,6 +68,8 @@ def download_directory(header, path_to_resource, repo_data, process_info_path, a
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    job_control: JobControl
+        The job's cancellation token and deadline
 
     Returns
     -------
@@ -76,8 +80,11 @@ def download_directory(header, path_to_resource, repo_data, process_info_path, a
     trees_url = '{}/master?recursive=1'.format(repo_data['trees_url'][:-6])
     contents = requests.get(trees_url, headers=header).json()
 
-    number_of_files = len([file for file in contents['tree'] if file['path'].startswith(
-        path_to_resource) and file['type'] == 'blob'])
+    blobs = [file for file in contents['tree'] if file['path'].startswith(
+        path_to_resource) and file['type'] == 'blob']
+    number_of_files = len(blobs)
+    # Wait for disk space for the files before fetching them
+    admit_download(blobs, lambda blob: blob['size'])
     # Add the total number of repository to the process info file.
     # This is necessary to keep track of the progress of the request.
     update_process_info(process_info_path, number_of_files, action, 'download')
@@ -86,6 +93,7 @@ def download_directory(header, path_to_resource, repo_data, process_info_path, a
     files = []
     for resource in contents['tree']:
         if resource['path'].startswith(path_to_resource) and resource['type'] == 'blob':
+            job_control.check()
             # Strip the requested directory's parents off the directory path
             path_to_strip = path_to_resource.rpartition('/')[0]
             if path_to_strip:
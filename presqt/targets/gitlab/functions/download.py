@@ -1,4 +1,5 @@
 import asyncio
+import time
 import aiohttp
 import requests
 import base64
@@ -7,10 +8,11 @@ from rest_framework import status
 
 from presqt.targets.gitlab.utilities import (
     validation_check, gitlab_paginated_data, download_content, extra_metadata_helper)
-from presqt.utilities import (PresQTResponseException, get_dictionary_from_list,
+from presqt.utilities import (PresQTResponseException, get_dictionary_index,
                               update_process_info,
                               increment_process_info,
-                              update_process_info_message)
+                              update_process_info_message,
+                              stream_resources, stream_downloaded_contents, record_span)
 
 
 async def async_get(url, session, header, process_info_path, action):
@@ -35,15 +37,21 @@ async def async_get(url, session, header, process_info_path, action):
     -------
     Response JSON
     """
+    start = time.monotonic()
     async with session.get(url, headers=header) as response:
         assert response.status == 200
         content = await response.json()
         # Increment the number of files done in the process info file.
         increment_process_info(process_info_path, action, 'download')
+        binary_content = base64.b64decode(content['content'])
+        record_span('file_download', time.monotonic() - start, len(binary_content))
+        hashes = {'sha256': content['content_sha256']}
+        # Pass the file on right away if this is a pipelined transfer
+        await stream_downloaded_contents(url, binary_content, hashes)
         return {
             'url': url,
-            'binary_content': base64.b64decode(content['content']),
-            'hashes': {'sha256': content['content_sha256']}}
+            'binary_content': binary_content,
+            'hashes': hashes}
 
 
 async def async_main(url_list, header, process_info_path, action):
@@ -70,7 +78,7 @@ async def async_main(url_list, header, process_info_path, action):
         return await asyncio.gather(*[async_get(url, session, header, process_info_path, action) for url in url_list])
 
 
-def gitlab_download_resource(token, resource_id, process_info_path, action):
+def gitlab_download_resource(token, resource_id, process_info_path, action, job_control):
     """
     Fetch the requested resource from GitLab along with its hash information.
 
@@ -84,6 +92,8 @@ def gitlab_download_resource(token, resource_id, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    job_control: JobControl
+        The job's cancellation token and deadline
 
     Returns
     -------
@@ -182,6 +192,7 @@ def gitlab_download_resource(token, resource_id, process_info_path, action):
     files, empty_containers, action_metadata = download_content(
         username, project_name, project_id, data, [], is_project)
     file_urls = [file['file'] for file in files]
+    stream_resources(files, file_urls)
 
     update_process_info_message(process_info_path, action, 'Downloading files from GitLab...')
     # Add the total number of projects to the process info file.
@@ -190,16 +201,15 @@ def gitlab_download_resource(token, resource_id, process_info_path, action):
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
-    download_data = loop.run_until_complete(
+    download_data = job_control.run_until_complete(loop,
         async_main(file_urls, header, process_info_path, action))
 
     # Go through the file dictionaries and replace the file path with the binary_content
     # and replace the hashes with the correct file hashes
+    download_index = get_dictionary_index(download_data, 'url')
     for file in files:
-        file['hashes'] = get_dictionary_from_list(
-            download_data, 'url', file['file'])['hashes']
-        file['file'] = get_dictionary_from_list(
-            download_data, 'url', file['file'])['binary_content']
+        file['hashes'] = download_index[file['file']]['hashes']
+        file['file'] = download_index[file['file']]['binary_content']
 
     return {
         'resources': files,
@@ -5,13 +5,16 @@ import requests
 from rest_framework import status
 
 from presqt.api_v1.utilities import hash_generator
-from presqt.targets.gitlab.utilities import gitlab_paginated_data
+from presqt.targets.gitlab.utilities import gitlab_paginated_data, create_gitlab_project
 from presqt.targets.gitlab.utilities.validation_check import validation_check
-from presqt.targets.utilities import get_duplicate_title, upload_total_files
-from presqt.utilities import PresQTResponseException, update_process_info, increment_process_info, update_process_info_message
+from presqt.targets.utilities import upload_total_files
+from presqt.utilities import (PresQTResponseException, update_process_info, increment_process_info,
+                              update_process_info_message, walk_upload_directory,
+                              list_upload_directory, checkpointed_destination, get_checkpointed_upload,
+                              checkpoint_uploaded_file)
 
 
-def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm, file_duplicate_action, process_info_path, action):
+def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm, file_duplicate_action, process_info_path, action, job_control):
     """
     Upload the files found in the resource_main_dir to the target.
 
@@ -31,6 +34,8 @@ def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    job_control: JobControl
+        The job's cancellation token and deadline
 
     Returns
     -------
@@ -69,7 +74,7 @@ def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
     username = requests.get("https://gitlab.com/api/v4/user", headers=headers).json()['username']
     action_metadata = {"destinationUsername": username}
 
-    os_path = next(os.walk(resource_main_dir))
+    os_path = list_upload_directory(resource_main_dir)
     # Get total amount of files
     total_files = upload_total_files(resource_main_dir)
     update_process_info(process_info_path, total_files, action, 'upload')
@@ -85,27 +90,23 @@ def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
     # Check if a project with this name exists for this user
     if not resource_id:
         project_title = os_path[1][0]
-        titles = [data['name'] for data in gitlab_paginated_data(headers, user_id)]
-        title = get_duplicate_title(project_title, titles,
-                                    '-PresQT*-').replace('(', '-').replace(')', '-')
-        response = requests.post('{}projects?name={}&visibility=public'.format(
-            base_url, title), headers=headers)
-        if response.status_code == 201:
-            project_id = response.json()['id']
-            project_name = response.json()['name']
-            web_url = response.json()['web_url']
-        else:
-            raise PresQTResponseException(
-                "Response has status code {} while creating project {}.".format(
-                    response.status_code, project_title), status.HTTP_400_BAD_REQUEST)
+        # A resumed job keeps uploading to the project its first attempt created
+        project_id, project_name, web_url = checkpointed_destination(
+            create_gitlab_project, headers, user_id, project_title)
 
         #*** UPLOAD FILES ***#
         # Upload files to project's repository
         base_repo_path = "{}projects/{}/repository/files/".format(base_url, project_id)
-        for path, subdirs, files in os.walk(resource_main_dir):
+        for path, subdirs, files in walk_upload_directory(resource_main_dir):
             if not subdirs and not files:
                 resources_ignored.append(path)
             for name in files:
+                job_control.check()
+                checkpointed_upload = get_checkpointed_upload(
+                    os.path.join(path, name), process_info_path, action)
+                if checkpointed_upload:
+                    file_metadata_list.append(checkpointed_upload[0])
+                    continue
                 # Strip server directories from file path
                 relative_file_path = os.path.join(path.partition('/data/{}/'.format(
                     project_title))[2], name)
@@ -131,14 +132,16 @@ def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
                 # Increment files finished
                 increment_process_info(process_info_path, action, 'upload')
 
-                file_metadata_list.append({
+                file_metadata = {
                     "actionRootPath": os.path.join(path, name),
                     # This ensures that the title is up to date if there are duplicates
                     "destinationPath": os.path.join(project_name, path.partition(
                         '/data/')[2].partition('/')[2], name),
                     "title": name,
                     "destinationHash": file_json.json()['content_sha256']
-                })
+                }
+                file_metadata_list.append(file_metadata)
+                checkpoint_uploaded_file(file_metadata)
     else:
         if ':' not in resource_id:
             project_id = resource_id
@@ -169,10 +172,20 @@ def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
         project_name = project.json()['name']
         web_url = project.json()['web_url']
 
-        for path, subdirs, files in os.walk(resource_main_dir):
+        for path, subdirs, files in walk_upload_directory(resource_main_dir):
             if not subdirs and not files:
                 resources_ignored.append(path)
             for name in files:
+                job_control.check()
+                # Files uploaded by an earlier attempt are in the project now, so they're
+                # skipped before they're compared with its files
+                checkpointed_upload = get_checkpointed_upload(
+                    os.path.join(path, name), process_info_path, action)
+                if checkpointed_upload:
+                    file_metadata_list.append(checkpointed_upload[0])
+                    if checkpointed_upload[1] == 'updated':
+                        resources_updated.append(os.path.join(path, name))
+                    continue
                 # Strip server directories from file path
                 relative_file_path = os.path.join(path.partition('/data/')[2], name)
 
@@ -207,7 +220,7 @@ def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
 
                             # Break out of this for loop and attempt to upload this duplicate
                             break
-                # If we find a file to ignore then move onto the next file in the os.walk
+                # If we find a file to ignore then move onto the next file in the walk
                 if ignore_file:
                     continue
 
@@ -234,12 +247,16 @@ def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
                 # Increment files finished
                 increment_process_info(process_info_path, action, 'upload')
 
-                file_metadata_list.append({
+                file_metadata = {
                     "actionRootPath": os.path.join(path, name),
                     "destinationPath": os.path.join(project_name, path.partition('/data/')[2], name),
                     "title": name,
                     "destinationHash": file_json['content_sha256']
-                })
+                }
+                file_metadata_list.append(file_metadata)
+                checkpoint_uploaded_file(
+                    file_metadata,
+                    'updated' if upload_request == requests.put else 'created')
 
     return {
         'resources_ignored': resources_ignored,
@@ -1,13 +1,15 @@
 import base64
-import itertools
 import json
 
 import requests
 
 from presqt.json_schemas.schema_handlers import schema_validator
-from presqt.targets.gitlab.utilities import validation_check
+from presqt.targets.gitlab.utilities import gitlab_paginated_data, validation_check
 from presqt.targets.gitlab.utilities.upload_extra_metadata import upload_extra_metadata
-from presqt.utilities import PresQTError
+from presqt.utilities import (PresQTError, FTS_METADATA_FILE_NAME, encode_fts_metadata,
+                              fts_metadata_needs_compaction, get_fts_metadata_delta_name,
+                              is_fts_metadata_file, load_valid_fts_metadata,
+                              merge_fts_metadata)
 
 
 def gitlab_upload_metadata(token, project_id, metadata_dict):
@@ -57,16 +59,45 @@ def gitlab_upload_metadata(token, project_id, metadata_dict):
                         invalid_metadata_response.status_code))
             request_type = requests.put
         else:
-            # Loop through each 'action' in both metadata files and make a new list of them.
-            joined_actions = [entry for entry in itertools.chain(metadata_dict['actions'],
-                                                                 updated_metadata['actions'])]
-            joined_keywords = [entry for entry in itertools.chain(metadata_dict['allKeywords'],
-                                                                  updated_metadata['allKeywords'])]
-
-            updated_metadata['actions'] = joined_actions
-            updated_metadata['allKeywords'] = list(set(joined_keywords))
-
-            updated_metadata_bytes = json.dumps(updated_metadata, indent=4).encode('utf-8')
+            # Only this action's metadata is uploaded until there are enough delta files to
+            # compact them into the existing metadata file.
+            tree_url = 'https://gitlab.com/api/v4/projects/{}/repository/tree?ref=master'.format(
+                project_id)
+            delta_files = [data for data in gitlab_paginated_data(headers, None, tree_url)
+                           if data['type'] == 'blob' and data['name'] != FTS_METADATA_FILE_NAME
+                           and is_fts_metadata_file(data['name'])]
+            files_url = "https://gitlab.com/api/v4/projects/{}/repository/files/{}"
+            if not fts_metadata_needs_compaction(len(delta_files)):
+                data = {"branch": "master",
+                        "commit_message": "PresQT Metadata Upload",
+                        "encoding": "base64",
+                        "content": base64.b64encode(encode_fts_metadata(metadata_dict))}
+                delta_response = requests.post(
+                    files_url.format(project_id, get_fts_metadata_delta_name(
+                        metadata_dict).replace('.', '%2E')),
+                    headers=headers,
+                    data=data)
+                if delta_response.status_code != 201:
+                    raise PresQTError(
+                        "The request to create a metadata delta file has resulted in a {} error code from GitLab.".format(
+                            delta_response.status_code))
+                return
+
+            # Merge the delta files and this action's metadata into the existing metadata.
+            # Invalid delta files are left where they are.
+            metadata_documents = [updated_metadata]
+            compacted_files = []
+            for delta_file in delta_files:
+                delta_file_url = files_url.format(project_id, delta_file['name'].replace('.', '%2E'))
+                delta_file_response = requests.get('{}/raw?ref=master'.format(delta_file_url),
+                                                   headers=headers)
+                delta_metadata = load_valid_fts_metadata(delta_file_response.content)
+                if delta_metadata:
+                    metadata_documents.append(delta_metadata)
+                    compacted_files.append(delta_file_url)
+            metadata_documents.append(metadata_dict)
+
+            updated_metadata_bytes = encode_fts_metadata(merge_fts_metadata(metadata_documents))
             updated_base64_metadata = base64.b64encode(updated_metadata_bytes)
 
             data = {"branch": "master",
@@ -84,6 +115,12 @@ def gitlab_upload_metadata(token, project_id, metadata_dict):
                 raise PresQTError(
                     "The request to update the metadata file has returned a {} error code from Gitlab.".format(
                         metadata_response.status_code))
+
+            # Actions left behind by a failed delete are merged only once at the next compaction
+            for delta_file_url in compacted_files:
+                requests.delete(delta_file_url, headers=headers,
+                                data={"branch": "master",
+                                      "commit_message": "Compacted PresQT Metadata"})
             return
 
     metadata_bytes = json.dumps(metadata_dict, indent=4).encode('utf-8')
@@ -8,7 +8,6 @@ from rest_framework.test import APIClient
 
 from presqt.utilities import read_file
 from presqt.targets.utilities import shared_call_get_resource_zip
-from presqt.api_v1.utilities import hash_tokens
 
 from config.settings.base import GITLAB_TEST_USER_TOKEN
 
@@ -227,7 +226,7 @@ class TestDownload(SimpleTestCase):
                                           'resource_format': 'zip'})
 
         response = self.client.get(url, **{'HTTP_PRESQT_SOURCE_TOKEN': 'eggs', 'HTTP_PRESQT_EMAIL_OPT_IN': ''})
-        ticket_number = hash_tokens('eggs')
+        ticket_number = response.data['job_id']
         download_url = response.data['download_job_zip']
         process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(ticket_number)
         process_info = read_file(process_info_path, True)
@@ -258,7 +257,7 @@ class TestDownload(SimpleTestCase):
                                           'resource_format': 'zip'})
 
         response = self.client.get(url, **self.header)
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         download_url = response.data['download_job_zip']
         process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(ticket_number)
         process_info = read_file(process_info_path, True)
@@ -289,7 +288,7 @@ class TestDownload(SimpleTestCase):
                                           'resource_format': 'zip'})
 
         response = self.client.get(url, **self.header)
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         download_url = response.data['download_job_zip']
         process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(ticket_number)
         process_info = read_file(process_info_path, True)
@@ -320,7 +319,7 @@ class TestDownload(SimpleTestCase):
                                           'resource_format': 'zip'})
 
         response = self.client.get(url, **self.header)
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         download_url = response.data['download_job_zip']
         process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(ticket_number)
         process_info = read_file(process_info_path, True)
@@ -15,7 +15,6 @@ from presqt.targets.gitlab.functions.upload_metadata import gitlab_upload_metada
 from presqt.targets.utilities.tests.shared_upload_test_functions import \
     (shared_upload_function_gitlab, process_wait)
 from presqt.utilities import read_file, PresQTError
-from presqt.api_v1.utilities import hash_tokens
 
 
 class TestResourceGETJSON(SimpleTestCase):
@@ -191,7 +190,6 @@ class TestResourcePOST(SimpleTestCase):
     def setUp(self):
         self.client = APIClient()
         self.token = GITLAB_UPLOAD_TEST_USER_TOKEN
-        self.ticket_number = hash_tokens(self.token)
         self.headers = {'HTTP_PRESQT_DESTINATION_TOKEN': self.token,
                         'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
                         'HTTP_PRESQT_EMAIL_OPT_IN': ''}
@@ -268,7 +266,7 @@ class TestResourcePOST(SimpleTestCase):
         response = self.client.post(self.url, {'presqt-file': open(
             self.file, 'rb')}, **self.headers)
 
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         self.ticket_path = 'mediafiles/uploads/{}'.format(ticket_number)
 
         # Verify status code and message
@@ -326,7 +324,7 @@ class TestResourcePOST(SimpleTestCase):
         response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
 
-        self.ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        self.ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Verify status code and message
         self.assertEqual(response.status_code, 202)
@@ -549,7 +547,7 @@ class TestResourcePOST(SimpleTestCase):
             response = self.client.post(self.url, {'presqt-file': open(
                 self.file, 'rb')}, **self.headers)
 
-            ticket_number = hash_tokens(self.token)
+            ticket_number = response.data['job_id']
             self.ticket_path = 'mediafiles/uploads/{}'.format(ticket_number)
 
             # Verify status code and message
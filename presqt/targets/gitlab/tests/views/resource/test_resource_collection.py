@@ -14,7 +14,6 @@ from presqt.targets.gitlab.utilities import delete_gitlab_project
 from presqt.targets.utilities.tests.shared_upload_test_functions import \
     shared_upload_function_gitlab
 from presqt.utilities import PresQTError, read_file
-from presqt.api_v1.utilities import hash_tokens
 
 
 class TestResourceCollection(SimpleTestCase):
@@ -182,7 +181,6 @@ class TestResourceCollectionPOST(SimpleTestCase):
     def setUp(self):
         self.client = APIClient()
         self.token = GITLAB_UPLOAD_TEST_USER_TOKEN
-        self.ticket_number = hash_tokens(self.token)
 
         self.headers = {'HTTP_PRESQT_DESTINATION_TOKEN': self.token,
                         'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
@@ -287,7 +285,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         response = self.client.post(self.url, {'presqt-file': open(bag_with_bad_metadata, 'rb')},
                                     **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -325,6 +323,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
         process_info = read_file('{}/process_info.json'.format(ticket_path), True)
         while process_info['resource_upload']['status'] == 'in_progress':
             try:
@@ -358,7 +357,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
                    'HTTP_PRESQT_EMAIL_OPT_IN': ''}
         response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')}, **headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(hash_tokens('eggyboi'))
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -396,7 +395,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
             response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')},
                                         **self.headers)
 
-            ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+            ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
             # Wait until the spawned off process finishes in the background
             # to do validation on the resulting files
@@ -424,7 +423,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         response = self.client.post(self.url, {'presqt-file': open(bag_with_empty_directory, 'rb')},
                                     **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -3,3 +3,4 @@ from presqt.targets.gitlab.utilities.gitlab_paginated_data import gitlab_paginat
 from presqt.targets.gitlab.utilities.download_content import download_content
 from presqt.targets.gitlab.utilities.delete_gitlab_project import delete_gitlab_project
 from presqt.targets.gitlab.utilities.extra_metadata_helper import extra_metadata_helper
+from presqt.targets.gitlab.utilities.create_gitlab_project import create_gitlab_project
@@ -0,0 +1,36 @@
+import requests
+from rest_framework import status
+
+from presqt.targets.gitlab.utilities.gitlab_paginated_data import gitlab_paginated_data
+from presqt.targets.utilities import get_duplicate_title
+from presqt.utilities import PresQTResponseException
+
+
+def create_gitlab_project(headers, user_id, project_title):
+    """
+    Create a public GitLab project, renaming it if the user already has a project with its name.
+
+    Parameters
+    ----------
+    headers: dict
+        The GitLab request headers holding the user's token.
+    user_id: str
+        The user's GitLab ID.
+    project_title: str
+        The title of the project being created.
+
+    Returns
+    -------
+    The ID, name and web URL of the new project.
+    """
+    titles = [data['name'] for data in gitlab_paginated_data(headers, user_id)]
+    title = get_duplicate_title(project_title, titles,
+                                '-PresQT*-').replace('(', '-').replace(')', '-')
+    response = requests.post('https://gitlab.com/api/v4/projects?name={}&visibility=public'.format(
+        title), headers=headers)
+    if response.status_code != 201:
+        raise PresQTResponseException(
+            "Response has status code {} while creating project {}.".format(
+                response.status_code, project_title), status.HTTP_400_BAD_REQUEST)
+
+    return response.json()['id'], response.json()['name'], response.json()['web_url']
@@ -4,7 +4,9 @@ from requests.exceptions import ConnectionError
 from rest_framework import status
 
 from presqt.api_v1.utilities import hash_generator
-from presqt.utilities import read_file, increment_process_info
+from presqt.utilities import (read_file, increment_process_info, get_upload_stream,
+                              walk_upload_directory, get_checkpointed_upload,
+                              checkpoint_uploaded_file)
 from presqt.utilities import PresQTResponseException
 from presqt.targets.osf.classes.base import OSFBase
 from presqt.targets.osf.classes.file import File
@@ -184,7 +186,7 @@ class ContainerMixin:
 
     def create_directory(self, directory_path, file_duplicate_action, file_hashes,
                          resources_ignored, resources_updated, file_metadata_list,
-                         process_info_path, action):
+                         process_info_path, action, job_control):
         """
         Create a directory of folders and files found in the given directory_path.
 
@@ -206,39 +208,99 @@ class ContainerMixin:
             Path to the process info file that keeps track of the action's progress
         action: str
             The action being performed
+        job_control: JobControl
+            The job's cancellation token and deadline
 
         Returns
         -------
         Returns same file_hashes, resources ignored, resources updated parameters.
         """
+        # Pipelined transfers hand over each file as soon as it is written
+        if get_upload_stream(directory_path):
+            return self.create_streamed_directory(
+                directory_path, file_duplicate_action, file_hashes, resources_ignored,
+                resources_updated, file_metadata_list, process_info_path, action, job_control)
+
         directory, folders, files = next(os.walk(directory_path))
 
         for filename in files:
-            file_path = '{}/{}'.format(directory, filename)
+            self.create_directory_file(directory, filename, file_duplicate_action, file_hashes,
+                                       resources_ignored, resources_updated, file_metadata_list,
+                                       process_info_path, action, job_control)
+
+        for folder in folders:
+            created_folder = self.create_folder(folder)
+            created_folder.create_directory('{}/{}'.format(directory, folder),
+                                            file_duplicate_action, file_hashes,
+                                            resources_ignored, resources_updated, file_metadata_list,
+                                            process_info_path, action, job_control)
+
+    def create_streamed_directory(self, directory_path, file_duplicate_action, file_hashes,
+                                  resources_ignored, resources_updated, file_metadata_list,
+                                  process_info_path, action, job_control):
+        """
+        Create the folders and files of a directory that is still being written to by a
+        pipelined transfer. Files arrive in any order so their folders are created as needed.
+
+        Parameters
+        ----------
+        Same as create_directory.
+        """
+        containers = {'.': self}
+        for directory, folders, files in walk_upload_directory(directory_path):
+            relative_directory = os.path.relpath(directory, directory_path)
+            if relative_directory not in containers:
+                parent = '.'
+                for folder in relative_directory.split('/'):
+                    path = os.path.normpath(os.path.join(parent, folder))
+                    if path not in containers:
+                        containers[path] = containers[parent].create_folder(folder)
+                    parent = path
+
+            for filename in files:
+                containers[relative_directory].create_directory_file(
+                    directory, filename, file_duplicate_action, file_hashes, resources_ignored,
+                    resources_updated, file_metadata_list, process_info_path, action, job_control)
+
+    def create_directory_file(self, directory, filename, file_duplicate_action, file_hashes,
+                              resources_ignored, resources_updated, file_metadata_list,
+                              process_info_path, action, job_control):
+        """
+        Upload a file found on disk to this container and record its metadata.
+
+        Parameters
+        ----------
+        directory : str
+            Directory the file is found in.
+        filename : str
+            Name of the file.
+        The rest are the same as create_directory.
+        """
+        job_control.check()
+        file_path = '{}/{}'.format(directory, filename)
+        # Files uploaded by an earlier attempt of a resumed job aren't uploaded again
+        checkpointed_upload = get_checkpointed_upload(file_path, process_info_path, action)
+        if checkpointed_upload:
+            file_metadata, file_action = checkpointed_upload
+        else:
             file_to_write = read_file(file_path)
 
             file_action, file = self.create_file(filename, file_to_write, file_duplicate_action)
 
-            file_metadata_list.append({
+            file_metadata = {
                 "actionRootPath": file_path,
                 "destinationPath": '{}{}'.format(file.provider, file.materialized_path),
                 "title": file.title,
-                "destinationHash": file.hashes})
+                "destinationHash": file.hashes}
             increment_process_info(process_info_path, action, 'upload')
-
-            file_hashes[file_path] = file.hashes
-            if file_action == 'ignored':
-                resources_ignored.append(file_path)
-            elif file_action == 'updated':
-                resources_updated.append(file_path)
-
-        for folder in folders:
-            created_folder = self.create_folder(folder)
-            created_folder.create_directory('{}/{}'.format(directory, folder),
-                                            file_duplicate_action, file_hashes,
-                                            resources_ignored, resources_updated, file_metadata_list,
-                                            process_info_path, action)
-
+            checkpoint_uploaded_file(file_metadata, file_action)
+        file_metadata_list.append(file_metadata)
+
+        file_hashes[file_path] = file_metadata['destinationHash']
+        if file_action == 'ignored':
+            resources_ignored.append(file_path)
+        elif file_action == 'updated':
+            resources_updated.append(file_path)
 
 
 
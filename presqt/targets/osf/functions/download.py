@@ -1,4 +1,5 @@
 import asyncio
+import time
 import aiohttp
 import requests
 
@@ -6,8 +7,10 @@ from rest_framework import status
 
 from presqt.targets.osf.utilities import get_osf_resource, osf_download_metadata, extra_metadata_helper
 from presqt.utilities import (PresQTResponseException, PresQTInvalidTokenError,
-                              get_dictionary_from_list, update_process_info, increment_process_info,
-                              update_process_info_message)
+                              get_dictionary_index, update_process_info, increment_process_info,
+                              update_process_info_message, get_uncached_resources,
+                              stream_resources, stream_downloaded_contents, record_span,
+                              admit_download)
 from presqt.targets.osf.classes.main import OSF
 
 
@@ -33,11 +36,15 @@ async def async_get(url, session, token, process_info_path, action):
     -------
     Response JSON
     """
+    start = time.monotonic()
     async with session.get(url, headers={'Authorization': 'Bearer {}'.format(token)}) as response:
         assert response.status == 200
         content = await response.read()
         # Increment the number of files done in the process info file.
+        record_span('file_download', time.monotonic() - start, len(content))
         increment_process_info(process_info_path, action, 'download')
+        # Pass the file on right away if this is a pipelined transfer
+        await stream_downloaded_contents(url, content)
         return {'url': url, 'binary_content': content}
 
 
@@ -65,7 +72,7 @@ async def async_main(url_list, token, process_info_path, action):
         return await asyncio.gather(*[async_get(url, session, token, process_info_path, action) for url in url_list])
 
 
-def osf_download_resource(token, resource_id, process_info_path, action):
+def osf_download_resource(token, resource_id, process_info_path, action, job_control):
     """
     Fetch the requested resource from OSF along with its hash information.
 
@@ -79,6 +86,8 @@ def osf_download_resource(token, resource_id, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    job_control: JobControl
+        The job's cancellation token and deadline
 
     Returns
     -------
@@ -157,7 +166,17 @@ def osf_download_resource(token, resource_id, process_info_path, action):
                 path_to_strip = resource.materialized_path[:-(len(resource.title) + 2)]
                 file['path'] = file['file'].materialized_path[len(path_to_strip):]
 
-        file_urls = [file['file'].download_url for file in files]
+        for file in files:
+            file['source_path'] = '/{}/{}{}'.format(project.title,
+                                                    file['file'].provider,
+                                                    file['file'].materialized_path)
+
+        # Files already in the content store don't need to be downloaded again
+        files_to_download = get_uncached_resources(files)
+        file_urls = [file['file'].download_url for file in files_to_download]
+        stream_resources(files_to_download, file_urls)
+        # Wait for disk space for the files before fetching them
+        admit_download(files, lambda file: file['file'].size)
 
         update_process_info_message(process_info_path, action, 'Downloading files from OSF...')
         # Add the total number of projects to the process info file.
@@ -167,15 +186,12 @@ def osf_download_resource(token, resource_id, process_info_path, action):
         # Asynchronously make all download requests
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        download_data = loop.run_until_complete(async_main(file_urls, token, process_info_path, action))
+        download_data = job_control.run_until_complete(loop, async_main(file_urls, token, process_info_path, action))
 
         # Go through the file dictionaries and replace the file class with the binary_content
-        for file in files:
-            file['source_path'] = '/{}/{}{}'.format(project.title,
-                                                    file['file'].provider,
-                                                    file['file'].materialized_path)
-            file['file'] = get_dictionary_from_list(
-                download_data, 'url', file['file'].download_url)['binary_content']
+        download_index = get_dictionary_index(download_data, 'url')
+        for file in files_to_download:
+            file['file'] = download_index[file['file'].download_url]['binary_content']
 
     return {
         'resources': files,
@@ -3,17 +3,17 @@ import requests
 
 from rest_framework import status
 
-from presqt.targets.osf.utilities import get_osf_resource
+from presqt.targets.osf.utilities import get_osf_resource, create_osf_project
 from presqt.utilities import (
     PresQTInvalidTokenError, PresQTResponseException, update_process_info,
-    update_process_info_message)
+    update_process_info_message, checkpointed_destination, list_upload_directory)
 from presqt.targets.osf.classes.main import OSF
 from presqt.targets.utilities import upload_total_files
 
 
 def osf_upload_resource(token, resource_id, resource_main_dir,
                         hash_algorithm, file_duplicate_action,
-                        process_info_path, action):
+                        process_info_path, action, job_control):
     """
     Upload the files found in the resource_main_dir to OSF.
 
@@ -33,6 +33,8 @@ def osf_upload_resource(token, resource_id, resource_main_dir,
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    job_control: JobControl
+        The job's cancellation token and deadline
 
     Returns
     -------
@@ -98,12 +100,14 @@ def osf_upload_resource(token, resource_id, resource_main_dir,
             project_id = project.id
             resource.storage('osfstorage').create_directory(
                 resource_main_dir, file_duplicate_action, hashes,
-                resources_ignored, resources_updated, file_metadata_list, process_info_path, action)
+                resources_ignored, resources_updated, file_metadata_list, process_info_path, action,
+                job_control)
 
         else:  # Folder or Storage
             resource.create_directory(
                 resource_main_dir, file_duplicate_action, hashes,
-                resources_ignored, resources_updated, file_metadata_list, process_info_path, action)
+                resources_ignored, resources_updated, file_metadata_list, process_info_path, action,
+                job_control)
             # Get the project class for later metadata work
             if resource.kind_name == 'storage':
                 project_id = resource.node
@@ -113,19 +117,21 @@ def osf_upload_resource(token, resource_id, resource_main_dir,
 
     # else we are uploading a new project
     else:
-        os_path = next(os.walk(resource_main_dir))
+        os_path = list_upload_directory(resource_main_dir)
 
         # Get the actual data we want to upload
         data_to_upload_path = '{}/{}'.format(os_path[0], os_path[1][0])
 
-        # Create a new project with the name being the top level directory's name.
-        project = osf_instance.create_project(os_path[1][0])
-        project_id = project.id
+        # Create a new project with the name being the top level directory's name. A resumed
+        # upload continues in the project its earlier attempt created.
+        project_id = checkpointed_destination(create_osf_project, osf_instance, os_path[1][0])
+        project = osf_instance.project(project_id)
 
         # Upload resources into OSFStorage for the new project.
         project.storage('osfstorage').create_directory(
             data_to_upload_path, file_duplicate_action, hashes,
-            resources_ignored, resources_updated, file_metadata_list, process_info_path, action)
+            resources_ignored, resources_updated, file_metadata_list, process_info_path, action,
+            job_control)
 
     for file_metadata in file_metadata_list:
         # Only send forward the hash we need based on the hash_algorithm provided
@@ -1,11 +1,13 @@
-import itertools
 import json
 import requests
 
 from presqt.json_schemas.schema_handlers import schema_validator
 from presqt.targets.osf.classes.main import OSF
 from presqt.targets.osf.utilities.upload_extra_metadata import upload_extra_metadata
-from presqt.utilities import PresQTError
+from presqt.utilities import (PresQTError, FTS_METADATA_FILE_NAME, encode_fts_metadata,
+                              fts_metadata_needs_compaction, get_fts_metadata_delta_name,
+                              is_fts_metadata_file, load_valid_fts_metadata,
+                              merge_fts_metadata)
 
 
 def osf_upload_metadata(token, project_id, metadata_dict):
@@ -23,13 +25,15 @@ def osf_upload_metadata(token, project_id, metadata_dict):
     """
     osf_instance = OSF(token)
     header = {'Authorization': 'Bearer {}'.format(token)}
-    file_name = 'PRESQT_FTS_METADATA.json'
-    encoded_metadata = json.dumps(metadata_dict, indent=4).encode('utf-8')
+    file_name = FTS_METADATA_FILE_NAME
+    encoded_metadata = encode_fts_metadata(metadata_dict)
     put_url = "https://files.osf.io/v1/resources/{}/providers/osfstorage/"
 
     # We need to find out if this project already has metadata associated with it.
     project_data = osf_instance._get_all_paginated_data(
         'https://api.osf.io/v2/nodes/{}/files/osfstorage'.format(project_id))
+    delta_files = [data for data in project_data if data['attributes']['name'] != file_name
+                   and is_fts_metadata_file(data['attributes']['name'])]
 
     for data in project_data:
         if data['attributes']['name'] == file_name:
@@ -50,16 +54,30 @@ def osf_upload_metadata(token, project_id, metadata_dict):
                             response.status_code))
                 break
 
-            # Loop through each 'action' in both metadata files and make a new list of them.
-            joined_actions = [entry for entry in itertools.chain(metadata_dict['actions'],
-                                                                 updated_metadata['actions'])]
-            joined_keywords = [entry for entry in itertools.chain(metadata_dict['allKeywords'],
-                                                                  updated_metadata['allKeywords'])]
+            # Only this action's metadata is uploaded until there are enough delta files to
+            # compact them into the existing metadata file.
+            if not fts_metadata_needs_compaction(len(delta_files)):
+                response = requests.put(put_url.format(project_id), headers=header,
+                                        params={"name": get_fts_metadata_delta_name(metadata_dict)},
+                                        data=encoded_metadata)
+                if response.status_code != 201:
+                    raise PresQTError(
+                        "The request to create a metadata delta file has resulted in a {} error code from OSF".format(
+                            response.status_code))
+                return
 
-            updated_metadata['actions'] = joined_actions
-            updated_metadata['allKeywords'] = list(set(joined_keywords))
-            
-            encoded_metadata = json.dumps(updated_metadata, indent=4).encode('utf-8')
+            # Merge the delta files and this action's metadata into the existing metadata.
+            # Invalid delta files are left where they are.
+            metadata_documents = [updated_metadata]
+            compacted_files = []
+            for delta_file in delta_files:
+                delta_metadata = load_valid_fts_metadata(
+                    requests.get(delta_file['links']['move'], headers=header).content)
+                if delta_metadata:
+                    metadata_documents.append(delta_metadata)
+                    compacted_files.append(delta_file)
+            metadata_documents.append(metadata_dict)
+            encoded_metadata = encode_fts_metadata(merge_fts_metadata(metadata_documents))
 
             # Now we need to update the metadata file with this updated metadata
             response = requests.put(data['links']['upload'], headers=header,
@@ -70,6 +88,10 @@ def osf_upload_metadata(token, project_id, metadata_dict):
                 raise PresQTError(
                     "The request to update the metadata file has returned a {} error code from OSF.".format(
                         response.status_code))
+
+            # Actions left behind by a failed delete are merged only once at the next compaction
+            for delta_file in compacted_files:
+                requests.delete(delta_file['links']['delete'], headers=header)
             return
 
     # If there is no existing metadata file, then create a new one.
@@ -16,6 +16,7 @@ from rest_framework.test import APIClient
 
 from config.settings.base import OSF_TEST_USER_TOKEN, OSF_UPLOAD_TEST_USER_TOKEN
 
+from presqt.api_v1.utilities import hash_tokens
 from presqt.api_v1.utilities.fixity.download_fixity_checker import download_fixity_checker
 from presqt.api_v1.views.resource.base_resource import BaseResource
 from presqt.json_schemas.schema_handlers import schema_validator
@@ -24,7 +25,6 @@ from presqt.targets.osf.utilities import delete_users_projects
 from presqt.targets.utilities import (shared_get_success_function_202,
                                       shared_get_success_function_202_with_error, process_wait,
                                       shared_upload_function_osf)
-from presqt.api_v1.utilities import hash_tokens
 from presqt.utilities import (
     read_file, get_dictionary_from_list, remove_path_contents, PresQTError)
 from presqt.utilities.io import zip_file
@@ -479,7 +479,7 @@ class TestResourceGETZip(SimpleTestCase):
         # Verify the status code and content
         self.assertEqual(response.status_code, 202)
         self.assertEqual(response.data['message'], 'The server is processing the request.')
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
         # Verify process_info file status is 'in_progress' initially
@@ -543,7 +543,7 @@ class TestResourceGETZip(SimpleTestCase):
             resource_instance.process_info_path = process_info_path
             resource_instance.process_state = process_state
             resource_instance.process_info_obj = {
-                'presqt-source-token': ticket_number,
+                'presqt-source-token': hash_tokens(self.token),
                 'status': 'in_progress',
                 'expiration': str(timezone.now() + relativedelta(hours=5)),
                 'message': 'Download is being processed on the server',
@@ -600,7 +600,7 @@ class TestResourceGETZip(SimpleTestCase):
         # Verify the status code and content
         self.assertEqual(response.status_code, 202)
 
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
         # Wait until the spawned off process finishes in the background
@@ -676,7 +676,7 @@ class TestResourceGETZip(SimpleTestCase):
 
         self.assertEqual(response.status_code, 202)
 
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
         # Wait until the spawned off process finishes in the background
@@ -713,7 +713,7 @@ class TestResourceGETZip(SimpleTestCase):
         # Verify the status code and content
         self.assertEqual(response.status_code, 202)
 
-        ticket_number = hash_tokens(self.token)
+        ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
         # Wait until the spawned off process finishes in the background
@@ -743,21 +743,39 @@ class TestResourceGETZip(SimpleTestCase):
         # Delete corresponding folder
         shutil.rmtree(ticket_path)
 
-    def test_error_attempt_multiple_downloads(self):
+    def test_success_multiple_downloads(self):
         """
-        If a user has other process in action, alert the user.
+        A user can run several downloads at once, each with its own job.
         """
         url = reverse('resource', kwargs={'target_name': 'osf',
                                           'resource_id': '5cd988d3054f5b00185ca5e3',
                                           'resource_format': 'zip'})
         # Verify the status code and content
-        response = self.client.get(url, **self.header)
-        self.assertEqual(response.status_code, 202)
+        first_response = self.client.get(url, **self.header)
+        self.assertEqual(first_response.status_code, 202)
+
+        second_response = self.client.get(url, **self.header)
+        self.assertEqual(second_response.status_code, 202)
+        self.assertNotEqual(first_response.data['job_id'], second_response.data['job_id'])
+
+        # WE NEED TO WAIT FOR BOTH DOWNLOADS TO FINISH
+        for response in [first_response, second_response]:
+            ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
+            process_info_path = '{}/process_info.json'.format(ticket_path)
+            process_info = read_file(process_info_path, True)
+            while process_info['resource_download']['status'] == 'in_progress':
+                try:
+                    process_info = read_file(process_info_path, True)
+                except json.decoder.JSONDecodeError:
+                    # Pass while the process_info file is being written to
+                    pass
 
-        response = self.client.get(url, **self.header)
-        # Verify the status code and content
-        self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.data['error'], "User currently has processes in progress.")
+            # Each job reports its own result
+            job_response = self.client.get(response.data['download_job_json'], **self.header)
+            self.assertEqual(job_response.status_code, 200)
+            self.assertEqual(job_response.data['message'], 'Download successful.')
+
+            shutil.rmtree(ticket_path)
 
 
 class TestResourcePOST(SimpleTestCase):
@@ -772,7 +790,6 @@ class TestResourcePOST(SimpleTestCase):
     def setUp(self):
         self.client = APIClient()
         self.token = OSF_UPLOAD_TEST_USER_TOKEN
-        self.ticket_number = hash_tokens(self.token)
         self.headers = {'HTTP_PRESQT_DESTINATION_TOKEN': self.token,
                         'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
                         'HTTP_PRESQT_EMAIL_OPT_IN': ''}
@@ -949,7 +966,7 @@ class TestResourcePOST(SimpleTestCase):
         self.assertEqual(response.status_code, 202)
 
         # Wait for the process to finish
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
         process_info_path = '{}/process_info.json'.format(ticket_path)
         process_info = read_file(process_info_path, True)
         process_wait(process_info, ticket_path)
@@ -968,7 +985,7 @@ class TestResourcePOST(SimpleTestCase):
         self.assertEqual(response.status_code, 202)
 
         # Wait for the process to finish
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
         process_info_path = '{}/process_info.json'.format(ticket_path)
         process_info = read_file(process_info_path, True)
         process_wait(process_info, ticket_path)
@@ -979,7 +996,7 @@ class TestResourcePOST(SimpleTestCase):
         self.assertEqual(response.status_code, 202)
 
         # Wait for the process to finish
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
         process_info_path = '{}/process_info.json'.format(ticket_path)
         process_info = read_file(process_info_path, True)
         process_wait(process_info, ticket_path)
@@ -1118,7 +1135,7 @@ class TestResourcePOST(SimpleTestCase):
             response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')},
                                         **self.headers)
 
-            self.ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+            self.ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
             # Verify status code and message
             self.assertEqual(response.status_code, 202)
@@ -1152,24 +1169,32 @@ class TestResourcePOST(SimpleTestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['error'], 'PresQT Error: Bag is not formatted properly.')
 
-    def test_error_attempt_multiple_uploads(self):
+    def test_success_multiple_uploads(self):
         """
-        If a user has other process in action, alert the user.
+        A user can run several uploads at once, each with its own job.
         """
         self.resource_id = None
         self.duplicate_action = 'ignore'
         self.url = reverse('resource_collection', kwargs={'target_name': 'osf'})
         self.file = 'presqt/api_v1/tests/resources/upload/ProjectBagItToUpload.zip'
-        response = self.client.post(
+        first_response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
-
-        error_response = self.client.post(
+        second_response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
         # Verify the status code and content
-        self.assertEqual(error_response.status_code, 400)
-        self.assertEqual(error_response.data['error'], "User currently has processes in progress.")
+        self.assertEqual(first_response.status_code, 202)
+        self.assertEqual(second_response.status_code, 202)
+        self.assertNotEqual(first_response.data['job_id'], second_response.data['job_id'])
+
+        # WE NEED TO WAIT FOR BOTH POSTS TO FINISH
+        for response in [first_response, second_response]:
+            self.ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
+            process_info = read_file('{}/process_info.json'.format(self.ticket_path), True)
+            process_wait(process_info, self.ticket_path)
+
+            # Each job reports its own result
+            upload_job_response = self.client.get(response.data['upload_job'], **self.headers)
+            self.assertEqual(upload_job_response.status_code, 200)
+            self.assertEqual(upload_job_response.data['message'], 'Upload successful.')
 
-        # WE NEED TO WAIT FOR THE INITIAL POST TO FINISH
-        self.ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
-        process_info = read_file('{}/process_info.json'.format(self.ticket_path), True)
-        process_wait(process_info, self.ticket_path)
\ No newline at end of file
+            shutil.rmtree(self.ticket_path)
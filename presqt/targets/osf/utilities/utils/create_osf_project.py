@@ -0,0 +1,16 @@
+def create_osf_project(osf_instance, title):
+    """
+    Create a new project on OSF.
+
+    Parameters
+    ----------
+    osf_instance : OSF class object
+        Instance of the OSF class to create the project with.
+    title : str
+        Title of the new project.
+
+    Returns
+    -------
+    The new project's ID.
+    """
+    return osf_instance.create_project(title).id
@@ -10,4 +10,11 @@ from presqt.targets.utilities.tests.shared_upload_test_functions import (shared_
                                                                          shared_upload_function_github,
                                                                          process_wait)
 from presqt.targets.utilities.utils.upload_total_files import upload_total_files
+from presqt.targets.utilities.utils.target_urls import (TARGET_HOSTS, override_target_url,
+                                                         install_target_url_override)
 
+from presqt.targets.utilities.utils.endpoint_templates import (ENDPOINT_TEMPLATES,
+                                                               get_endpoint_template)
+from presqt.targets.utilities.utils.http_accounting import (LATENCY_BUCKETS, HttpAccounting,
+                                                            open_http_accounting,
+                                                            close_http_accounting)
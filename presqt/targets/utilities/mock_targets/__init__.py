@@ -0,0 +1,3 @@
+from presqt.targets.utilities.mock_targets.dataset import (
+    DEFAULT_DATASET_SHAPE, MOCK_INVALID_TOKEN, MockDataset)
+from presqt.targets.utilities.mock_targets.server import create_mock_targets_app, MockTargetsServer
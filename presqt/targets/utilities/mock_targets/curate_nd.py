@@ -0,0 +1,135 @@
+from aiohttp import web
+
+from presqt.targets.utilities.mock_targets.dataset import (
+    MOCK_DATE, MOCK_FULL_NAME, MOCK_INVALID_TOKEN, MOCK_USERNAME, resource_hash)
+from presqt.targets.utilities.mock_targets.helpers import add_route, get_page, get_query, paginate
+
+API_URL = 'https://curate.nd.edu/api'
+DOWNLOADS_URL = 'https://curate.nd.edu/downloads'
+PER_PAGE = 12
+
+
+def add_routes(app):
+    """
+    Add the routes of the CurateND API. CurateND is read only, so items are only ever the
+    generated projects and their files are every file in the project.
+    """
+    for method, path, handler in [
+            ('GET', '/curate_nd/api/items', get_items),
+            ('GET', '/curate_nd/api/items/{item_id}', get_item),
+            ('GET', '/curate_nd/downloads/{file_id}', download_file)]:
+        add_route(app, method, path, authorized(handler))
+
+
+def authorized(handler):
+    """
+    Answer requests without a valid token with an error payload, like CurateND does.
+    """
+    async def authorized_handler(request):
+        token = request.headers.get('X-Api-Token')
+        if not token or token == MOCK_INVALID_TOKEN:
+            return web.json_response({'error': 'You must be logged in to do that!'}, status=500)
+        return await handler(request)
+    return authorized_handler
+
+
+def not_found():
+    return web.json_response({'error': 'Not found'}, status=404)
+
+
+def file_id(project, file):
+    # File ids look like item ids
+    return 'mk{}'.format(resource_hash('curate_nd', project.id, file.path)[:9])
+
+
+def find_file(request, file_id_to_find):
+    """
+    Get the item and the file with the given id.
+
+    Returns
+    -------
+    The MockProject and MockFile, or None and None if the file doesn't exist.
+    """
+    for project in request.app['dataset'].projects['curate_nd'].values():
+        for file in project.walk():
+            if file_id(project, file) == file_id_to_find:
+                return project, file
+    return None, None
+
+
+def item_json(project):
+    item_url = '{}/items/{}'.format(API_URL, project.id)
+    return {
+        'id': project.id,
+        'title': project.title,
+        'requestUrl': item_url,
+        'type': 'Dataset',
+        'dateSubmitted': MOCK_DATE,
+        'modified': MOCK_DATE,
+        'depositor': MOCK_USERNAME,
+        'creator': MOCK_FULL_NAME,
+        'rights': 'All rights reserved',
+        'containedFiles': [{
+            'id': file_id(project, file),
+            'label': file.path.replace('/', '_'),
+            'downloadUrl': '{}/{}'.format(DOWNLOADS_URL, file_id(project, file))
+        } for file in project.walk()]
+    }
+
+
+def file_json(project, file):
+    return {
+        'id': file_id(project, file),
+        'label': file.path.replace('/', '_'),
+        'requestUrl': '{}/items/{}'.format(API_URL, file_id(project, file)),
+        'downloadUrl': '{}/{}'.format(DOWNLOADS_URL, file_id(project, file)),
+        'dateSubmitted': MOCK_DATE,
+        'modified': MOCK_DATE,
+        'depositor': MOCK_USERNAME,
+        'isPartOf': '{}/items/{}'.format(API_URL, project.id),
+        'characterization': '<fits><md5checksum>{}</md5checksum></fits>'.format(file.md5)
+    }
+
+
+async def get_items(request):
+    projects = list(request.app['dataset'].projects['curate_nd'].values())
+    query = get_query(request)
+    if 'q' in query:
+        projects = [project for project in projects if query['q'].lower() in project.title.lower()]
+
+    page = get_page(request)
+    results, total_pages = paginate(
+        [{'type': 'Dataset', 'id': project.id, 'title': project.title,
+          'itemUrl': '{}/items/{}'.format(API_URL, project.id)} for project in projects],
+        page, request.app['dataset'].page_size(PER_PAGE))
+
+    query_string = '&'.join('{}={}'.format(key, value) for key, value in query.items()
+                            if key != 'page')
+    base_url = '{}/items?{}&page='.format(API_URL, query_string)
+    pagination = {
+        'itemsPerPage': request.app['dataset'].page_size(PER_PAGE),
+        'firstPage': '{}1'.format(base_url),
+        # CurateND returns 'self' instead of the page number when there's one page
+        'lastPage': '{}{}'.format(base_url, total_pages if total_pages > 1 else 'self')}
+    if page > 1:
+        pagination['previousPage'] = '{}{}'.format(base_url, page - 1)
+    if page < total_pages:
+        pagination['nextPage'] = '{}{}'.format(base_url, page + 1)
+    return web.json_response({'results': results, 'pagination': pagination})
+
+
+async def get_item(request):
+    project = request.app['dataset'].get_project('curate_nd', request.match_info['item_id'])
+    if project:
+        return web.json_response(item_json(project))
+    project, file = find_file(request, request.match_info['item_id'])
+    if not file:
+        return not_found()
+    return web.json_response(file_json(project, file))
+
+
+async def download_file(request):
+    project, file = find_file(request, request.match_info['file_id'])
+    if not file:
+        return not_found()
+    return web.Response(body=file.contents)
@@ -0,0 +1,235 @@
+import hashlib
+import posixpath
+
+# Shape of the dataset each mock target is filled with
+DEFAULT_DATASET_SHAPE = {
+    # Number of projects each target has
+    'projects': 2,
+    # Number of folder levels below each project
+    'depth': 2,
+    # Number of folders in each folder
+    'folders': 2,
+    # Number of files in each folder
+    'files': 3,
+    # Size of each file in bytes, or a list of sizes the files of each folder cycle through
+    'file_size': 1024,
+    # Number of entries in each page of paginated listings. None uses each target's own size.
+    'page_size': None
+}
+
+MOCK_TARGETS = ['osf', 'github', 'gitlab', 'zenodo', 'figshare', 'curate_nd']
+
+
+def _base36(number):
+    digits = ''
+    while True:
+        number, digit = divmod(number, 36)
+        digits = '0123456789abcdefghijklmnopqrstuvwxyz'[digit] + digits
+        if not number:
+            return digits
+
+
+# The id format of each target's projects
+PROJECT_ID_FORMATS = {
+    # OSF ids are five characters long
+    'osf': lambda number: 'm{:0>4}'.format(_base36(number)),
+    'github': lambda number: 100000 + number,
+    'gitlab': lambda number: 200000 + number,
+    'zenodo': lambda number: 300000 + number,
+    'figshare': lambda number: 400000 + number,
+    'curate_nd': lambda number: 'mk{:09d}'.format(number)
+}
+
+# Every token is accepted except this one
+MOCK_INVALID_TOKEN = 'invalid'
+MOCK_USERNAME = 'presqt-mock'
+MOCK_FULL_NAME = 'PresQT Mock'
+MOCK_DATE = '2020-01-01T00:00:00.000000Z'
+
+
+def resource_hash(*parts):
+    """
+    Get a stable hex digest for a resource to build ids out of.
+
+    Parameters
+    ----------
+    parts : str
+        The values that identify the resource.
+
+    Returns
+    -------
+    The hex digest.
+    """
+    return hashlib.md5('/'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def file_contents(path, size):
+    """
+    Build the contents of a generated file. The contents are different for every path.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file in its project.
+    size : int
+        The size of the file in bytes.
+
+    Returns
+    -------
+    The file's bytes.
+    """
+    line = '{}\n'.format(path).encode('utf-8')
+    return (line * (size // len(line) + 1))[:size]
+
+
+class MockFile(object):
+    """
+    A file in a mock project.
+    """
+    def __init__(self, path, contents):
+        self.path = path
+        self.name = posixpath.basename(path)
+        self.contents = contents
+        self.size = len(contents)
+        self.md5 = hashlib.md5(contents).hexdigest()
+        self.sha1 = hashlib.sha1(contents).hexdigest()
+        self.sha256 = hashlib.sha256(contents).hexdigest()
+        self.tags = []
+
+
+class MockProject(object):
+    """
+    A project of a mock target. Its files are kept by their path from the top of the project.
+    """
+    def __init__(self, project_id, title):
+        self.id = project_id
+        self.title = title
+        self.tags = []
+        self.description = ''
+        self.files = {}
+        self.folders = set()
+
+    def add_file(self, path, contents):
+        """
+        Add a file to the project, replacing any file at the same path.
+        """
+        self.files[path] = MockFile(path, contents)
+        self.add_folder(posixpath.dirname(path))
+        return self.files[path]
+
+    def add_folder(self, path):
+        """
+        Add a folder and all of its parents to the project.
+        """
+        while path:
+            self.folders.add(path)
+            path = posixpath.dirname(path)
+
+    def delete(self, path):
+        """
+        Delete a file or a folder with everything in it.
+        """
+        self.files.pop(path, None)
+        for file_path in [file_path for file_path in self.files
+                          if file_path.startswith(path + '/')]:
+            del self.files[file_path]
+        self.folders = {folder for folder in self.folders
+                        if folder != path and not folder.startswith(path + '/')}
+
+    def rename(self, path, new_path):
+        """
+        Move a file or a folder with everything in it to a new path.
+        """
+        def moved(old_path):
+            return new_path + old_path[len(path):]
+
+        for file_path in [file_path for file_path in self.files
+                          if file_path == path or file_path.startswith(path + '/')]:
+            moved_file = self.files.pop(file_path)
+            moved_file.path = moved(file_path)
+            moved_file.name = posixpath.basename(moved_file.path)
+            self.files[moved_file.path] = moved_file
+        self.folders = {moved(folder) if folder == path or folder.startswith(path + '/')
+                        else folder for folder in self.folders}
+        self.add_folder(posixpath.dirname(new_path))
+
+    def list_folder(self, path=''):
+        """
+        Get the folders and files directly inside a folder. '' is the top of the project.
+
+        Returns
+        -------
+        Sorted lists of the folder paths and the MockFiles in the folder.
+        """
+        folders = sorted(folder for folder in self.folders if posixpath.dirname(folder) == path)
+        files = [self.files[file_path] for file_path in sorted(self.files)
+                 if posixpath.dirname(file_path) == path]
+        return folders, files
+
+    def walk(self, path=''):
+        """
+        Get every file below a folder, ordered by path.
+        """
+        return [self.files[file_path] for file_path in sorted(self.files)
+                if not path or file_path.startswith(path + '/')]
+
+
+class MockDataset(object):
+    """
+    The projects of every mock target. Each target starts with the same generated projects and
+    projects added by uploads are only added to their own target.
+    """
+    def __init__(self, shape=None):
+        self.shape = dict(DEFAULT_DATASET_SHAPE, **(shape or {}))
+        self.projects = {target: {} for target in MOCK_TARGETS}
+        self._project_counts = {target: 0 for target in MOCK_TARGETS}
+
+        for number in range(1, self.shape['projects'] + 1):
+            title = 'Mock Project {}'.format(number)
+            for target in MOCK_TARGETS:
+                project = self.add_project(target, title)
+                self._fill_folder(project, '', self.shape['depth'])
+
+    def _fill_folder(self, project, path, depth):
+        """
+        Fill a folder with the files and folders of the dataset shape.
+        """
+        file_sizes = self.shape['file_size']
+        if isinstance(file_sizes, int):
+            file_sizes = [file_sizes]
+        for number in range(1, self.shape['files'] + 1):
+            file_path = posixpath.join(path, 'file_{}.txt'.format(number))
+            project.add_file(file_path, file_contents(
+                file_path, file_sizes[(number - 1) % len(file_sizes)]))
+        if depth:
+            for number in range(1, self.shape['folders'] + 1):
+                folder_path = posixpath.join(path, 'folder_{}'.format(number))
+                project.add_folder(folder_path)
+                self._fill_folder(project, folder_path, depth - 1)
+
+    def add_project(self, target, title):
+        """
+        Add an empty project to a target.
+
+        Returns
+        -------
+        The new MockProject.
+        """
+        self._project_counts[target] += 1
+        project_id = PROJECT_ID_FORMATS[target](self._project_counts[target])
+        project = MockProject(project_id, title)
+        self.projects[target][str(project_id)] = project
+        return project
+
+    def get_project(self, target, project_id):
+        """
+        Get a project of a target by its id or None if it doesn't exist.
+        """
+        return self.projects[target].get(str(project_id))
+
+    def page_size(self, default):
+        """
+        Get the page size of paginated listings for a target with the given default size.
+        """
+        return self.shape['page_size'] or default
+
@@ -0,0 +1,328 @@
+import json
+import posixpath
+
+from aiohttp import web
+
+from presqt.targets.utilities.mock_targets.dataset import (
+    MOCK_DATE, MOCK_FULL_NAME, MOCK_INVALID_TOKEN, MOCK_USERNAME, resource_hash)
+from presqt.targets.utilities.mock_targets.helpers import add_route, get_page, json_error, paginate
+
+API_URL = 'https://api.figshare.com/v2'
+DOWNLOADS_URL = 'https://ndownloader.figshare.com/files'
+UPLOADS_URL = 'https://fup.figshare.com/upload'
+PER_PAGE = 10
+# Size of the parts files are uploaded in
+UPLOAD_PART_SIZE = 10 * 1024 * 1024
+
+
+def add_routes(app):
+    """
+    Add the routes of the FigShare API and its download and upload services. The folders at the
+    top of each project are its articles and the files below them are the articles' files.
+    """
+    # Uploads that have been initiated but not completed, by file id
+    app['figshare_uploads'] = {}
+    # Tags of each article, by article id
+    app['figshare_article_tags'] = {}
+
+    for method, path, handler in [
+            ('GET', '/figshare/v2/account', get_account),
+            ('GET', '/figshare/v2/account/projects', get_projects),
+            ('POST', '/figshare/v2/account/projects', create_project),
+            ('GET', '/figshare/v2/account/projects/{project_id}', get_project_json),
+            ('PUT', '/figshare/v2/account/projects/{project_id}', update_project),
+            ('GET', '/figshare/v2/account/projects/{project_id}/articles', get_articles),
+            ('POST', '/figshare/v2/account/projects/{project_id}/articles', create_article),
+            ('GET', '/figshare/v2/account/projects/{project_id}/articles/{article_id}',
+             get_article),
+            ('GET', '/figshare/v2/account/articles/{article_id}', get_article),
+            ('PUT', '/figshare/v2/account/articles/{article_id}', update_article),
+            ('GET', '/figshare/v2/account/articles/{article_id}/files', get_article_files),
+            ('POST', '/figshare/v2/account/articles/{article_id}/files', initiate_upload),
+            ('GET', '/figshare/v2/account/articles/{article_id}/files/{file_id}', get_file),
+            ('POST', '/figshare/v2/account/articles/{article_id}/files/{file_id}',
+             complete_upload),
+            ('DELETE', '/figshare/v2/account/articles/{article_id}/files/{file_id}',
+             delete_file),
+            ('GET', '/figshare/v2/projects/{project_id}', not_found),
+            ('GET', '/figshare/v2/articles/{article_id}', not_found),
+            ('GET', '/figshare_downloads/files/{file_id}', download_file),
+            ('GET', '/figshare_uploads/upload/{file_id}', get_upload),
+            ('PUT', '/figshare_uploads/upload/{file_id}/{part_number}', upload_part)]:
+        add_route(app, method, path, authorized(handler))
+
+
+def authorized(handler):
+    """
+    Answer requests without a valid token with a 403, like FigShare does.
+    """
+    async def authorized_handler(request):
+        token = request.headers.get('Authorization', '').partition('token ')[2]
+        if not token or token == MOCK_INVALID_TOKEN:
+            return json_error(403, 'Invalid or expired token.', headers={
+                'WWW-Authenticate': 'token'})
+        return await handler(request)
+    return authorized_handler
+
+
+async def not_found(request=None):
+    return json_error(404, 'Entity not found')
+
+
+def article_id(project, folder):
+    return int(resource_hash('figshare', project.id, folder)[:7], 16)
+
+
+def file_id(project, file):
+    return int(resource_hash('figshare', project.id, file.path)[:8], 16)
+
+
+def get_project(request):
+    return request.app['dataset'].get_project('figshare', request.match_info['project_id'])
+
+
+def get_articles_of(project):
+    return project.list_folder('')[0]
+
+
+def find_article(request):
+    """
+    Get the project and folder of the article in the request's url.
+
+    Returns
+    -------
+    The MockProject and the article's folder, or None and None if it doesn't exist.
+    """
+    if 'project_id' in request.match_info:
+        projects = [project for project in [get_project(request)] if project]
+    else:
+        projects = request.app['dataset'].projects['figshare'].values()
+    for project in projects:
+        for folder in get_articles_of(project):
+            if str(article_id(project, folder)) == request.match_info['article_id']:
+                return project, folder
+    return None, None
+
+
+def find_file(request, project, folder):
+    for file in project.walk(folder):
+        if str(file_id(project, file)) == request.match_info['file_id']:
+            return file
+    return None
+
+
+def file_name(folder, file):
+    # Articles don't have folders
+    return file.path[len(folder) + 1:].replace('/', '_')
+
+
+def project_json(project):
+    return {
+        'id': int(project.id),
+        'title': project.title,
+        'url': '{}/account/projects/{}'.format(API_URL, project.id),
+        'figshare_url': 'https://figshare.com/projects/{}/{}'.format(
+            project.title.replace(' ', '_'), project.id),
+        'created_date': MOCK_DATE,
+        'modified_date': MOCK_DATE,
+        'published_date': None,
+        'funding': '',
+        'collaborators': [{'name': MOCK_FULL_NAME, 'role_name': 'Owner'}],
+        'description': project.description,
+        'custom_fields': []
+    }
+
+
+def file_json(project, folder, file):
+    return {
+        'id': file_id(project, file),
+        'name': file_name(folder, file),
+        'size': file.size,
+        'computed_md5': file.md5,
+        'supplied_md5': file.md5,
+        'status': 'available',
+        'is_link_only': False,
+        'download_url': '{}/{}'.format(DOWNLOADS_URL, file_id(project, file))
+    }
+
+
+def article_json(app, project, folder):
+    article = article_id(project, folder)
+    return {
+        'id': article,
+        'title': posixpath.basename(folder),
+        'url': '{}/account/projects/{}/articles/{}'.format(API_URL, project.id, article),
+        'url_private_api': '{}/account/articles/{}'.format(API_URL, article),
+        'figshare_url': 'https://figshare.com/articles/{}/{}'.format(folder, article),
+        'defined_type': 3,
+        'defined_type_name': 'dataset',
+        'created_date': MOCK_DATE,
+        'modified_date': MOCK_DATE,
+        'description': '',
+        'tags': app['figshare_article_tags'].get(article, []),
+        'files': [file_json(project, folder, file) for file in project.walk(folder)]
+    }
+
+
+async def get_account(request):
+    return web.json_response({'id': 1, 'email': '{}@example.com'.format(MOCK_USERNAME),
+                              'first_name': MOCK_FULL_NAME.split(' ')[0],
+                              'last_name': MOCK_FULL_NAME.partition(' ')[2]})
+
+
+async def get_projects(request):
+    projects, _ = paginate(
+        [project_json(project) for project in
+         request.app['dataset'].projects['figshare'].values()],
+        get_page(request), request.app['dataset'].page_size(PER_PAGE))
+    return web.json_response(projects)
+
+
+async def create_project(request):
+    title = json.loads(await request.read())['title']
+    project = request.app['dataset'].add_project('figshare', title)
+    return web.json_response({'entity_id': int(project.id),
+                              'location': '{}/account/projects/{}'.format(API_URL, project.id)},
+                             status=201)
+
+
+async def get_project_json(request):
+    project = get_project(request)
+    if not project:
+        return await not_found()
+    return web.json_response(project_json(project))
+
+
+async def update_project(request):
+    project = get_project(request)
+    if not project:
+        return await not_found()
+    project.description = json.loads(await request.read()).get('description',
+                                                               project.description)
+    return web.Response(status=205)
+
+
+async def get_articles(request):
+    project = get_project(request)
+    if not project:
+        return await not_found()
+    articles, _ = paginate(
+        [article_json(request.app, project, folder) for folder in get_articles_of(project)],
+        get_page(request), request.app['dataset'].page_size(PER_PAGE))
+    for article in articles:
+        del article['files']
+    return web.json_response(articles)
+
+
+async def create_article(request):
+    project = get_project(request)
+    if not project:
+        return await not_found()
+    title = json.loads(await request.read())['title']
+    project.add_folder(title)
+    return web.json_response({'entity_id': article_id(project, title),
+                              'location': '{}/account/articles/{}'.format(
+                                  API_URL, article_id(project, title))}, status=201)
+
+
+async def get_article(request):
+    project, folder = find_article(request)
+    if not project:
+        return await not_found()
+    return web.json_response(article_json(request.app, project, folder))
+
+
+async def update_article(request):
+    project, folder = find_article(request)
+    if not project:
+        return await not_found()
+    payload = json.loads(await request.read())
+    if 'tags' in payload:
+        request.app['figshare_article_tags'][article_id(project, folder)] = payload['tags']
+    return web.Response(status=205)
+
+
+async def get_article_files(request):
+    project, folder = find_article(request)
+    if not project:
+        return await not_found()
+    return web.json_response([file_json(project, folder, file)
+                              for file in project.walk(folder)])
+
+
+async def initiate_upload(request):
+    project, folder = find_article(request)
+    if not project:
+        return await not_found()
+    payload = json.loads(await request.read())
+    path = posixpath.join(folder, payload['name'])
+    upload_id = int(resource_hash('figshare', project.id, path)[:8], 16)
+    request.app['figshare_uploads'][upload_id] = {
+        'project': project, 'path': path, 'contents': bytearray(payload['size'])}
+    return web.json_response({'location': '{}/account/articles/{}/files/{}'.format(
+        API_URL, request.match_info['article_id'], upload_id)}, status=201)
+
+
+async def get_file(request):
+    upload = request.app['figshare_uploads'].get(int(request.match_info['file_id']))
+    if upload:
+        return web.json_response({
+            'id': int(request.match_info['file_id']),
+            'name': posixpath.basename(upload['path']),
+            'size': len(upload['contents']),
+            'status': 'created',
+            'upload_url': '{}/{}'.format(UPLOADS_URL, request.match_info['file_id'])})
+
+    project, folder = find_article(request)
+    file = find_file(request, project, folder) if project else None
+    if not file:
+        return await not_found()
+    return web.json_response(file_json(project, folder, file))
+
+
+async def complete_upload(request):
+    upload = request.app['figshare_uploads'].pop(int(request.match_info['file_id']), None)
+    if not upload:
+        return await not_found()
+    upload['project'].add_file(upload['path'], bytes(upload['contents']))
+    return web.Response(status=202)
+
+
+async def delete_file(request):
+    project, folder = find_article(request)
+    file = find_file(request, project, folder) if project else None
+    if not file:
+        return await not_found()
+    project.delete(file.path)
+    return web.Response(status=204)
+
+
+async def get_upload(request):
+    upload = request.app['figshare_uploads'].get(int(request.match_info['file_id']))
+    if not upload:
+        return await not_found()
+    size = len(upload['contents'])
+    parts = [{'partNo': number + 1, 'startOffset': start,
+              'endOffset': min(start + UPLOAD_PART_SIZE, size) - 1, 'status': 'PENDING'}
+             for number, start in enumerate(range(0, max(size, 1), UPLOAD_PART_SIZE))]
+    return web.json_response({'token': request.match_info['file_id'], 'size': size,
+                              'status': 'PENDING', 'parts': parts})
+
+
+async def upload_part(request):
+    upload = request.app['figshare_uploads'].get(int(request.match_info['file_id']))
+    if not upload:
+        return await not_found()
+    start = (int(request.match_info['part_number']) - 1) * UPLOAD_PART_SIZE
+    data = await request.read()
+    upload['contents'][start:start + len(data)] = data
+    return web.Response(status=200)
+
+
+async def download_file(request):
+    for project in request.app['dataset'].projects['figshare'].values():
+        for folder in get_articles_of(project):
+            file = find_file(request, project, folder)
+            if file:
+                return web.Response(body=file.contents)
+    return await not_found()
@@ -0,0 +1,278 @@
+import base64
+import json
+import posixpath
+
+from aiohttp import web
+
+from presqt.targets.utilities.mock_targets.dataset import (
+    MOCK_DATE, MOCK_FULL_NAME, MOCK_INVALID_TOKEN, MOCK_USERNAME)
+from presqt.targets.utilities.mock_targets.helpers import (
+    add_route, get_page, get_query, json_error, paginate)
+
+API_URL = 'https://api.github.com'
+RAW_URL = 'https://raw.githubusercontent.com'
+PER_PAGE = 29
+
+
+def add_routes(app):
+    """
+    Add the routes of the GitHub API and its raw file server.
+    """
+    for method, path, handler in [
+            ('GET', '/github/user', get_user),
+            ('GET', '/github/users/{username}', get_user),
+            ('GET', '/github/user/repos', get_repos),
+            ('POST', '/github/user/repos', create_repo),
+            ('GET', '/github/users/{username}/repos', get_repos),
+            ('GET', '/github/search/repositories', search_repos),
+            ('GET', '/github/repositories/{repo_id}', get_repo),
+            ('PUT', '/github/repositories/{repo_id}/topics', update_topics),
+            ('GET', '/github/repos/{owner}/{repo}', get_repo),
+            ('PATCH', '/github/repos/{owner}/{repo}', update_repo),
+            ('GET', '/github/repos/{owner}/{repo}/contents', get_contents),
+            ('GET', '/github/repos/{owner}/{repo}/contents/{path:.*}', get_contents),
+            ('PUT', '/github/repos/{owner}/{repo}/contents/{path:.*}', put_contents),
+            ('GET', '/github/repos/{owner}/{repo}/git/trees/{branch}', get_tree)]:
+        add_route(app, method, path, authorized(handler))
+    # Blobs of public repositories are fetched without a token
+    add_route(app, 'GET', '/github/repos/{owner}/{repo}/git/blobs/{sha}', get_blob)
+    add_route(app, 'GET', '/github_raw/{owner}/{repo}/{branch}/{path:.*}', download_file)
+
+
+def authorized(handler):
+    """
+    Answer requests without a valid token with a 401.
+    """
+    async def authorized_handler(request):
+        token = request.headers.get('Authorization', '').partition('token ')[2]
+        if not token or token == MOCK_INVALID_TOKEN:
+            return json_error(401, 'Bad credentials')
+        return await handler(request)
+    return authorized_handler
+
+
+def not_found():
+    return json_error(404, 'Not Found')
+
+
+def repo_name(project):
+    return project.title.replace(' ', '-')
+
+
+def get_project(request):
+    """
+    Get the repository in the request's url by its id or its owner and name.
+    """
+    projects = request.app['dataset'].projects['github']
+    if 'repo_id' in request.match_info:
+        return projects.get(request.match_info['repo_id'])
+    if request.match_info['owner'] != MOCK_USERNAME:
+        return None
+    for project in projects.values():
+        if repo_name(project) == request.match_info['repo']:
+            return project
+    return None
+
+
+def git_sha(file):
+    # Files are addressed by their SHA-1, so blobs can be found from the tree entries
+    return file.sha1
+
+
+def repo_json(project):
+    full_name = '{}/{}'.format(MOCK_USERNAME, repo_name(project))
+    repo_url = '{}/repos/{}'.format(API_URL, full_name)
+    return {
+        'id': int(project.id),
+        'name': repo_name(project),
+        'full_name': full_name,
+        'private': False,
+        'owner': {'login': MOCK_USERNAME, 'url': '{}/users/{}'.format(API_URL, MOCK_USERNAME)},
+        'html_url': 'https://github.com/{}'.format(full_name),
+        'svn_url': 'https://github.com/{}'.format(full_name),
+        'url': repo_url,
+        'contents_url': '{}/contents/{{+path}}'.format(repo_url),
+        'trees_url': '{}/git/trees{{/sha}}'.format(repo_url),
+        'description': project.description or None,
+        'topics': project.tags,
+        'license': None,
+        'default_branch': 'master',
+        'created_at': MOCK_DATE,
+        'updated_at': MOCK_DATE
+    }
+
+
+def content_json(project, path):
+    repo_url = '{}/repos/{}/{}'.format(API_URL, MOCK_USERNAME, repo_name(project))
+    entry = {
+        'name': posixpath.basename(path),
+        'path': path,
+        'url': '{}/contents/{}?ref=master'.format(repo_url, path),
+        'html_url': 'https://github.com/{}/{}/tree/master/{}'.format(
+            MOCK_USERNAME, repo_name(project), path),
+    }
+    if path in project.files:
+        entry.update({
+            'type': 'file',
+            'sha': git_sha(project.files[path]),
+            'size': project.files[path].size,
+            'download_url': '{}/{}/{}/master/{}'.format(
+                RAW_URL, MOCK_USERNAME, repo_name(project), path)})
+    else:
+        entry.update({'type': 'dir', 'sha': None, 'size': 0, 'download_url': None})
+    return entry
+
+
+def link_header(url, page, total_pages):
+    """
+    Build the Link header GitHub paginates its listings with.
+    """
+    separator = '&' if '?' in url else '?'
+    links = []
+    if page < total_pages:
+        links.append('<{}{}page={}>; rel="next"'.format(url, separator, page + 1))
+        links.append('<{}{}page={}>; rel="last"'.format(url, separator, total_pages))
+    if page > 1:
+        links.append('<{}{}page={}>; rel="prev"'.format(url, separator, page - 1))
+        links.append('<{}{}page=1>; rel="first"'.format(url, separator))
+    return {'Link': ', '.join(links)} if links else {}
+
+
+async def get_user(request):
+    if request.match_info.get('username', MOCK_USERNAME) != MOCK_USERNAME:
+        return not_found()
+    return web.json_response({
+        'login': MOCK_USERNAME,
+        'name': MOCK_FULL_NAME,
+        'url': '{}/users/{}'.format(API_URL, MOCK_USERNAME),
+        'public_repos': len(request.app['dataset'].projects['github']),
+        'total_private_repos': 0})
+
+
+async def get_repos(request):
+    if request.match_info.get('username', MOCK_USERNAME) != MOCK_USERNAME:
+        return not_found()
+    page = get_page(request)
+    repos, total_pages = paginate(
+        [repo_json(project) for project in request.app['dataset'].projects['github'].values()],
+        page, request.app['dataset'].page_size(PER_PAGE))
+    return web.json_response(repos, headers=link_header(
+        '{}{}'.format(API_URL, request.path.partition('/github')[2]), page, total_pages))
+
+
+async def search_repos(request):
+    search = get_query(request).get('q', '')
+    # Search qualifiers like in:name are ignored
+    query = search.partition(' in:')[0].lower().replace('-', ' ')
+    projects = [project for project in request.app['dataset'].projects['github'].values()
+                if query in project.title.lower() or
+                any(query in tag.lower() for tag in project.tags)]
+    page = get_page(request)
+    items, total_pages = paginate([repo_json(project) for project in projects], page,
+                                  request.app['dataset'].page_size(PER_PAGE))
+    return web.json_response(
+        {'total_count': len(projects), 'incomplete_results': False, 'items': items},
+        headers=link_header('{}/search/repositories?q={}'.format(
+            API_URL, search), page, total_pages))
+
+
+async def create_repo(request):
+    name = json.loads(await request.read())['name']
+    if any(repo_name(project) == name
+           for project in request.app['dataset'].projects['github'].values()):
+        return web.json_response({'message': 'Repository creation failed.', 'errors': [
+            {'message': 'name already exists on this account'}]}, status=422)
+    project = request.app['dataset'].add_project('github', name)
+    return web.json_response(repo_json(project), status=201)
+
+
+async def get_repo(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    return web.json_response(repo_json(project))
+
+
+async def update_repo(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    project.description = json.loads(await request.read()).get('description',
+                                                               project.description)
+    return web.json_response(repo_json(project))
+
+
+async def update_topics(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    project.tags = json.loads(await request.read())['names']
+    return web.json_response({'names': project.tags})
+
+
+async def get_contents(request):
+    project = get_project(request)
+    path = request.match_info.get('path', '').strip('/')
+    if not project:
+        return not_found()
+
+    if path in project.files:
+        entry = content_json(project, path)
+        entry['encoding'] = 'base64'
+        entry['content'] = base64.b64encode(project.files[path].contents).decode('utf-8')
+        return web.json_response(entry)
+    if path and path not in project.folders:
+        return not_found()
+
+    folders, files = project.list_folder(path)
+    return web.json_response([content_json(project, entry)
+                              for entry in folders + [file.path for file in files]])
+
+
+async def put_contents(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    path = request.match_info['path'].strip('/')
+    payload = json.loads(await request.read())
+
+    if path in project.files and payload.get('sha') != git_sha(project.files[path]):
+        return json_error(422, '"sha" wasn\'t supplied.')
+    created = path not in project.files
+    project.add_file(path, base64.b64decode(payload['content']))
+    return web.json_response({'content': content_json(project, path)},
+                             status=201 if created else 200)
+
+
+async def get_tree(request):
+    project = get_project(request)
+    if not project or request.match_info['branch'] != 'master':
+        return not_found()
+    repo_url = '{}/repos/{}/{}'.format(API_URL, MOCK_USERNAME, repo_name(project))
+
+    tree = [{'path': folder, 'type': 'tree', 'sha': None,
+             'url': '{}/git/trees/{}'.format(repo_url, folder)}
+            for folder in sorted(project.folders)]
+    tree.extend({'path': file.path, 'type': 'blob', 'sha': git_sha(file), 'size': file.size,
+                 'url': '{}/git/blobs/{}'.format(repo_url, git_sha(file))}
+                for file in project.walk())
+    return web.json_response({'sha': 'master', 'tree': tree, 'truncated': False})
+
+
+async def get_blob(request):
+    project = get_project(request)
+    if project:
+        for file in project.walk():
+            if git_sha(file) == request.match_info['sha']:
+                return web.json_response({
+                    'sha': git_sha(file), 'size': file.size, 'encoding': 'base64',
+                    'content': base64.b64encode(file.contents).decode('utf-8')})
+    return not_found()
+
+
+async def download_file(request):
+    project = get_project(request)
+    path = request.match_info['path']
+    if not project or path not in project.files:
+        return web.Response(text='404: Not Found', status=404)
+    return web.Response(body=project.files[path].contents)
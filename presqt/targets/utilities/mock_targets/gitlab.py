@@ -0,0 +1,267 @@
+import base64
+import hashlib
+import posixpath
+from urllib.parse import unquote
+
+from aiohttp import web
+
+from presqt.targets.utilities.mock_targets.dataset import (
+    MOCK_DATE, MOCK_FULL_NAME, MOCK_INVALID_TOKEN, MOCK_USERNAME)
+from presqt.targets.utilities.mock_targets.helpers import (
+    add_route, get_page, get_query, json_error, paginate)
+
+API_URL = 'https://gitlab.com/api/v4'
+PER_PAGE = 20
+MOCK_USER_ID = 1
+
+
+def add_routes(app):
+    """
+    Add the routes of the GitLab API.
+    """
+    for method, path, handler in [
+            ('GET', '/gitlab/api/v4/user', get_user),
+            ('GET', '/gitlab/api/v4/users', get_users),
+            ('GET', '/gitlab/api/v4/users/{user_id}/projects', get_projects),
+            ('GET', '/gitlab/api/v4/projects', search_projects),
+            ('POST', '/gitlab/api/v4/projects', create_project),
+            ('GET', '/gitlab/api/v4/projects/{project_id}', get_project_json),
+            ('PUT', '/gitlab/api/v4/projects/{project_id}', update_project),
+            ('DELETE', '/gitlab/api/v4/projects/{project_id}', delete_project),
+            ('GET', '/gitlab/api/v4/projects/{project_id}/repository/tree', get_tree),
+            ('GET', '/gitlab/api/v4/projects/{project_id}/repository/files/{path:[^/]+}',
+             get_file),
+            ('GET', '/gitlab/api/v4/projects/{project_id}/repository/files/{path:[^/]+}/raw',
+             get_raw_file),
+            ('POST', '/gitlab/api/v4/projects/{project_id}/repository/files/{path:[^/]+}',
+             create_file),
+            ('PUT', '/gitlab/api/v4/projects/{project_id}/repository/files/{path:[^/]+}',
+             update_file),
+            ('DELETE', '/gitlab/api/v4/projects/{project_id}/repository/files/{path:[^/]+}',
+             delete_file)]:
+        add_route(app, method, path, authorized(handler))
+
+
+def authorized(handler):
+    """
+    Answer requests without a valid private token with a 401.
+    """
+    async def authorized_handler(request):
+        token = request.headers.get('Private-Token')
+        if not token or token == MOCK_INVALID_TOKEN:
+            return json_error(401, '401 Unauthorized')
+        return await handler(request)
+    return authorized_handler
+
+
+def not_found(resource='Project'):
+    return json_error(404, '404 {} Not Found'.format(resource))
+
+
+def get_project(request):
+    return request.app['dataset'].get_project('gitlab', request.match_info['project_id'])
+
+
+def file_path(request):
+    # File paths are sent with their slashes and dots encoded
+    return unquote(request.match_info['path'])
+
+
+def pagination_headers(page, total_pages, per_page):
+    """
+    Build the headers GitLab paginates its listings with.
+    """
+    return {
+        'X-Page': str(page),
+        'X-Next-Page': str(page + 1) if page < total_pages else '',
+        'X-Prev-Page': str(page - 1) if page > 1 else '',
+        'X-Total-Pages': str(total_pages),
+        'X-Per-Page': str(per_page)}
+
+
+def listing(request, entries):
+    page = get_page(request)
+    per_page = request.app['dataset'].page_size(PER_PAGE)
+    data, total_pages = paginate(entries, page, per_page)
+    return web.json_response(data, headers=pagination_headers(page, total_pages, per_page))
+
+
+def project_json(project):
+    project_url = '{}/projects/{}'.format(API_URL, project.id)
+    return {
+        'id': int(project.id),
+        'name': project.title,
+        'path': project.title.replace(' ', '-').lower(),
+        'description': project.description,
+        'web_url': 'https://gitlab.com/{}/{}'.format(
+            MOCK_USERNAME, project.title.replace(' ', '-').lower()),
+        'created_at': MOCK_DATE,
+        'last_activity_at': MOCK_DATE,
+        'tag_list': project.tags,
+        'owner': {'id': MOCK_USER_ID, 'username': MOCK_USERNAME, 'name': MOCK_FULL_NAME},
+        'marked_for_deletion_at': None,
+        '_links': {'self': project_url}
+    }
+
+
+def file_json(project, path):
+    file = project.files[path]
+    return {
+        'file_name': file.name,
+        'file_path': path,
+        'size': file.size,
+        'encoding': 'base64',
+        'content': base64.b64encode(file.contents).decode('utf-8'),
+        'content_sha256': file.sha256,
+        'ref': 'master',
+        'blob_id': file.sha1,
+        'commit_id': file.sha1,
+        'last_commit_id': file.sha1
+    }
+
+
+def tree_entry(project, path):
+    is_file = path in project.files
+    return {
+        'id': project.files[path].sha1 if is_file else hashlib.sha1(path.encode()).hexdigest(),
+        'name': posixpath.basename(path),
+        'type': 'blob' if is_file else 'tree',
+        'path': path,
+        'mode': '100644' if is_file else '040000'
+    }
+
+
+async def get_user(request):
+    return web.json_response({'id': MOCK_USER_ID, 'username': MOCK_USERNAME,
+                              'name': MOCK_FULL_NAME})
+
+
+async def get_users(request):
+    if get_query(request).get('username') != MOCK_USERNAME:
+        return web.json_response([])
+    return web.json_response([{'id': MOCK_USER_ID, 'username': MOCK_USERNAME,
+                               'name': MOCK_FULL_NAME}])
+
+
+async def get_projects(request):
+    if request.match_info['user_id'] != str(MOCK_USER_ID):
+        return not_found('User')
+    return listing(request, [project_json(project) for project in
+                             request.app['dataset'].projects['gitlab'].values()])
+
+
+async def search_projects(request):
+    search = get_query(request).get('search', '').lower()
+    return listing(request, [project_json(project) for project in
+                             request.app['dataset'].projects['gitlab'].values()
+                             if search in project.title.lower()])
+
+
+async def create_project(request):
+    name = get_query(request).get('name') or (await request.post()).get('name')
+    if any(project.title == name
+           for project in request.app['dataset'].projects['gitlab'].values()):
+        return json_error(400, {'name': ['has already been taken']})
+    project = request.app['dataset'].add_project('gitlab', name)
+    return web.json_response(project_json(project), status=201)
+
+
+async def get_project_json(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    return web.json_response(project_json(project))
+
+
+async def update_project(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    query = get_query(request)
+    if 'tag_list' in query:
+        project.tags = [tag for tag in query['tag_list'].split(',') if tag]
+    project.description = query.get('description', project.description)
+    return web.json_response(project_json(project))
+
+
+async def delete_project(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    del request.app['dataset'].projects['gitlab'][str(project.id)]
+    return web.json_response({'message': '202 Accepted'}, status=202)
+
+
+async def get_tree(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    query = get_query(request)
+    path = query.get('path', '').strip('/')
+    if path and path not in project.folders:
+        # GitLab answers with an empty tree for folders that don't exist
+        return listing(request, [])
+
+    if query.get('recursive') in ['1', 'true']:
+        entries = sorted(folder for folder in project.folders
+                         if not path or folder.startswith(path + '/'))
+        entries.extend(file.path for file in project.walk(path))
+    else:
+        folders, files = project.list_folder(path)
+        entries = folders + [file.path for file in files]
+    return listing(request, [tree_entry(project, entry) for entry in entries])
+
+
+async def get_file(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    path = file_path(request)
+    if path not in project.files:
+        return not_found('File')
+    return web.json_response(file_json(project, path))
+
+
+async def get_raw_file(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    path = file_path(request)
+    if path not in project.files:
+        return not_found('File')
+    return web.Response(body=project.files[path].contents)
+
+
+async def create_file(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    path = file_path(request)
+    if path in project.files:
+        return json_error(400, 'A file with this name already exists')
+    payload = await request.post()
+    project.add_file(path, base64.b64decode(payload['content']))
+    return web.json_response({'file_path': path, 'branch': 'master'}, status=201)
+
+
+async def update_file(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    path = file_path(request)
+    if path not in project.files:
+        return json_error(400, 'A file with this name doesn\'t exist')
+    payload = await request.post()
+    project.add_file(path, base64.b64decode(payload['content']))
+    return web.json_response({'file_path': path, 'branch': 'master'})
+
+
+async def delete_file(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    path = file_path(request)
+    if path not in project.files:
+        return not_found('File')
+    project.delete(path)
+    return web.Response(status=204)
@@ -0,0 +1,72 @@
+import math
+from urllib.parse import parse_qsl, urlsplit
+
+from aiohttp import web
+from multidict import MultiDict
+
+
+def add_route(app, method, path, handler):
+    """
+    Add a route that matches its path with and without a trailing slash. The adapters aren't
+    consistent about trailing slashes and redirecting them would add requests to benchmarks.
+
+    Parameters
+    ----------
+    app : aiohttp.web.Application
+        The mock target server application.
+    method : str
+        The HTTP method of the route.
+    path : str
+        The path of the route.
+    handler : coroutine function
+        The handler of the route.
+    """
+    path = path.rstrip('/')
+    app.router.add_route(method, path, handler)
+    app.router.add_route(method, path + '/', handler)
+
+
+def get_query(request):
+    """
+    Get the query string parameters of a request. They are parsed from the raw path because some
+    versions of yarl encode the query string of aiohttp server requests twice.
+    """
+    return MultiDict(parse_qsl(urlsplit(request.raw_path).query, keep_blank_values=True))
+
+
+def get_page(request):
+    """
+    Get the page number requested in the query string. Pages start at 1.
+    """
+    try:
+        return max(int(get_query(request).get('page', 1)), 1)
+    except ValueError:
+        return 1
+
+
+def paginate(items, page, per_page):
+    """
+    Get one page of a listing.
+
+    Parameters
+    ----------
+    items : list
+        Every entry of the listing.
+    page : int
+        The page to get. Pages start at 1.
+    per_page : int
+        Number of entries in each page.
+
+    Returns
+    -------
+    The entries of the page and the total number of pages.
+    """
+    total_pages = max(math.ceil(len(items) / per_page), 1)
+    return items[(page - 1) * per_page:page * per_page], total_pages
+
+
+def json_error(status, message, **kwargs):
+    """
+    Build a JSON error response in the {"message": "..."} format most targets use.
+    """
+    return web.json_response({'message': message}, status=status, **kwargs)
@@ -0,0 +1,364 @@
+import json
+import posixpath
+
+from aiohttp import web
+
+from presqt.targets.utilities.mock_targets.dataset import (
+    MOCK_DATE, MOCK_FULL_NAME, MOCK_INVALID_TOKEN, MOCK_USERNAME, resource_hash)
+from presqt.targets.utilities.mock_targets.helpers import add_route, get_page, get_query, paginate
+
+API_URL = 'https://api.osf.io/v2'
+FILES_URL = 'https://files.osf.io/v1/resources'
+PER_PAGE = 10
+PROVIDER = 'osfstorage'
+
+
+def add_routes(app):
+    """
+    Add the routes of the OSF API and its WaterButler file server.
+    """
+    # Ids of the files and folders in every project, by resource id
+    app['osf_resources'] = {}
+    for project in app['dataset'].projects['osf'].values():
+        for path in list(project.files) + list(project.folders):
+            resource_id(app, project, path)
+
+    for method, path, handler in [
+            ('GET', '/osf/v2/users/me', get_me),
+            ('GET', '/osf/v2/users', get_users),
+            ('GET', '/osf/v2/users/{user_id}/nodes', get_nodes),
+            ('GET', '/osf/v2/nodes', get_nodes),
+            ('POST', '/osf/v2/nodes', create_node),
+            ('GET', '/osf/v2/nodes/{node_id}', get_node),
+            ('PATCH', '/osf/v2/nodes/{node_id}', update_node),
+            ('GET', '/osf/v2/nodes/{node_id}/children', get_children),
+            ('GET', '/osf/v2/nodes/{node_id}/identifiers', get_children),
+            ('GET', '/osf/v2/nodes/{node_id}/citation', get_citation),
+            ('GET', '/osf/v2/nodes/{node_id}/files', get_storages),
+            ('GET', '/osf/v2/nodes/{node_id}/files/{provider}', get_folder_files),
+            ('GET', '/osf/v2/nodes/{node_id}/files/{provider}/{resource_id}', get_folder_files),
+            ('GET', '/osf/v2/files/{resource_id}', get_file),
+            ('PATCH', '/osf/v2/files/{resource_id}', update_file),
+            ('GET', '/osf_files/v1/resources/{node_id}/providers/{provider}/{resource_id}',
+             download_file),
+            ('PUT', '/osf_files/v1/resources/{node_id}/providers/{provider}', upload),
+            ('PUT', '/osf_files/v1/resources/{node_id}/providers/{provider}/{resource_id}',
+             upload),
+            ('POST', '/osf_files/v1/resources/{node_id}/providers/{provider}/{resource_id}',
+             rename),
+            ('DELETE', '/osf_files/v1/resources/{node_id}/providers/{provider}/{resource_id}',
+             delete)]:
+        add_route(app, method, path, authorized(handler))
+
+
+def authorized(handler):
+    """
+    Answer requests without a valid bearer token with a 401.
+    """
+    async def authorized_handler(request):
+        token = request.headers.get('Authorization', '').partition('Bearer ')[2]
+        if not token or token == MOCK_INVALID_TOKEN:
+            return web.json_response(
+                {'errors': [{'detail': 'User provided an invalid OAuth2 access token'}]},
+                status=401)
+        return await handler(request)
+    return authorized_handler
+
+
+def not_found():
+    return web.json_response({'errors': [{'detail': 'Not found.'}]}, status=404)
+
+
+def resource_id(app, project, path):
+    """
+    Get the id of a file or folder and remember which one it belongs to.
+    """
+    osf_id = resource_hash('osf', project.id, path)[:24]
+    app['osf_resources'][osf_id] = (project.id, path)
+    return osf_id
+
+
+def get_resource(request, project=None):
+    """
+    Get the project and path of the file or folder in the request's url. Storages are the
+    top of their project, ''.
+
+    Returns
+    -------
+    The MockProject and path of the resource, or None and None if it doesn't exist.
+    """
+    if 'resource_id' not in request.match_info:
+        return project, ''
+
+    project_id, path = request.app['osf_resources'].get(
+        request.match_info['resource_id'], (None, None))
+    project = request.app['dataset'].get_project('osf', project_id)
+    if project and (path in project.files or path in project.folders):
+        return project, path
+    return None, None
+
+
+def listing(request, url, entries):
+    """
+    Build one page of a listing in the format of the OSF API.
+    """
+    page = get_page(request)
+    per_page = request.app['dataset'].page_size(PER_PAGE)
+    data, total_pages = paginate(entries, page, per_page)
+
+    query_string = '&'.join('{}={}'.format(key, value)
+                            for key, value in get_query(request).items() if key != 'page')
+    base_url = '{}?{}&page='.format(url, query_string) if query_string else '{}?page='.format(url)
+    return web.json_response({
+        'data': data,
+        'links': {
+            'first': None if page == 1 else '{}1'.format(base_url),
+            'last': None if page >= total_pages else '{}{}'.format(base_url, total_pages),
+            'prev': None if page == 1 else '{}{}'.format(base_url, page - 1),
+            'next': None if page >= total_pages else '{}{}'.format(base_url, page + 1),
+            'meta': {'total': len(entries), 'per_page': per_page}}})
+
+
+def user_json():
+    return {
+        'id': MOCK_USERNAME,
+        'type': 'users',
+        'attributes': {'full_name': MOCK_FULL_NAME, 'given_name': MOCK_FULL_NAME.split(' ')[0],
+                       'family_name': MOCK_FULL_NAME.partition(' ')[2]},
+        'relationships': {'nodes': {'links': {'related': {
+            'href': '{}/users/{}/nodes/'.format(API_URL, MOCK_USERNAME)}}}},
+        'links': {'self': '{}/users/{}/'.format(API_URL, MOCK_USERNAME)}
+    }
+
+
+def node_json(project):
+    node_url = '{}/nodes/{}/'.format(API_URL, project.id)
+    return {
+        'id': project.id,
+        'type': 'nodes',
+        'attributes': {
+            'title': project.title, 'description': project.description, 'category': 'project',
+            'fork': False, 'current_user_is_contributor': True, 'preprint': False,
+            'current_user_permissions': ['read', 'write', 'admin'], 'custom_citation': None,
+            'date_created': MOCK_DATE, 'date_modified': MOCK_DATE, 'collection': False,
+            'public': True, 'subjects': [], 'registration': False,
+            'current_user_can_comment': True, 'node_license': None, 'wiki_enabled': True,
+            'tags': project.tags},
+        'relationships': {
+            'files': {'links': {'related': {'href': '{}files/'.format(node_url)}}},
+            'children': {'links': {'related': {'href': '{}children/'.format(node_url)}}}},
+        'links': {'self': node_url, 'html': 'https://osf.io/{}/'.format(project.id)}
+    }
+
+
+def storage_json(project):
+    waterbutler_url = '{}/{}/providers/{}/'.format(FILES_URL, project.id, PROVIDER)
+    return {
+        'id': '{}:{}'.format(project.id, PROVIDER),
+        'type': 'files',
+        'attributes': {'kind': 'folder', 'name': PROVIDER, 'path': '/', 'node': project.id,
+                       'provider': PROVIDER},
+        'relationships': {'files': {'links': {'related': {
+            'href': '{}/nodes/{}/files/{}/'.format(API_URL, project.id, PROVIDER)}}}},
+        'links': {'upload': waterbutler_url,
+                  'new_folder': '{}?kind=folder'.format(waterbutler_url)}
+    }
+
+
+def file_json(app, project, path):
+    osf_id = resource_id(app, project, path)
+    is_file = path in project.files
+    waterbutler_url = '{}/{}/providers/{}/{}'.format(FILES_URL, project.id, PROVIDER, osf_id)
+    if not is_file:
+        waterbutler_url += '/'
+
+    entry = {
+        'id': osf_id,
+        'type': 'files',
+        'attributes': {
+            'kind': 'file' if is_file else 'folder',
+            'name': posixpath.basename(path),
+            'materialized_path': '/{}'.format(path) if is_file else '/{}/'.format(path),
+            'path': '/{}'.format(osf_id) if is_file else '/{}/'.format(osf_id),
+            'provider': PROVIDER, 'last_touched': None, 'date_created': MOCK_DATE,
+            'date_modified': MOCK_DATE, 'current_version': 1, 'current_user_can_comment': True,
+            'guid': None, 'checkout': None,
+            'tags': project.files[path].tags if is_file else [],
+            'size': project.files[path].size if is_file else None,
+            'extra': {'hashes': {'md5': project.files[path].md5,
+                                 'sha256': project.files[path].sha256} if is_file else {}}},
+        'relationships': {
+            'node': {'data': {'id': project.id, 'type': 'nodes'}},
+            'target': {'links': {'related': {'href': '{}/nodes/{}/'.format(API_URL, project.id),
+                                             'meta': {'type': 'node'}}}}},
+        'links': {'self': '{}/files/{}/'.format(API_URL, osf_id), 'move': waterbutler_url,
+                  'upload': waterbutler_url, 'delete': waterbutler_url,
+                  'download': waterbutler_url}
+    }
+    if not is_file:
+        files_url = '{}/nodes/{}/files/{}/{}/'.format(API_URL, project.id, PROVIDER, osf_id)
+        entry['relationships']['files'] = {'links': {'related': {'href': files_url}}}
+        entry['links']['new_folder'] = '{}?kind=folder'.format(waterbutler_url)
+    return entry
+
+
+def get_project(request):
+    return request.app['dataset'].get_project('osf', request.match_info['node_id'])
+
+
+async def get_me(request):
+    return web.json_response({'data': user_json()})
+
+
+async def get_users(request):
+    full_name = get_query(request).get('filter[full_name]', '').lower()
+    users = [user_json()] if full_name in MOCK_FULL_NAME.lower() else []
+    return listing(request, '{}/users/'.format(API_URL), users)
+
+
+async def get_nodes(request):
+    projects = list(request.app['dataset'].projects['osf'].values())
+    if 'user_id' in request.match_info:
+        if request.match_info['user_id'] not in ['me', MOCK_USERNAME]:
+            return listing(request, '{}/users/{}/nodes/'.format(
+                API_URL, request.match_info['user_id']), [])
+        url = '{}/users/{}/nodes/'.format(API_URL, request.match_info['user_id'])
+    else:
+        url = '{}/nodes/'.format(API_URL)
+
+    query = get_query(request)
+    title = query.get('filter[title]')
+    if title:
+        projects = [project for project in projects if title.lower() in project.title.lower()]
+    if 'filter[id]' in query:
+        projects = [project for project in projects if project.id == query['filter[id]']]
+    tag = query.get('filter[tags][icontains]')
+    if tag:
+        projects = [project for project in projects
+                    if any(tag.lower() in project_tag.lower() for project_tag in project.tags)]
+    return listing(request, url, [node_json(project) for project in projects])
+
+
+async def create_node(request):
+    attributes = json.loads(await request.read())['data']['attributes']
+    project = request.app['dataset'].add_project('osf', attributes['title'])
+    return web.json_response({'data': node_json(project)}, status=201)
+
+
+async def get_node(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    return web.json_response({'data': node_json(project)})
+
+
+async def update_node(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    attributes = json.loads(await request.read())['data']['attributes']
+    project.tags = attributes.get('tags', project.tags)
+    project.description = attributes.get('description', project.description)
+    return web.json_response({'data': node_json(project)})
+
+
+async def get_children(request):
+    # Mock projects don't have subprojects or identifiers
+    if not get_project(request):
+        return not_found()
+    return listing(request, '{}/nodes/{}/{}/'.format(
+        API_URL, request.match_info['node_id'], request.path.rstrip('/').rpartition('/')[2]), [])
+
+
+async def get_citation(request):
+    if not get_project(request):
+        return not_found()
+    return web.json_response({'data': {'attributes': {'author': [{
+        'given': MOCK_FULL_NAME.split(' ')[0], 'family': MOCK_FULL_NAME.partition(' ')[2]}]}}})
+
+
+async def get_storages(request):
+    project = get_project(request)
+    if not project:
+        return not_found()
+    return listing(request, '{}/nodes/{}/files/'.format(API_URL, project.id),
+                   [storage_json(project)])
+
+
+async def get_folder_files(request):
+    project, path = get_resource(request, get_project(request))
+    if not project or request.match_info['provider'] != PROVIDER or path in project.files:
+        return not_found()
+
+    folders, files = project.list_folder(path)
+    url = '{}/nodes/{}/files/{}/'.format(API_URL, project.id, PROVIDER)
+    if path:
+        url = '{}{}/'.format(url, request.match_info['resource_id'])
+    return listing(request, url, [file_json(request.app, project, entry) for entry in
+                                  folders + [file.path for file in files]])
+
+
+async def get_file(request):
+    project, path = get_resource(request)
+    if not project:
+        return not_found()
+    return web.json_response({'data': file_json(request.app, project, path)})
+
+
+async def update_file(request):
+    project, path = get_resource(request)
+    if not project or path not in project.files:
+        return not_found()
+    attributes = json.loads(await request.read())['data']['attributes']
+    project.files[path].tags = attributes.get('tags', project.files[path].tags)
+    return web.json_response({'data': file_json(request.app, project, path)})
+
+
+async def download_file(request):
+    project, path = get_resource(request)
+    if not project or path not in project.files:
+        return not_found()
+    return web.Response(body=project.files[path].contents)
+
+
+async def upload(request):
+    """
+    Create a file or folder in a folder, or update a file. Like WaterButler, creating a file or
+    folder that already exists is a 409.
+    """
+    project, path = get_resource(request, get_project(request))
+    if not project:
+        return not_found()
+    contents = await request.read()
+
+    if path in project.files:
+        project.add_file(path, contents)
+        return web.json_response({'data': file_json(request.app, project, path)})
+
+    query = get_query(request)
+    new_path = posixpath.join(path, query.get('name', ''))
+    if new_path in project.files or new_path in project.folders:
+        return web.json_response({'message': 'Conflict'}, status=409)
+    if query.get('kind') == 'folder':
+        project.add_folder(new_path)
+    else:
+        project.add_file(new_path, contents)
+    return web.json_response({'data': file_json(request.app, project, new_path)}, status=201)
+
+
+async def rename(request):
+    project, path = get_resource(request)
+    if not project:
+        return not_found()
+    payload = json.loads(await request.read())
+    new_path = posixpath.join(posixpath.dirname(path), payload['rename'])
+    project.rename(path, new_path)
+    return web.json_response({'data': file_json(request.app, project, new_path)}, status=201)
+
+
+async def delete(request):
+    project, path = get_resource(request)
+    if not project:
+        return not_found()
+    project.delete(path)
+    return web.Response(status=204)
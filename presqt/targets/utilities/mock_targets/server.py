@@ -0,0 +1,146 @@
+import asyncio
+import collections
+import socket
+import threading
+import time
+
+from aiohttp import web
+
+from presqt.targets.utilities.mock_targets import (curate_nd, figshare, github, gitlab, osf,
+                                                   zenodo)
+from presqt.targets.utilities.mock_targets.dataset import MockDataset
+from presqt.targets.utilities.mock_targets.helpers import json_error
+
+# Modules that add the routes of each mock target
+MOCK_TARGET_ROUTES = [osf, github, gitlab, zenodo, figshare, curate_nd]
+
+
+@web.middleware
+async def count_middleware(request, handler):
+    """
+    Count the requests made to each target, including the ones answered with a 429.
+    """
+    request.app['request_counts'][request.path.split('/')[1]] += 1
+    return await handler(request)
+
+
+@web.middleware
+async def throttle_middleware(request, handler):
+    """
+    Delay every response by the server's latency and answer with a 429 once a target has had
+    more requests in the last second than the server's rate limit.
+    """
+    rate_limit = request.app['rate_limit']
+    if rate_limit:
+        # Each target is limited separately, like the live targets are
+        target = request.path.split('/')[1]
+        now = time.monotonic()
+        requests_made = [request_time for request_time in request.app['requests_made'].get(
+            target, []) if now - request_time < 1]
+        if len(requests_made) >= rate_limit:
+            request.app['requests_made'][target] = requests_made
+            return json_error(429, 'API rate limit exceeded.', headers={'Retry-After': '1'})
+        requests_made.append(now)
+        request.app['requests_made'][target] = requests_made
+
+    if request.app['latency']:
+        await asyncio.sleep(request.app['latency'])
+    return await handler(request)
+
+
+def create_mock_targets_app(shape=None, latency=0, rate_limit=0):
+    """
+    Create the application of a server that emulates the parts of the target APIs PresQT uses.
+    Each target is served under its prefix in TARGET_HOSTS.
+
+    Parameters
+    ----------
+    shape : dict
+        The shape of the dataset the targets are filled with. Missing keys use the values in
+        DEFAULT_DATASET_SHAPE.
+    latency : float
+        Number of seconds every response is delayed by.
+    rate_limit : int
+        Number of requests each target answers each second. 0 means there is no limit.
+
+    Returns
+    -------
+    The aiohttp application.
+    """
+    app = web.Application(
+        client_max_size=1024 ** 3,
+        middlewares=[count_middleware,
+                     throttle_middleware,
+                     # GitLab urls are sometimes built with double slashes
+                     web.normalize_path_middleware(redirect_class=web.HTTPPermanentRedirect)])
+    app['dataset'] = MockDataset(shape)
+    app['latency'] = latency
+    app['rate_limit'] = rate_limit
+    app['requests_made'] = {}
+    app['request_counts'] = collections.Counter()
+
+    for target_routes in MOCK_TARGET_ROUTES:
+        target_routes.add_routes(app)
+    return app
+
+
+class MockTargetsServer(object):
+    """
+    Run a mock target server in a background thread. Used by tests and benchmarks.
+
+    with MockTargetsServer(latency=0.05) as server:
+        install_target_url_override(server.url)
+    """
+    def __init__(self, shape=None, latency=0, rate_limit=0, host='127.0.0.1', port=0):
+        self.app = create_mock_targets_app(shape, latency, rate_limit)
+        self.host = host
+        self.port = port
+        self.url = None
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    @property
+    def dataset(self):
+        return self.app['dataset']
+
+    @property
+    def request_counts(self):
+        """
+        The number of requests each target has been sent, by target prefix.
+        """
+        return dict(self.app['request_counts'])
+
+    def start(self):
+        """
+        Start serving and return once the server accepts connections.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+        self.url = 'http://{}:{}'.format(self.host, self.port)
+
+        self._loop = asyncio.new_event_loop()
+        self._runner = web.AppRunner(self.app, access_log=None)
+        self._loop.run_until_complete(self._runner.setup())
+        self._loop.run_until_complete(web.SockSite(self._runner, sock).start())
+
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and close the server's event loop.
+        """
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
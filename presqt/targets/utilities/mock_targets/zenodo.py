@@ -0,0 +1,197 @@
+import json
+import uuid
+
+from aiohttp import web
+
+from presqt.targets.utilities.mock_targets.dataset import (
+    MOCK_DATE, MOCK_FULL_NAME, MOCK_INVALID_TOKEN, resource_hash)
+from presqt.targets.utilities.mock_targets.helpers import (
+    add_route, get_page, get_query, json_error, paginate)
+
+API_URL = 'https://zenodo.org/api'
+PER_PAGE = 10
+MOCK_OWNER_ID = 1
+
+
+def add_routes(app):
+    """
+    Add the routes of the Zenodo deposit API. The mock only has unpublished depositions, so
+    records are never found.
+    """
+    for method, path, handler in [
+            ('GET', '/zenodo/api/deposit/depositions', get_depositions),
+            ('POST', '/zenodo/api/deposit/depositions', create_deposition),
+            ('GET', '/zenodo/api/deposit/depositions/{deposition_id}', get_deposition),
+            ('PUT', '/zenodo/api/deposit/depositions/{deposition_id}', update_deposition),
+            ('GET', '/zenodo/api/deposit/depositions/{deposition_id}/files', get_files),
+            ('POST', '/zenodo/api/deposit/depositions/{deposition_id}/files', create_file),
+            ('GET', '/zenodo/api/deposit/depositions/{deposition_id}/files/{file_id}', get_file),
+            ('DELETE', '/zenodo/api/deposit/depositions/{deposition_id}/files/{file_id}',
+             delete_file),
+            ('GET', '/zenodo/api/files/{bucket}/{filename}', download_file),
+            ('GET', '/zenodo/api/records', search_records),
+            ('GET', '/zenodo/api/records/{record_id}', not_found),
+            ('GET', '/zenodo/api/files/{bucket}', not_found),
+            ('GET', '/zenodo/api/licenses', get_licenses)]:
+        add_route(app, method, path, authorized(handler))
+
+
+def authorized(handler):
+    """
+    Answer requests without a valid access token with a 401.
+    """
+    async def authorized_handler(request):
+        token = get_query(request).get('access_token')
+        if not token or token == MOCK_INVALID_TOKEN:
+            return json_error(401, 'The server could not verify that you are authorized to '
+                                   'access the URL requested.')
+        return await handler(request)
+    return authorized_handler
+
+
+async def not_found(request=None):
+    return json_error(404, 'The requested URL was not found on the server.')
+
+
+def get_project(request):
+    return request.app['dataset'].get_project('zenodo', request.match_info['deposition_id'])
+
+
+def file_id(project, file):
+    # File ids are UUIDs, which are longer than the deposition ids the adapter tells them apart by
+    return str(uuid.UUID(resource_hash('zenodo', project.id, file.path)))
+
+
+def file_name(file):
+    # Depositions don't have folders
+    return file.path.replace('/', '_')
+
+
+def find_file(project, request):
+    for file in project.walk():
+        if file_id(project, file) == request.match_info['file_id']:
+            return file
+    return None
+
+
+def file_json(project, file):
+    deposition_url = '{}/deposit/depositions/{}'.format(API_URL, project.id)
+    return {
+        'id': file_id(project, file),
+        'filename': file_name(file),
+        'filesize': file.size,
+        'checksum': file.md5,
+        'links': {
+            'self': '{}/files/{}'.format(deposition_url, file_id(project, file)),
+            'download': '{}/files/{}/{}'.format(API_URL, project.id, file_name(file))}
+    }
+
+
+def deposition_json(project):
+    deposition_url = '{}/deposit/depositions/{}'.format(API_URL, project.id)
+    return {
+        'id': int(project.id),
+        'title': project.title,
+        'owner': MOCK_OWNER_ID,
+        'state': 'unsubmitted',
+        'submitted': False,
+        'created': MOCK_DATE,
+        'modified': MOCK_DATE,
+        'metadata': {
+            'title': project.title,
+            'upload_type': 'dataset',
+            'description': project.description,
+            'creators': [{'name': '{}, {}'.format(*reversed(MOCK_FULL_NAME.split(' ', 1)))}],
+            'publication_date': MOCK_DATE[:10],
+            'license': 'CC-BY-4.0',
+            'keywords': project.tags,
+            'prereserve_doi': {'doi': '10.5281/zenodo.{}'.format(project.id),
+                               'recid': int(project.id)}},
+        'files': [file_json(project, file) for file in project.walk()],
+        'links': {'self': deposition_url, 'files': '{}/files'.format(deposition_url)}
+    }
+
+
+async def get_depositions(request):
+    page = get_page(request)
+    depositions, _ = paginate(
+        [deposition_json(project) for project in
+         request.app['dataset'].projects['zenodo'].values()],
+        page, request.app['dataset'].page_size(PER_PAGE))
+    return web.json_response(depositions)
+
+
+async def create_deposition(request):
+    project = request.app['dataset'].add_project('zenodo', '')
+    return web.json_response(deposition_json(project), status=201)
+
+
+async def get_deposition(request):
+    project = get_project(request)
+    if not project:
+        return await not_found()
+    return web.json_response(deposition_json(project))
+
+
+async def update_deposition(request):
+    project = get_project(request)
+    if not project:
+        return await not_found()
+    metadata = json.loads(await request.read())['metadata']
+    project.title = metadata.get('title', project.title)
+    project.description = metadata.get('description', project.description)
+    project.tags = metadata.get('keywords', project.tags)
+    return web.json_response(deposition_json(project))
+
+
+async def get_files(request):
+    project = get_project(request)
+    if not project:
+        return await not_found()
+    return web.json_response([file_json(project, file) for file in project.walk()])
+
+
+async def create_file(request):
+    project = get_project(request)
+    if not project:
+        return await not_found()
+    payload = await request.post()
+    name = payload['name']
+    if name in [file_name(file) for file in project.walk()]:
+        return json_error(400, 'Filename already exists.')
+    file = project.add_file(name, payload['file'].file.read())
+    return web.json_response(file_json(project, file), status=201)
+
+
+async def get_file(request):
+    project = get_project(request)
+    file = find_file(project, request) if project else None
+    if not file:
+        return await not_found()
+    return web.json_response(file_json(project, file))
+
+
+async def delete_file(request):
+    project = get_project(request)
+    file = find_file(project, request) if project else None
+    if not file:
+        return await not_found()
+    project.delete(file.path)
+    return web.Response(status=204)
+
+
+async def download_file(request):
+    project = request.app['dataset'].get_project('zenodo', request.match_info['bucket'])
+    if project:
+        for file in project.walk():
+            if file_name(file) == request.match_info['filename']:
+                return web.Response(body=file.contents)
+    return await not_found()
+
+
+async def search_records(request):
+    return web.json_response({'hits': {'hits': [], 'total': 0}, 'links': {}})
+
+
+async def get_licenses(request):
+    return web.json_response({'hits': {'hits': [], 'total': 0}})
@@ -22,15 +22,14 @@ def shared_get_success_function_202(test_case_instance):
     -------
     Fixity JSON from the fixity_info.json file
     """
-    from presqt.api_v1.utilities.utils.hash_tokens import hash_tokens
     url = reverse('resource', kwargs={'target_name': test_case_instance.target_name,
                                       'resource_id': test_case_instance.resource_id,
                                       'resource_format': 'zip'})
     response = test_case_instance.client.get(url, **test_case_instance.header)
     # Verify the status code and content
     test_case_instance.assertEqual(response.status_code, 202)
-    ticket_number = hash_tokens(test_case_instance.token)
-    ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
+    test_case_instance.ticket_number = response.data['job_id']
+    ticket_path = 'mediafiles/jobs/{}'.format(test_case_instance.ticket_number)
 
     # Verify process_info file status is 'in_progress' initially
     process_info = read_file('{}/process_info.json'.format(ticket_path), True)
@@ -80,7 +79,6 @@ def shared_get_success_function_202_with_error(test_case_instance):
     test_case_instance : instance
         instance of a test case
     """
-    from presqt.api_v1.utilities.utils.hash_tokens import hash_tokens
     url = reverse('resource', kwargs={'target_name': test_case_instance.target_name,
                                       'resource_id': test_case_instance.resource_id,
                                       'resource_format': 'zip'})
@@ -90,19 +88,18 @@ def shared_get_success_function_202_with_error(test_case_instance):
     test_case_instance.assertEqual(response.status_code, 202)
     test_case_instance.assertEqual(
         response.data['message'], 'The server is processing the request.')
-    ticket_number = hash_tokens(test_case_instance.token)
-    ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
+    test_case_instance.ticket_number = response.data['job_id']
+    ticket_path = 'mediafiles/jobs/{}'.format(test_case_instance.ticket_number)
 
     # Verify process_info file status is 'in_progress' initially
-    process_info = read_file('mediafiles/jobs/{}/process_info.json'.format(ticket_number), True)
+    process_info = read_file('{}/process_info.json'.format(ticket_path), True)
     test_case_instance.assertEqual(process_info['resource_download']['status'], 'in_progress')
 
     # Wait until the spawned off process finishes in the background
     # to do validation on the resulting files
     while process_info['resource_download']['status'] == 'in_progress':
         try:
-            process_info = read_file(
-                'mediafiles/jobs/{}/process_info.json'.format(ticket_number), True)
+            process_info = read_file('{}/process_info.json'.format(ticket_path), True)
         except json.decoder.JSONDecodeError:
             # Pass while the process_info file is being written to
             pass
@@ -134,16 +131,15 @@ def shared_call_get_resource_zip(test_case_instance, resource_id):
     resource_id : str
         The id of the resource to be downloaded
     """
-    from presqt.api_v1.utilities.utils.hash_tokens import hash_tokens
     url = reverse('resource', kwargs={'target_name': test_case_instance.target_name,
                                       'resource_id': resource_id,
                                       'resource_format': 'zip'})
     response = test_case_instance.client.get(url, **test_case_instance.header)
-    test_case_instance.ticket_number = hash_tokens(test_case_instance.token)
     # Verify the status code
     test_case_instance.assertEqual(response.status_code, 202)
+    test_case_instance.ticket_number = response.data['job_id']
     test_case_instance.process_info_path = 'mediafiles/jobs/{}/process_info.json'.format(
-        hash_tokens(test_case_instance.token))
+        test_case_instance.ticket_number)
     process_info = read_file(test_case_instance.process_info_path, True)
 
     # Save initial process data that we can use to rewrite to the process_info file for testing
@@ -20,11 +20,10 @@ def shared_upload_function_osf(test_case_instance):
     response = test_case_instance.client.post(test_case_instance.url, {
         'presqt-file': open(test_case_instance.file, 'rb')}, **test_case_instance.headers)
 
-    test_case_instance.ticket_path = 'mediafiles/jobs/{}'.format(test_case_instance.ticket_number)
-
-
     # Verify status code and message
     test_case_instance.assertEqual(response.status_code, 202)
+    test_case_instance.ticket_number = response.data['job_id']
+    test_case_instance.ticket_path = 'mediafiles/jobs/{}'.format(test_case_instance.ticket_number)
 
     test_case_instance.assertEqual(
         response.data['message'], 'The server is processing the request.')
@@ -55,10 +54,10 @@ def shared_upload_function_github(test_case_instance):
     response = test_case_instance.client.post(test_case_instance.url, {'presqt-file': open(
         test_case_instance.file, 'rb')}, **test_case_instance.headers)
 
-    test_case_instance.ticket_path = 'mediafiles/jobs/{}'.format(test_case_instance.ticket_number)
-
     # Verify status code and message
     test_case_instance.assertEqual(response.status_code, 202)
+    test_case_instance.ticket_number = response.data['job_id']
+    test_case_instance.ticket_path = 'mediafiles/jobs/{}'.format(test_case_instance.ticket_number)
     test_case_instance.assertEqual(
         response.data['message'], 'The server is processing the request.')
 
@@ -91,10 +90,10 @@ def shared_upload_function_gitlab(test_case_instance):
     response = test_case_instance.client.post(test_case_instance.url, {'presqt-file': open(
         test_case_instance.file, 'rb')}, **test_case_instance.headers)
 
-    test_case_instance.ticket_path = 'mediafiles/jobs/{}'.format(test_case_instance.ticket_number)
-
     # Verify status code and message
     test_case_instance.assertEqual(response.status_code, 202)
+    test_case_instance.ticket_number = response.data['job_id']
+    test_case_instance.ticket_path = 'mediafiles/jobs/{}'.format(test_case_instance.ticket_number)
     test_case_instance.assertEqual(
         response.data['message'], 'The server is processing the request.')
 
@@ -0,0 +1,178 @@
+import re
+from urllib.parse import urlsplit
+
+from presqt.targets.utilities.utils import target_urls
+
+# The target each TARGET_HOSTS prefix belongs to, where it isn't the prefix itself
+PREFIX_TARGETS = {
+    'osf_files': 'osf',
+    'github_raw': 'github',
+    'figshare_downloads': 'figshare',
+    'figshare_uploads': 'figshare'
+}
+
+# The endpoints requested on each target host. Ids and paths in a request's url are replaced
+# by the {names} of the endpoint it matches, so requests can be counted by endpoint without a
+# new count for every resource. {name:.*} matches several path segments.
+ENDPOINT_TEMPLATES = {
+    'osf': [
+        '/v2/users/me',
+        '/v2/users',
+        '/v2/users/{user_id}/nodes',
+        '/v2/nodes',
+        '/v2/nodes/{node_id}',
+        '/v2/nodes/{node_id}/children',
+        '/v2/nodes/{node_id}/identifiers',
+        '/v2/nodes/{node_id}/citation',
+        '/v2/nodes/{node_id}/files',
+        '/v2/nodes/{node_id}/files/{provider}',
+        '/v2/nodes/{node_id}/files/{provider}/{resource_id}',
+        '/v2/files/{resource_id}'
+    ],
+    'osf_files': [
+        '/v1/resources/{node_id}/providers/{provider}',
+        '/v1/resources/{node_id}/providers/{provider}/{resource_id}'
+    ],
+    'github': [
+        '/user',
+        '/user/repos',
+        '/users/{username}',
+        '/users/{username}/repos',
+        '/search/repositories',
+        '/repositories/{repo_id}',
+        '/repositories/{repo_id}/topics',
+        '/repos/{owner}/{repo}',
+        '/repos/{owner}/{repo}/topics',
+        '/repos/{owner}/{repo}/contents',
+        '/repos/{owner}/{repo}/contents/{path:.*}',
+        '/repos/{owner}/{repo}/git/trees/{branch}',
+        '/repos/{owner}/{repo}/git/blobs/{sha}'
+    ],
+    'github_raw': [
+        '/{owner}/{repo}/{branch}/{path:.*}'
+    ],
+    'gitlab': [
+        '/api/v4/user',
+        '/api/v4/users',
+        '/api/v4/users/{user_id}/projects',
+        '/api/v4/projects',
+        '/api/v4/projects/{project_id}',
+        '/api/v4/projects/{project_id}/repository/tree',
+        '/api/v4/projects/{project_id}/repository/files/{path}',
+        '/api/v4/projects/{project_id}/repository/files/{path}/raw'
+    ],
+    'zenodo': [
+        '/api/licenses',
+        '/api/records',
+        '/api/records/{record_id}',
+        '/api/deposit/depositions',
+        '/api/deposit/depositions/{deposition_id}',
+        '/api/deposit/depositions/{deposition_id}/actions/{action}',
+        '/api/deposit/depositions/{deposition_id}/files',
+        '/api/deposit/depositions/{deposition_id}/files/{file_id}',
+        '/api/files/{bucket}',
+        '/api/files/{bucket}/{filename:.*}'
+    ],
+    'figshare': [
+        '/v2/account',
+        '/v2/account/projects',
+        '/v2/account/projects/{project_id}',
+        '/v2/account/projects/{project_id}/articles',
+        '/v2/account/projects/{project_id}/articles/{article_id}',
+        '/v2/account/articles/{article_id}',
+        '/v2/account/articles/{article_id}/files',
+        '/v2/account/articles/{article_id}/files/{file_id}',
+        '/v2/projects/{project_id}',
+        '/v2/projects/{project_id}/articles',
+        '/v2/articles/{article_id}',
+        '/v2/articles/{article_id}/files'
+    ],
+    'figshare_downloads': [
+        '/files/{file_id}'
+    ],
+    'figshare_uploads': [
+        '/upload/{file_id}',
+        '/upload/{file_id}/{part_number}'
+    ],
+    'curate_nd': [
+        '/api/items',
+        '/api/items/{item_id}',
+        '/downloads/{file_id}'
+    ]
+}
+
+# The endpoint of target requests that don't match any template
+OTHER_ENDPOINT = '{other}'
+# The target of requests to hosts that aren't target APIs. Their endpoint is the host.
+OTHER_TARGET = 'other'
+
+_compiled_templates = {}
+
+
+def _compile_template(template):
+    pattern = ''
+    for literal, name, name_pattern in re.findall(r'([^{]*)(?:\{(\w+)(?::([^}]*))?\})?',
+                                                  template):
+        pattern += re.escape(literal)
+        if name:
+            pattern += '(?:{})'.format(name_pattern or '[^/]+')
+    return re.compile(pattern + '$')
+
+
+def _get_compiled_templates(prefix):
+    if prefix not in _compiled_templates:
+        _compiled_templates[prefix] = [(template, _compile_template(template))
+                                       for template in ENDPOINT_TEMPLATES.get(prefix, [])]
+    return _compiled_templates[prefix]
+
+
+def get_url_prefix(url):
+    """
+    Find the TARGET_HOSTS prefix of a url, including urls sent to a mock target server by
+    install_target_url_override.
+
+    Parameters
+    ----------
+    url : str
+        The url of the request.
+
+    Returns
+    -------
+    The url's TARGET_HOSTS prefix and path, or None and the url's host if it's not a target url.
+    """
+    base_url = target_urls._target_base_url
+    if base_url and url.startswith(base_url + '/'):
+        prefix, _, path = urlsplit(url[len(base_url):]).path.lstrip('/').partition('/')
+        if prefix in target_urls.TARGET_HOSTS.values():
+            return prefix, '/' + path
+
+    host, path = urlsplit(url)[1:3]
+    if host in target_urls.TARGET_HOSTS:
+        return target_urls.TARGET_HOSTS[host], path or '/'
+    return None, host
+
+
+def get_endpoint_template(url):
+    """
+    Get the target and endpoint template of a request's url.
+
+    Parameters
+    ----------
+    url : str
+        The url of the request.
+
+    Returns
+    -------
+    The target name and the endpoint template, e.g. ('github', '/repos/{owner}/{repo}').
+    Requests to other hosts return OTHER_TARGET and the host.
+    """
+    prefix, path = get_url_prefix(url)
+    if prefix is None:
+        return OTHER_TARGET, path
+
+    target = PREFIX_TARGETS.get(prefix, prefix)
+    path = path.rstrip('/') or '/'
+    for template, pattern in _get_compiled_templates(prefix):
+        if pattern.match(path):
+            return target, template
+    return target, OTHER_ENDPOINT
@@ -0,0 +1,117 @@
+import threading
+
+from presqt.targets.utilities.utils.endpoint_templates import get_endpoint_template
+
+# Upper bounds, in seconds, of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Requests are only accounted inside the process running a job so they are never shared between
+# jobs.
+_http_accounting = None
+
+
+class HttpAccounting(object):
+    """
+    Counts of the HTTP requests made during a job by target, method, endpoint template and
+    status code, with a latency histogram for each endpoint. Requests that raised have the
+    status 'error'. Requests can be counted from several threads at once.
+    """
+    def __init__(self):
+        # {(target, method, endpoint): {'statuses': {status: count}, 'seconds': float,
+        #                               'buckets': [count per LATENCY_BUCKETS and +Inf]}}
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def request_made(self, method, url, status_code, seconds):
+        """
+        Count a request that has finished.
+
+        Parameters
+        ----------
+        method : str
+            The request's method.
+        url : str
+            The request's url.
+        status_code : int or None
+            The response's status code, or None if the request raised.
+        seconds : float
+            The duration of the request.
+        """
+        target, endpoint = get_endpoint_template(url)
+        status = 'error' if status_code is None else str(status_code)
+        bucket = next((index for index, upper_bound in enumerate(LATENCY_BUCKETS)
+                       if seconds <= upper_bound), len(LATENCY_BUCKETS))
+
+        with self._lock:
+            key = (target, method.upper(), endpoint)
+            if key not in self.endpoints:
+                self.endpoints[key] = {'statuses': {}, 'seconds': 0,
+                                       'buckets': [0] * (len(LATENCY_BUCKETS) + 1)}
+            totals = self.endpoints[key]
+            totals['statuses'][status] = totals['statuses'].get(status, 0) + 1
+            totals['seconds'] += seconds
+            totals['buckets'][bucket] += 1
+
+    def to_dict(self):
+        """
+        Get the job's summary: the number of requests and the counts of each target's
+        endpoints. Each endpoint's latency histogram holds the number of requests that took
+        at most each bucket's seconds, like Prometheus histograms.
+        """
+        summary = {'requests': 0, 'targets': {}}
+        with self._lock:
+            for (target, method, endpoint), totals in sorted(self.endpoints.items()):
+                count = sum(totals['statuses'].values())
+                target_summary = summary['targets'].setdefault(
+                    target, {'requests': 0, 'errors': 0, 'seconds': 0, 'endpoints': []})
+                target_summary['requests'] += count
+                target_summary['errors'] += sum(
+                    status_count for status, status_count in totals['statuses'].items()
+                    if status == 'error' or int(status) >= 400)
+                target_summary['seconds'] += totals['seconds']
+
+                latency = {}
+                cumulative_count = 0
+                for upper_bound, bucket_count in zip(LATENCY_BUCKETS + ('+Inf',),
+                                                     totals['buckets']):
+                    cumulative_count += bucket_count
+                    latency[str(upper_bound)] = cumulative_count
+                target_summary['endpoints'].append({
+                    'method': method,
+                    'endpoint': endpoint,
+                    'requests': count,
+                    'seconds': round(totals['seconds'], 4),
+                    'statuses': dict(totals['statuses']),
+                    'latency': latency
+                })
+                summary['requests'] += count
+
+        for target_summary in summary['targets'].values():
+            target_summary['seconds'] = round(target_summary['seconds'], 4)
+        return summary
+
+
+def _account_request(method, url, status_code, seconds):
+    if _http_accounting is not None:
+        _http_accounting.request_made(method, url, status_code, seconds)
+
+
+def open_http_accounting(accounting):
+    """
+    Count the HTTP requests made in this process with the job's accounting.
+
+    Parameters
+    ----------
+    accounting : HttpAccounting
+        The job's request counts.
+    """
+    from presqt.utilities.utils.http_hooks import add_request_listener
+
+    global _http_accounting
+    _http_accounting = accounting
+    add_request_listener(_account_request)
+
+
+def close_http_accounting():
+    global _http_accounting
+    _http_accounting = None
@@ -0,0 +1,76 @@
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+
+# Hosts of the target APIs and the path prefix each one is served under by a mock target server
+TARGET_HOSTS = {
+    'api.osf.io': 'osf',
+    'files.osf.io': 'osf_files',
+    'api.github.com': 'github',
+    'raw.githubusercontent.com': 'github_raw',
+    'gitlab.com': 'gitlab',
+    'zenodo.org': 'zenodo',
+    'api.figshare.com': 'figshare',
+    'ndownloader.figshare.com': 'figshare_downloads',
+    'fup.figshare.com': 'figshare_uploads',
+    'curate.nd.edu': 'curate_nd'
+}
+
+_target_base_url = None
+_override_installed = False
+
+
+def override_target_url(url):
+    """
+    Point a target API url at the target base url override if there is one.
+
+    Parameters
+    ----------
+    url : str
+        The url of the request.
+
+    Returns
+    -------
+    The url the request should be made to.
+    """
+    if not _target_base_url:
+        return url
+
+    scheme, host, path, query, fragment = urlsplit(url)
+    if host not in TARGET_HOSTS:
+        return url
+
+    overridden_url = '{}/{}{}'.format(_target_base_url, TARGET_HOSTS[host], path or '/')
+    if query:
+        overridden_url = '{}?{}'.format(overridden_url, query)
+    return overridden_url
+
+
+def install_target_url_override(base_url):
+    """
+    Send the requests that the target adapters make to the target APIs to a mock target server
+    instead. Requests made with both requests and aiohttp are redirected.
+
+    Parameters
+    ----------
+    base_url : str
+        Base url of the mock target server. Each target is served under its TARGET_HOSTS prefix.
+    """
+    global _target_base_url, _override_installed
+
+    if not _override_installed:
+        session_request = requests.Session.request
+        client_request = aiohttp.ClientSession._request
+
+        def request(self, method, url, *args, **kwargs):
+            return session_request(self, method, override_target_url(url), *args, **kwargs)
+
+        def _request(self, method, str_or_url, **kwargs):
+            return client_request(self, method, override_target_url(str(str_or_url)), **kwargs)
+
+        requests.Session.request = request
+        aiohttp.ClientSession._request = _request
+        _override_installed = True
+
+    _target_base_url = base_url.rstrip('/')
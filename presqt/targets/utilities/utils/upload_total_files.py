@@ -1,5 +1,7 @@
 import os
 
+from presqt.utilities import get_upload_stream
+
 
 def upload_total_files(resource_main_dir):
     """
@@ -14,5 +16,10 @@ def upload_total_files(resource_main_dir):
     -------
         The number of files to be uploaded.
     """
+    # Pipelined transfers are still writing the files so go by how many are expected instead
+    stream = get_upload_stream(resource_main_dir)
+    if stream is not None:
+        return stream.total_files + 1
+
     # We add one to account for the PRESQT_FTS_METADATA.json file that is created at the end of the upload process
     return len([os.path.join(path, name) for path, subdirs, files in os.walk(resource_main_dir) for name in files]) + 1
@@ -4,14 +4,16 @@ import requests
 
 from rest_framework import status
 
-from presqt.targets.utilities import get_duplicate_title, upload_total_files
-from presqt.targets.zenodo.utilities import zenodo_validation_check, zenodo_upload_helper
+from presqt.targets.utilities import upload_total_files
+from presqt.targets.zenodo.utilities import zenodo_validation_check, zenodo_create_project
 from presqt.utilities import (PresQTValidationError, PresQTResponseException,
-                              update_process_info, increment_process_info, update_process_info_message)
+                              update_process_info, increment_process_info, update_process_info_message,
+                              checkpointed_destination, get_checkpointed_upload,
+                              checkpoint_uploaded_file)
 
 
 def zenodo_upload_resource(token, resource_id, resource_main_dir, hash_algorithm,
-                           file_duplicate_action, process_info_path, action):
+                           file_duplicate_action, process_info_path, action, job_control):
     """
     Upload the files found in the resource_main_dir to the target.
 
@@ -31,6 +33,8 @@ def zenodo_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
         Path to the process info file that keeps track of the action's progress
     action: str
             The action being performed
+    job_control: JobControl
+            The job's cancellation token and deadline
 
     Returns
     -------
@@ -87,22 +91,20 @@ def zenodo_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
     else:
         action_metadata = {"destinationUsername": None}
         project_title = os_path[1][0]
-        name_helper = requests.get("https://zenodo.org/api/deposit/depositions",
-                                   params=auth_parameter).json()
-        titles = [project['title'] for project in name_helper]
-        final_title = get_duplicate_title(project_title, titles, ' (PresQT*)')
-        resource_id = zenodo_upload_helper(auth_parameter, final_title)
+        # A resumed job keeps uploading to the project its first attempt created
+        resource_id, final_title = checkpointed_destination(
+            zenodo_create_project, auth_parameter, project_title)
 
     post_url = "https://zenodo.org/api/deposit/depositions/{}/files".format(resource_id)
     upload_dict = zenodo_upload_loop(action_metadata, resource_id, resource_main_dir,
                                      post_url, auth_parameter, final_title, file_duplicate_action,
-                                     process_info_path, action)
+                                     process_info_path, action, job_control)
 
     return upload_dict
 
 
 def zenodo_upload_loop(action_metadata, resource_id, resource_main_dir, post_url, auth_parameter,
-                       title, file_duplicate_action, process_info_path, action):
+                       title, file_duplicate_action, process_info_path, action, job_control):
     """
     Loop through the files to be uploaded and return the dictionary.
 
@@ -124,6 +126,8 @@ def zenodo_upload_loop(action_metadata, resource_id, resource_main_dir, post_url
         Path to the process info file that keeps track of the action's progress
     action: str
             The action being performed
+    job_control: JobControl
+            The job's cancellation token and deadline
 
     Returns
     -------
@@ -166,6 +170,16 @@ def zenodo_upload_loop(action_metadata, resource_id, resource_main_dir, post_url
             resources_ignored.append(path)
 
         for name in files:
+            job_control.check()
+            # Files uploaded by an earlier attempt are in the project now, so they're skipped
+            # before they're compared with its files
+            checkpointed_upload = get_checkpointed_upload(
+                os.path.join(path, name), process_info_path, action)
+            if checkpointed_upload:
+                file_metadata_list.append(checkpointed_upload[0])
+                if checkpointed_upload[1] == 'updated':
+                    resources_updated.append(os.path.join(path, name))
+                continue
             formatted_name = name.replace(' ', '_')
             if formatted_name in file_title_list and file_duplicate_action == 'ignore':
                 resources_ignored.append(os.path.join(path, name))
@@ -196,11 +210,14 @@ def zenodo_upload_loop(action_metadata, resource_id, resource_main_dir, post_url
             # Increment process info file
             increment_process_info(process_info_path, action, 'upload')
 
-            file_metadata_list.append({
+            file_metadata = {
                 'actionRootPath': os.path.join(path, name),
                 'destinationPath': '/{}/{}'.format(title, formatted_name),
                 'title': formatted_name,
-                'destinationHash': response.json()['checksum']})
+                'destinationHash': response.json()['checksum']}
+            file_metadata_list.append(file_metadata)
+            checkpoint_uploaded_file(
+                file_metadata, 'updated' if formatted_name in file_title_list else 'created')
 
     return {
         "resources_ignored": resources_ignored,
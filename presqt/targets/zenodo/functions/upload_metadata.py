@@ -1,11 +1,13 @@
-import itertools
 import json
 import requests
 
 from presqt.json_schemas.schema_handlers import schema_validator
 from presqt.targets.zenodo.utilities import zenodo_validation_check
 from presqt.targets.zenodo.utilities.upload_extra_metadata import upload_extra_metadata
-from presqt.utilities import PresQTError
+from presqt.utilities import (PresQTError, FTS_METADATA_FILE_NAME, encode_fts_metadata,
+                              fts_metadata_needs_compaction, get_fts_metadata_delta_name,
+                              is_fts_metadata_file, load_valid_fts_metadata,
+                              merge_fts_metadata)
 
 
 def zenodo_upload_metadata(token, project_id, metadata_dict):
@@ -23,9 +25,11 @@ def zenodo_upload_metadata(token, project_id, metadata_dict):
     """
     auth_parameter = zenodo_validation_check(token)
     post_url = "https://zenodo.org/api/deposit/depositions/{}/files".format(project_id)
-    file_name = 'PRESQT_FTS_METADATA.json'
+    file_name = FTS_METADATA_FILE_NAME
 
     project_files = requests.get(post_url, params=auth_parameter).json()
+    delta_files = [file for file in project_files if file['filename'] != file_name
+                   and is_fts_metadata_file(file['filename'])]
 
     for file in project_files:
         if file['filename'] == file_name:
@@ -48,24 +52,44 @@ def zenodo_upload_metadata(token, project_id, metadata_dict):
                             response_status))
                 break
 
+            # Only this action's metadata is uploaded until there are enough delta files to
+            # compact them into the existing metadata file.
+            if not fts_metadata_needs_compaction(len(delta_files)):
+                response_status = metadata_post_request(get_fts_metadata_delta_name(metadata_dict),
+                                                        metadata_dict, auth_parameter, post_url)
+                if response_status != 201:
+                    raise PresQTError(
+                        "The request to create a metadata delta file has resulted in a {} error code from Zenodo.".format(
+                            response_status))
+                return
+
+            # Merge the delta files and this action's metadata into the existing metadata.
+            # Invalid delta files are left where they are.
+            metadata_documents = [updated_metadata]
+            compacted_files = []
+            for delta_file in delta_files:
+                delta_metadata = load_valid_fts_metadata(
+                    requests.get(delta_file['links']['download'], params=auth_parameter).content)
+                if delta_metadata:
+                    metadata_documents.append(delta_metadata)
+                    compacted_files.append(delta_file)
+            metadata_documents.append(metadata_dict)
+
             # Need to delete the old metadata file.
             requests.delete(file['links']['self'], params=auth_parameter)
 
-            # Loop through each 'action' in both metadata files and make a new list of them.
-            joined_actions = [entry for entry in itertools.chain(metadata_dict['actions'],
-                                                                 updated_metadata['actions'])]
-            joined_keywords = [entry for entry in itertools.chain(metadata_dict['allKeywords'],
-                                                                  updated_metadata['allKeywords'])]
-            updated_metadata['actions'] = joined_actions
-            updated_metadata['allKeywords'] = list(set(joined_keywords))
-
-            response_status = metadata_post_request(file_name, updated_metadata, auth_parameter,
-                                                    post_url)
+            response_status = metadata_post_request(file_name,
+                                                    merge_fts_metadata(metadata_documents),
+                                                    auth_parameter, post_url)
             # When updating an existing metadata file, Zenodo returns a 201 status
             if response_status != 201:
                 raise PresQTError(
                     "The request to update the metadata file has returned a {} error code from Zenodo.".format(
                         response_status))
+
+            # Actions left behind by a failed delete are merged only once at the next compaction
+            for delta_file in compacted_files:
+                requests.delete(delta_file['links']['self'], params=auth_parameter)
             return
 
     response_status = metadata_post_request(file_name, metadata_dict, auth_parameter, post_url)
@@ -101,7 +125,7 @@ def metadata_post_request(file_name, metadata, auth_parameter, url):
     """
     # Prepare the request values
     data = {'name': file_name}
-    metadata_bytes = json.dumps(metadata, indent=4).encode('utf-8')
+    metadata_bytes = encode_fts_metadata(metadata)
     files = {'file': metadata_bytes}
 
     # Make the request
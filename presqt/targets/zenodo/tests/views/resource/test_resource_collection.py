@@ -11,7 +11,6 @@ from config.settings.base import ZENODO_TEST_USER_TOKEN
 from presqt.targets.utilities import shared_upload_function_osf
 from presqt.targets.zenodo.functions.upload_metadata import zenodo_upload_metadata
 from presqt.utilities import read_file, PresQTError
-from presqt.api_v1.utilities import hash_tokens
 
 
 class TestResourceCollection(SimpleTestCase):
@@ -135,7 +134,6 @@ class TestResourceCollectionPOST(SimpleTestCase):
     def setUp(self):
         self.client = APIClient()
         self.token = ZENODO_TEST_USER_TOKEN
-        self.ticket_number = hash_tokens(self.token)
         self.headers = {'HTTP_PRESQT_DESTINATION_TOKEN': self.token,
                         'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
                         'HTTP_PRESQT_EMAIL_OPT_IN': ''}
@@ -251,7 +249,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')},
                                     **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -311,7 +309,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
             response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')},
                                         **self.headers)
 
-            ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+            ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
             # Wait until the spawned off process finishes in the background
             # to do validation on the resulting files
@@ -371,7 +369,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
             response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')},
                                         **self.headers)
 
-            ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+            ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
             # Wait until the spawned off process finishes in the background
             # to do validation on the resulting files
@@ -453,7 +451,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         response = self.client.post(self.url, {'presqt-file': open(bag_with_good_metadata, 'rb')},
                                     **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -527,7 +525,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')},
                                     **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
         process_info = read_file('{}/process_info.json'.format(ticket_path), True)
         while process_info['resource_upload']['status'] == 'in_progress':
             try:
@@ -607,7 +605,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
                    'HTTP_PRESQT_EMAIL_OPT_IN': ''}
         response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')}, **headers)
 
-        ticket_number = hash_tokens('eggyboi')
+        ticket_number = response.data['job_id']
         ticket_path = 'mediafiles/jobs/{}'.format(ticket_number)
 
         # Wait until the spawned off process finishes in the background
@@ -638,7 +636,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         self.headers['HTTP_PRESQT_FILE_DUPLICATE_ACTION'] = self.duplicate_action
         response = self.client.post(self.url, {'presqt-file': open(bad_bag, 'rb')}, **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -665,7 +663,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         self.headers['HTTP_PRESQT_FILE_DUPLICATE_ACTION'] = self.duplicate_action
         response = self.client.post(self.url, {'presqt-file': open(bad_bag, 'rb')}, **self.headers)
 
-        ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
         # Wait until the spawned off process finishes in the background
         # to do validation on the resulting files
@@ -703,7 +701,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
             response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')},
                                         **self.headers)
 
-            ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+            ticket_path = 'mediafiles/jobs/{}'.format(response.data['job_id'])
 
             # Wait until the spawned off process finishes in the background
             # to do validation on the resulting files
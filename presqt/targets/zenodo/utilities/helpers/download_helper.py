@@ -136,7 +136,7 @@ def zenodo_project_download_helper(is_record, project_name, project_helper, file
                 "title": resource['key'],
                 "path": "/{}/{}".format(project_name, resource['key']),
                 "source_path": "/{}/{}".format(project_name, resource['key']),
-                "extra_metadata": {}})
+                "extra_metadata": {"size": resource['size']}})
     else:
         for resource in project_helper['files']:
             files.append({
@@ -145,6 +145,6 @@ def zenodo_project_download_helper(is_record, project_name, project_helper, file
                 "title": resource['filename'],
                 "path": "/{}/{}".format(project_name, resource['filename']),
                 "source_path": "/{}/{}".format(project_name, resource['filename']),
-                "extra_metadata": {}})
+                "extra_metadata": {"size": resource['filesize']}})
 
     return files
@@ -3,6 +3,7 @@ import requests
 
 from rest_framework import status
 
+from presqt.targets.utilities import get_duplicate_title
 from presqt.utilities import PresQTResponseException
 
 
@@ -46,3 +47,26 @@ def zenodo_upload_helper(auth_parameter, project_title=None):
                  params=auth_parameter, data=json.dumps(data), headers=headers)
 
     return project_id
+
+
+def zenodo_create_project(auth_parameter, project_title):
+    """
+    Create a new project on Zenodo, renaming it if the user already has a project with its title.
+
+    Parameters
+    ----------
+    auth_parameter : str
+        The Authentication parameter expected by Zenodo.
+    project_title : str
+        The title of the project being created.
+
+    Returns
+    -------
+    The new Project ID and its final title.
+    """
+    name_helper = requests.get("https://zenodo.org/api/deposit/depositions",
+                               params=auth_parameter).json()
+    titles = [project['title'] for project in name_helper]
+    final_title = get_duplicate_title(project_title, titles, ' (PresQT*)')
+
+    return zenodo_upload_helper(auth_parameter, final_title), final_title
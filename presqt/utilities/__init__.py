@@ -1,12 +1,31 @@
 
 from presqt.utilities.exceptions.exceptions import (
-    PresQTError, PresQTInvalidTokenError, PresQTResponseException, PresQTValidationError)
+    PresQTError, PresQTInvalidTokenError, PresQTResponseException, PresQTValidationError,
+    PresQTJobStopped)
 from presqt.utilities.io.read_file import read_file
 from presqt.utilities.io.remove_path_contents import remove_path_contents
 from presqt.utilities.io.write_file import write_file
 from presqt.utilities.io.zip_file import zip_directory
-from presqt.utilities.utils.get_dictionary_from_list import get_dictionary_from_list
+from presqt.utilities.io.content_store import get_uncached_resources, write_resource_file
+from presqt.utilities.utils.get_dictionary_from_list import (get_dictionary_from_list,
+                                                            get_dictionary_index)
+from presqt.utilities.utils.fts_metadata import (
+    FTS_METADATA_FILE_NAME, is_fts_metadata_file, get_fts_metadata_delta_name,
+    fts_metadata_needs_compaction, load_valid_fts_metadata, merge_fts_metadata,
+    encode_fts_metadata)
 from presqt.utilities.utils.list_differences import list_differences
 from presqt.utilities.utils.list_intersection import list_intersection
 from presqt.utilities.utils.update_process_info import (
-    update_process_info_message, update_process_info, increment_process_info)
+    update_process_info_message, update_process_info, increment_process_info, PROCESS_INFO_LOCK)
+from presqt.utilities.io.checkpoint_journal import (
+    CheckpointJournal, open_checkpoint_journal, close_checkpoint_journal, get_checkpointed_file,
+    get_checkpointed_upload, checkpoint_uploaded_file, checkpointed_destination)
+from presqt.utilities.utils.resource_stream import (
+    ResourceStream, open_download_stream, close_download_stream, stream_resources,
+    stream_downloaded_contents, open_upload_stream, close_upload_stream, get_upload_stream,
+    walk_upload_directory, list_upload_directory)
+from presqt.utilities.utils.job_spans import JobSpans, open_job_spans, close_job_spans, record_span
+from presqt.utilities.utils.stack_sampler import StackSampler
+from presqt.utilities.utils.job_control import CANCEL_SIGNAL, JobControl, run_with_job_control
+from presqt.utilities.utils.download_admission import (
+    open_download_admission, close_download_admission, admit_download)
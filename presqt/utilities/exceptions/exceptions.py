@@ -21,3 +21,11 @@ class PresQTResponseException(PresQTError):
 class PresQTValidationError(PresQTResponseException):
     pass
 
+
+
+class PresQTJobStopped(PresQTResponseException):
+    """
+    Raised inside a job's target functions when the job has been cancelled or has run out of
+    time, so the job can stop cleanly and save what it has done so far.
+    """
+    pass
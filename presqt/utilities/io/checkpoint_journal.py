@@ -0,0 +1,310 @@
+import json
+import os
+import shutil
+import threading
+
+from presqt.utilities.io.write_file import write_file
+from presqt.utilities.utils.fts_metadata import is_fts_metadata_file
+from presqt.utilities.utils.update_process_info import increment_process_info
+
+# The journal only lives inside the process running a job so it is never shared between jobs.
+_checkpoint_journal = None
+# Pipelined transfers record downloads and uploads from several threads at once
+_JOURNAL_LOCK = threading.Lock()
+
+
+class CheckpointJournal(object):
+    """
+    Append-only record of the work a job has finished, kept in the job's directory so a job that
+    failed, was cancelled or was killed can be resumed. Each line of the journal is one of:
+        {"stage": "download", "path": ..., "hashes": {...}, "file_path": ...}
+        {"stage": "upload", "file_metadata": {...}, "file_action": "created", "hash": ...}
+        {"stage": "destination", "name": ..., "result": ...}
+    The spec of the job is saved next to the journal so the job can be started again.
+    Only plain values are kept so the job can be sent to a job worker.
+    """
+    # Directory the journal is kept in, inside the job's ticket directory
+    DIRECTORY_NAME = 'checkpoint'
+    JOURNAL_NAME = 'journal.jsonl'
+    JOB_SPEC_NAME = 'job_spec.pickle'
+    # Files saved by the attempts before a resume are moved here so they can be reused
+    PREVIOUS_DIRECTORY = 'previous'
+
+    def __init__(self, directory, resource_main_dir):
+        """
+        Parameters
+        ----------
+        directory : str
+            Directory the journal is kept in.
+        resource_main_dir : str
+            The job's directory for the resources, where downloads are saved.
+        """
+        self.directory = directory
+        self.resource_main_dir = resource_main_dir
+        self.downloads = {}
+        self.uploads = {}
+        self.destinations = {}
+        # Hashes of the files being uploaded by their paths, set by the job before uploading
+        self.file_hashes = {}
+
+    @property
+    def journal_path(self):
+        return os.path.join(self.directory, self.JOURNAL_NAME)
+
+    @property
+    def previous_directory(self):
+        return os.path.join(self.directory, self.PREVIOUS_DIRECTORY)
+
+    def start(self, job_spec):
+        """
+        Start an empty journal for a new job.
+
+        Parameters
+        ----------
+        job_spec : bytes
+            The pickled spec of the job, or None if the job can't be resumed.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory)
+        open(self.journal_path, 'w').close()
+        if job_spec is not None:
+            write_file(os.path.join(self.directory, self.JOB_SPEC_NAME), job_spec)
+
+    @classmethod
+    def read_job_spec(cls, ticket_path):
+        """
+        Get the pickled spec of a job, or None if the job can't be resumed.
+
+        Parameters
+        ----------
+        ticket_path : str
+            The job's ticket directory.
+        """
+        try:
+            with open(os.path.join(ticket_path, cls.DIRECTORY_NAME, cls.JOB_SPEC_NAME),
+                      'rb') as job_spec:
+                return job_spec.read()
+        except FileNotFoundError:
+            return None
+
+    def keep_previous_files(self):
+        """
+        Move the resources saved by the job's earlier attempts out of the way before it runs
+        again. Downloads are linked back in from here if they don't need to be downloaded again.
+        """
+        shutil.rmtree(self.previous_directory, ignore_errors=True)
+        if os.path.isdir(self.resource_main_dir):
+            os.replace(self.resource_main_dir, self.previous_directory)
+
+    def remove_previous_files(self):
+        """
+        Remove the resources saved by the job's earlier attempts once the downloads are done.
+        """
+        shutil.rmtree(self.previous_directory, ignore_errors=True)
+
+    def load(self):
+        """
+        Read the work recorded by the job's earlier attempts.
+        """
+        self.downloads, self.uploads, self.destinations = {}, {}, {}
+        try:
+            with open(self.journal_path) as journal:
+                lines = journal.readlines()
+        except FileNotFoundError:
+            return
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # The process was killed while it was writing this entry
+                continue
+            self._add_entry(entry)
+
+    def record(self, entry):
+        """
+        Append an entry to the journal. Each entry is written with a single write so entries are
+        never interleaved.
+
+        Parameters
+        ----------
+        entry : dict
+            The entry to record.
+        """
+        line = '{}\n'.format(json.dumps(entry)).encode()
+        with _JOURNAL_LOCK:
+            journal = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+            try:
+                os.write(journal, line)
+            finally:
+                os.close(journal)
+            # Keep a copy so the caller can go on changing what it recorded
+            self._add_entry(json.loads(line))
+
+    def record_download(self, resource, file_path):
+        """
+        Record a downloaded resource that was saved to the job's directory.
+
+        Parameters
+        ----------
+        resource : dict
+            Resource dictionary returned by the source target's download function.
+        file_path : str
+            Path the resource was saved to.
+        """
+        self.record({'stage': 'download', 'path': resource['path'],
+                     'hashes': resource['hashes'],
+                     'file_path': file_path[len(self.resource_main_dir):]})
+
+    def get_previous_file(self, resource):
+        """
+        Find the copy an earlier attempt saved of a resource, if it was downloaded with one of
+        the same source hashes.
+
+        Parameters
+        ----------
+        resource : dict
+            Resource dictionary built by a target's download function before downloading.
+
+        Returns
+        -------
+        Path to the saved copy or None.
+        """
+        entry = self.downloads.get(resource['path'])
+        if not entry or not any(hash_value and entry['hashes'].get(algorithm) == hash_value
+                                for algorithm, hash_value in resource['hashes'].items()):
+            return None
+
+        # Making the bag moves the saved files into its data directory
+        for file_path in [entry['file_path'], '/data{}'.format(entry['file_path'])]:
+            previous_path = '{}{}'.format(self.previous_directory, file_path)
+            if os.path.isfile(previous_path):
+                return previous_path
+        return None
+
+    def _add_entry(self, entry):
+        if entry['stage'] == 'download':
+            self.downloads[entry['path']] = entry
+        elif entry['stage'] == 'upload':
+            self.uploads[entry['file_metadata']['actionRootPath']] = entry
+        elif entry['stage'] == 'destination':
+            self.destinations[entry['name']] = entry['result']
+
+
+def open_checkpoint_journal(journal):
+    """
+    Record the work of the target functions in this process in a job's checkpoint journal, and
+    let them skip the work its earlier attempts already finished.
+
+    Parameters
+    ----------
+    journal : CheckpointJournal
+        The job's checkpoint journal.
+    """
+    global _checkpoint_journal
+    # Transfers open the journal for each part of the job
+    if _checkpoint_journal is not journal:
+        journal.load()
+    _checkpoint_journal = journal
+
+
+def close_checkpoint_journal():
+    """
+    Stop recording the work of the target functions.
+    """
+    global _checkpoint_journal
+    _checkpoint_journal = None
+
+
+def get_checkpointed_file(resource):
+    """
+    Find the copy an earlier attempt of the job saved of a resource, so it doesn't need to be
+    downloaded again. PresQT metadata files are always downloaded since they are read and
+    validated during the download.
+
+    Parameters
+    ----------
+    resource : dict
+        Resource dictionary built by a target's download function before downloading.
+
+    Returns
+    -------
+    Path to the saved copy, or None if no checkpoint journal is open or it has no copy.
+    """
+    if _checkpoint_journal is None or is_fts_metadata_file(resource['title']):
+        return None
+    return _checkpoint_journal.get_previous_file(resource)
+
+
+def get_checkpointed_upload(file_path, process_info_path, action):
+    """
+    Get what an earlier attempt of the job recorded when it uploaded a file, so the file
+    doesn't need to be uploaded again. Files whose contents have changed since, like zip files
+    made again by the resumed job, are uploaded again. Files found are counted as finished in
+    the process_info.json file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file on the server.
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    The file's entry in the upload function's file_metadata_list and what was done with the
+    file at the destination, or None if the file still needs to be uploaded.
+    """
+    if _checkpoint_journal is None:
+        return None
+    entry = _checkpoint_journal.uploads.get(file_path)
+    if not entry or entry['hash'] != _checkpoint_journal.file_hashes.get(file_path):
+        return None
+    increment_process_info(process_info_path, action, 'upload')
+    return entry['file_metadata'], entry['file_action']
+
+
+def checkpoint_uploaded_file(file_metadata, file_action='created'):
+    """
+    Record a file uploaded by a target's upload function. Does nothing unless a checkpoint
+    journal is open.
+
+    Parameters
+    ----------
+    file_metadata : dict
+        The file's entry in the upload function's file_metadata_list.
+    file_action : str
+        What was done with the file at the destination: 'created', 'updated' or 'ignored'.
+    """
+    if _checkpoint_journal is not None:
+        _checkpoint_journal.record({
+            'stage': 'upload', 'file_metadata': file_metadata, 'file_action': file_action,
+            'hash': _checkpoint_journal.file_hashes.get(file_metadata['actionRootPath'])})
+
+
+def checkpointed_destination(create_destination, *args):
+    """
+    Create a new resource at the destination only once per job. If an earlier attempt of the job
+    already created it, what it returned then is returned instead.
+
+    Parameters
+    ----------
+    create_destination : function
+        The target function creating the resource. What it returns must be JSON serializable.
+    args
+        Arguments to pass to the function.
+
+    Returns
+    -------
+    What the function returned, as it was recorded. Tuples are recorded as lists.
+    """
+    if _checkpoint_journal is None:
+        return create_destination(*args)
+
+    name = create_destination.__name__
+    if name not in _checkpoint_journal.destinations:
+        _checkpoint_journal.record({'stage': 'destination', 'name': name,
+                                    'result': create_destination(*args)})
+    return _checkpoint_journal.destinations[name]
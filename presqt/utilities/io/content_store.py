@@ -0,0 +1,276 @@
+import fcntl
+import hashlib
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import closing
+
+from config.settings.base import (MEDIA_ROOT, PRESQT_CONTENT_STORE,
+                                  PRESQT_CONTENT_STORE_MAX_SIZE)
+from presqt.utilities.io.checkpoint_journal import get_checkpointed_file
+from presqt.utilities.io.write_file import write_file
+from presqt.utilities.utils.fts_metadata import is_fts_metadata_file
+
+CONTENT_STORE_DIRECTORY = os.path.join(MEDIA_ROOT, 'cas')
+# ioctl request that makes a file share another file's blocks copy-on-write (linux/fs.h)
+FICLONE = 0x40049409
+
+
+def connect_content_store():
+    """
+    Open a connection to the content store index, creating it if it doesn't exist yet.
+    'blobs' holds the size and last use of every blob saved under mediafiles/cas/<sha256>.
+    'hashes' maps every source hash a blob has been downloaded with to the blob's sha256.
+    'pins' holds the blobs that job processes are going to copy, which aren't evicted.
+
+    Returns
+    -------
+    sqlite3.Connection
+    """
+    os.makedirs(CONTENT_STORE_DIRECTORY, exist_ok=True)
+    connection = sqlite3.connect(os.path.join(CONTENT_STORE_DIRECTORY, 'index.sqlite3'),
+                                 timeout=30)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS blobs ('
+        'sha256 TEXT PRIMARY KEY, size INTEGER NOT NULL, last_used REAL NOT NULL)')
+    connection.execute('CREATE INDEX IF NOT EXISTS blobs_last_used ON blobs (last_used)')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS hashes ('
+        'algorithm TEXT NOT NULL, hash TEXT NOT NULL, sha256 TEXT NOT NULL, '
+        'PRIMARY KEY (algorithm, hash))')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS pins (sha256 TEXT NOT NULL, pid INTEGER NOT NULL)')
+    return connection
+
+
+def is_process_running(pid):
+    """
+    Check if a process is still running.
+
+    Parameters
+    ----------
+    pid : int
+        The process id.
+
+    Returns
+    -------
+    True if the process is running.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process exists but belongs to another user
+        pass
+    return True
+
+
+def get_blob_path(source_hashes):
+    """
+    Find a blob in the content store matching any of a file's source hashes. The blob is
+    pinned for this process so it isn't evicted before release_blob is called for it.
+
+    Parameters
+    ----------
+    source_hashes : dict
+        Hashes provided by the source target. Example: {'md5': 'the_hash'}
+
+    Returns
+    -------
+    Path to the blob or None if the content store is off or doesn't have the file.
+    """
+    if not PRESQT_CONTENT_STORE:
+        return None
+
+    with closing(connect_content_store()) as connection, connection:
+        # Blobs are only evicted while the index is locked so the blob can't be evicted
+        # between finding and pinning it
+        connection.execute('BEGIN IMMEDIATE')
+        for algorithm, hash_value in source_hashes.items():
+            if not hash_value:
+                continue
+            row = connection.execute('SELECT sha256 FROM hashes WHERE algorithm = ? AND hash = ?',
+                                     (algorithm, hash_value.lower())).fetchone()
+            if row and os.path.isfile(os.path.join(CONTENT_STORE_DIRECTORY, row[0])):
+                connection.execute('UPDATE blobs SET last_used = ? WHERE sha256 = ?',
+                                   (time.time(), row[0]))
+                connection.execute('INSERT INTO pins VALUES (?, ?)', (row[0], os.getpid()))
+                return os.path.join(CONTENT_STORE_DIRECTORY, row[0])
+    return None
+
+
+def release_blob(blob_path):
+    """
+    Release a pin this process holds on a blob so it can be evicted again.
+
+    Parameters
+    ----------
+    blob_path : str
+        Path to the blob in the content store.
+    """
+    with closing(connect_content_store()) as connection, connection:
+        connection.execute(
+            'DELETE FROM pins WHERE rowid IN '
+            '(SELECT rowid FROM pins WHERE sha256 = ? AND pid = ? LIMIT 1)',
+            (os.path.basename(blob_path), os.getpid()))
+
+
+def store_blob(contents, source_hashes):
+    """
+    Save file contents to the content store under their sha256 and map the file's source hashes
+    to it. The least recently used blobs are evicted if the store grows past its size cap.
+
+    Parameters
+    ----------
+    contents : bytes
+        Contents of the file. They must already have passed a fixity check against the
+        source hashes.
+    source_hashes : dict
+        Hashes provided by the source target. Example: {'md5': 'the_hash'}
+
+    Returns
+    -------
+    Path to the blob.
+    """
+    sha256 = hashlib.sha256(contents).hexdigest()
+    blob_path = os.path.join(CONTENT_STORE_DIRECTORY, sha256)
+    if not os.path.isfile(blob_path):
+        # Write to a temporary file first so a partially written blob is never copied
+        temporary_path = '{}.{}.tmp'.format(blob_path, os.getpid())
+        write_file(temporary_path, contents)
+        os.replace(temporary_path, blob_path)
+
+    with closing(connect_content_store()) as connection, connection:
+        connection.execute('INSERT OR REPLACE INTO blobs VALUES (?, ?, ?)',
+                           (sha256, len(contents), time.time()))
+        source_hashes = dict(source_hashes, sha256=sha256)
+        for algorithm, hash_value in source_hashes.items():
+            if hash_value:
+                connection.execute('INSERT OR REPLACE INTO hashes VALUES (?, ?, ?)',
+                                   (algorithm, hash_value.lower(), sha256))
+        evict_blobs(connection, keep=sha256)
+    return blob_path
+
+
+def evict_blobs(connection, keep=None):
+    """
+    Remove the least recently used blobs until the content store is under its size cap.
+    Jobs keep their own copies of evicted blobs. Blobs pinned by running processes are kept,
+    the pins of processes that have ended are dropped.
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection
+        Open connection to the content store index.
+    keep : str
+        sha256 of a blob that must not be evicted.
+    """
+    total_size = connection.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+    if total_size <= PRESQT_CONTENT_STORE_MAX_SIZE:
+        return
+
+    pinned = set()
+    for sha256, pid in connection.execute('SELECT DISTINCT sha256, pid FROM pins').fetchall():
+        if is_process_running(pid):
+            pinned.add(sha256)
+        else:
+            connection.execute('DELETE FROM pins WHERE pid = ?', (pid,))
+
+    for sha256, size in connection.execute(
+            'SELECT sha256, size FROM blobs ORDER BY last_used').fetchall():
+        if total_size <= PRESQT_CONTENT_STORE_MAX_SIZE:
+            break
+        if sha256 == keep or sha256 in pinned:
+            continue
+        try:
+            os.remove(os.path.join(CONTENT_STORE_DIRECTORY, sha256))
+        except FileNotFoundError:
+            pass
+        connection.execute('DELETE FROM blobs WHERE sha256 = ?', (sha256,))
+        connection.execute('DELETE FROM hashes WHERE sha256 = ?', (sha256,))
+        total_size -= size
+
+
+def copy_blob(blob_path, file_path):
+    """
+    Copy a blob into a job directory. Blobs aren't hard linked since a job writing to its file
+    would change the blob every other job gets. Where the file system supports it the copy is a
+    reflink that shares the blob's blocks until either file is written to.
+
+    Parameters
+    ----------
+    blob_path : str
+        Path to the blob in the content store.
+    file_path : str
+        Path the file should be saved to.
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    # Replace any existing file rather than writing over it in place
+    temporary_path = '{}.{}.tmp'.format(file_path, os.getpid())
+    with open(blob_path, 'rb') as blob, open(temporary_path, 'wb') as file:
+        try:
+            fcntl.ioctl(file.fileno(), FICLONE, blob.fileno())
+        except OSError:
+            shutil.copyfileobj(blob, file)
+    os.replace(temporary_path, file_path)
+
+
+def write_resource_file(file_path, resource, fixity_obj):
+    """
+    Save a downloaded resource to disk. Resources served from the content store are copied
+    from it, and new resources that passed their fixity check are added to the store when it
+    is on.
+
+    Parameters
+    ----------
+    file_path : str
+        Path the file should be saved to.
+    resource : dict
+        Resource dictionary returned by a target's download function.
+    fixity_obj : dict
+        Fixity check results returned by download_fixity_checker.
+    """
+    if resource.get('blob_path'):
+        copy_blob(resource['blob_path'], file_path)
+        if os.path.dirname(resource['blob_path']) == CONTENT_STORE_DIRECTORY:
+            release_blob(resource['blob_path'])
+    elif PRESQT_CONTENT_STORE and fixity_obj['fixity']:
+        # Only the source hash the contents were checked against is mapped to the blob
+        store_blob(resource['file'], {fixity_obj['hash_algorithm']: fixity_obj['source_hash']})
+        write_file(file_path, resource['file'])
+    else:
+        write_file(file_path, resource['file'])
+
+
+def get_uncached_resources(resources):
+    """
+    Point every resource found in the content store, or saved by an earlier attempt of a resumed
+    job, at its blob so it doesn't need to be downloaded. The resource's 'file' is set to None
+    and its 'blob_path' to the blob. Blobs in the content store stay pinned until the resource
+    is written.
+
+    Parameters
+    ----------
+    resources : list
+        Resource dictionaries built by a target's download function before downloading.
+
+    Returns
+    -------
+    List of the resources that still need to be downloaded.
+    """
+    resources_to_download = []
+    for resource in resources:
+        blob_path = get_checkpointed_file(resource)
+        # PresQT metadata files are read and validated during the download
+        if not blob_path and not is_fts_metadata_file(resource['title']):
+            blob_path = get_blob_path(resource['hashes'])
+
+        if blob_path:
+            resource['file'] = None
+            resource['blob_path'] = blob_path
+        else:
+            resources_to_download.append(resource)
+    return resources_to_download
@@ -0,0 +1,52 @@
+import os
+
+_admit_download = None
+
+
+def open_download_admission(admit):
+    """
+    Hold every download function run in this process until the job has disk space for the
+    files it is about to fetch.
+
+    Parameters
+    ----------
+    admit : function
+        Called with the number of bytes the download function is about to fetch. Returns once
+        the job has been admitted.
+    """
+    global _admit_download
+    _admit_download = admit
+
+
+def close_download_admission():
+    global _admit_download
+    _admit_download = None
+
+
+def admit_download(resources, get_size):
+    """
+    Wait until the job has disk space for the resources a download function has listed but not
+    fetched yet. Resources served from the content store count the size of their blob, the rest
+    the size the source target reported for them. Does nothing unless admission is open.
+
+    Parameters
+    ----------
+    resources : list
+        Resources listed by the download function.
+    get_size : function
+        Returns the size in bytes the source target reported for a resource.
+    """
+    if _admit_download is None:
+        return
+
+    byte_count = 0
+    for resource in resources:
+        if resource.get('blob_path'):
+            try:
+                byte_count += os.path.getsize(resource['blob_path'])
+                continue
+            except FileNotFoundError:
+                # The blob was evicted so the resource will be downloaded after all
+                pass
+        byte_count += get_size(resource)
+    _admit_download(byte_count)
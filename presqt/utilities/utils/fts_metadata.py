@@ -0,0 +1,131 @@
+import json
+
+from config.settings.base import PRESQT_FTS_METADATA_MAX_DELTAS
+
+FTS_METADATA_FILE_NAME = 'PRESQT_FTS_METADATA.json'
+FTS_METADATA_DELTA_PREFIX = 'PRESQT_FTS_METADATA_DELTA_'
+
+
+def is_fts_metadata_file(file_name):
+    """
+    Check if a file is a PresQT FTS metadata file, either the base PRESQT_FTS_METADATA.json or
+    one of its delta files.
+
+    Parameters
+    ----------
+    file_name: str
+        The name of the file.
+
+    Returns
+    -------
+    True if the file holds FTS metadata, False otherwise.
+    """
+    return file_name == FTS_METADATA_FILE_NAME or (
+        file_name.startswith(FTS_METADATA_DELTA_PREFIX) and file_name.endswith('.json'))
+
+
+def get_fts_metadata_delta_name(metadata_dict):
+    """
+    Get the file name of the delta file an action's FTS metadata is uploaded as.
+
+    Parameters
+    ----------
+    metadata_dict: dict
+        The FTS metadata of the action.
+
+    Returns
+    -------
+    The name of the delta file.
+    """
+    return '{}{}.json'.format(FTS_METADATA_DELTA_PREFIX, metadata_dict['actions'][0]['id'])
+
+
+def fts_metadata_needs_compaction(delta_count):
+    """
+    Check if a project's FTS metadata delta files should be compacted into its base file
+    instead of adding another delta file.
+
+    Parameters
+    ----------
+    delta_count: int
+        The number of delta files the project already has.
+
+    Returns
+    -------
+    True if the deltas should be compacted, False otherwise.
+    """
+    return delta_count >= PRESQT_FTS_METADATA_MAX_DELTAS
+
+
+def load_valid_fts_metadata(content):
+    """
+    Load the contents of an FTS metadata file if they're valid.
+
+    Parameters
+    ----------
+    content: bytes or str
+        The contents of the file.
+
+    Returns
+    -------
+    The FTS metadata dictionary or None if the contents aren't valid FTS metadata.
+    """
+    from presqt.json_schemas.schema_handlers import load_and_validate_json
+
+    try:
+        metadata, validation = load_and_validate_json(
+            'presqt/json_schemas/metadata_schema.json', content)
+    except ValueError:
+        return None
+    return metadata if validation is True else None
+
+
+def merge_fts_metadata(metadata_documents):
+    """
+    Merge FTS metadata documents into one. Actions found in more than one document are only
+    kept once and the merged actions are ordered newest first.
+
+    Parameters
+    ----------
+    metadata_documents: list
+        The FTS metadata documents to merge, oldest first.
+
+    Returns
+    -------
+    The merged FTS metadata dictionary.
+    """
+    actions = {}
+    keywords = set()
+    extra_metadata = {}
+    for document in metadata_documents:
+        for action in document['actions']:
+            actions.setdefault(action['id'], action)
+        keywords.update(document['allKeywords'])
+        # The oldest document's extra metadata is the one uploaded to the project
+        if not extra_metadata and document.get('extra_metadata'):
+            extra_metadata = document['extra_metadata']
+
+    merged_metadata = {
+        'allKeywords': sorted(keywords),
+        'actions': sorted(actions.values(), key=lambda action: action['actionDateTime'],
+                          reverse=True)
+    }
+    if extra_metadata:
+        merged_metadata['extra_metadata'] = extra_metadata
+    return merged_metadata
+
+
+def encode_fts_metadata(metadata_dict):
+    """
+    Encode an FTS metadata dictionary the way it's written to targets.
+
+    Parameters
+    ----------
+    metadata_dict: dict
+        The FTS metadata to encode.
+
+    Returns
+    -------
+    The encoded metadata bytes.
+    """
+    return json.dumps(metadata_dict, indent=4).encode('utf-8')
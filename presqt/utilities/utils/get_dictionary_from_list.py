@@ -17,4 +17,26 @@ def get_dictionary_from_list(list_to_search, key, search_value):
     """
     for the_dict in list_to_search:
         if the_dict[key] == search_value:
-            return the_dict
\ No newline at end of file
+            return the_dict
+
+def get_dictionary_index(list_to_search, key):
+    """
+    Index a list of dictionaries by a certain key's value so dictionaries can be found without
+    searching the whole list each time.
+
+    Parameters
+    ----------
+    list_to_search: list
+        List of dictionaries to index
+    key: str
+        The key in the dictionaries to index them by
+
+    Returns
+    -------
+    Dictionary of the dictionaries keyed by their value for the key. If several dictionaries
+    share a value the first one is kept, the same one get_dictionary_from_list finds.
+    """
+    index = {}
+    for the_dict in list_to_search:
+        index.setdefault(the_dict[key], the_dict)
+    return index
@@ -0,0 +1,83 @@
+import time
+
+import aiohttp
+import requests
+
+# Functions called with (method, url, status_code, seconds) after every HTTP request made
+# through requests or aiohttp. status_code is None when the request raised.
+_request_listeners = []
+_hooks_installed = False
+
+
+def add_request_listener(listener):
+    """
+    Call a function after every HTTP request made in this process.
+
+    Parameters
+    ----------
+    listener : function
+        Called with the request's method, url, response status code and duration in seconds.
+    """
+    install_http_hooks()
+    if listener not in _request_listeners:
+        _request_listeners.append(listener)
+
+
+def remove_request_listener(listener):
+    if listener in _request_listeners:
+        _request_listeners.remove(listener)
+
+
+def _notify_listeners(method, url, status_code, seconds):
+    for listener in list(_request_listeners):
+        listener(method, str(url), status_code, seconds)
+
+
+async def _on_request_start(session, trace_config_ctx, params):
+    trace_config_ctx.start = time.monotonic()
+
+
+async def _on_request_end(session, trace_config_ctx, params):
+    _notify_listeners(params.method, params.url, params.response.status,
+                      time.monotonic() - trace_config_ctx.start)
+
+
+async def _on_request_exception(session, trace_config_ctx, params):
+    _notify_listeners(params.method, params.url, None, time.monotonic() - trace_config_ctx.start)
+
+
+def install_http_hooks():
+    """
+    Hook into every HTTP request made with requests or aiohttp. Targets call requests.get and
+    friends directly, use sessions and open their own aiohttp sessions, so requests are caught
+    in the requests transport adapter and with an aiohttp trace config added to every session.
+    """
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    _hooks_installed = True
+
+    adapter_send = requests.adapters.HTTPAdapter.send
+
+    def send(self, request, *args, **kwargs):
+        start = time.monotonic()
+        try:
+            response = adapter_send(self, request, *args, **kwargs)
+        except Exception:
+            _notify_listeners(request.method, request.url, None, time.monotonic() - start)
+            raise
+        _notify_listeners(request.method, request.url, response.status_code,
+                          time.monotonic() - start)
+        return response
+    requests.adapters.HTTPAdapter.send = send
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.on_request_exception.append(_on_request_exception)
+    session_init = aiohttp.ClientSession.__init__
+
+    def init(self, *args, **kwargs):
+        kwargs['trace_configs'] = list(kwargs.get('trace_configs') or []) + [trace_config]
+        session_init(self, *args, **kwargs)
+    aiohttp.ClientSession.__init__ = init
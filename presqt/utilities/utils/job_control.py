@@ -0,0 +1,120 @@
+import asyncio
+import signal
+import time
+
+from rest_framework import status
+
+from presqt.utilities.exceptions.exceptions import PresQTJobStopped
+
+# Signal the request server sends a job's process to ask it to stop
+CANCEL_SIGNAL = signal.SIGUSR1
+# Seconds between checks of a job's async requests
+CHECK_INTERVAL = 0.1
+# Messages saved in process_info when a job is cancelled, by action
+CANCEL_MESSAGES = {
+    'resource_download': 'Download was cancelled by the user',
+    'resource_upload': 'Upload was cancelled by the user',
+    'resource_transfer_in': 'Transfer was cancelled by the user'
+}
+TIMEOUT_MESSAGE = 'The process took too long on the server.'
+
+
+class JobControl(object):
+    """
+    Cancellation token and deadline handed to a job's target functions. Targets call check()
+    between files and run their async requests through run_until_complete, so a job that is
+    cancelled or runs out of time stops cleanly instead of being killed mid request.
+    Only plain values are kept so the job can be sent to a job worker.
+    """
+    def __init__(self, action, deadline=None):
+        """
+        Parameters
+        ----------
+        action : str
+            The job's action, e.g. 'resource_download'.
+        deadline : float
+            The time.time() the job must be finished by, if any.
+        """
+        self.action = action
+        self.deadline = deadline
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def listen_for_cancel(self):
+        """
+        Cancel the job when its process gets CANCEL_SIGNAL. Must be called from the main
+        thread of the job's process.
+        """
+        signal.signal(CANCEL_SIGNAL, lambda signal_number, frame: self.cancel())
+
+    def time_left(self):
+        """
+        Get the seconds left before the job's deadline, or None if it doesn't have one.
+        """
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.time(), 0)
+
+    def stopping(self):
+        """
+        Whether the job has been cancelled or has run out of time.
+        """
+        return self.cancelled or self.time_left() == 0
+
+    def check(self):
+        """
+        Raise PresQTJobStopped if the job has been cancelled or has run out of time.
+        """
+        if self.cancelled:
+            raise PresQTJobStopped(
+                CANCEL_MESSAGES.get(self.action, 'The job was cancelled by the user'), '499')
+        if self.time_left() == 0:
+            raise PresQTJobStopped(TIMEOUT_MESSAGE, status.HTTP_504_GATEWAY_TIMEOUT)
+
+    def run_until_complete(self, loop, coroutine):
+        """
+        Run a coroutine on an event loop, cancelling it and raising PresQTJobStopped if the job
+        is stopped before it completes. Requests still in flight are cancelled with it.
+
+        Parameters
+        ----------
+        loop : asyncio event loop
+            The loop to run the coroutine on.
+        coroutine : coroutine
+            The coroutine making the job's async requests.
+
+        Returns
+        -------
+        The coroutine's result.
+        """
+        return loop.run_until_complete(self._watch(coroutine))
+
+    async def _watch(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        while not task.done():
+            await asyncio.wait([task], timeout=CHECK_INTERVAL)
+            if not task.done() and self.stopping():
+                task.cancel()
+                try:
+                    return await task
+                except asyncio.CancelledError:
+                    self.check()
+                    raise
+        return task.result()
+
+
+def run_with_job_control(method_to_call, job_control):
+    """
+    Run a job's method in its own process, listening for the request server asking it to stop.
+
+    Parameters
+    ----------
+    method_to_call : class method
+        The job's method.
+    job_control : JobControl
+        The job's JobControl.
+    """
+    job_control.listen_for_cancel()
+    method_to_call()
@@ -0,0 +1,162 @@
+import collections
+import threading
+import time
+from contextlib import contextmanager
+
+# Spans are only recorded inside the process running a job so they are never shared between jobs.
+_job_spans = None
+
+
+class Span(object):
+    """
+    A span that is being timed. Code inside the span adds the bytes it handles.
+    """
+    def __init__(self):
+        self.bytes = 0
+
+    def add_bytes(self, byte_count):
+        self.bytes += byte_count
+
+
+class JobSpans(object):
+    """
+    Totals for each span of a job, e.g. fetch, file_download, fixity, bag, zip and upload.
+    Each span name keeps the number of times it ran, the seconds spent in it, the bytes it
+    handled and the HTTP requests made while it was open. A request for a method and url whose
+    last request during the job raised or got a 429 or 5xx response is counted as a retry.
+    Requests that are repeated after succeeding, like polling, aren't retries.
+    Spans can be recorded from several threads at once.
+    """
+    def __init__(self):
+        self.spans = {}
+        self._open_spans = collections.Counter()
+        self._failed_requests = set()
+        self._lock = threading.Lock()
+
+    def _get_totals(self, name):
+        if name not in self.spans:
+            self.spans[name] = {'count': 0, 'seconds': 0, 'bytes': 0,
+                                'http_requests': 0, 'http_retries': 0}
+        return self.spans[name]
+
+    @contextmanager
+    def span(self, name):
+        """
+        Add the time spent in the with block to the span's totals.
+
+        Parameters
+        ----------
+        name : str
+            The name of the span.
+
+        Yields
+        ------
+        The Span, to add byte counts to.
+        """
+        span = Span()
+        with self._lock:
+            self._get_totals(name)
+            self._open_spans[name] += 1
+        start = time.monotonic()
+        try:
+            yield span
+        finally:
+            self.record(name, time.monotonic() - start, span.bytes)
+            with self._lock:
+                self._open_spans[name] -= 1
+
+    def record(self, name, seconds, byte_count=0):
+        """
+        Add a span that has already finished to the span's totals.
+
+        Parameters
+        ----------
+        name : str
+            The name of the span.
+        seconds : float
+            The duration of the span.
+        byte_count : int
+            The number of bytes handled in the span.
+        """
+        with self._lock:
+            totals = self._get_totals(name)
+            totals['count'] += 1
+            totals['seconds'] += seconds
+            totals['bytes'] += byte_count
+
+    def request_made(self, method, url, status_code):
+        """
+        Count an HTTP request in every open span.
+
+        Parameters
+        ----------
+        method : str
+            The request's method.
+        url : str
+            The request's url.
+        status_code : int
+            The response's status code, None if the request raised.
+        """
+        with self._lock:
+            retry = (method, url) in self._failed_requests
+            if status_code is None or status_code == 429 or status_code >= 500:
+                self._failed_requests.add((method, url))
+            else:
+                self._failed_requests.discard((method, url))
+            for name, open_count in self._open_spans.items():
+                if open_count:
+                    self.spans[name]['http_requests'] += 1
+                    self.spans[name]['http_retries'] += retry
+
+    def to_dict(self):
+        """
+        Get the totals of each span.
+        """
+        with self._lock:
+            return {name: dict(totals, seconds=round(totals['seconds'], 4))
+                    for name, totals in self.spans.items()}
+
+
+def _count_request(method, url, status_code, seconds):
+    if _job_spans is not None:
+        _job_spans.request_made(method, url, status_code)
+
+
+def open_job_spans(spans):
+    """
+    Record the spans of target functions run in this process, such as each file download, and
+    the HTTP requests made in this process with the job's spans.
+
+    Parameters
+    ----------
+    spans : JobSpans
+        The job's spans.
+    """
+    # The HTTP hooks import aiohttp, so they're only imported by processes that run jobs
+    from presqt.utilities.utils.http_hooks import add_request_listener
+
+    global _job_spans
+    _job_spans = spans
+    add_request_listener(_count_request)
+
+
+def close_job_spans():
+    global _job_spans
+    _job_spans = None
+
+
+def record_span(name, seconds, byte_count=0):
+    """
+    Add a finished span to the job running in this process, if there is one.
+
+    Parameters
+    ----------
+    name : str
+        The name of the span.
+    seconds : float
+        The duration of the span.
+    byte_count : int
+        The number of bytes handled in the span.
+    """
+    if _job_spans is not None:
+        _job_spans.record(name, seconds, byte_count)
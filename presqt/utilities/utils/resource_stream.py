@@ -0,0 +1,257 @@
+import asyncio
+import os
+import queue
+import threading
+
+from rest_framework import status
+
+from presqt.utilities.exceptions.exceptions import PresQTResponseException
+
+# Streams only live inside the process running a job so they are never shared between jobs.
+_download_stream = None
+_pending_downloads = {}
+_upload_streams = {}
+
+
+class ResourceStream(object):
+    """
+    Bounded queue that hands resources from one stage of a pipelined transfer to the next.
+    Producers wait while the queue is full so a slow stage holds back the stages before it.
+    """
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize)
+        # Set by the consumer when it won't take any more items
+        self.stopped = threading.Event()
+        # Set by the producer when it won't finish the stream
+        self.aborted = threading.Event()
+        self.total_files = 0
+        # Names of the folders and files at the top of the streamed directory, kept up to date
+        # by the producer as it adds items
+        self.top_level_folders = []
+        self.top_level_files = []
+
+    def put(self, item):
+        """
+        Add an item to the stream, waiting for room. Items are dropped once the consumer stops.
+        """
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=1)
+                return
+            except queue.Full:
+                pass
+
+    async def put_async(self, item):
+        """
+        Add an item to the stream from a coroutine. While the stream is full the coroutine is
+        suspended and the wait happens on an executor thread, so the event loop keeps running
+        the other coroutines.
+        """
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            await asyncio.get_event_loop().run_in_executor(None, self.put, item)
+
+    def get(self):
+        """
+        Take the next item from the stream, waiting for one to arrive.
+        None is returned once the producer has finished.
+        """
+        while True:
+            if self.aborted.is_set():
+                raise PresQTResponseException(
+                    "PresQT Error: The transfer was stopped before all resources were downloaded.",
+                    status.HTTP_500_INTERNAL_SERVER_ERROR)
+            try:
+                return self.queue.get(timeout=1)
+            except queue.Empty:
+                pass
+
+    def drain(self):
+        """
+        Take every item already in the stream without waiting for more.
+        """
+        items = []
+        while True:
+            try:
+                items.append(self.queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def finish(self):
+        """
+        Let the consumer know that no more items are coming.
+        """
+        self.put(None)
+
+    def stop(self):
+        self.stopped.set()
+
+    def abort(self):
+        self.aborted.set()
+
+
+def open_download_stream(stream):
+    """
+    Pass every file downloaded by a target's download function in this process to the stream
+    as soon as its contents arrive.
+
+    Parameters
+    ----------
+    stream : ResourceStream
+        The stream the downloaded resources are added to.
+    """
+    global _download_stream
+    _download_stream = stream
+    _pending_downloads.clear()
+
+
+def close_download_stream():
+    """
+    Stop passing downloaded files to the download stream.
+    """
+    global _download_stream
+    _download_stream = None
+    _pending_downloads.clear()
+
+
+def stream_resources(resources, urls):
+    """
+    Register the resources a download function is about to fetch along with their download urls.
+    Does nothing unless a download stream is open.
+
+    Parameters
+    ----------
+    resources : list
+        Resource dictionaries with everything but their contents filled in.
+    urls : list
+        The url each resource is downloaded from, in the same order as the resources.
+    """
+    if _download_stream is None:
+        return
+
+    for resource, url in zip(resources, urls):
+        _pending_downloads.setdefault(url, []).append(resource)
+
+
+async def stream_downloaded_contents(url, contents, hashes=None):
+    """
+    Add the resources registered for a url to the download stream now that their contents
+    have arrived. Does nothing unless a download stream is open. Download coroutines are
+    suspended while the stream is full.
+
+    Parameters
+    ----------
+    url : str
+        The url the contents were downloaded from.
+    contents : bytes
+        The downloaded contents.
+    hashes : dict
+        Hashes returned along with the contents, if the target only provides them then.
+    """
+    if _download_stream is None:
+        return
+
+    for resource in _pending_downloads.pop(url, []):
+        resource = dict(resource, file=contents)
+        if hashes:
+            resource['hashes'] = hashes
+        await _download_stream.put_async(resource)
+
+
+def open_upload_stream(directory, stream):
+    """
+    Have uploads from a directory take their files from a stream instead of walking the disk.
+
+    Parameters
+    ----------
+    directory : str
+        Directory the files are written to before they are added to the stream.
+    stream : ResourceStream
+        Stream of (directory, [], [file_name]) tuples for each file as it is written. Empty
+        directories are added as (directory, [], []).
+    """
+    _upload_streams[directory] = stream
+
+
+def close_upload_stream(directory):
+    """
+    Go back to walking the disk for uploads from a directory.
+
+    Parameters
+    ----------
+    directory : str
+        Directory the upload stream was opened for.
+    """
+    _upload_streams.pop(directory, None)
+
+
+def get_upload_stream(directory):
+    """
+    Get the upload stream feeding a directory or any of its parents.
+
+    Parameters
+    ----------
+    directory : str
+        Directory being uploaded.
+
+    Returns
+    -------
+    The ResourceStream or None if the directory isn't being streamed.
+    """
+    for stream_directory, stream in _upload_streams.items():
+        if '{}/'.format(directory).startswith('{}/'.format(stream_directory.rstrip('/'))):
+            return stream
+    return None
+
+
+def walk_upload_directory(directory):
+    """
+    Walk a directory of resources to upload the same way os.walk does. When the directory is
+    being written by a pipelined transfer each file is yielded as soon as it is on disk, and
+    the walk ends once the transfer has written every file.
+
+    Parameters
+    ----------
+    directory : str
+        Directory to walk.
+
+    Returns
+    -------
+    Iterator of (directory, sub directories, files) tuples.
+    """
+    stream = get_upload_stream(directory)
+    if stream is None:
+        return os.walk(directory)
+    return _walk_stream(directory, stream)
+
+
+def list_upload_directory(directory):
+    """
+    Get the top level of a directory of resources to upload the same way next(os.walk()) does.
+    When the directory is being written by a pipelined transfer the folders and files are the
+    ones the transfer has added so far, which it has checked are a valid structure to upload.
+
+    Parameters
+    ----------
+    directory : str
+        Directory to list.
+
+    Returns
+    -------
+    The (directory, folders, files) tuple.
+    """
+    stream = _upload_streams.get(directory.rstrip('/'))
+    if stream is None:
+        return next(os.walk(directory))
+    return directory, list(stream.top_level_folders), list(stream.top_level_files)
+
+
+def _walk_stream(directory, stream):
+    directory = directory.rstrip('/')
+    while True:
+        item = stream.get()
+        if item is None:
+            return
+        if item[0] == directory or item[0].startswith('{}/'.format(directory)):
+            yield item
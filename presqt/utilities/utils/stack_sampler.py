@@ -0,0 +1,94 @@
+import collections
+import os
+import sys
+import threading
+import time
+
+
+class StackSampler(object):
+    """
+    Sample the stacks of every thread in this process from a background thread and count them.
+    The counts are written in the collapsed stack format that flamegraph.pl and speedscope read,
+    one 'thread;outer_function (file:line);inner_function (file:line) count' line per stack.
+    The file is rewritten every few seconds so it's still there if the process is killed.
+    """
+    def __init__(self, path, interval=0.01, write_interval=5):
+        """
+        Parameters
+        ----------
+        path : str
+            The collapsed stack file to write.
+        interval : float
+            Number of seconds between samples.
+        write_interval : float
+            Number of seconds between rewrites of the file while sampling.
+        """
+        self.path = path
+        self.interval = interval
+        self.write_interval = write_interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample_loop, name='StackSampler',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop sampling and write the file.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.write()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _sample_loop(self):
+        last_write = time.monotonic()
+        while not self._stop.wait(self.interval):
+            self.sample()
+            if time.monotonic() - last_write > self.write_interval:
+                self.write()
+                last_write = time.monotonic()
+
+    def sample(self):
+        """
+        Count the current stack of every thread but the sampler's.
+        """
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == threading.get_ident():
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(_get_frame_name(frame))
+                frame = frame.f_back
+            frames.append(thread_names.get(thread_id, 'Thread-{}'.format(thread_id)))
+            self.stacks[';'.join(reversed(frames))] += 1
+
+    def write(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temporary_path = '{}.tmp'.format(self.path)
+        with open(temporary_path, 'w') as collapsed_file:
+            for stack, count in sorted(self.stacks.items()):
+                collapsed_file.write('{} {}\n'.format(stack, count))
+        os.replace(temporary_path, self.path)
+
+
+def _get_frame_name(frame):
+    code = frame.f_code
+    file_name = code.co_filename
+    # Keep paths short and the same across installs
+    if 'site-packages' + os.sep in file_name:
+        file_name = file_name.split('site-packages' + os.sep, 1)[1]
+    elif file_name.startswith(os.getcwd() + os.sep):
+        file_name = os.path.relpath(file_name)
+    return '{} ({}:{})'.format(code.co_name, file_name, code.co_firstlineno)
@@ -1,7 +1,11 @@
 # TODO: Refactor these funcs to keep things dry
+import threading
 
 from presqt.utilities import write_file, read_file
 
+# Pipelined transfers update the process_info.json file from several threads at once
+PROCESS_INFO_LOCK = threading.RLock()
+
 
 def update_process_info(process_info_path, total_files, action, function):
     """
@@ -18,18 +22,19 @@ def update_process_info(process_info_path, total_files, action, function):
     function: str
         The function being called
     """
-    process_info_data = read_file(process_info_path, True)
+    with PROCESS_INFO_LOCK:
+        process_info_data = read_file(process_info_path, True)
 
-    # Get the proper dict key
-    if function == 'upload':
-        key = 'upload_total_files'
-    elif function == 'download':
-        key = 'download_total_files'
-    else:
-        key = 'total_files'
+        # Get the proper dict key
+        if function == 'upload':
+            key = 'upload_total_files'
+        elif function == 'download':
+            key = 'download_total_files'
+        else:
+            key = 'total_files'
 
-    process_info_data[action][key] = total_files
-    write_file(process_info_path, process_info_data, True)
+        process_info_data[action][key] = total_files
+        write_file(process_info_path, process_info_data, True)
     return
 
 
@@ -46,18 +51,19 @@ def increment_process_info(process_info_path, action, function):
     function: str
         The function being called
     """
-    process_info_data = read_file(process_info_path, True)
+    with PROCESS_INFO_LOCK:
+        process_info_data = read_file(process_info_path, True)
 
-    # Get the proper dict key
-    if function == 'upload':
-        key = 'upload_files_finished'
-    elif function == 'download':
-        key = 'download_files_finished'
-    else:
-        key = 'files_finished'
+        # Get the proper dict key
+        if function == 'upload':
+            key = 'upload_files_finished'
+        elif function == 'download':
+            key = 'download_files_finished'
+        else:
+            key = 'files_finished'
 
-    process_info_data[action][key] = process_info_data[action][key] + 1
-    write_file(process_info_path, process_info_data, True)
+        process_info_data[action][key] = process_info_data[action][key] + 1
+        write_file(process_info_path, process_info_data, True)
     return
 
 
@@ -74,7 +80,8 @@ def update_process_info_message(process_info_path, action, message):
     message: str
         The message to add to the process_info file
     """
-    process_info_data = read_file(process_info_path, True)
-    process_info_data[action]['message'] = message
-    write_file(process_info_path, process_info_data, True)
+    with PROCESS_INFO_LOCK:
+        process_info_data = read_file(process_info_path, True)
+        process_info_data[action]['message'] = message
+        write_file(process_info_path, process_info_data, True)
     return